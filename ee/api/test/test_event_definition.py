@@ -13,6 +13,7 @@ from posthog.api.test.test_team import create_team
 from posthog.api.test.test_user import create_user
 from posthog.models import Tag, ActivityLog, Team, User
 from posthog.models.event_definition import EventDefinition
+from posthog.models.hogql_schema_version import get_hogql_schema_version
 from posthog.test.base import APIBaseTest
 from posthog.api.test.test_organization import create_organization
 
@@ -212,6 +213,21 @@ class TestEventDefinitionEnterpriseAPI(APIBaseTest):
             },
         ]
 
+    def test_update_event_definition_bumps_hogql_schema_version(self):
+        super(LicenseManager, cast(LicenseManager, License.objects)).create(
+            plan="enterprise", valid_until=timezone.datetime(2038, 1, 19, 3, 14, 7)
+        )
+        event = EnterpriseEventDefinition.objects.create(team=self.demo_team, name="enterprise event", owner=self.user)
+        schema_version = get_hogql_schema_version(self.demo_team.pk)
+
+        response = self.client.patch(
+            f"/api/projects/@current/event_definitions/{str(event.id)}/",
+            {"description": "This is a description."},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(get_hogql_schema_version(self.demo_team.pk), schema_version)
+
     def test_update_event_without_license(self):
         event = EnterpriseEventDefinition.objects.create(team=self.demo_team, name="enterprise event")
         response = self.client.patch(
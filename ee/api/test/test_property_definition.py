@@ -8,6 +8,7 @@ from rest_framework import status
 from ee.models.license import License, LicenseManager
 from ee.models.property_definition import EnterprisePropertyDefinition
 from posthog.models import EventProperty, Tag, ActivityLog
+from posthog.models.hogql_schema_version import get_hogql_schema_version
 from posthog.models.property_definition import PropertyDefinition
 from posthog.test.base import APIBaseTest
 
@@ -248,6 +249,18 @@ class TestPropertyDefinitionEnterpriseAPI(APIBaseTest):
         response_data = response.json()
         self.assertEqual(response_data["property_type"], "DateTime")
 
+    def test_update_property_type_bumps_hogql_schema_version(self):
+        property = EnterprisePropertyDefinition.objects.create(team=self.team, name="enterprise property")
+        schema_version = get_hogql_schema_version(self.team.pk)
+
+        response = self.client.patch(
+            f"/api/projects/@current/property_definitions/{str(property.id)}/",
+            data={"property_type": "Numeric"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(get_hogql_schema_version(self.team.pk), schema_version)
+
     def test_can_update_property_type_and_unchanged_keys_without_license(self):
         property = EnterprisePropertyDefinition.objects.create(team=self.team, name="enterprise property")
         response = self.client.patch(
@@ -0,0 +1,122 @@
+# isort: skip_file
+# Needs to be first to set up django environment
+from .helpers import now  # noqa: F401
+import asyncio
+import datetime as dt
+import json
+import time
+
+import pyarrow as pa
+from google.cloud import bigquery
+
+from posthog.temporal.batch_exports.bigquery_batch_export import load_records_to_bigquery_table
+
+RECORDS = 50_000
+RECORDS_PER_BATCH = 5_000
+MAX_BYTES = 1024 * 1024 * 2
+# Roughly how long BigQuery takes to run a small load job, besides the upload itself
+LOAD_JOB_LATENCY_SECONDS = 0.1
+
+
+class FakeLoadJob:
+    def result(self):
+        time.sleep(LOAD_JOB_LATENCY_SECONDS)
+
+
+class FakeBigQueryClient:
+    """Stands in for a `bigquery.Client`, reading each loaded file whole as if it was uploaded."""
+
+    def __init__(self):
+        self.loaded_bytes = 0
+
+    def load_table_from_file(self, file, table, job_config, rewind=False):
+        if rewind:
+            file.seek(0)
+        self.loaded_bytes += len(file.read())
+        return FakeLoadJob()
+
+
+def _record_batches() -> list[pa.RecordBatch]:
+    inserted_at = dt.datetime(2024, 5, 28, tzinfo=dt.timezone.utc)
+    properties = json.dumps(
+        {
+            "$browser": "Chrome",
+            "$os": "Mac OS X",
+            "$current_url": "https://example.com/blog/post?utm_source=newsletter",
+            "$screen_width": 1728,
+            "$active_feature_flags": ["new-onboarding", "beta-dashboard"],
+        }
+    )
+    batches = []
+    for start in range(0, RECORDS, RECORDS_PER_BATCH):
+        indexes = range(start, start + RECORDS_PER_BATCH)
+        batches.append(
+            pa.RecordBatch.from_pydict(
+                {
+                    "uuid": [f"018fc0a4-a1b2-7c3d-9e4f-{index:012d}" for index in indexes],
+                    "event": ["$pageview"] * RECORDS_PER_BATCH,
+                    "properties": [properties] * RECORDS_PER_BATCH,
+                    "distinct_id": [f"user-{index % 1000}" for index in indexes],
+                    "team_id": [1] * RECORDS_PER_BATCH,
+                    "timestamp": [inserted_at + dt.timedelta(seconds=index) for index in indexes],
+                    "_inserted_at": [inserted_at + dt.timedelta(seconds=index) for index in indexes],
+                }
+            )
+        )
+    return batches
+
+
+def _table_schema(json_type: bool) -> list[bigquery.SchemaField]:
+    return [
+        bigquery.SchemaField("uuid", "STRING"),
+        bigquery.SchemaField("event", "STRING"),
+        bigquery.SchemaField("properties", "JSON" if json_type else "STRING"),
+        bigquery.SchemaField("distinct_id", "STRING"),
+        bigquery.SchemaField("team_id", "INT64"),
+        bigquery.SchemaField("timestamp", "TIMESTAMP"),
+    ]
+
+
+class BigQueryBatchExportLoadSuite:
+    """
+    Loading events into BigQuery as a batch export does, against a fake client that only reads the files and
+    simulates the latency of load jobs. Tables with JSON columns are loaded from JSONL, all others from Parquet.
+    """
+
+    version = "v001"
+    params = (["string_properties", "json_properties"], [1, 4])
+    param_names = ["properties_type", "max_concurrent_loads"]
+    timeout = 600
+
+    def setup(self, properties_type, max_concurrent_loads):
+        json_type = properties_type == "json_properties"
+        self.record_batches = _record_batches()
+        self.table_schema = _table_schema(json_type)
+        self.json_columns = ["properties"] if json_type else []
+
+    def _load(self, max_concurrent_loads) -> int:
+        async def record_batches():
+            for record_batch in self.record_batches:
+                yield record_batch
+
+        return asyncio.run(
+            load_records_to_bigquery_table(
+                record_batches(),
+                bigquery.Table("project.dataset.events"),
+                self.table_schema,
+                FakeBigQueryClient(),  # type: ignore[arg-type]
+                json_columns=self.json_columns,
+                max_bytes=MAX_BYTES,
+                max_concurrent_loads=max_concurrent_loads,
+            )
+        )
+
+    def time_load_records(self, properties_type, max_concurrent_loads):
+        self._load(max_concurrent_loads)
+
+    def track_records_per_second(self, properties_type, max_concurrent_loads):
+        start = time.perf_counter()
+        records = self._load(max_concurrent_loads)
+        return records / (time.perf_counter() - start)
+
+    track_records_per_second.unit = "records/s"  # type: ignore[attr-defined]
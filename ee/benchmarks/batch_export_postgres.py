@@ -0,0 +1,70 @@
+# isort: skip_file
+# Needs to be first to set up django environment
+from .helpers import now  # noqa: F401
+import csv
+import datetime as dt
+import json
+
+import pyarrow as pa
+
+from posthog.temporal.batch_exports.postgres_batch_export import iter_pgcopy_chunks
+from posthog.temporal.batch_exports.temporary_file import BatchExportTemporaryFile
+
+RECORDS = 10_000
+COLUMNS = ["uuid", "event", "properties", "distinct_id", "team_id", "timestamp"]
+PG_TYPES = [
+    "character varying",
+    "character varying",
+    "jsonb",
+    "character varying",
+    "integer",
+    "timestamp with time zone",
+]
+
+
+def _record_batch() -> pa.RecordBatch:
+    timestamp = dt.datetime(2024, 5, 28, tzinfo=dt.timezone.utc)
+    properties = json.dumps(
+        {
+            "$browser": "Chrome",
+            "$os": "Mac OS X",
+            "$current_url": "https://example.com/blog/post?utm_source=newsletter",
+            "$screen_width": 1728,
+            "$active_feature_flags": ["new-onboarding", "beta-dashboard"],
+        }
+    )
+    return pa.RecordBatch.from_pydict(
+        {
+            "uuid": [f"018fc0a4-a1b2-7c3d-9e4f-{index:012d}" for index in range(RECORDS)],
+            "event": ["$pageview"] * RECORDS,
+            "properties": [properties] * RECORDS,
+            "distinct_id": [f"user-{index % 1000}" for index in range(RECORDS)],
+            "team_id": pa.array([1] * RECORDS, type=pa.int32()),
+            "timestamp": [timestamp + dt.timedelta(seconds=index) for index in range(RECORDS)],
+        }
+    )
+
+
+class PostgresBatchExportEncodingSuite:
+    """
+    Encoding a record batch of events for a Postgres COPY, as TSV row by row through a temporary file, and in the
+    binary COPY format column by column. Nothing is sent to Postgres.
+    """
+
+    version = "v001"
+
+    def setup(self):
+        self.record_batch = _record_batch()
+
+    def time_encode_tsv(self):
+        with BatchExportTemporaryFile() as pg_file:
+            for row in self.record_batch.to_pylist():
+                pg_file.write_records_to_tsv([row], fieldnames=COLUMNS, quoting=csv.QUOTE_MINIMAL, escapechar=None)
+
+    def time_encode_binary(self):
+        for _ in iter_pgcopy_chunks(self.record_batch, PG_TYPES):
+            pass
+
+    def peakmem_encode_binary(self):
+        for _ in iter_pgcopy_chunks(self.record_batch, PG_TYPES):
+            pass
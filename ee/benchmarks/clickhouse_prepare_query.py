@@ -0,0 +1,133 @@
+# isort: skip_file
+# Needs to be first to set up django environment
+from .helpers import now  # noqa: F401
+from typing import Any
+
+import sqlparse
+
+from posthog.clickhouse.client.comments import strip_sql_comments
+from posthog.clickhouse.client.escape import substitute_params
+from posthog.clickhouse.client.execute import _prepare_query
+from posthog.queries.trends.sql import BREAKDOWN_INNER_SQL, BREAKDOWN_QUERY_SQL
+
+FUNNEL_STEPS = 10
+BREAKDOWN_VALUES = 25
+
+
+def _legacy_breakdown_query() -> tuple[str, dict[str, Any]]:
+    """A legacy trends breakdown query, whose SQL template has a lot of comments in it."""
+    inner_sql = BREAKDOWN_INNER_SQL.format(
+        aggregate_operation="count(*)",
+        timestamp_truncated="toStartOfDay(toTimeZone(toDateTime(timestamp, 'UTC'), %(timezone)s))",
+        breakdown_value="replaceRegexpAll(JSONExtractRaw(properties, %(key)s), '^\"|\"$', '')",
+        sample_clause="",
+        person_join="",
+        groups_join="",
+        sessions_join="",
+        breakdown_filter=(
+            "WHERE team_id = %(team_id)s AND event = %(event)s AND timestamp >= toDateTime(%(date_from)s, 'UTC') "
+            "AND timestamp <= toDateTime(%(date_to)s, 'UTC') AND breakdown_value IN %(values)s"
+        ),
+        null_person_filter="",
+    )
+    sql = BREAKDOWN_QUERY_SQL.format(
+        date_to_truncated="toStartOfDay(toDateTime(%(date_to)s, %(timezone)s))",
+        interval_func="toIntervalDay",
+        num_intervals=30,
+        date_from_truncated="toStartOfDay(toDateTime(%(date_from)s, %(timezone)s))",
+        inner_sql=inner_sql,
+    )
+    args = {
+        "team_id": 1,
+        "event": "$pageview",
+        "key": "$current_url",
+        "timezone": "UTC",
+        "date_from": "2024-05-01 00:00:00",
+        "date_to": "2024-05-31 23:59:59",
+        "values": [f"https://posthog.com/blog/post-{index}?utm_source=newsletter" for index in range(BREAKDOWN_VALUES)],
+    }
+    return sql, args
+
+
+def _hogql_funnel_query() -> tuple[str, dict[str, Any]]:
+    """
+    A funnel printed by HogQL, which has no comments, but a URL filter value with a wildcard that looks like the
+    start of one.
+    """
+    step_columns = ",\n".join(
+        f"            if(and(equals(e.event, %(hogql_val_{step})s), ifNull(like(replaceRegexpAll(nullIf(nullIf("
+        f"JSONExtractRaw(e.properties, %(hogql_val_url_key)s), ''), 'null'), '^\"|\"$', ''), %(hogql_val_url)s), 0)), "
+        f"1, 0) AS step_{step},\n"
+        f"            if(ifNull(equals(step_{step}, 1), 0), timestamp, NULL) AS latest_{step}"
+        for step in range(FUNNEL_STEPS)
+    )
+    window_columns = ",\n".join(
+        f"         min(latest_{step}) OVER (PARTITION BY aggregation_target ORDER BY timestamp DESC "
+        f"ROWS BETWEEN UNBOUNDED PRECEDING AND 0 PRECEDING) AS latest_{step}"
+        for step in range(FUNNEL_STEPS)
+    )
+    conditions = " AND ".join(
+        f"ifNull(lessOrEquals(latest_{step - 1}, latest_{step}), 0)" for step in range(1, FUNNEL_STEPS)
+    )
+    sql = f"""SELECT countIf(ifNull(equals(steps, {FUNNEL_STEPS}), 0)) AS conversions, count() AS total
+FROM
+  (SELECT aggregation_target AS aggregation_target,
+          max(steps) AS steps
+   FROM
+     (SELECT *, if({conditions}, {FUNNEL_STEPS}, 1) AS steps
+      FROM
+        (SELECT aggregation_target AS aggregation_target,
+                timestamp AS timestamp,
+{window_columns}
+         FROM
+           (SELECT e.timestamp AS timestamp,
+                   if(not(empty(e__override.distinct_id)), e__override.person_id, e.person_id) AS aggregation_target,
+{step_columns}
+            FROM events AS e
+            LEFT OUTER JOIN
+              (SELECT argMax(person_distinct_id_overrides.person_id, person_distinct_id_overrides.version) AS person_id,
+                      person_distinct_id_overrides.distinct_id AS distinct_id
+               FROM person_distinct_id_overrides
+               WHERE equals(person_distinct_id_overrides.team_id, 1)
+               GROUP BY person_distinct_id_overrides.distinct_id
+               HAVING ifNull(equals(argMax(person_distinct_id_overrides.is_deleted, person_distinct_id_overrides.version), 0), 0)) AS e__override ON equals(e.distinct_id, e__override.distinct_id)
+            WHERE and(equals(e.team_id, 1), and(greaterOrEquals(toTimeZone(e.timestamp, 'UTC'), toDateTime64('2024-05-01 00:00:00.000000', 6, 'UTC')), lessOrEquals(toTimeZone(e.timestamp, 'UTC'), toDateTime64('2024-05-31 23:59:59.999999', 6, 'UTC'))))))))
+   GROUP BY aggregation_target)
+LIMIT 100 SETTINGS readonly=2, max_execution_time=60, allow_experimental_object_type=1"""
+    args: dict[str, Any] = {f"hogql_val_{step}": f"step {step}" for step in range(FUNNEL_STEPS)}
+    args["hogql_val_url_key"] = "$current_url"
+    args["hogql_val_url"] = "https://posthog.com/blog/*"
+    return sql, args
+
+
+# Queries with their args, and whether they're declared comment-free as their callers do
+QUERIES: dict[str, tuple[str, dict[str, Any], bool]] = {
+    "legacy_breakdown": (*_legacy_breakdown_query(), False),
+    "hogql_funnel": (*_hogql_funnel_query(), True),
+}
+
+
+class ClickHousePrepareQuerySuite:
+    """
+    Preparing generated queries for ClickHouse, and stripping their comments with and without sqlparse, as
+    queries used to be prepared. Nothing is sent to ClickHouse.
+    """
+
+    version = "v001"
+
+    params = list(QUERIES.keys())
+    param_names = ["query"]
+
+    def setup(self, query: str):
+        sql, args, _ = QUERIES[query]
+        self.rendered_sql = substitute_params(sql, args)
+
+    def time_prepare_query(self, query: str):
+        sql, args, comment_free = QUERIES[query]
+        _prepare_query(client=None, query=sql, args=args, comment_free=comment_free)
+
+    def time_strip_comments(self, query: str):
+        strip_sql_comments(self.rendered_sql)
+
+    def time_strip_comments_with_sqlparse(self, query: str):
+        sqlparse.format(self.rendered_sql, strip_comments=True)
@@ -0,0 +1,227 @@
+# isort: skip_file
+# Needs to be first to set up django environment
+from .helpers import now  # noqa: F401
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from posthog.hogql.constants import HogQLGlobalSettings
+from posthog.hogql.context import HogQLContext
+from posthog.hogql.printer import print_ast
+from posthog.hogql.timings import HogQLTimings
+from posthog.hogql_queries.query_runner import get_query_runner
+from posthog.models import Organization, Team
+
+EVENT_PROPERTY_FILTER = {"key": "$host", "operator": "is_not", "value": ["localhost:8000"], "type": "event"}
+PERSON_PROPERTY_FILTER = {"key": "email", "operator": "icontains", "value": ".com", "type": "person"}
+BROWSER_BREAKDOWN = {"breakdown": "$browser", "breakdown_type": "event"}
+FUNNEL_SERIES = [
+    {"kind": "EventsNode", "event": "$pageview"},
+    {"kind": "EventsNode", "event": "signed up", "properties": [PERSON_PROPERTY_FILTER]},
+    {"kind": "EventsNode", "event": "created insight"},
+    {"kind": "EventsNode", "event": "invited teammate"},
+]
+
+# Representative queries of every kind that is compiled through HogQL, keyed by benchmark parameter name
+QUERIES: dict[str, dict[str, Any]] = {
+    "trends": {
+        "kind": "TrendsQuery",
+        "series": [{"kind": "EventsNode", "event": "$pageview"}],
+        "dateRange": {"date_from": "-30d"},
+        "properties": [EVENT_PROPERTY_FILTER],
+    },
+    "trends_dau_breakdown": {
+        "kind": "TrendsQuery",
+        "series": [{"kind": "EventsNode", "event": "$pageview", "math": "dau"}],
+        "dateRange": {"date_from": "-30d"},
+        "breakdownFilter": BROWSER_BREAKDOWN,
+        "properties": [PERSON_PROPERTY_FILTER],
+    },
+    "trends_formula": {
+        "kind": "TrendsQuery",
+        "series": [
+            {"kind": "EventsNode", "event": "signed up"},
+            {"kind": "EventsNode", "event": "$pageview", "math": "dau"},
+        ],
+        "dateRange": {"date_from": "-90d"},
+        "interval": "week",
+        "trendsFilter": {"formula": "A / B"},
+    },
+    "funnel": {
+        "kind": "FunnelsQuery",
+        "series": FUNNEL_SERIES,
+        "dateRange": {"date_from": "-14d"},
+        "funnelsFilter": {"funnelWindowInterval": 14, "funnelWindowIntervalUnit": "day"},
+    },
+    "funnel_breakdown": {
+        "kind": "FunnelsQuery",
+        "series": FUNNEL_SERIES,
+        "dateRange": {"date_from": "-14d"},
+        "breakdownFilter": BROWSER_BREAKDOWN,
+    },
+    "funnel_trends": {
+        "kind": "FunnelsQuery",
+        "series": FUNNEL_SERIES,
+        "dateRange": {"date_from": "-30d"},
+        "funnelsFilter": {"funnelVizType": "trends"},
+    },
+    "paths": {
+        "kind": "PathsQuery",
+        "dateRange": {"date_from": "-7d"},
+        "pathsFilter": {"includeEventTypes": ["$pageview", "custom_event"], "stepLimit": 8},
+    },
+    "retention": {
+        "kind": "RetentionQuery",
+        "dateRange": {"date_from": "-90d"},
+        "retentionFilter": {
+            "period": "Week",
+            "totalIntervals": 12,
+            "retentionType": "retention_first_time",
+            "targetEntity": {"id": "signed up", "type": "events"},
+            "returningEntity": {"id": "$pageview", "type": "events"},
+        },
+    },
+    "web_overview": {
+        "kind": "WebOverviewQuery",
+        "dateRange": {"date_from": "-7d"},
+        "properties": [],
+    },
+    "web_stats_table": {
+        "kind": "WebStatsTableQuery",
+        "dateRange": {"date_from": "-7d"},
+        "properties": [],
+        "breakdownBy": "Page",
+        "includeBounceRate": True,
+        "includeScrollDepth": True,
+    },
+    "hogql": {
+        "kind": "HogQLQuery",
+        "query": """
+            select person.properties.email, count(), uniq(properties.$session_id)
+            from events
+            where event = '$pageview' and timestamp > now() - interval 7 day and person.properties.email ilike '%.com'
+            group by person.properties.email
+            order by count() desc
+        """,
+    },
+}
+
+# Parts of the compilation tracked separately, matching the keys measured with HogQLTimings
+PHASES = [
+    "to_query",
+    "create_hogql_database",
+    "resolve_types",
+    "resolve_property_types",
+    "resolve_lazy_tables",
+    "printer",
+]
+
+
+@dataclass
+class AllocationTimings(HogQLTimings):
+    """HogQLTimings that also record the bytes still allocated at the end of each phase."""
+
+    allocations: dict[str, int] = field(default_factory=dict)
+
+    @contextmanager
+    def measure(self, key: str):
+        full_key = f"{self._timing_pointer}/{key}"
+        before = tracemalloc.get_traced_memory()[0]
+        with super().measure(key):
+            yield
+        self.allocations[full_key] = self.allocations.get(full_key, 0) + tracemalloc.get_traced_memory()[0] - before
+
+
+def get_benchmark_team() -> Team:
+    team = Team.objects.filter(name="HogQL compilation benchmark").first()
+    if team is None:
+        organization = Organization.objects.create(name="HogQL compilation benchmark")
+        team = Team.objects.create(organization=organization, name="HogQL compilation benchmark")
+    return team
+
+
+def compile_query(query: dict[str, Any], team: Team, timings: HogQLTimings) -> str:
+    """Compiles a query to ClickHouse SQL, like its query runner would, without executing it."""
+    runner = get_query_runner(query, team, timings=timings)
+    with timings.measure("to_query"):
+        select_query = runner.to_query()
+    context = HogQLContext(
+        team_id=team.pk, team=team, enable_select_queries=True, timings=timings, modifiers=runner.modifiers
+    )
+    return print_ast(select_query, context=context, dialect="clickhouse", settings=HogQLGlobalSettings(), pretty=True)
+
+
+def totals_by_phase(measurements: dict[str, Any]) -> dict[str, Any]:
+    """Sums nested measurements like "./to_query/printer" by their last key"""
+    totals: dict[str, Any] = {}
+    for key, value in measurements.items():
+        phase = key.rsplit("/", 1)[-1]
+        totals[phase] = totals.get(phase, 0) + value
+    return totals
+
+
+class HogQLCompilationSuite:
+    """
+    Compiles a corpus of insight, web analytics and HogQL queries to ClickHouse SQL without executing them. Only
+    needs Postgres for the team and its schema, so regressions in the Python side of HogQL show up on their own.
+    """
+
+    timeout = 600.0
+    version = "v001"
+
+    params = list(QUERIES.keys())
+    param_names = ["query"]
+
+    team: Team
+
+    def setup(self, query: str):
+        self.team = get_benchmark_team()
+        # Warm up the imports and caches that are only paid once per process
+        compile_query(QUERIES[query], self.team, HogQLTimings())
+
+    def time_compile(self, query: str):
+        compile_query(QUERIES[query], self.team, HogQLTimings())
+
+    def peakmem_compile(self, query: str):
+        compile_query(QUERIES[query], self.team, HogQLTimings())
+
+
+class HogQLCompilationPhasesSuite:
+    """
+    Time and retained allocations of each compilation phase, as measured by HogQLTimings.
+    """
+
+    timeout = 600.0
+    version = "v001"
+
+    params = (list(QUERIES.keys()), PHASES)
+    param_names = ["query", "phase"]
+
+    def setup_cache(self) -> dict[str, dict[str, dict[str, float]]]:
+        team = get_benchmark_team()
+
+        results: dict[str, dict[str, dict[str, float]]] = {}
+        tracemalloc.start()
+        try:
+            for name, query in QUERIES.items():
+                compile_query(query, team, HogQLTimings())  # warm up
+                timings = AllocationTimings()
+                compile_query(query, team, timings)
+                results[name] = {
+                    "ms": {phase: seconds * 1000 for phase, seconds in totals_by_phase(timings.to_dict()).items()},
+                    "bytes": totals_by_phase(timings.allocations),
+                }
+        finally:
+            tracemalloc.stop()
+        return results
+
+    def track_phase_ms(self, results, query: str, phase: str):
+        return results[query]["ms"].get(phase, 0.0)
+
+    track_phase_ms.unit = "ms"  # type: ignore
+
+    def track_phase_retained_bytes(self, results, query: str, phase: str):
+        return results[query]["bytes"].get(phase, 0)
+
+    track_phase_retained_bytes.unit = "bytes"  # type: ignore
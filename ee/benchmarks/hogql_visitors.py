@@ -0,0 +1,101 @@
+# isort: skip_file
+# Needs to be first to set up django environment
+from .helpers import now  # noqa: F401
+from .hogql_compilation import QUERIES, get_benchmark_team
+
+from posthog.hogql.context import HogQLContext
+from posthog.hogql.database.database import create_hogql_database
+from posthog.hogql.parser import parse_select
+from posthog.hogql.printer import prepare_ast_for_printing, print_prepared_ast
+from posthog.hogql.timings import HogQLTimings
+from posthog.hogql_queries.query_runner import get_query_runner
+from posthog.hogql.visitor import CloningVisitor, TraversingVisitor, clear_locations
+
+
+def _funnel_like_query(steps: int) -> str:
+    step_columns = ",\n".join(
+        f"if(event = 'step_{step}' and properties.$browser in ('Chrome', 'Firefox') and person.properties.email ilike '%@posthog.com', 1, 0) as step_{step}"
+        for step in range(steps)
+    )
+    step_conditions = " or ".join(f"step_{step} = 1" for step in range(steps))
+    return f"""
+        select aggregation_target, max(steps) as steps
+        from (
+            select aggregation_target, timestamp, {", ".join(f"step_{step}" for step in range(steps))},
+                arraySum([{", ".join(f"step_{step}" for step in range(steps))}]) as steps
+            from (
+                select person_id as aggregation_target, timestamp, {step_columns}
+                from events
+                where timestamp >= toDateTime('2024-01-01') and timestamp < toDateTime('2024-02-01')
+            )
+            where {step_conditions}
+        )
+        group by aggregation_target
+        order by steps desc
+        limit 100
+    """
+
+
+class HogQLVisitorSuite:
+    """
+    Visiting a large unresolved HogQL query, to track the overhead of the visitor dispatch and of the AST nodes
+    themselves, without touching the database.
+    """
+
+    version = "v001"
+
+    def setup(self):
+        self.query = _funnel_like_query(20)
+        self.node = parse_select(self.query)
+
+    def time_traverse(self):
+        TraversingVisitor().visit(self.node)
+
+    def time_clone(self):
+        CloningVisitor().visit(self.node)
+
+    def time_clone_clear_locations(self):
+        clear_locations(self.node)
+
+    def peakmem_parse(self):
+        parse_select(self.query)
+
+    def peakmem_clone(self):
+        CloningVisitor().visit(self.node)
+
+
+class HogQLPrintingSuite:
+    """
+    Resolving and printing the queries of real funnel and paths insights, the passes over the AST that every query
+    goes through. The database schema is created once in setup, so that only the visitors are timed.
+    """
+
+    timeout = 600.0
+    version = "v001"
+
+    params = ["funnel", "funnel_breakdown", "paths"]
+    param_names = ["query"]
+
+    def setup(self, query: str):
+        self.team = get_benchmark_team()
+        runner = get_query_runner(QUERIES[query], self.team)
+        self.modifiers = runner.modifiers
+        self.database = create_hogql_database(self.team.pk, self.modifiers, self.team)
+        self.node = runner.to_query()
+        self.prepared_node = prepare_ast_for_printing(self.node, context=self._context(), dialect="clickhouse")
+
+    def _context(self) -> HogQLContext:
+        return HogQLContext(
+            team_id=self.team.pk,
+            team=self.team,
+            enable_select_queries=True,
+            timings=HogQLTimings(),
+            modifiers=self.modifiers,
+            database=self.database,
+        )
+
+    def time_prepare_ast_for_printing(self, query: str):
+        prepare_ast_for_printing(self.node, context=self._context(), dialect="clickhouse")
+
+    def time_print_prepared_ast(self, query: str):
+        print_prepared_ast(self.prepared_node, context=self._context(), dialect="clickhouse")
@@ -0,0 +1,69 @@
+# isort: skip_file
+# Needs to be first to set up django environment
+from .helpers import now  # noqa: F401
+import re
+import time
+
+from hogvm.python.execute import execute_bytecode
+from hogvm.python.utils import compile_like, compile_regex
+from posthog.hogql.bytecode import create_bytecode
+from posthog.hogql.parser import parse_expr
+
+EVENTS = 2_000
+# A hog function filter as matched against every event: URL and path checks, some case insensitive
+FILTER = (
+    "event = '$pageview' "
+    "and properties.$current_url ilike '%posthog.com%' "
+    "and properties.$current_url !~* '^https?://(localhost|127\\\\.0\\\\.0\\\\.1)' "
+    "and match(properties.$pathname, '^/(blog|docs|tutorials)/[a-z0-9-]+/?$') "
+    "and properties.$browser not like '%Headless%'"
+)
+
+
+def _events() -> list[dict]:
+    paths = ["/blog/hogvm-internals", "/docs/cdp", "/pricing", "/tutorials/session-replay/"]
+    return [
+        {
+            "event": "$pageview",
+            "properties": {
+                "$current_url": f"https://posthog.com{paths[index % len(paths)]}?ref={index}",
+                "$pathname": paths[index % len(paths)],
+                "$browser": "Chrome" if index % 10 else "HeadlessChrome",
+            },
+        }
+        for index in range(EVENTS)
+    ]
+
+
+class HogVMPatternSuite:
+    """
+    Running a regex-heavy filter against events in the HogVM. With "uncached", the pattern caches (the VM's and the
+    `re` module's own) are cleared before every event, as when a process matches more distinct patterns than `re`
+    keeps, and every pattern is compiled each time it's matched.
+    """
+
+    version = "v001"
+    params = ["cached", "uncached"]
+    param_names = ["patterns"]
+
+    def setup(self, patterns):
+        self.bytecode = create_bytecode(parse_expr(FILTER))
+        self.events = _events()
+
+    def _run(self, patterns):
+        for event in self.events:
+            if patterns == "uncached":
+                compile_like.cache_clear()
+                compile_regex.cache_clear()
+                re.purge()
+            execute_bytecode(self.bytecode, event)
+
+    def time_filter_events(self, patterns):
+        self._run(patterns)
+
+    def track_microseconds_per_event(self, patterns):
+        start = time.perf_counter()
+        self._run(patterns)
+        return (time.perf_counter() - start) / EVENTS * 1_000_000
+
+    track_microseconds_per_event.unit = "μs"  # type: ignore[attr-defined]
@@ -0,0 +1,80 @@
+# isort: skip_file
+# Needs to be first to set up django environment
+from .helpers import now  # noqa: F401
+import base64
+import gzip
+import json
+
+import lzstring
+
+from posthog.utils import decompress
+
+
+def _event(index: int) -> dict:
+    return {
+        "event": "$pageview",
+        "properties": {
+            "$os": "Mac OS X",
+            "$browser": "Chrome",
+            "$browser_version": 124,
+            "$current_url": f"https://example.com/blog/post-{index}?utm_source=newsletter",
+            "$host": "example.com",
+            "$pathname": f"/blog/post-{index}",
+            "$screen_height": 1117,
+            "$screen_width": 1728,
+            "$lib": "web",
+            "$lib_version": "1.130.0",
+            "$insert_id": f"insert-{index}",
+            "$time": 1716900000.123 + index,
+            "distinct_id": "018fc0a4-a1b2-7c3d-9e4f-5a6b7c8d9e0f",
+            "$device_id": "018fc0a4-a1b2-7c3d-9e4f-5a6b7c8d9e0f",
+            "$session_id": "018fc0a4-0000-7c3d-9e4f-5a6b7c8d9e0f",
+            "$window_id": "018fc0a4-1111-7c3d-9e4f-5a6b7c8d9e0f",
+            "token": "phc_benchmark",
+            "$feature/new-onboarding": True,
+            "$active_feature_flags": ["new-onboarding", "beta-dashboard"],
+        },
+        "timestamp": "2024-05-28T12:00:00.000Z",
+    }
+
+
+BATCH = json.dumps([_event(index) for index in range(50)]).encode()
+DECIDE = json.dumps(
+    {
+        "token": "phc_benchmark",
+        "distinct_id": "018fc0a4-a1b2-7c3d-9e4f-5a6b7c8d9e0f",
+        "groups": {},
+        "person_properties": {"email": "someone@example.com"},
+    }
+).encode()
+
+
+class RequestPayloadDecodingSuite:
+    """
+    Decoding of representative SDK payloads as received by /batch, /e and /decide, without any I/O.
+    """
+
+    version = "v001"
+
+    def setup(self):
+        self.gzip_batch = gzip.compress(BATCH)
+        self.base64_batch = base64.b64encode(BATCH)
+        self.lz64_batch = lzstring.LZString().compressToBase64(BATCH.decode())
+
+    def time_decompress_plain_json_batch(self):
+        decompress(BATCH, "")
+
+    def time_decompress_gzip_js_batch(self):
+        decompress(self.gzip_batch, "gzip-js")
+
+    def time_decompress_gzip_batch_without_compression_flag(self):
+        decompress(self.gzip_batch, "")
+
+    def time_decompress_base64_batch(self):
+        decompress(self.base64_batch, "")
+
+    def time_decompress_lz64_batch(self):
+        decompress(self.lz64_batch, "lz64")
+
+    def time_decompress_plain_json_decide(self):
+        decompress(DECIDE, "")
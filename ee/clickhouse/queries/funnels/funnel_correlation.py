@@ -24,6 +24,7 @@ from posthog.models.event.util import ElementSerializer
 from posthog.models.filters import Filter
 from posthog.models.property.util import get_property_string_expr
 from posthog.models.team import Team
+from posthog.queries.funnels.correlation import EventOddsRatio, get_top_odds_ratios
 from posthog.queries.funnels.utils import get_funnel_order_actor_class
 from posthog.queries.insight import insight_sync_execute
 from posthog.queries.person_distinct_id_query import get_team_distinct_ids_query
@@ -39,16 +40,6 @@ class EventDefinition(TypedDict):
     elements: list
 
 
-class EventOddsRatio(TypedDict):
-    event: str
-
-    success_count: int
-    failure_count: int
-
-    odds_ratio: float
-    correlation_type: Literal["success", "failure"]
-
-
 class EventOddsRatioSerialized(TypedDict):
     event: EventDefinition
 
@@ -102,6 +93,8 @@ class FunnelCorrelation:
     MIN_PERSON_COUNT = 25
     MIN_PERSON_PERCENTAGE = 0.02
     PRIOR_COUNT = 1
+    # When set, only events whose correlation is significant at this false discovery rate are returned
+    MAX_FALSE_DISCOVERY_RATE: Optional[float] = None
 
     def __init__(
         self,
@@ -635,12 +628,12 @@ class FunnelCorrelation:
 
         (
             event_contingency_tables,
-            success_total,
-            failure_total,
+            queried_success_total,
+            queried_failure_total,
         ) = self.get_partial_event_contingency_tables()
 
-        success_total = int(correct_result_for_sampling(success_total, self._filter.sampling_factor))
-        failure_total = int(correct_result_for_sampling(failure_total, self._filter.sampling_factor))
+        success_total = int(correct_result_for_sampling(queried_success_total, self._filter.sampling_factor))
+        failure_total = int(correct_result_for_sampling(queried_failure_total, self._filter.sampling_factor))
 
         if not success_total or not failure_total:
             return [], True
@@ -652,26 +645,18 @@ class FunnelCorrelation:
         if success_total / failure_total > 10 or failure_total / success_total > 10:
             skewed_totals = True
 
-        odds_ratios = [
-            get_entity_odds_ratio(event_stats, FunnelCorrelation.PRIOR_COUNT)
-            for event_stats in event_contingency_tables
-            if not FunnelCorrelation.are_results_insignificant(event_stats)
-        ]
-
-        positively_correlated_events = sorted(
-            [odds_ratio for odds_ratio in odds_ratios if odds_ratio["correlation_type"] == "success"],
-            key=lambda x: x["odds_ratio"],
-            reverse=True,
-        )
-
-        negatively_correlated_events = sorted(
-            [odds_ratio for odds_ratio in odds_ratios if odds_ratio["correlation_type"] == "failure"],
-            key=lambda x: x["odds_ratio"],
-            reverse=False,
-        )
-
         # Return the top ten positively correlated events, and top then negatively correlated events
-        events = positively_correlated_events[:10] + negatively_correlated_events[:10]
+        events = get_top_odds_ratios(
+            [table.event for table in event_contingency_tables],
+            [table.visited.success_count for table in event_contingency_tables],
+            [table.visited.failure_count for table in event_contingency_tables],
+            queried_success_total,
+            queried_failure_total,
+            prior_count=FunnelCorrelation.PRIOR_COUNT,
+            min_person_count=FunnelCorrelation.MIN_PERSON_COUNT,
+            min_person_percentage=FunnelCorrelation.MIN_PERSON_PERCENTAGE,
+            max_false_discovery_rate=FunnelCorrelation.MAX_FALSE_DISCOVERY_RATE,
+        )
         return events, skewed_totals
 
     def construct_people_url(
@@ -879,23 +864,6 @@ class FunnelCorrelation:
 
         return self._funnel_actors_generator.actor_query(limit_actors=False, extra_fields=extra_fields)
 
-    @staticmethod
-    def are_results_insignificant(event_contingency_table: EventContingencyTable) -> bool:
-        """
-        Check if the results are insignificant, i.e. if the success/failure counts are
-        significantly different from the total counts
-        """
-
-        total_count = event_contingency_table.success_total + event_contingency_table.failure_total
-
-        if event_contingency_table.visited.success_count + event_contingency_table.visited.failure_count < min(
-            FunnelCorrelation.MIN_PERSON_COUNT,
-            FunnelCorrelation.MIN_PERSON_PERCENTAGE * total_count,
-        ):
-            return True
-
-        return False
-
     def serialize_event_odds_ratio(self, odds_ratio: EventOddsRatio) -> EventOddsRatioSerialized:
         event_definition = self.serialize_event_with_property(event=odds_ratio["event"])
         cache_invalidation_key = generate_short_id()
@@ -939,25 +907,6 @@ class FunnelCorrelation:
         return EventDefinition(event=event, properties={}, elements=[])
 
 
-def get_entity_odds_ratio(event_contingency_table: EventContingencyTable, prior_counts: int) -> EventOddsRatio:
-    # Add 1 to all values to prevent divide by zero errors, and introduce a [prior](https://en.wikipedia.org/wiki/Prior_probability)
-    odds_ratio = (
-        (event_contingency_table.visited.success_count + prior_counts)
-        * (event_contingency_table.failure_total - event_contingency_table.visited.failure_count + prior_counts)
-    ) / (
-        (event_contingency_table.success_total - event_contingency_table.visited.success_count + prior_counts)
-        * (event_contingency_table.visited.failure_count + prior_counts)
-    )
-
-    return EventOddsRatio(
-        event=event_contingency_table.event,
-        success_count=event_contingency_table.visited.success_count,
-        failure_count=event_contingency_table.visited.failure_count,
-        odds_ratio=odds_ratio,
-        correlation_type="success" if odds_ratio > 1 else "failure",
-    )
-
-
 def build_selector(elements: list[dict[str, Any]]) -> str:
     # build a CSS select given an "elements_chain"
     # NOTE: my source of what this should be doing is
@@ -1,10 +1,6 @@
-import unittest
-
 from rest_framework.exceptions import ValidationError
 
 from ee.clickhouse.queries.funnels.funnel_correlation import (
-    EventContingencyTable,
-    EventStats,
     FunnelCorrelation,
 )
 from ee.clickhouse.queries.funnels.funnel_correlation_persons import (
@@ -1988,94 +1984,3 @@ class TestClickhouseFunnelCorrelation(ClickhouseTestMixin, APIBaseTest):
             ),
             6,
         )
-
-
-class TestCorrelationFunctions(unittest.TestCase):
-    def test_are_results_insignificant(self):
-        # Same setup as above test: test_discarding_insignificant_events
-        contingency_tables = [
-            EventContingencyTable(
-                event="negatively_related",
-                visited=EventStats(success_count=0, failure_count=5),
-                success_total=10,
-                failure_total=10,
-            ),
-            EventContingencyTable(
-                event="positively_related",
-                visited=EventStats(success_count=5, failure_count=0),
-                success_total=10,
-                failure_total=10,
-            ),
-            EventContingencyTable(
-                event="low_sig_negatively_related",
-                visited=EventStats(success_count=0, failure_count=2),
-                success_total=10,
-                failure_total=10,
-            ),
-            EventContingencyTable(
-                event="low_sig_positively_related",
-                visited=EventStats(success_count=1, failure_count=0),
-                success_total=10,
-                failure_total=10,
-            ),
-        ]
-
-        # Discard both low_sig due to %
-        FunnelCorrelation.MIN_PERSON_PERCENTAGE = 0.11
-        FunnelCorrelation.MIN_PERSON_COUNT = 25
-        result = [
-            1
-            for contingency_table in contingency_tables
-            if not FunnelCorrelation.are_results_insignificant(contingency_table)
-        ]
-        self.assertEqual(len(result), 2)
-
-        # Discard one low_sig due to %
-        FunnelCorrelation.MIN_PERSON_PERCENTAGE = 0.051
-        FunnelCorrelation.MIN_PERSON_COUNT = 25
-        result = [
-            1
-            for contingency_table in contingency_tables
-            if not FunnelCorrelation.are_results_insignificant(contingency_table)
-        ]
-        self.assertEqual(len(result), 3)
-
-        # Discard both due to count
-        FunnelCorrelation.MIN_PERSON_PERCENTAGE = 0.5
-        FunnelCorrelation.MIN_PERSON_COUNT = 3
-        result = [
-            1
-            for contingency_table in contingency_tables
-            if not FunnelCorrelation.are_results_insignificant(contingency_table)
-        ]
-        self.assertEqual(len(result), 2)
-
-        # Discard one due to count
-        FunnelCorrelation.MIN_PERSON_PERCENTAGE = 0.5
-        FunnelCorrelation.MIN_PERSON_COUNT = 2
-        result = [
-            1
-            for contingency_table in contingency_tables
-            if not FunnelCorrelation.are_results_insignificant(contingency_table)
-        ]
-        self.assertEqual(len(result), 3)
-
-        # Discard everything due to %
-        FunnelCorrelation.MIN_PERSON_PERCENTAGE = 0.5
-        FunnelCorrelation.MIN_PERSON_COUNT = 100
-        result = [
-            1
-            for contingency_table in contingency_tables
-            if not FunnelCorrelation.are_results_insignificant(contingency_table)
-        ]
-        self.assertEqual(len(result), 0)
-
-        # Discard everything due to count
-        FunnelCorrelation.MIN_PERSON_PERCENTAGE = 0.5
-        FunnelCorrelation.MIN_PERSON_COUNT = 6
-        result = [
-            1
-            for contingency_table in contingency_tables
-            if not FunnelCorrelation.are_results_insignificant(contingency_table)
-        ]
-        self.assertEqual(len(result), 0)
@@ -3,8 +3,9 @@ import pytest
 from ee.clickhouse.materialized_columns.columns import materialize
 from posthog.client import sync_execute
 from posthog.models.filters import Filter
+from posthog.models.person import Person
 from posthog.models.team import Team
-from posthog.queries.person_query import PersonQuery
+from posthog.queries.person_query import PersonQuery, encode_person_cursor
 from posthog.test.base import _create_person
 from posthog.models.cohort import Cohort
 from posthog.models.property import Property
@@ -403,3 +404,18 @@ def test_person_query_with_updated_after(testdata, team, snapshot):
 
     assert person_query(team, filter) == snapshot
     assert run_query(team, filter) == {"rows": 0}
+
+
+def test_person_query_with_cursor(testdata, team):
+    newest_person = Person.objects.filter(team=team).order_by("-created_at").first()
+    assert newest_person is not None
+    filter = Filter(data={"cursor": encode_person_cursor(newest_person.created_at, newest_person.uuid)})
+
+    query, params = PersonQuery(filter, team.pk).get_query(paginate=True)
+    # Rows of persons created after the cursor are skipped before grouping, and the cursor is checked exactly after
+    assert query.index("person.created_at <= ") < query.index("GROUP BY id") < query.index("argMax(person.created_at")
+
+    rows = sync_execute(query, {**params, **filter.hogql_context.values, "team_id": team.pk})
+    assert [row[0] for row in rows] == [
+        person.uuid for person in Person.objects.filter(team=team).order_by("-created_at")[1:]
+    ]
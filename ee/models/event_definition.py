@@ -1,7 +1,10 @@
 from django.contrib.postgres.fields import ArrayField
 from django.db import models
+from django.db.models.signals import post_delete, post_save
 
+from posthog.models.hogql_schema_version import bump_hogql_schema_version
 from posthog.models.event_definition import EventDefinition
+from posthog.models.signals import mutable_receiver
 
 
 class EnterpriseEventDefinition(EventDefinition):
@@ -33,3 +36,8 @@ class EnterpriseEventDefinition(EventDefinition):
         default=None,
         db_column="tags",
     )
+
+
+@mutable_receiver([post_save, post_delete], sender=EnterpriseEventDefinition)
+def enterprise_event_definition_schema_changed(sender, instance: EnterpriseEventDefinition, **kwargs):
+    bump_hogql_schema_version(instance.team_id)
@@ -1,7 +1,10 @@
 from django.contrib.postgres.fields import ArrayField
 from django.db import models
+from django.db.models.signals import post_delete, post_save
 
+from posthog.models.hogql_schema_version import bump_hogql_schema_version
 from posthog.models.property_definition import PropertyDefinition
+from posthog.models.signals import mutable_receiver
 
 
 class EnterprisePropertyDefinition(PropertyDefinition):
@@ -28,3 +31,8 @@ class EnterprisePropertyDefinition(PropertyDefinition):
         default=None,
         db_column="tags",
     )
+
+
+@mutable_receiver([post_save, post_delete], sender=EnterprisePropertyDefinition)
+def enterprise_property_definition_schema_changed(sender, instance: EnterprisePropertyDefinition, **kwargs):
+    bump_hogql_schema_version(instance.team_id)
@@ -1087,6 +1087,8 @@ export interface ActorsQueryResponse extends AnalyticsQueryResponseBase<any[][]>
     limit: integer
     offset: integer
     missing_actors_count?: integer
+    /** Cursor to pass in the next query to get the next page, when paginating by cursor */
+    nextCursor?: string
 }
 
 export type CachedActorsQueryResponse = CachedQueryResponse<ActorsQueryResponse>
@@ -1103,6 +1105,8 @@ export interface ActorsQuery extends DataNode<ActorsQueryResponse> {
     orderBy?: string[]
     limit?: integer
     offset?: integer
+    /** Continue from the `nextCursor` of the previous page, instead of paginating by offset. Only supported when listing persons by creation date. */
+    cursor?: string
 }
 
 export interface TimelineEntry {
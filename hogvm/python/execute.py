@@ -1,46 +1,111 @@
 from datetime import timedelta
 import re
+import sys
 import time
 from copy import deepcopy
 from typing import Any, Optional, TYPE_CHECKING
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 
 from hogvm.python.debugger import debugger, color_bytecode
 from hogvm.python.operation import Operation, HOGQL_BYTECODE_IDENTIFIER
-from hogvm.python.stl import STL
+from hogvm.python.profiler import VMProfile
+from hogvm.python.stl import ASYNC_STL, STL
 from dataclasses import dataclass
 
-from hogvm.python.utils import HogVMException, get_nested_value, like, set_nested_value
+from hogvm.python.utils import HogVMException, compile_regex, estimate_memory, get_nested_value, like, set_nested_value
 
 if TYPE_CHECKING:
     from posthog.models import Team
 
 
+DEFAULT_MAX_ASYNC_STEPS = 100
+
+
+@dataclass
+class VMState:
+    """Everything needed to resume a suspended VM. Only holds plain values, so it can be serialized."""
+
+    bytecode: list[Any]
+    stack: list[Any]
+    call_stack: list[tuple[int, int, int]]  # (ip, stack_start, arg_len)
+    declared_functions: dict[str, tuple[int, int]]
+    # Position of the last token read, i.e. the argument count of the async call
+    ip: int
+    ops: int
+    async_steps: int
+    # Seconds spent running, not counting the time spent waiting for async calls
+    sync_duration: float
+    # Estimated bytes allocated so far, only counted with `max_memory`
+    memory_allocated: int = 0
+
+
 @dataclass
 class BytecodeResult:
     result: Any
     bytecode: list[Any]
     stdout: list[str]
+    # False if the VM suspended on an async call, to be resumed from `state` with the call's result on the stack
+    finished: bool = True
+    async_function_name: Optional[str] = None
+    async_function_args: Optional[list[Any]] = None
+    state: Optional[VMState] = None
+    # Only with `profile=True`
+    profile: Optional[VMProfile] = None
 
 
 def execute_bytecode(
-    bytecode: list[Any],
+    code: list[Any] | VMState,
     globals: Optional[dict[str, Any]] = None,
     functions: Optional[dict[str, Callable[..., Any]]] = None,
     timeout=timedelta(seconds=5),
     team: Optional["Team"] = None,
     debug=False,
+    *,
+    async_functions: Optional[dict[str, Callable[..., Awaitable[Any]]]] = None,
+    max_async_steps: int = DEFAULT_MAX_ASYNC_STEPS,
+    max_ops: Optional[int] = None,
+    max_memory: Optional[int] = None,
+    profile: bool = False,
 ) -> BytecodeResult:
+    """
+    Runs bytecode, or resumes a VM from its state.
+
+    With `async_functions`, even if empty, the VM runs in async mode: instead of calling one of those functions or an
+    async STL function (e.g. `sleep`), it suspends and returns its state, see `execute_bytecode_async`.
+
+    Unlike the timeout, the budgets fail deterministically: `max_ops` caps the number of ops run (including before
+    suspending), and `max_memory` caps the estimated bytes allocated by the values the program creates (joined strings,
+    built dicts, arrays and tuples, function results and globals read), checked as each of them is created.
+    With `profile`, the result includes a profile of the ops and functions run.
+    """
     result = None
     start_time = time.time()
+    if isinstance(code, VMState):
+        bytecode = code.bytecode
+        stack: list = code.stack
+        call_stack: list[tuple[int, int, int]] = code.call_stack  # (ip, stack_start, arg_len)
+        declared_functions: dict[str, tuple[int, int]] = code.declared_functions
+        ip = code.ip
+        ops = code.ops
+        async_steps = code.async_steps
+        sync_duration = code.sync_duration
+        memory_allocated = code.memory_allocated
+    else:
+        bytecode = code
+        stack = []
+        call_stack = []
+        declared_functions = {}
+        ip = -1
+        ops = 0
+        async_steps = 0
+        sync_duration = 0.0
+        memory_allocated = 0
     last_op = len(bytecode) - 1
-    stack: list = []
-    call_stack: list[tuple[int, int, int]] = []  # (ip, stack_start, arg_len)
-    declared_functions: dict[str, tuple[int, int]] = {}
-    ip = -1
-    ops = 0
     stdout: list[str] = []
     colored_bytecode = color_bytecode(bytecode) if debug else []
+    symbol: Any = None
+    ops_limit = max_ops if max_ops is not None else sys.maxsize
+    vm_profile = VMProfile() if profile else None
 
     def next_token():
         nonlocal ip
@@ -54,19 +119,46 @@ def execute_bytecode(
             raise HogVMException("Stack underflow")
         return stack.pop()
 
-    if next_token() != HOGQL_BYTECODE_IDENTIFIER:
-        raise HogVMException(f"Invalid bytecode. Must start with '{HOGQL_BYTECODE_IDENTIFIER}'")
+    if ip == -1:
+        if next_token() != HOGQL_BYTECODE_IDENTIFIER:
+            raise HogVMException(f"Invalid bytecode. Must start with '{HOGQL_BYTECODE_IDENTIFIER}'")
 
-    if len(bytecode) == 1:
-        return BytecodeResult(result=None, stdout=stdout, bytecode=bytecode)
+        if len(bytecode) == 1:
+            return BytecodeResult(result=None, stdout=stdout, bytecode=bytecode, profile=vm_profile)
 
     def check_timeout():
-        if time.time() - start_time > timeout.total_seconds() and not debug:
+        if sync_duration + time.time() - start_time > timeout.total_seconds() and not debug:
             raise HogVMException(f"Execution timed out after {timeout.total_seconds()} seconds. Performed {ops} ops.")
 
-    while True:
+    def allocate(size: int):
+        nonlocal memory_allocated
+        memory_allocated += size
+        if max_memory is not None and memory_allocated > max_memory:
+            raise HogVMException(f"Exceeded maximum memory of {max_memory} bytes. Performed {ops} ops.")
+
+    if isinstance(code, VMState) and max_memory is not None and stack:
+        # The VM resumes with the result of the async call it suspended on at the top of the stack
+        allocate(estimate_memory(stack[-1]))
+
+    def finish_profile() -> Optional[VMProfile]:
+        return vm_profile.finish(len(stack)) if vm_profile is not None else None
+
+    def call_function(name: str, function: Callable[..., Any], *args: Any) -> Any:
+        if vm_profile is None:
+            return function(*args)
+        call_start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            vm_profile.record_call(name, time.perf_counter() - call_start)
+
+    while ip != last_op:
         ops += 1
+        if ops > ops_limit:
+            raise HogVMException(f"Exceeded maximum number of ops: {max_ops}")
         symbol = next_token()
+        if vm_profile is not None:
+            vm_profile.record_op(symbol, len(stack))
         if (ops & 127) == 0:  # every 128th operation
             check_timeout()
         elif debug:
@@ -93,7 +185,10 @@ def execute_bytecode(
             case Operation.OR:
                 stack.append(any([pop_stack() for _ in range(next_token())]))  # noqa: C419
             case Operation.PLUS:
-                stack.append(pop_stack() + pop_stack())
+                value = pop_stack() + pop_stack()
+                if max_memory is not None and isinstance(value, str):
+                    allocate(len(value))
+                stack.append(value)
             case Operation.MINUS:
                 stack.append(pop_stack() - pop_stack())
             case Operation.DIVIDE:
@@ -128,19 +223,22 @@ def execute_bytecode(
                 stack.append(pop_stack() not in pop_stack())
             case Operation.REGEX:
                 args = [pop_stack(), pop_stack()]
-                stack.append(bool(re.search(re.compile(args[1]), args[0])))
+                stack.append(bool(compile_regex(args[1], 0).search(args[0])))
             case Operation.NOT_REGEX:
                 args = [pop_stack(), pop_stack()]
-                stack.append(not bool(re.search(re.compile(args[1]), args[0])))
+                stack.append(not bool(compile_regex(args[1], 0).search(args[0])))
             case Operation.IREGEX:
                 args = [pop_stack(), pop_stack()]
-                stack.append(bool(re.search(re.compile(args[1], re.RegexFlag.IGNORECASE), args[0])))
+                stack.append(bool(compile_regex(args[1], re.IGNORECASE).search(args[0])))
             case Operation.NOT_IREGEX:
                 args = [pop_stack(), pop_stack()]
-                stack.append(not bool(re.search(re.compile(args[1], re.RegexFlag.IGNORECASE), args[0])))
+                stack.append(not bool(compile_regex(args[1], re.IGNORECASE).search(args[0])))
             case Operation.GET_GLOBAL:
                 chain = [pop_stack() for _ in range(next_token())]
-                stack.append(deepcopy(get_nested_value(globals, chain)))
+                value = deepcopy(get_nested_value(globals, chain))
+                if max_memory is not None:
+                    allocate(estimate_memory(value))
+                stack.append(value)
             case Operation.POP:
                 pop_stack()
             case Operation.RETURN:
@@ -150,7 +248,9 @@ def execute_bytecode(
                     stack = stack[0:stack_start]
                     stack.append(response)
                 else:
-                    return BytecodeResult(result=pop_stack(), stdout=stdout, bytecode=bytecode)
+                    return BytecodeResult(
+                        result=pop_stack(), stdout=stdout, bytecode=bytecode, profile=finish_profile()
+                    )
             case Operation.GET_LOCAL:
                 stack_start = 0 if not call_stack else call_stack[-1][1]
                 stack.append(stack[next_token() + stack_start])
@@ -173,16 +273,23 @@ def execute_bytecode(
                     stack.append({elems[i]: elems[i + 1] for i in range(0, len(elems), 2)})
                 else:
                     stack.append({})
+                if max_memory is not None:
+                    # Only the new container, its keys and values were already allocated
+                    allocate(16 * count)
             case Operation.ARRAY:
                 count = next_token()
                 elems = stack[-count:]
                 stack = stack[:-count]
                 stack.append(elems)
+                if max_memory is not None:
+                    allocate(8 * count)
             case Operation.TUPLE:
                 count = next_token()
                 elems = stack[-count:]
                 stack = stack[:-count]
                 stack.append(tuple(elems))
+                if max_memory is not None:
+                    allocate(8 * count)
             case Operation.JUMP:
                 count = next_token()
                 ip += count
@@ -200,6 +307,8 @@ def execute_bytecode(
                 check_timeout()
                 name = next_token()
                 if name in declared_functions:
+                    if vm_profile is not None:
+                        vm_profile.record_call(name)
                     func_ip, arg_len = declared_functions[name]
                     call_stack.append((ip + 1, len(stack) - arg_len, arg_len))
                     ip = func_ip
@@ -207,19 +316,91 @@ def execute_bytecode(
                     args = [pop_stack() for _ in range(next_token())]
 
                     if functions is not None and name in functions:
-                        stack.append(functions[name](*args))
+                        value = call_function(name, functions[name], *args)
+                        if max_memory is not None:
+                            allocate(estimate_memory(value))
+                        stack.append(value)
                         continue
 
+                    if async_functions is not None and (name in async_functions or name in ASYNC_STL):
+                        if async_steps >= max_async_steps:
+                            raise HogVMException(f"Exceeded maximum number of async steps: {max_async_steps}")
+                        return BytecodeResult(
+                            result=None,
+                            stdout=stdout,
+                            bytecode=bytecode,
+                            finished=False,
+                            async_function_name=name,
+                            async_function_args=args,
+                            state=VMState(
+                                bytecode=bytecode,
+                                stack=stack,
+                                call_stack=call_stack,
+                                declared_functions=declared_functions,
+                                ip=ip,
+                                ops=ops,
+                                async_steps=async_steps + 1,
+                                sync_duration=sync_duration + time.time() - start_time,
+                                memory_allocated=memory_allocated,
+                            ),
+                            profile=finish_profile(),
+                        )
+
                     if name not in STL:
                         raise HogVMException(f"Unsupported function call: {name}")
 
-                    stack.append(STL[name](name, args, team, stdout, timeout))
-        if ip == last_op:
-            break
+                    value = call_function(name, STL[name], name, args, team, stdout, timeout)
+                    if max_memory is not None:
+                        allocate(estimate_memory(value))
+                    stack.append(value)
     if debug:
         debugger(symbol, bytecode, colored_bytecode, ip, stack, call_stack)
     if len(stack) > 1:
         raise HogVMException("Invalid bytecode. More than one value left on stack")
+    finished_profile = finish_profile()
     if len(stack) == 1:
         result = pop_stack()
-    return BytecodeResult(result=result, stdout=stdout, bytecode=bytecode)
+    return BytecodeResult(result=result, stdout=stdout, bytecode=bytecode, profile=finished_profile)
+
+
+async def execute_bytecode_async(
+    bytecode: list[Any],
+    globals: Optional[dict[str, Any]] = None,
+    functions: Optional[dict[str, Callable[..., Any]]] = None,
+    async_functions: Optional[dict[str, Callable[..., Awaitable[Any]]]] = None,
+    timeout=timedelta(seconds=5),
+    team: Optional["Team"] = None,
+    max_async_steps: int = DEFAULT_MAX_ASYNC_STEPS,
+    max_ops: Optional[int] = None,
+    max_memory: Optional[int] = None,
+) -> BytecodeResult:
+    """
+    Runs bytecode, awaiting async functions and async STL functions (e.g. `sleep`) on the event loop instead of
+    blocking the thread, so that many VMs waiting on I/O can run concurrently. The timeout only counts time spent
+    running bytecode, not waiting.
+    """
+    async_functions = async_functions if async_functions is not None else {}
+    code: list[Any] | VMState = bytecode
+    stdout: list[str] = []
+    while True:
+        response = execute_bytecode(
+            code,
+            globals,
+            functions,
+            timeout,
+            team,
+            async_functions=async_functions,
+            max_async_steps=max_async_steps,
+            max_ops=max_ops,
+            max_memory=max_memory,
+        )
+        stdout.extend(response.stdout)
+        if response.finished:
+            return BytecodeResult(result=response.result, stdout=stdout, bytecode=bytecode)
+        assert response.state is not None and response.async_function_name is not None
+        name, args = response.async_function_name, response.async_function_args or []
+        if name in async_functions:
+            response.state.stack.append(await async_functions[name](*args))
+        else:
+            response.state.stack.append(await ASYNC_STL[name](name, args, team, stdout, timeout))
+        code = response.state
@@ -0,0 +1,51 @@
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Optional
+
+from hogvm.python.operation import Operation
+
+OPERATION_NAMES = {operation.value: operation.name for operation in Operation}
+
+
+@dataclass
+class VMProfile:
+    """
+    Where a run of the VM spent its time, in seconds. The time of an op includes the functions it calls,
+    which are also timed separately, except for functions declared in the bytecode.
+    """
+
+    ops: int = 0
+    op_counts: dict[str, int] = field(default_factory=dict)
+    op_time: dict[str, float] = field(default_factory=dict)
+    function_calls: dict[str, int] = field(default_factory=dict)
+    function_time: dict[str, float] = field(default_factory=dict)
+    peak_stack_depth: int = 0
+    _current_op: Optional[str] = field(default=None, repr=False)
+    _current_op_start: float = field(default=0.0, repr=False)
+
+    def record_op(self, symbol: Any, stack_depth: int) -> None:
+        now = perf_counter()
+        self._finish_current_op(now)
+        name = OPERATION_NAMES.get(symbol, str(symbol))
+        self.ops += 1
+        self.op_counts[name] = self.op_counts.get(name, 0) + 1
+        self._current_op = name
+        self._current_op_start = now
+        if stack_depth > self.peak_stack_depth:
+            self.peak_stack_depth = stack_depth
+
+    def record_call(self, name: str, duration: Optional[float] = None) -> None:
+        self.function_calls[name] = self.function_calls.get(name, 0) + 1
+        if duration is not None:
+            self.function_time[name] = self.function_time.get(name, 0.0) + duration
+
+    def finish(self, stack_depth: int) -> "VMProfile":
+        self._finish_current_op(perf_counter())
+        self._current_op = None
+        if stack_depth > self.peak_stack_depth:
+            self.peak_stack_depth = stack_depth
+        return self
+
+    def _finish_current_op(self, now: float) -> None:
+        if self._current_op is not None:
+            self.op_time[self._current_op] = self.op_time.get(self._current_op, 0.0) + now - self._current_op_start
@@ -1,9 +1,10 @@
 import time
+import asyncio
 from typing import Any, Optional, TYPE_CHECKING
-from collections.abc import Callable
-import re
+from collections.abc import Awaitable, Callable
 import json
 
+from hogvm.python.utils import compile_regex
 from .print import print_hog_string_output
 
 if TYPE_CHECKING:
@@ -24,7 +25,7 @@ def concat(name: str, args: list[Any], team: Optional["Team"], stdout: Optional[
 
 
 def match(name: str, args: list[Any], team: Optional["Team"], stdout: Optional[list[str]], timeout: int):
-    return bool(re.search(re.compile(args[1]), args[0]))
+    return bool(compile_regex(args[1], 0).search(args[0]))
 
 
 def toString(name: str, args: list[Any], team: Optional["Team"], stdout: Optional[list[str]], timeout: int):
@@ -183,3 +184,24 @@ STL: dict[str, Callable[[str, list[Any], Optional["Team"], list[str] | None, int
     "replaceAll": replaceAll,
     "generateUUIDv4": generateUUIDv4,
 }
+
+
+async def sleep_async(name: str, args: list[Any], team: Optional["Team"], stdout: Optional[list[str]], timeout: int):
+    await asyncio.sleep(args[0])
+    return None
+
+
+async def run_async(
+    name: str, args: list[Any], team: Optional["Team"], stdout: Optional[list[str]], timeout: int
+) -> list[Any]:
+    from asgiref.sync import sync_to_async
+
+    # Queries are run by a synchronous client, so they still take up a thread while waiting, but not the VM's
+    return await sync_to_async(run)(name, args, team, stdout, timeout)
+
+
+# Functions that wait for I/O, which VMs running in async mode suspend on instead of calling the ones in STL
+ASYNC_STL: dict[str, Callable[[str, list[Any], Optional["Team"], list[str] | None, int], Awaitable[Any]]] = {
+    "sleep": sleep_async,
+    "run": run_async,
+}
@@ -1,10 +1,14 @@
+import asyncio
+import dataclasses
 import json
+import time
 from typing import Any, Optional
 from collections.abc import Callable
 
 
-from hogvm.python.execute import execute_bytecode, get_nested_value
+from hogvm.python.execute import VMState, execute_bytecode, execute_bytecode_async, get_nested_value
 from hogvm.python.operation import Operation as op, HOGQL_BYTECODE_IDENTIFIER as _H
+from hogvm.python.utils import compile_like, compile_regex
 from posthog.hogql.bytecode import create_bytecode
 from posthog.hogql.parser import parse_expr, parse_program
 
@@ -112,6 +116,23 @@ class TestBytecodeExecute:
         chain = ["properties", "tuple", 2]
         assert get_nested_value(my_dict, chain) == "item3"
 
+    def test_patterns_are_compiled_once(self):
+        compile_like.cache_clear()
+        compile_regex.cache_clear()
+        bytecode = [_H, op.STRING, "%a%", op.STRING, "baa", op.LIKE]
+        for _ in range(3):
+            assert execute_bytecode(bytecode, {}).result is True
+        assert execute_bytecode([_H, op.STRING, "%A%", op.STRING, "baa", op.ILIKE], {}).result is True
+        assert compile_like.cache_info().misses == 2
+        assert compile_like.cache_info().hits == 2
+
+        for _ in range(3):
+            assert execute_bytecode([_H, op.STRING, "^b", op.STRING, "baa", op.REGEX], {}).result is True
+            assert execute_bytecode([_H, op.STRING, "^B", op.STRING, "baa", op.NOT_IREGEX], {}).result is False
+            assert execute_bytecode([_H, op.STRING, "^b", op.STRING, "baa", op.CALL, "match", 2], {}).result is True
+        assert compile_regex.cache_info().misses == 2
+        assert compile_regex.cache_info().hits == 7
+
     def test_errors(self):
         try:
             execute_bytecode([_H, op.TRUE, op.CALL, "notAFunction", 1], {})
@@ -661,3 +682,166 @@ class TestBytecodeExecute:
         ) == {"event": "$autocapture", "properties": {"$browser": "Firefox"}}
         assert globals["globalEvent"]["event"] == "$pageview"
         assert globals["globalEvent"]["properties"]["$browser"] == "Chrome"
+
+    def test_bytecode_suspend_and_resume(self):
+        bytecode = create_bytecode(
+            parse_program(
+                """
+                fn greet(name) {
+                    let greeting := fetchGreeting(name);
+                    sleep(0);
+                    return concat(greeting, ', ', name);
+                }
+                print('before');
+                return greet(properties.foo);
+                """
+            ),
+            supported_functions={"fetchGreeting"},
+        )
+        globals = {"properties": {"foo": "bar"}}
+
+        response = execute_bytecode(bytecode, globals, async_functions={"fetchGreeting": lambda name: None})
+        assert response.finished is False
+        assert response.async_function_name == "fetchGreeting"
+        assert response.async_function_args == ["bar"]
+        assert response.stdout == ["before"]
+        assert response.state is not None
+
+        # The state survives serialization, e.g. to be resumed by another worker
+        state = VMState(**json.loads(json.dumps(dataclasses.asdict(response.state))))
+        state.stack.append("Hello")
+        response = execute_bytecode(state, globals, async_functions={})
+        assert response.finished is False
+        assert response.async_function_name == "sleep"
+        assert response.async_function_args == [0]
+        assert response.state is not None
+        assert response.state.async_steps == 2
+
+        response.state.stack.append(None)
+        response = execute_bytecode(response.state, globals, async_functions={})
+        assert response.finished is True
+        assert response.result == "Hello, bar"
+
+        # Without async functions, the VM runs through as before
+        assert execute_bytecode(bytecode, globals, functions={"fetchGreeting": lambda name: "Hi"}).result == "Hi, bar"
+
+    def test_bytecode_execute_async(self):
+        async def fetch_greeting(name):
+            await asyncio.sleep(0.2)
+            return f"Hello, {name}"
+
+        bytecode = create_bytecode(
+            parse_program("sleep(0.2); print('slept'); return fetchGreeting(properties.name);"),
+            supported_functions={"fetchGreeting"},
+        )
+
+        async def run_all():
+            return await asyncio.gather(
+                *(
+                    execute_bytecode_async(
+                        bytecode,
+                        {"properties": {"name": str(index)}},
+                        async_functions={"fetchGreeting": fetch_greeting},
+                    )
+                    for index in range(20)
+                )
+            )
+
+        start = time.monotonic()
+        responses = asyncio.run(run_all())
+
+        # The VMs waited concurrently, not one after another
+        assert time.monotonic() - start < 2
+        assert [response.result for response in responses] == [f"Hello, {index}" for index in range(20)]
+        assert responses[0].stdout == ["slept"]
+
+    def test_bytecode_execute_async_max_steps(self):
+        bytecode = create_bytecode(parse_program("for (let i := 0; i < 5; i := i + 1) { sleep(0); }"))
+
+        assert asyncio.run(execute_bytecode_async(bytecode, max_async_steps=5)).result is None
+        try:
+            asyncio.run(execute_bytecode_async(bytecode, max_async_steps=4))
+        except Exception as e:
+            assert str(e) == "Exceeded maximum number of async steps: 4"
+        else:
+            raise AssertionError("Expected Exception not raised")
+
+    def test_bytecode_profile(self):
+        bytecode = create_bytecode(
+            parse_program(
+                """
+                fn double(x) {
+                    return x * 2;
+                }
+                let total := 0;
+                for (let i := 0; i < 10; i := i + 1) {
+                    total := total + double(length(properties.foo));
+                }
+                return total;
+                """
+            )
+        )
+
+        response = execute_bytecode(bytecode, {"properties": {"foo": "bar"}}, profile=True)
+
+        assert response.result == 60
+        profile = response.profile
+        assert profile is not None
+        assert profile.ops == sum(profile.op_counts.values())
+        assert profile.op_counts["MULTIPLY"] == 10
+        assert profile.op_counts["CALL"] == 20
+        assert profile.op_time.keys() == profile.op_counts.keys()
+        assert profile.function_calls == {"double": 10, "length": 10}
+        assert profile.function_time.keys() == {"length"}
+        assert profile.peak_stack_depth >= 4
+        assert execute_bytecode(bytecode, {"properties": {"foo": "bar"}}).profile is None
+
+    def test_bytecode_max_ops(self):
+        bytecode = create_bytecode(parse_program("let i := 0; while (true) { i := i + 1; }"))
+        ops = execute_bytecode(create_bytecode(parse_program("return 1 + 2;")), max_ops=4, profile=True).profile
+
+        assert ops is not None and ops.ops == 4
+        try:
+            execute_bytecode(bytecode, max_ops=1000)
+        except Exception as e:
+            assert str(e) == "Exceeded maximum number of ops: 1000"
+        else:
+            raise AssertionError("Expected Exception not raised")
+
+    def test_bytecode_max_memory(self):
+        bytecode = create_bytecode(
+            parse_program("let text := 'hog'; for (let i := 0; i < 20; i := i + 1) { text := concat(text, text); }")
+        )
+
+        try:
+            execute_bytecode(bytecode, max_memory=1_000_000)
+        except Exception as e:
+            assert str(e).startswith("Exceeded maximum memory of 1000000 bytes.")
+        else:
+            raise AssertionError("Expected Exception not raised")
+
+    def test_bytecode_max_memory_is_checked_as_values_are_created(self):
+        bytecode = create_bytecode(
+            parse_program("let text := 'hog'; for (let i := 0; i < 20; i := i + 1) { text := concat(text, text); }")
+        )
+
+        try:
+            execute_bytecode(bytecode, max_memory=1000)
+        except Exception as e:
+            # Well before the 128th op, when the timeout is first checked
+            ops = int(str(e).split("Performed ")[1].split(" ops")[0])
+            assert ops < 128
+        else:
+            raise AssertionError("Expected Exception not raised")
+
+        assert execute_bytecode(create_bytecode(parse_expr("[1, 2, {'a': 'b'}]")), max_memory=40).result == [
+            1,
+            2,
+            {"a": "b"},
+        ]
+        try:
+            execute_bytecode(create_bytecode(parse_expr("[1, 2, {'a': 'b'}]")), max_memory=39)
+        except Exception as e:
+            assert str(e).startswith("Exceeded maximum memory of 39 bytes.")
+        else:
+            raise AssertionError("Expected Exception not raised")
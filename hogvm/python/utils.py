@@ -1,15 +1,57 @@
 import re
+from functools import lru_cache
 from typing import Any
 
+# How many compiled patterns each process keeps, shared by all programs it runs.
+# Flags are always passed explicitly to the compile functions, as the cache tells `f(p)` and `f(p, 0)` apart.
+PATTERN_CACHE_SIZE = 1024
+
 
 class HogVMException(Exception):
     pass
 
 
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_regex(pattern: str, flags: int) -> re.Pattern:
+    return re.compile(pattern, flags)
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_like(pattern: str, flags: int) -> re.Pattern:
+    return re.compile(re.escape(pattern).replace("%", ".*"), flags)
+
+
 def like(string, pattern, flags=0):
-    pattern = re.escape(pattern).replace("%", ".*")
-    re_pattern = re.compile(pattern, flags)
-    return re_pattern.search(string) is not None
+    return compile_like(pattern, flags).search(string) is not None
+
+
+def estimate_memory(value: Any) -> int:
+    """
+    Roughly how many bytes a Hog value takes: the length of strings and 8 bytes per other value or container item.
+    It's deterministic, unlike measuring the process, so that memory budgets fail the same way on every run.
+    """
+    size = 0
+    seen: set[int] = set()
+    to_visit = [value]
+    while to_visit:
+        item = to_visit.pop()
+        if isinstance(item, str):
+            size += len(item)
+        elif isinstance(item, list | tuple | dict):
+            # Values can reference themselves, e.g. after `obj.self := obj`
+            if id(item) in seen:
+                continue
+            seen.add(id(item))
+            if isinstance(item, dict):
+                size += 16 * len(item)
+                to_visit.extend(item.keys())
+                to_visit.extend(item.values())
+            else:
+                size += 8 * len(item)
+                to_visit.extend(item)
+        else:
+            size += 8
+    return size
 
 
 def get_nested_value(obj, chain) -> Any:
@@ -24,4 +24,16 @@ for file in hogvm/__tests__/*.hog; do
         rm $basename.stdout.nodejs $basename.stdout.python
     fi
     set -e
+
+    # the optimized bytecode must print the same output on both VMs
+    ./bin/hoge --optimize $file $basename.optimized.hoge
+    ./bin/hog --nodejs $basename.optimized.hoge > $basename.stdout.nodejs
+    ./bin/hog --python $basename.optimized.hoge > $basename.stdout.python
+    set +e
+    diff $basename.stdout $basename.stdout.nodejs && diff $basename.stdout $basename.stdout.python
+    if [ $? -ne 0 ]; then
+        echo "Optimized test failed"
+    fi
+    rm $basename.optimized.hoge $basename.stdout.nodejs $basename.stdout.python
+    set -e
 done
@@ -1,4 +1,3 @@
-import json
 import re
 import structlog
 import time
@@ -36,6 +35,7 @@ from posthog.metrics import KLUDGES_COUNTER, LABEL_RESOURCE_TYPE
 from posthog.models.utils import UUIDT
 from posthog.redis import get_client
 from posthog.session_recordings.session_recording_helpers import (
+    event_to_json,
     preprocess_replay_events_for_blob_ingestion,
     split_replay_events,
 )
@@ -147,7 +147,7 @@ def build_kafka_event_data(
         "distinct_id": safe_clickhouse_string(distinct_id),
         "ip": safe_clickhouse_string(ip) if ip else ip,
         "site_url": safe_clickhouse_string(site_url),
-        "data": json.dumps(data),
+        "data": event_to_json(data),
         "now": now.isoformat(),
         "sent_at": sent_at.isoformat() if sent_at else "",
         "token": token,
@@ -1,4 +1,5 @@
 import json
+import urllib.parse
 from posthog.clickhouse.client.connection import Workload
 from posthog.models.person.missing_person import MissingPerson
 from posthog.renderers import SafeJSONRenderer
@@ -67,7 +68,7 @@ from posthog.queries.funnels.funnel_unordered_persons import (
 )
 from posthog.queries.insight import insight_sync_execute
 from posthog.queries.paths import PathsActors
-from posthog.queries.person_query import PersonQuery
+from posthog.queries.person_query import PersonQuery, encode_person_cursor
 from posthog.queries.properties_timeline import PropertiesTimeline
 from posthog.queries.property_values import get_person_property_values_for_key
 from posthog.queries.retention import Retention
@@ -258,6 +259,12 @@ class PersonViewSet(TeamAndOrgViewSetMixin, viewsets.ModelViewSet):
 
         return get_object_or_404(queryset)
 
+    def _build_next_cursor_url(self, request: request.Request, cursor: str) -> str:
+        params = request.GET.dict()
+        params["cursor"] = cursor
+        params.pop(OFFSET, None)
+        return request.build_absolute_uri(f"{request.path}?{urllib.parse.urlencode(params)}")
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -276,6 +283,11 @@ class PersonViewSet(TeamAndOrgViewSetMixin, viewsets.ModelViewSet):
                 OpenApiTypes.STR,
                 description="Search persons, either by email (full text search) or distinct_id (exact match).",
             ),
+            OpenApiParameter(
+                "cursor",
+                OpenApiTypes.STR,
+                description="Paginate by cursor instead of offset, so that pages deep into the list are as fast as the first. Pass an empty cursor for the first page, then follow the `next` URL.",
+            ),
             PersonPropertiesSerializer(required=False),
         ],
     )
@@ -291,7 +303,8 @@ class PersonViewSet(TeamAndOrgViewSetMixin, viewsets.ModelViewSet):
         elif not filter.limit:
             filter = filter.shallow_clone({LIMIT: DEFAULT_PAGE_LIMIT})
 
-        person_query = PersonQuery(filter, team.pk)
+        is_cursor_request = filter.cursor is not None
+        person_query = PersonQuery(filter, team.pk, extra_fields=["created_at"] if is_cursor_request else None)
         paginated_query, paginated_params = person_query.get_query(paginate=True, filter_future_persons=True)
 
         raw_paginated_result = insight_sync_execute(
@@ -305,6 +318,11 @@ class PersonViewSet(TeamAndOrgViewSetMixin, viewsets.ModelViewSet):
         actor_ids = [row[0] for row in raw_paginated_result]
         _, serialized_actors = get_people(team, actor_ids)
         _should_paginate = len(actor_ids) >= filter.limit
+        next_cursor = (
+            encode_person_cursor(raw_paginated_result[-1][1 + person_query.fields.index("created_at")], actor_ids[-1])
+            if is_cursor_request and _should_paginate
+            else None
+        )
 
         # If the undocumented include_total param is set to true, we'll return the total count of people
         # This is extra time and DB load, so we only do this when necessary, which is in PostHog 3000 navigation
@@ -322,12 +340,19 @@ class PersonViewSet(TeamAndOrgViewSetMixin, viewsets.ModelViewSet):
             )
             total_count = raw_paginated_result[0][0]
 
-        next_url = format_query_params_absolute_url(request, filter.offset + filter.limit) if _should_paginate else None
-        previous_url = (
-            format_query_params_absolute_url(request, filter.offset - filter.limit)
-            if filter.offset - filter.limit >= 0
-            else None
-        )
+        if is_cursor_request:
+            next_url = self._build_next_cursor_url(request, next_cursor) if next_cursor else None
+            # Cursors only go forward
+            previous_url = None
+        else:
+            next_url = (
+                format_query_params_absolute_url(request, filter.offset + filter.limit) if _should_paginate else None
+            )
+            previous_url = (
+                format_query_params_absolute_url(request, filter.offset - filter.limit)
+                if filter.offset - filter.limit >= 0
+                else None
+            )
 
         # TEMPORARY: Work out usage patterns of this endpoint
         renderer = SafeJSONRenderer()
@@ -801,9 +801,9 @@ class TestCapture(BaseTest):
 
         validate_response(openapi_spec, response)
 
-    @patch("gzip.decompress")
+    @patch("posthog.utils._gunzip")
     @patch("posthog.kafka_client.client._KafkaProducer.produce")
-    def test_invalid_js_gzip_zlib_error(self, kafka_produce, gzip_decompress):
+    def test_invalid_js_gzip_zlib_error(self, kafka_produce, gunzip):
         """
         This was prompted by an event request that was resulting in the zlib
         error "invalid distance too far back". I couldn't easily generate such a
@@ -815,7 +815,7 @@ class TestCapture(BaseTest):
         self.team.api_token = "rnEnwNvmHphTu5rFG4gWDDs49t00Vk50tDOeDdedMb4"
         self.team.save()
 
-        gzip_decompress.side_effect = zlib.error("Error -3 while decompressing data: invalid distance too far back")
+        gunzip.side_effect = zlib.error("Error -3 while decompressing data: invalid distance too far back")
 
         response = self.client.post(
             "/batch/?compression=gzip-js",
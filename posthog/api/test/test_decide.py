@@ -2951,6 +2951,40 @@ class TestDecide(BaseTest, QueryMatchingTest):
                 },
             )
 
+    def test_rate_limits_with_shared_storage(self, *args):
+        self.client.logout()
+        with self.settings(
+            DECIDE_RATE_LIMIT_ENABLED="y",
+            DECIDE_BUCKET_REPLENISH_RATE=0.01,
+            DECIDE_BUCKET_CAPACITY=3,
+            DECIDE_BUCKET_SHARED=True,
+            DECIDE_BUCKET_LOCAL_ALLOCATION=2,
+        ):
+            token = "shared-bucket-token"
+            for _ in range(3):
+                response = self._post_decide(api_version=3, data={"token": token, "distinct_id": "123"})
+                self.assertEqual(response.status_code, 401)
+
+            # a new client gets a new middleware, and so a new process-local allocation, but shares the bucket
+            self.client = Client()
+            response = self._post_decide(api_version=3, data={"token": token, "distinct_id": "123"})
+            self.assertEqual(response.status_code, 429)
+
+    def test_rate_limited_requests_are_only_parsed_once(self, *args):
+        self.client.logout()
+        with self.settings(
+            DECIDE_RATE_LIMIT_ENABLED="y",
+            DECIDE_BUCKET_REPLENISH_RATE=0.1,
+            DECIDE_BUCKET_CAPACITY=3,
+        ):
+            from posthog.utils import _load_data_from_request
+
+            with patch("posthog.utils._load_data_from_request", wraps=_load_data_from_request) as load_data:
+                response = self._post_decide(api_version=3)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(load_data.call_count, 1)
+
     def test_rate_limits_dont_apply_when_disabled(self, *args):
         with self.settings(DECIDE_RATE_LIMIT_ENABLED="n"):
             self.client.logout()
@@ -1019,3 +1019,32 @@ class TestPersonFromClickhouse(TestPerson):
 
         response_include_total = self.client.get("/api/person/?limit=10&include_total").json()
         self.assertEqual(response_include_total["count"], 19)  #  With `include_total`, the total count is returned too
+
+    @override_settings(PERSON_ON_EVENTS_V2_OVERRIDE=False)
+    def test_pagination_cursor(self):
+        created_ids = []
+
+        for index in range(0, 19):
+            created_ids.append(str(index + 100))
+            Person.objects.create(  # creating without _create_person to guarentee created_at ordering
+                team=self.team,
+                distinct_ids=[str(index + 100)],
+                properties={"$browser": "whatever", "$os": "Windows"},
+            )
+        returned_ids = []
+        response = self.client.get("/api/person/?limit=10&cursor=").json()
+        self.assertEqual(len(response["results"]), 10)
+        self.assertIn("cursor=", response["next"])
+        self.assertNotIn("offset=", response["next"])
+        self.assertIsNone(response["previous"])
+        returned_ids += [x["distinct_ids"][0] for x in response["results"]]
+        response_next = self.client.get(response["next"]).json()
+        returned_ids += [x["distinct_ids"][0] for x in response_next["results"]]
+        self.assertEqual(len(response_next["results"]), 9)
+        self.assertIsNone(response_next["next"])
+
+        created_ids.reverse()  # ids are returned in desc order
+        self.assertEqual(returned_ids, created_ids, returned_ids)
+
+        response_invalid = self.client.get("/api/person/?limit=10&cursor=not-a-cursor")
+        self.assertEqual(response_invalid.status_code, status.HTTP_400_BAD_REQUEST)
@@ -36,7 +36,7 @@ class BatchExportDestination(UUIDModel):
         "S3": {"aws_access_key_id", "aws_secret_access_key"},
         "Snowflake": set("password"),
         "Postgres": set("password"),
-        "Redshift": set("password"),
+        "Redshift": {"password", "s3_staging_aws_access_key_id", "s3_staging_aws_secret_access_key"},
         "BigQuery": {"private_key", "private_key_id", "client_email", "token_uri"},
         "HTTP": set("token"),
         "NoOp": set(),
@@ -142,9 +142,20 @@ class PostgresBatchExportInputs:
 
 @dataclass
 class RedshiftBatchExportInputs(PostgresBatchExportInputs):
-    """Inputs for Redshift export workflow."""
+    """Inputs for Redshift export workflow.
+
+    Setting an S3 staging bucket switches from INSERT statements to staging Parquet files in it and loading
+    them with a COPY, which Redshift can read with either the IAM role or the access keys provided.
+    """
 
     properties_data_type: str = "varchar"
+    s3_staging_bucket_name: str | None = None
+    s3_staging_region: str | None = None
+    s3_staging_key_prefix: str = ""
+    s3_staging_aws_access_key_id: str | None = None
+    s3_staging_aws_secret_access_key: str | None = None
+    s3_staging_iam_role: str | None = None
+    s3_staging_endpoint_url: str | None = None
 
 
 @dataclass
@@ -1,4 +1,9 @@
-from typing import Optional
+import hashlib
+import json
+from typing import Any, Optional
+
+from django.conf import settings
+
 from posthog.models.action.action import Action
 from posthog.hogql.bytecode import create_bytecode
 from posthog.hogql.parser import parse_expr
@@ -6,10 +11,63 @@ from posthog.hogql.property import action_to_expr, property_to_expr, ast
 from posthog.models.team.team import Team
 
 
-def hog_function_filters_to_expr(filters: dict, team: Team, actions: dict[int, Action]) -> ast.Expr:
+class FiltersCompilationContext:
+    """
+    Shares the work of compiling the filters of many hog functions of the same team: the test account filters and
+    each action are converted to HogQL once, and functions with identical filters are only compiled once.
+    """
+
+    def __init__(self, team: Team, actions: dict[int, Action]):
+        self.team = team
+        self.actions = actions
+        self._test_account_filters_exprs: Optional[list[ast.Expr]] = None
+        self._action_exprs: dict[int, ast.Expr] = {}
+        self._bytecode_by_hash: dict[str, tuple[Optional[list[Any]], Optional[str]]] = {}
+
+    def test_account_filters_exprs(self) -> list[ast.Expr]:
+        if self._test_account_filters_exprs is None:
+            self._test_account_filters_exprs = [
+                property_to_expr(property, self.team) for property in self.team.test_account_filters
+            ]
+        return self._test_account_filters_exprs
+
+    def action_expr(self, action_id: int) -> ast.Expr:
+        # Raises a KeyError if the action doesn't exist
+        if action_id not in self._action_exprs:
+            self._action_exprs[action_id] = action_to_expr(self.actions[action_id])
+        return self._action_exprs[action_id]
+
+    def compile(self, filters: dict) -> tuple[Optional[list[Any]], Optional[str]]:
+        """Returns the bytecode of the filters, or the error raised while compiling them."""
+        key = filters_hash(filters)
+        if key not in self._bytecode_by_hash:
+            try:
+                self._bytecode_by_hash[key] = (
+                    create_bytecode(
+                        hog_function_filters_to_expr(filters, self.team, self.actions, context=self),
+                        optimize=settings.HOG_BYTECODE_OPTIMIZATION_ENABLED,
+                    ),
+                    None,
+                )
+            except Exception as e:
+                # TODO: Better reporting of this issue
+                self._bytecode_by_hash[key] = (None, str(e))
+        return self._bytecode_by_hash[key]
+
+
+def filters_hash(filters: dict) -> str:
+    """Hashes the filters that make up the bytecode, ignoring the output of previous compilations."""
+    inputs = {key: value for key, value in filters.items() if key not in ("bytecode", "bytecode_error")}
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def hog_function_filters_to_expr(
+    filters: dict, team: Team, actions: dict[int, Action], context: Optional[FiltersCompilationContext] = None
+) -> ast.Expr:
+    context = context or FiltersCompilationContext(team, actions)
     test_account_filters_exprs: list[ast.Expr] = []
     if filters.get("filter_test_accounts", False):
-        test_account_filters_exprs = [property_to_expr(property, team) for property in team.test_account_filters]
+        test_account_filters_exprs = context.test_account_filters_exprs()
 
     all_filters = filters.get("events", []) + filters.get("actions", [])
     all_filters_exprs: list[ast.Expr] = []
@@ -29,8 +87,7 @@ def hog_function_filters_to_expr(filters: dict, team: Team, actions: dict[int, A
         # Actions
         if filter.get("type") == "actions":
             try:
-                action = actions[int(filter["id"])]
-                exprs.append(action_to_expr(action))
+                exprs.append(context.action_expr(int(filter["id"])))
             except KeyError:
                 # If an action doesn't exist, we want to return no events
                 exprs.append(parse_expr("1 = 2"))
@@ -73,10 +130,24 @@ def compile_filters_expr(filters: Optional[dict], team: Team, actions: Optional[
     return hog_function_filters_to_expr(filters, team, actions)
 
 
-def compile_filters_bytecode(filters: Optional[dict], team: Team, actions: Optional[dict[int, Action]] = None) -> dict:
+def compile_filters_bytecode(
+    filters: Optional[dict],
+    team: Team,
+    actions: Optional[dict[int, Action]] = None,
+    context: Optional[FiltersCompilationContext] = None,
+) -> dict:
     filters = filters or {}
+    if context is not None:
+        bytecode, error = context.compile(filters)
+        filters["bytecode"] = bytecode
+        if error is not None:
+            filters["bytecode_error"] = error
+        return filters
+
     try:
-        filters["bytecode"] = create_bytecode(compile_filters_expr(filters, team, actions))
+        filters["bytecode"] = create_bytecode(
+            compile_filters_expr(filters, team, actions), optimize=settings.HOG_BYTECODE_OPTIMIZATION_ENABLED
+        )
     except Exception as e:
         # TODO: Better reporting of this issue
         filters["bytecode"] = None
@@ -0,0 +1,87 @@
+import re
+from typing import Optional
+
+import sqlparse
+from sqlparse.utils import split_unquoted_newlines
+
+# A quoted string or identifier, where quotes are escaped with a backslash or doubled
+_QUOTED = r"""'[^'\\]*(?:(?:\\.|'')[^'\\]*)*'|"[^"\\]*(?:(?:\\.|"")[^"\\]*)*"|`[^`\\]*(?:(?:\\.|``)[^`\\]*)*`"""
+# sqlparse lexes what's between square brackets as a name, so doesn't strip comments in array literals either
+_BRACKETED = r"(?<![\w\])])\[[^\]\[]+\]"
+# Comments as sqlparse lexes them, including `# ` ones
+_COMMENT = r"(?:--|\# )[^\r\n]*(?:\r\n|\r|\n)?|/\*[\s\S]*?\*/"
+_COMMENT_RE = re.compile(_COMMENT)
+# Quoted strings to skip over, runs of comments to strip, and semicolons, which start a new statement
+_TOKEN_RE = re.compile(rf"(?P<quoted>{_QUOTED}|{_BRACKETED})|(?P<comments>(?:{_COMMENT})(?:\s*(?:{_COMMENT}))*\s*)|;")
+# Dollar-quoted literals, which sqlparse doesn't look for comments in either
+_DOLLAR_QUOTED_RE = re.compile(r"(?<!\S)\$(?:[_A-ZÀ-Ü]\w*)?\$", re.IGNORECASE)
+# Characters that sqlparse would lex a comment right after as part of an operator or name instead
+_OPERATOR_CHARACTERS = frozenset("+/@#%^&|-")
+_NAME_CHARACTERS_RE = re.compile(r"[\w$#]")
+# The line breaks that a removed comment is replaced with, as in sqlparse's StripCommentsFilter
+_TRAILING_LINE_BREAKS_RE = re.compile(r"((\r|\n)+) *$")
+
+
+def strip_sql_comments(sql: str) -> str:
+    """
+    Removes comments from ClickHouse SQL like `sqlparse.format(sql, strip_comments=True)`, leaving the same tokens.
+
+    sqlparse lexes and groups the whole query to do this, which takes a very long time for the large queries we
+    generate, so this only scans for quoted strings and comments instead. The whitespace left where a comment was
+    can differ from sqlparse's, which depends on how it grouped the tokens around the comment, e.g. before a `::`
+    cast. Unlike sqlparse, this never joins the tokens on both sides of a comment, e.g. `:--x\n::` into `:::`.
+    The few queries that this scan could lex differently from sqlparse, such as ones with several statements or with
+    a comment right after an operator, are still left to sqlparse.
+    """
+    if _DOLLAR_QUOTED_RE.search(sql):
+        return sqlparse.format(sql, strip_comments=True)
+
+    parts: list[str] = []
+    position = 0
+    for match in _TOKEN_RE.finditer(sql):
+        if match.lastgroup == "quoted":
+            continue
+        if match.lastgroup is None:
+            return sqlparse.format(sql, strip_comments=True)
+        start, end = match.span()
+        previous = sql[start - 1] if start else None
+        if previous is not None and (
+            previous in _OPERATOR_CHARACTERS or (sql[start] == "#" and _NAME_CHARACTERS_RE.match(previous))
+        ):
+            return sqlparse.format(sql, strip_comments=True)
+        parts.append(sql[position:start])
+        if end < len(sql):
+            # Consecutive comments are stripped together, along with the whitespace that follows them
+            parts.append(_replace_comment(match.group(), previous))
+        else:
+            # Unless they end the query, in which case the whitespace between them is kept
+            parts.extend(_strip_trailing_comments(match.group(), previous))
+        position = end
+    parts.append(sql[position:])
+    # Like sqlparse's serializer, which also strips trailing whitespace from every line
+    return "\n".join(line.rstrip() for line in split_unquoted_newlines("".join(parts)))
+
+
+def _replace_comment(comment: str, previous: Optional[str]) -> str:
+    # Comments that start the query or follow an opening parenthesis are removed without a trace
+    if previous is None or previous == "(":
+        return ""
+    line_breaks = _TRAILING_LINE_BREAKS_RE.search(comment)
+    return line_breaks.group(1) if line_breaks else " "
+
+
+def _strip_trailing_comments(comments: str, previous: Optional[str]) -> list[str]:
+    parts: list[str] = []
+    position = 0
+    for match in _COMMENT_RE.finditer(comments):
+        whitespace = comments[position : match.start()]
+        if whitespace:
+            parts.append(whitespace)
+            previous = whitespace[-1]
+        replacement = _replace_comment(match.group(), previous)
+        if replacement:
+            parts.append(replacement)
+            previous = replacement[-1]
+        position = match.end()
+    parts.append(comments[position:])
+    return parts
@@ -12,6 +12,7 @@ from clickhouse_driver import Client as SyncClient
 from django.conf import settings as app_settings
 from statshog.defaults.django import statsd
 
+from posthog.clickhouse.client.comments import strip_sql_comments
 from posthog.clickhouse.client.connection import Workload, get_pool
 from posthog.clickhouse.client.escape import substitute_params
 from posthog.clickhouse.query_tagging import get_query_tag_value, get_query_tags
@@ -79,6 +80,7 @@ def sync_execute(
     workload: Workload = Workload.DEFAULT,
     team_id: Optional[int] = None,
     readonly=False,
+    comment_free=False,
 ):
     if TEST and flush:
         try:
@@ -104,7 +106,9 @@ def sync_execute(
     with get_pool(workload, team_id, readonly).get_client() as client:
         start_time = perf_counter()
 
-        prepared_sql, prepared_args, tags = _prepare_query(client=client, query=query, args=args, workload=workload)
+        prepared_sql, prepared_args, tags = _prepare_query(
+            client=client, query=query, args=args, workload=workload, comment_free=comment_free
+        )
         query_id = validated_client_query_id()
         core_settings = {**default_settings(), **(settings or {})}
         tags["query_settings"] = core_settings
@@ -175,6 +179,7 @@ def _prepare_query(
     query: str,
     args: QueryArgs,
     workload: Workload = Workload.DEFAULT,
+    comment_free: bool = False,
 ):
     """
     Given a string query with placeholders we do one of two things:
@@ -196,6 +201,10 @@ def _prepare_query(
     We only want to try to substitue for SELECT queries, which
     clickhouse_driver at this moment in time decides based on the
     below predicate.
+
+    Callers that generate `query` without comments, such as HogQL, pass
+    `comment_free=True` to skip looking for them, as the values in
+    `args` can look like comments too.
     """
     prepared_args: Any = QueryArgs
     if isinstance(args, list | tuple | types.GeneratorType):
@@ -215,9 +224,8 @@ def _prepare_query(
         rendered_sql = substitute_params(query, args)
         prepared_args = None
 
-    if "--" in rendered_sql or "/*" in rendered_sql:
-        # This can take a very long time with e.g. large funnel queries
-        formatted_sql = sqlparse.format(rendered_sql, strip_comments=True)
+    if not comment_free and ("--" in rendered_sql or "/*" in rendered_sql):
+        formatted_sql = strip_sql_comments(rendered_sql)
     else:
         formatted_sql = rendered_sql
     annotated_sql, tags = _annotate_tagged_query(formatted_sql, workload)
@@ -0,0 +1,61 @@
+import pytest
+import sqlparse
+from sqlparse import lexer, tokens
+
+from posthog.clickhouse.client.comments import strip_sql_comments
+
+
+def _tokens(sql: str) -> list[tuple]:
+    return [(ttype, value) for ttype, value in lexer.tokenize(sql) if ttype not in tokens.Whitespace]
+
+
+@pytest.mark.parametrize(
+    "sql,expected",
+    [
+        ("SELECT 1 -- comment\nFROM events", "SELECT 1\nFROM events"),
+        ("SELECT 1\n    -- comment\n    FROM events", "SELECT 1\n\nFROM events"),
+        ("SELECT /* comment */ 1", "SELECT  1"),
+        ("SELECT count(/* comment */1)", "SELECT count(1)"),
+        ("-- comment\nSELECT 1", "SELECT 1"),
+        ("SELECT 1 -- first\n -- second\nFROM events -- last", "SELECT 1\nFROM events"),
+        (
+            "SELECT '--not a comment', 'it''s /* not */ either' -- comment\n",
+            "SELECT '--not a comment', 'it''s /* not */ either'\n",
+        ),
+        ("SELECT 'it\\'s -- not', \"a--b\", `c/*d*/` /* comment */", "SELECT 'it\\'s -- not', \"a--b\", `c/*d*/`"),
+        ("SELECT 1 /* not closed", "SELECT 1 /* not closed"),
+        ("SELECT 'not closed -- comment\nFROM events", "SELECT 'not closed\nFROM events"),
+        ("SELECT 1 /* x */ + 2", "SELECT 1  + 2"),
+        ("SELECT 1 /* a */ /* b */ FROM t", "SELECT 1  FROM t"),
+        ("SELECT has([1, 2 /* comment */], a) -- comment", "SELECT has([1, 2 /* comment */], a)"),
+        ("SELECT 1   \r\nFROM events -- comment   \r\n  ", "SELECT 1\nFROM events\n"),
+        # sqlparse leaves no space before a cast here
+        ("SELECT 'x'/* comment */::String", "SELECT 'x' ::String"),
+    ],
+)
+def test_strip_sql_comments(sql, expected):
+    assert strip_sql_comments(sql) == expected
+    # The whitespace can differ from sqlparse's, but not the tokens
+    assert _tokens(strip_sql_comments(sql)) == _tokens(sqlparse.format(sql, strip_comments=True))
+
+
+def test_strip_sql_comments_keeps_tokens_apart():
+    sql = ":--x\n::"
+
+    assert strip_sql_comments(sql) == ":\n::"
+    assert _tokens(strip_sql_comments(sql)) == [
+        (ttype, value) for ttype, value in _tokens(sql) if ttype not in tokens.Comment
+    ]
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT 1; -- comment\nSELECT 2 /* comment */",
+        "SELECT a +-- comment\nb",
+        "SELECT $$ -- not a comment $$ -- comment",
+        "SELECT a# not a comment\n# comment\nFROM events",
+    ],
+)
+def test_strip_sql_comments_falls_back_to_sqlparse(sql):
+    assert strip_sql_comments(sql) == sqlparse.format(sql, strip_comments=True)
@@ -0,0 +1,84 @@
+import json
+import os
+from collections.abc import Callable
+from typing import Any, Optional
+
+from .manager import MatrixManager
+from .matrix import Matrix
+from .sinks import ColumnarSimDataSink, ParquetSimDataSink, insert_columns_into_clickhouse
+
+MANIFEST_FILE_NAME = "manifest.json"
+
+
+def generate_dataset(
+    matrix_factory: Callable[[str], Matrix],
+    directory: str,
+    *,
+    seed: str,
+    events: int,
+    team_id: int,
+    processes: int = 1,
+    batch_size: int = 1_000_000,
+    print_steps: bool = False,
+) -> dict[str, Any]:
+    """
+    Writes a reproducible dataset of simulated analytics data with at least `events` past events to Parquet files
+    in `directory`, one set of files per ClickHouse table. The same arguments always produce the same data.
+
+    Large datasets don't fit in memory as a single simulation, so clusters are simulated in shards: matrices made by
+    `matrix_factory` from seeds derived from `seed`, until enough events have been written. Raises a `ValueError`
+    if a shard doesn't have any past events, as more shards of the same kind would likely never get there either.
+    """
+    sink = ParquetSimDataSink(directory, batch_size=batch_size, seed=seed)
+    shards = 0
+    events_written = 0
+    while events_written < events:
+        matrix = matrix_factory(f"{seed}-shard-{shards}")
+        matrix.simulate(processes=processes)
+        if sink.loaded_at is None:
+            sink.loaded_at = matrix.now
+        MatrixManager(matrix, sink=sink).save_clickhouse_data(team_id)
+        shards += 1
+        if sink.rows_written["events"] == events_written:
+            raise ValueError(
+                f"Shard {shards} has no past events, so {events} events can't be reached. "
+                "Simulate more days in the past or more clusters per shard."
+            )
+        events_written = sink.rows_written["events"]
+        if print_steps:
+            print(f"Shard {shards} written, {events_written}/{events} events so far...")
+    manifest = {
+        "seed": seed,
+        "team_id": team_id,
+        "shards": shards,
+        "rows": dict(sink.rows_written),
+        "files": sink.files_written,
+    }
+    with open(os.path.join(directory, MANIFEST_FILE_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_dataset(directory: str, *, team_id: Optional[int] = None, print_steps: bool = False) -> dict[str, int]:
+    """
+    Inserts a dataset written by `generate_dataset` into ClickHouse, optionally for a team other than the one
+    it was generated for. Sessions are filled in by ClickHouse from the events, as in production.
+    """
+    import pyarrow.parquet as pq
+
+    with open(os.path.join(directory, MANIFEST_FILE_NAME)) as f:
+        manifest = json.load(f)
+    rows_loaded: dict[str, int] = {}
+    for table in ColumnarSimDataSink.TABLE_COLUMNS:
+        rows_loaded[table] = 0
+        for file_name in manifest["files"].get(table, []):
+            parquet_file = pq.ParquetFile(os.path.join(directory, file_name))
+            for record_batch in parquet_file.iter_batches(batch_size=100_000):
+                columns = record_batch.to_pydict()
+                if team_id is not None:
+                    columns["team_id"] = [team_id] * record_batch.num_rows
+                insert_columns_into_clickhouse(table, columns)
+                rows_loaded[table] += record_batch.num_rows
+            if print_steps:
+                print(f"Loaded {file_name}, {rows_loaded[table]} {table} rows so far...")
+    return rows_loaded
@@ -20,10 +20,10 @@ from posthog.models import (
     Team,
     User,
 )
-from posthog.models.utils import UUIDT
 
 from .matrix import Matrix
 from .models import SimEvent, SimPerson
+from .sinks import KafkaSimDataSink, SimDataSink
 
 
 class MatrixManager:
@@ -33,14 +33,23 @@ class MatrixManager:
     matrix: Matrix
     use_pre_save: bool
     print_steps: bool
+    sink: SimDataSink
 
     _persons_created: int
     _person_distinct_ids_created: int
 
-    def __init__(self, matrix: Matrix, *, use_pre_save: bool = False, print_steps: bool = False):
+    def __init__(
+        self,
+        matrix: Matrix,
+        *,
+        use_pre_save: bool = False,
+        print_steps: bool = False,
+        sink: Optional[SimDataSink] = None,
+    ):
         self.matrix = matrix
         self.use_pre_save = use_pre_save
         self.print_steps = print_steps
+        self.sink = sink if sink is not None else KafkaSimDataSink()
         self._persons_created = 0
         self._person_distinct_ids_created = 0
 
@@ -98,7 +107,6 @@ class MatrixManager:
             self.matrix.simulate()
         master_team = self._prepare_master_team(ensure_blank_slate=True)
         self._save_analytics_data(master_team)
-        self._sleep_until_person_data_in_clickhouse(self.MASTER_TEAM_ID)
 
     @staticmethod
     def create_team(organization: Organization, **kwargs) -> Team:
@@ -140,11 +148,10 @@ class MatrixManager:
         team.save()
 
     def _save_analytics_data(self, data_team: Team):
-        sim_persons = self.matrix.people
         bulk_group_type_mappings = []
         if len(self.matrix.groups.keys()) + self.matrix.group_type_index_offset > 5:
             raise ValueError("Too many group types! The maximum for a project is 5.")
-        for group_type_index, (group_type, groups) in enumerate(self.matrix.groups.items()):
+        for group_type_index, group_type in enumerate(self.matrix.groups.keys()):
             group_type_index += self.matrix.group_type_index_offset  # Adjust
             bulk_group_type_mappings.append(
                 GroupTypeMapping(
@@ -153,22 +160,35 @@ class MatrixManager:
                     group_type=group_type,
                 )
             )
+        try:
+            GroupTypeMapping.objects.bulk_create(bulk_group_type_mappings)
+        except IntegrityError as e:
+            print(f"SKIPPING GROUP TYPE MAPPING CREATION: {e}")
+        self.save_clickhouse_data(data_team.pk)
+        if not self.sink.is_synchronous:
+            # We need to wait a bit for data just queued into Kafka to show up in CH
+            self._sleep_until_person_data_in_clickhouse(data_team.pk)
+
+    def save_clickhouse_data(self, team_id: int):
+        """
+        Saves the simulated groups, persons, and events of the team to the sink, without touching Postgres.
+        Everything is flushed before returning, so with a synchronous sink the data is complete right away.
+        """
+        if len(self.matrix.groups.keys()) + self.matrix.group_type_index_offset > 5:
+            raise ValueError("Too many group types! The maximum for a project is 5.")
+        for group_type_index, groups in enumerate(self.matrix.groups.values()):
+            group_type_index += self.matrix.group_type_index_offset  # Adjust
             for group_key, group in groups.items():
                 self._save_sim_group(
-                    data_team,
+                    team_id,
                     cast(Literal[0, 1, 2, 3, 4], group_type_index),
                     group_key,
                     group,
                     self.matrix.now,
                 )
-        try:
-            GroupTypeMapping.objects.bulk_create(bulk_group_type_mappings)
-        except IntegrityError as e:
-            print(f"SKIPPING GROUP TYPE MAPPING CREATION: {e}")
-        for sim_person in sim_persons:
-            self._save_sim_person(data_team, sim_person)
-        # We need to wait a bit for data just queued into Kafka to show up in CH
-        self._sleep_until_person_data_in_clickhouse(data_team.pk)
+        for sim_person in self.matrix.people:
+            self._save_sim_person(team_id, sim_person)
+        self.sink.flush()
 
     @classmethod
     def _prepare_master_team(cls, *, ensure_blank_slate: bool = False) -> Team:
@@ -288,79 +308,53 @@ class MatrixManager:
         except IntegrityError as e:
             print(f"SKIPPING GROUP CREATION: {e}")
 
-    def _save_sim_person(self, team: Team, subject: SimPerson):
+    def _save_sim_person(self, team_id: int, subject: SimPerson):
         # We only want to save directly if there are past events
         if subject.past_events:
-            from posthog.models.person.util import (
-                create_person,
-                create_person_distinct_id,
-            )
-
-            create_person(
+            self.sink.add_person(
+                team_id=team_id,
                 uuid=str(subject.in_posthog_id),
-                team_id=team.pk,
                 properties=subject.properties_at_now,
-                version=0,
             )
             self._persons_created += 1
             self._person_distinct_ids_created += len(subject.distinct_ids_at_now)
             for distinct_id in subject.distinct_ids_at_now:
-                create_person_distinct_id(
-                    team_id=team.pk,
+                self.sink.add_person_distinct_id(
+                    team_id=team_id,
                     distinct_id=str(distinct_id),
                     person_id=str(subject.in_posthog_id),
                 )
-            self._save_past_sim_events(team, subject.past_events)
+            self._save_past_sim_events(team_id, subject.past_events)
         # We only want to queue future events if there are any
         if subject.future_events and self.matrix.end > self.matrix.now:
-            self._save_future_sim_events(team, subject.future_events)
-
-    @staticmethod
-    def _save_past_sim_events(team: Team, events: list[SimEvent]):
-        """Past events are saved into ClickHouse right away (via Kafka of course)."""
-        from posthog.models.event.util import create_event
+            self._save_future_sim_events(team_id, subject.future_events)
 
+    def _save_past_sim_events(self, team_id: int, events: list[SimEvent]):
+        """Past events are saved into ClickHouse right away (via the sink, which is Kafka by default)."""
         for event in events:
-            event_uuid = UUIDT(unix_time_ms=int(event.timestamp.timestamp() * 1000))
-            create_event(
-                event_uuid=event_uuid,
-                event=event.event,
-                team=team,
-                distinct_id=event.distinct_id,
-                timestamp=event.timestamp,
-                properties=event.properties,
-                person_id=event.person_id,
-                person_properties=event.person_properties,
-                person_created_at=event.person_created_at,
-                group0_properties=event.group0_properties,
-                group1_properties=event.group1_properties,
-                group2_properties=event.group2_properties,
-                group3_properties=event.group3_properties,
-                group4_properties=event.group4_properties,
-                group0_created_at=event.group0_created_at,
-                group1_created_at=event.group1_created_at,
-                group2_created_at=event.group2_created_at,
-                group3_created_at=event.group3_created_at,
-                group4_created_at=event.group4_created_at,
-            )
+            self.sink.add_event(team_id=team_id, event=event)
 
     @staticmethod
-    def _save_future_sim_events(team: Team, events: list[SimEvent]):
+    def _save_future_sim_events(team_id: int, events: list[SimEvent]):
         """Future events are not saved immediately, instead they're scheduled for ingestion via event buffer."""
 
         # TODO: This used the plugin server's Graphile Worker-based event buffer, but the event buffer is no more
 
-    @staticmethod
     def _save_sim_group(
-        team: Team,
+        self,
+        team_id: int,
         type_index: Literal[0, 1, 2, 3, 4],
         key: str,
         properties: dict[str, Any],
         timestamp: dt.datetime,
     ):
-        from posthog.models.group.util import raw_create_group_ch
-
-        raw_create_group_ch(team.pk, type_index, key, properties, timestamp)
+        self.sink.add_group(
+            team_id=team_id,
+            group_type_index=type_index,
+            group_key=key,
+            properties=properties,
+            timestamp=timestamp,
+        )
 
     def _sleep_until_person_data_in_clickhouse(self, team_id: int):
         from posthog.models.person.sql import (
@@ -1,6 +1,12 @@
 import datetime as dt
+import heapq
+import multiprocessing
+import secrets
+import uuid
 from abc import ABC, abstractmethod
 from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from typing import (
     Any,
     Optional,
@@ -18,6 +24,34 @@ from posthog.models.utils import UUIDT
 
 from .models import Effect, SimPerson, SimServerClient
 
+# State of a person that's used once the simulation is done, i.e. what processes simulating clusters send back
+PERSON_RESULT_ATTRIBUTES = (
+    "past_events",
+    "future_events",
+    "in_posthog_id",
+    "first_seen_at",
+    "last_seen_at",
+    "distinct_ids_at_now",
+    "properties_at_now",
+    "wake_up_by",
+    "all_time_pageview_counts",
+    "_groups",
+    "_distinct_ids",
+    "_properties",
+)
+
+
+@dataclass
+class ClusterSimulationResult:
+    """The outcome of simulating a cluster in another process."""
+
+    simulation_time: dt.datetime
+    reached_now: bool
+    # The groups updated by the cluster, keyed by group type in the order their indexes were assigned
+    groups: dict[str, dict[str, dict[str, Any]]]
+    # The state of each person, in the order of the people matrix
+    people: list[dict[str, Any]]
+
 
 class Cluster(ABC):
     """A cluster of people, e.g. a company, but perhaps a group of friends."""
@@ -27,6 +61,7 @@ class Cluster(ABC):
 
     index: int  # Cluster index
     matrix: "Matrix"  # Parent
+    seed: str  # Seed of the cluster's simulation, so that it doesn't depend on other clusters
     start: timezone.datetime  # Start of the simulation
     now: timezone.datetime  # Current moment in the simulation
     end: timezone.datetime  # End of the simulation (might be same as now or later)
@@ -47,10 +82,12 @@ class Cluster(ABC):
     _simulation_time: dt.datetime
     _reached_now: bool
     _scheduled_effects: deque[Effect]
+    _uuidt_series_per_ms: defaultdict[int, int]
 
     def __init__(self, *, index: int, matrix: "Matrix") -> None:
         self.index = index
         self.matrix = matrix
+        self.seed = f"{matrix.seed}-{index}"
         self.random = matrix.random
         self.properties_provider = matrix.properties_provider
         self.person_provider = matrix.person_provider
@@ -79,6 +116,7 @@ class Cluster(ABC):
         self._simulation_time = self.start
         self._reached_now = False
         self._scheduled_effects = deque()
+        self._uuidt_series_per_ms = defaultdict(int)
 
     def __str__(self) -> str:
         """Return cluster ID. Overriding this is recommended but optional."""
@@ -121,15 +159,60 @@ class Cluster(ABC):
         self.simulation_time += dt.timedelta(seconds=seconds)
 
     def simulate(self):
-        # Initialize people
-        for person in self.people:
+        self.matrix.reseed(self.seed)
+        # Initialize people, in a stable order as it determines the random values each person gets
+        people = [person for row in self.people_matrix for person in row]
+        for person in people:
             person.wake_up_by = person.determine_next_session_datetime()
+        # Queue of people by when their next session is, ties broken by their position in the cluster
+        queue = [(person.wake_up_by, position, person) for position, person in enumerate(people)]
+        heapq.heapify(queue)
         while self.simulation_time < self.end:
             # Get next person to simulate
-            session_person = min(self.people, key=lambda p: p.wake_up_by)
-            self._apply_due_effects(session_person.wake_up_by)
-            self.simulation_time = session_person.wake_up_by
+            wake_up_by, position, session_person = heapq.heappop(queue)
+            self._apply_due_effects(wake_up_by)
+            self.simulation_time = wake_up_by
             session_person.attempt_session()
+            heapq.heappush(queue, (session_person.wake_up_by, position, session_person))
+
+    def get_simulation_result(self) -> ClusterSimulationResult:
+        return ClusterSimulationResult(
+            simulation_time=self._simulation_time,
+            reached_now=self._reached_now,
+            groups={group_type: dict(groups) for group_type, groups in self.matrix.groups.items()},
+            people=[
+                {attr: getattr(person, attr) for attr in PERSON_RESULT_ATTRIBUTES if hasattr(person, attr)}
+                for row in self.people_matrix
+                for person in row
+            ],
+        )
+
+    def apply_simulation_result(self, result: ClusterSimulationResult):
+        """Bring the cluster to the state it was simulated to in another process, as if it was simulated here."""
+        self._simulation_time = result.simulation_time
+        self._reached_now = result.reached_now
+        for group_type, groups in result.groups.items():
+            for group_key, set_properties in groups.items():
+                self.matrix._update_group(group_type, group_key, set_properties)
+        # Group type indexes were assigned in the other process without knowing about the group types of other
+        # clusters, so events may need to refer to the indexes the group types have here
+        renamed_properties = {}
+        for local_index, group_type in enumerate(result.groups):
+            local_key = f"$group_{local_index + self.matrix.group_type_index_offset}"
+            key = f"$group_{self.matrix._get_group_type_index(group_type)}"
+            if local_key != key:
+                renamed_properties[local_key] = key
+        people = [person for row in self.people_matrix for person in row]
+        for person, person_result in zip(people, result.people):
+            for attr, value in person_result.items():
+                setattr(person, attr, value)
+            for distinct_id in person._distinct_ids:
+                self.matrix.distinct_id_to_person[distinct_id] = person
+            if renamed_properties:
+                for event in person.all_events:
+                    event.properties = {
+                        renamed_properties.get(key, key): value for key, value in event.properties.items()
+                    }
 
     def _apply_due_effects(self, until: dt.datetime):
         while self._scheduled_effects and self._scheduled_effects[0].timestamp <= until:
@@ -177,7 +260,16 @@ class Cluster(ABC):
     def roll_uuidt(self, at_timestamp: Optional[dt.datetime] = None) -> UUIDT:
         if at_timestamp is None:
             at_timestamp = self.simulation_time
-        return UUIDT(int(at_timestamp.timestamp() * 1000), seeded_random=self.random)
+        unix_time_ms = int(at_timestamp.timestamp() * 1000)
+        # Like UUIDT's own, but with the series counted per cluster, so that IDs don't depend on other clusters
+        series = self._uuidt_series_per_ms[unix_time_ms]
+        self._uuidt_series_per_ms[unix_time_ms] = (series + 1) % 65_536
+        uuid_bytes = (
+            unix_time_ms.to_bytes(6, "big", signed=False)
+            + series.to_bytes(2, "big", signed=False)
+            + bytes(self.random.getrandbits(8) for _ in range(8))
+        )
+        return UUIDT(uuid_str=str(uuid.UUID(bytes=uuid_bytes)))
 
 
 class Matrix(ABC):
@@ -195,6 +287,7 @@ class Matrix(ABC):
     CLUSTER_CLASS: type[Cluster]
     PERSON_CLASS: type[SimPerson]
 
+    seed: str
     start: dt.datetime
     now: dt.datetime
     end: dt.datetime
@@ -228,6 +321,9 @@ class Matrix(ABC):
     ):
         if now is None:
             now = timezone.now()
+        if seed is None:
+            seed = secrets.token_hex(16)
+        self.seed = seed
         self.now = now
         self.start = (now - dt.timedelta(days=days_past)).replace(hour=0, minute=0, second=0, microsecond=0)
         self.end = (now + dt.timedelta(days=days_future)).replace(hour=0, minute=0, second=0, microsecond=0)
@@ -259,14 +355,53 @@ class Matrix(ABC):
         """Project setup, such as relevant insights, dashboards, feature flags, etc."""
         team.name = self.PRODUCT_NAME
 
-    def simulate(self):
+    def simulate(self, *, processes: int = 1):
+        """Simulate all clusters. With multiple processes, clusters are simulated in parallel with the same result."""
         if self.is_complete is not None:
             raise RuntimeError("Simulation can only be started once!")
         self.is_complete = False
-        for cluster in self.clusters:
-            cluster.simulate()
+        if processes > 1:
+            self._simulate_in_processes(processes)
+        else:
+            for cluster in self.clusters:
+                cluster.simulate()
+        # Serially, randomness is left as the last cluster's simulation left it, while in processes it isn't touched,
+        # so project setup after the simulation starts from the same seed either way
+        self.reseed(f"{self.seed}-post")
         self.is_complete = True
 
+    def _simulate_in_processes(self, processes: int):
+        global _matrix_being_simulated
+        # Forked processes inherit the matrix as is, so only the results of the simulation need to be pickled
+        _matrix_being_simulated = self
+        try:
+            with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("fork")) as executor:
+                # Results are applied in the order of clusters, the same order a serial simulation would run in
+                results = executor.map(_simulate_cluster_in_process, range(len(self.clusters)))
+                for cluster, result in zip(self.clusters, results):
+                    cluster.apply_simulation_result(result)
+        finally:
+            _matrix_being_simulated = None
+
+    def reseed(self, seed: str):
+        """Reseed all randomness of the matrix."""
+        self.random.seed(seed)
+        for provider in (
+            self.properties_provider,
+            self.person_provider,
+            self.numeric_provider,
+            self.address_provider,
+            self.internet_provider,
+            self.datetime_provider,
+            self.finance_provider,
+            self.file_provider,
+        ):
+            provider.reseed(seed)
+            # Some providers use providers of their own
+            for nested_provider in vars(provider).values():
+                if isinstance(nested_provider, mimesis.BaseProvider):
+                    nested_provider.reseed(seed)
+
     def _update_group(self, group_type: str, group_key: str, set_properties: dict[str, Any]):
         if len(self.groups) == GROUP_TYPES_LIMIT and group_type not in self.groups:
             raise Exception(f"Cannot add group type {group_type} to simulation, limit of {GROUP_TYPES_LIMIT} reached!")
@@ -277,3 +412,17 @@ class Matrix(ABC):
             return list(self.groups.keys()).index(group_type) + self.group_type_index_offset
         except ValueError:
             return None
+
+
+_matrix_being_simulated: Optional[Matrix] = None
+
+
+def _simulate_cluster_in_process(index: int) -> ClusterSimulationResult:
+    matrix = _matrix_being_simulated
+    assert matrix is not None
+    # The process may have simulated other clusters before, which must not leak into the result
+    matrix.groups = defaultdict(lambda: defaultdict(dict))
+    matrix.distinct_id_to_person = {}
+    cluster = matrix.clusters[index]
+    cluster.simulate()
+    return cluster.get_simulation_result()
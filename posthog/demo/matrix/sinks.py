@@ -0,0 +1,361 @@
+import datetime as dt
+import json
+import os
+import random
+import uuid
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Any, Literal, Optional
+
+from posthog.client import sync_execute
+from posthog.models.utils import UUIDT
+
+from .models import SimEvent
+
+ZERO_DATE = dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc)
+
+GroupTypeIndex = Literal[0, 1, 2, 3, 4]
+
+
+class SimDataSink(ABC):
+    """Where MatrixManager saves simulated analytics data to."""
+
+    # Whether data is queryable in ClickHouse as soon as `flush()` returns, or only once it's been ingested
+    is_synchronous: bool
+
+    @abstractmethod
+    def add_person(self, *, team_id: int, uuid: str, properties: dict[str, Any]) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def add_person_distinct_id(self, *, team_id: int, distinct_id: str, person_id: str) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def add_event(self, *, team_id: int, event: SimEvent) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def add_group(
+        self,
+        *,
+        team_id: int,
+        group_type_index: GroupTypeIndex,
+        group_key: str,
+        properties: dict[str, Any],
+        timestamp: dt.datetime,
+    ) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def flush(self) -> None:
+        """Write everything that's buffered."""
+        raise NotImplementedError()
+
+
+class KafkaSimDataSink(SimDataSink):
+    """Produces every row to Kafka as regular ingestion would, so data shows up in ClickHouse some time later."""
+
+    is_synchronous = False
+
+    def add_person(self, *, team_id: int, uuid: str, properties: dict[str, Any]) -> None:
+        from posthog.models.person.util import create_person
+
+        create_person(uuid=uuid, team_id=team_id, properties=properties, version=0)
+
+    def add_person_distinct_id(self, *, team_id: int, distinct_id: str, person_id: str) -> None:
+        from posthog.models.person.util import create_person_distinct_id
+
+        create_person_distinct_id(team_id=team_id, distinct_id=distinct_id, person_id=person_id)
+
+    def add_event(self, *, team_id: int, event: SimEvent) -> None:
+        from posthog.models.event.util import create_event
+        from posthog.models.team import Team
+
+        create_event(
+            event_uuid=UUIDT(unix_time_ms=int(event.timestamp.timestamp() * 1000)),
+            event=event.event,
+            # Only the ID of the team is used
+            team=Team(pk=team_id),
+            distinct_id=event.distinct_id,
+            timestamp=event.timestamp,
+            properties=event.properties,
+            person_id=event.person_id,
+            person_properties=event.person_properties,
+            person_created_at=event.person_created_at,
+            group0_properties=event.group0_properties,
+            group1_properties=event.group1_properties,
+            group2_properties=event.group2_properties,
+            group3_properties=event.group3_properties,
+            group4_properties=event.group4_properties,
+            group0_created_at=event.group0_created_at,
+            group1_created_at=event.group1_created_at,
+            group2_created_at=event.group2_created_at,
+            group3_created_at=event.group3_created_at,
+            group4_created_at=event.group4_created_at,
+        )
+
+    def add_group(
+        self,
+        *,
+        team_id: int,
+        group_type_index: GroupTypeIndex,
+        group_key: str,
+        properties: dict[str, Any],
+        timestamp: dt.datetime,
+    ) -> None:
+        from posthog.models.group.util import raw_create_group_ch
+
+        raw_create_group_ch(team_id, group_type_index, group_key, properties, timestamp)
+
+    def flush(self) -> None:
+        pass  # Every row is produced as soon as it's added
+
+
+class ColumnarSimDataSink(SimDataSink):
+    """Buffers rows into columns per table, and writes each table's columns once `batch_size` rows are buffered."""
+
+    TABLE_COLUMNS: dict[str, tuple[str, ...]] = {
+        "person": (
+            "id",
+            "created_at",
+            "team_id",
+            "properties",
+            "is_identified",
+            "_timestamp",
+            "_offset",
+            "is_deleted",
+            "version",
+        ),
+        "person_distinct_id2": (
+            "distinct_id",
+            "person_id",
+            "team_id",
+            "is_deleted",
+            "version",
+            "_timestamp",
+            "_offset",
+            "_partition",
+        ),
+        "events": (
+            "uuid",
+            "event",
+            "properties",
+            "timestamp",
+            "team_id",
+            "distinct_id",
+            "elements_chain",
+            "person_id",
+            "person_properties",
+            "person_created_at",
+            *(f"group{index}_properties" for index in range(5)),
+            *(f"group{index}_created_at" for index in range(5)),
+            "person_mode",
+            "created_at",
+            "_timestamp",
+            "_offset",
+        ),
+        "groups": (
+            "group_type_index",
+            "group_key",
+            "team_id",
+            "group_properties",
+            "created_at",
+            "_timestamp",
+            "_offset",
+        ),
+    }
+
+    batch_size: int
+    # When set, the rows written are the same for the same simulation: event UUIDs are generated from the seed,
+    # and rows are timestamped as loaded at `loaded_at` rather than now
+    seed: Optional[str]
+    loaded_at: Optional[dt.datetime]
+    rows_written: defaultdict[str, int]
+    _columns: dict[str, dict[str, list[Any]]]
+    _random: Optional[random.Random]
+    _uuidt_series_per_ms: defaultdict[int, int]
+
+    def __init__(
+        self, *, batch_size: int = 100_000, seed: Optional[str] = None, loaded_at: Optional[dt.datetime] = None
+    ):
+        self.batch_size = batch_size
+        self.seed = seed
+        self.loaded_at = loaded_at
+        self.rows_written = defaultdict(int)
+        self._columns = {table: {column: [] for column in columns} for table, columns in self.TABLE_COLUMNS.items()}
+        self._random = random.Random(seed) if seed is not None else None
+        self._uuidt_series_per_ms = defaultdict(int)
+
+    def add_person(self, *, team_id: int, uuid: str, properties: dict[str, Any]) -> None:
+        loaded_at = self._get_loaded_at()
+        self._add_row(
+            "person",
+            (uuid, loaded_at, team_id, json.dumps(properties), 0, loaded_at.replace(microsecond=0), 0, 0, 0),
+        )
+
+    def add_person_distinct_id(self, *, team_id: int, distinct_id: str, person_id: str) -> None:
+        self._add_row(
+            "person_distinct_id2",
+            (distinct_id, person_id, team_id, 0, 0, self._get_loaded_at().replace(microsecond=0), 0, 0),
+        )
+
+    def add_event(self, *, team_id: int, event: SimEvent) -> None:
+        timestamp = event.timestamp.astimezone(dt.timezone.utc)
+        group_properties = [
+            event.group0_properties,
+            event.group1_properties,
+            event.group2_properties,
+            event.group3_properties,
+            event.group4_properties,
+        ]
+        group_created_ats = [
+            event.group0_created_at,
+            event.group1_created_at,
+            event.group2_created_at,
+            event.group3_created_at,
+            event.group4_created_at,
+        ]
+        self._add_row(
+            "events",
+            (
+                str(self._roll_event_uuidt(timestamp)),
+                event.event,
+                json.dumps(event.properties),
+                timestamp,
+                team_id,
+                event.distinct_id,
+                "",
+                str(event.person_id),
+                json.dumps(event.person_properties),
+                event.person_created_at or ZERO_DATE,
+                *(json.dumps(properties) if properties is not None else "" for properties in group_properties),
+                *(created_at or ZERO_DATE for created_at in group_created_ats),
+                "full",
+                timestamp,
+                self._get_loaded_at().replace(microsecond=0),
+                0,
+            ),
+        )
+
+    def add_group(
+        self,
+        *,
+        team_id: int,
+        group_type_index: GroupTypeIndex,
+        group_key: str,
+        properties: dict[str, Any],
+        timestamp: dt.datetime,
+    ) -> None:
+        self._add_row(
+            "groups",
+            (
+                group_type_index,
+                group_key,
+                team_id,
+                json.dumps(properties),
+                timestamp,
+                self._get_loaded_at().replace(microsecond=0),
+                0,
+            ),
+        )
+
+    def flush(self) -> None:
+        for table in self._columns:
+            self._flush_table(table)
+
+    def _get_loaded_at(self) -> dt.datetime:
+        return self.loaded_at if self.loaded_at is not None else dt.datetime.now(dt.timezone.utc)
+
+    def _roll_event_uuidt(self, timestamp: dt.datetime) -> UUIDT:
+        unix_time_ms = int(timestamp.timestamp() * 1000)
+        if self._random is None:
+            return UUIDT(unix_time_ms=unix_time_ms)
+        # Like UUIDT's own, but with the series counted per sink and the random part seeded
+        if len(self._uuidt_series_per_ms) > 10_000:
+            self._uuidt_series_per_ms.clear()
+        series = self._uuidt_series_per_ms[unix_time_ms]
+        self._uuidt_series_per_ms[unix_time_ms] = (series + 1) % 65_536
+        uuid_bytes = (
+            unix_time_ms.to_bytes(6, "big", signed=False)
+            + series.to_bytes(2, "big", signed=False)
+            + self._random.getrandbits(64).to_bytes(8, "big", signed=False)
+        )
+        return UUIDT(uuid_str=str(uuid.UUID(bytes=uuid_bytes)))
+
+    def _add_row(self, table: str, row: tuple) -> None:
+        columns = self._columns[table]
+        for values, value in zip(columns.values(), row):
+            values.append(value)
+        if len(columns[self.TABLE_COLUMNS[table][0]]) >= self.batch_size:
+            self._flush_table(table)
+
+    def _flush_table(self, table: str) -> None:
+        columns = self._columns[table]
+        row_count = len(columns[self.TABLE_COLUMNS[table][0]])
+        if not row_count:
+            return
+        self._write_columns(table, columns)
+        self.rows_written[table] += row_count
+        self._columns[table] = {column: [] for column in self.TABLE_COLUMNS[table]}
+
+    @abstractmethod
+    def _write_columns(self, table: str, columns: dict[str, list[Any]]) -> None:
+        raise NotImplementedError()
+
+
+class ClickHouseSimDataSink(ColumnarSimDataSink):
+    """Writes data straight into ClickHouse with bulk INSERTs, so it's queryable as soon as it's flushed."""
+
+    is_synchronous = True
+
+    def _write_columns(self, table: str, columns: dict[str, list[Any]]) -> None:
+        insert_columns_into_clickhouse(table, columns)
+
+
+class ParquetSimDataSink(ColumnarSimDataSink):
+    """Writes each batch of each table to a Parquet file in `directory`, e.g. to load into ClickHouse elsewhere."""
+
+    is_synchronous = True
+
+    directory: str
+    # Names of the files written so far, by table
+    files_written: defaultdict[str, list[str]]
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        batch_size: int = 100_000,
+        seed: Optional[str] = None,
+        loaded_at: Optional[dt.datetime] = None,
+    ):
+        super().__init__(batch_size=batch_size, seed=seed, loaded_at=loaded_at)
+        self.directory = directory
+        self.files_written = defaultdict(list)
+        os.makedirs(directory, exist_ok=True)
+
+    def _write_columns(self, table: str, columns: dict[str, list[Any]]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        file_name = f"{table}-{len(self.files_written[table]):05d}.parquet"
+        pq.write_table(pa.table(columns), os.path.join(self.directory, file_name))
+        self.files_written[table].append(file_name)
+
+
+def insert_columns_into_clickhouse(table: str, columns: dict[str, list[Any]]) -> None:
+    """Inserts rows given as columns, named as in `ColumnarSimDataSink.TABLE_COLUMNS`, into the ClickHouse table."""
+    from posthog.models.event.sql import BULK_INSERT_EVENT_SQL
+    from posthog.models.group.sql import BULK_INSERT_GROUPS_SQL
+    from posthog.models.person.sql import BULK_INSERT_PERSON_DISTINCT_ID2, INSERT_PERSON_BULK_SQL
+
+    insert_sql = {
+        "person": INSERT_PERSON_BULK_SQL,
+        "person_distinct_id2": BULK_INSERT_PERSON_DISTINCT_ID2,
+        "events": BULK_INSERT_EVENT_SQL(),
+        "groups": BULK_INSERT_GROUPS_SQL,
+    }[table]
+    # Passing rows rather than a dict of parameters makes this a native insert, with no SQL formatting of values
+    rows = list(zip(*(columns[column] for column in ColumnarSimDataSink.TABLE_COLUMNS[table])))
+    sync_execute(insert_sql, rows, flush=False)
@@ -5,6 +5,7 @@ from django.utils import timezone
 
 from posthog.models import EventDefinition, EventProperty, PropertyDefinition
 from posthog.models.group.sql import GROUPS_TABLE
+from posthog.models.hogql_schema_version import bump_hogql_schema_version
 from posthog.models.person.sql import PERSONS_TABLE
 from posthog.models.property_definition import PropertyType
 
@@ -40,6 +41,8 @@ def infer_taxonomy_for_team(team_id: int) -> tuple[int, int, int]:
         batch_size=1000,
         ignore_conflicts=True,
     )
+    # bulk_create doesn't send the post_save signals that make HogQL pick up the new property types
+    bump_hogql_schema_version(team_id)
 
     # (event, property) pairs
     event_property_pairs = _get_event_property_pairs(team_id)
@@ -0,0 +1,48 @@
+import datetime as dt
+import json
+import os
+from functools import partial
+
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from posthog.demo.matrix.dataset import MANIFEST_FILE_NAME, generate_dataset
+from posthog.demo.products.hedgebox import HedgeboxMatrix
+
+
+def _read_files(directory: str) -> dict[str, bytes]:
+    files = {}
+    for file_name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, file_name), "rb") as f:
+            files[file_name] = f.read()
+    return files
+
+
+def test_generated_dataset_is_reproducible(tmp_path):
+    matrix_factory = partial(
+        HedgeboxMatrix, now=dt.datetime(2024, 5, 1, tzinfo=ZoneInfo("UTC")), days_past=30, days_future=0, n_clusters=5
+    )
+    first_directory, second_directory = str(tmp_path / "first"), str(tmp_path / "second")
+
+    manifest = generate_dataset(
+        matrix_factory, first_directory, seed="test-seed", events=500, team_id=2, batch_size=200
+    )
+    generate_dataset(matrix_factory, second_directory, seed="test-seed", events=500, team_id=2, batch_size=200)
+
+    assert manifest["rows"]["events"] >= 500
+    # Several shards were needed, and several files per table
+    assert manifest["shards"] > 1
+    assert len(manifest["files"]["events"]) > 1
+    with open(os.path.join(first_directory, MANIFEST_FILE_NAME)) as f:
+        assert json.load(f) == manifest
+    assert _read_files(first_directory) == _read_files(second_directory)
+
+
+def test_generating_a_dataset_without_past_events_raises(tmp_path):
+    matrix_factory = partial(
+        HedgeboxMatrix, now=dt.datetime(2024, 5, 1, tzinfo=ZoneInfo("UTC")), days_past=0, days_future=0, n_clusters=1
+    )
+
+    with pytest.raises(ValueError, match="Shard 1 has no past events"):
+        generate_dataset(matrix_factory, str(tmp_path), seed="test-seed", events=500, team_id=2)
@@ -0,0 +1,33 @@
+import datetime as dt
+
+from zoneinfo import ZoneInfo
+
+from posthog.demo.matrix.matrix import Matrix
+from posthog.demo.products.hedgebox import HedgeboxMatrix
+
+
+def _simulation_output(matrix: Matrix) -> list:
+    output: list = [{group_type: dict(groups) for group_type, groups in matrix.groups.items()}]
+    for person in matrix.people:
+        output.append((str(person), person.in_posthog_id, person.first_seen_at, person.last_seen_at))
+        output.extend(
+            (event.event, event.distinct_id, event.timestamp, event.person_id, event.properties)
+            for event in person.all_events
+        )
+    return output
+
+
+def test_simulation_is_deterministic_across_processes():
+    now = dt.datetime(2024, 5, 1, tzinfo=ZoneInfo("UTC"))
+    serial_matrix = HedgeboxMatrix("test-seed", now=now, days_past=60, days_future=10, n_clusters=12)
+    serial_matrix.simulate()
+    parallel_matrix = HedgeboxMatrix("test-seed", now=now, days_past=60, days_future=10, n_clusters=12)
+    parallel_matrix.simulate(processes=3)
+
+    serial_output = _simulation_output(serial_matrix)
+    assert len(serial_output) > 12
+    assert _simulation_output(parallel_matrix) == serial_output
+    assert serial_matrix.distinct_id_to_person.keys() == parallel_matrix.distinct_id_to_person.keys()
+    # Randomness used after the simulation, e.g. in project setup, doesn't depend on how the simulation ran
+    assert serial_matrix.random.randint(0, 1_000_000) == parallel_matrix.random.randint(0, 1_000_000)
+    assert serial_matrix.person_provider.full_name() == parallel_matrix.person_provider.full_name()
@@ -1,13 +1,17 @@
 import datetime as dt
+import os
+import tempfile
 from enum import auto
 from typing import Optional
 
 from zoneinfo import ZoneInfo
 
 from posthog.client import sync_execute
+from posthog.demo.matrix.dataset import generate_dataset, load_dataset
 from posthog.demo.matrix.manager import MatrixManager
 from posthog.demo.matrix.matrix import Cluster, Matrix
 from posthog.demo.matrix.models import SimPerson, SimSessionIntent
+from posthog.demo.matrix.sinks import ClickHouseSimDataSink, ParquetSimDataSink
 from posthog.test.base import ClickhouseDestroyTablesMixin
 
 
@@ -107,3 +111,72 @@ class TestMatrixManager(ClickhouseDestroyTablesMixin):
             )[0][0]
             >= 3
         )
+
+    def test_run_on_team_using_clickhouse_sink(self):
+        sink = ClickHouseSimDataSink(batch_size=2)
+        manager = MatrixManager(self.matrix, sink=sink)
+
+        manager.run_on_team(self.team, self.user)
+
+        event_count = sum(len(person.past_events) for person in self.matrix.people)
+        assert sink.rows_written["events"] == event_count
+        assert (
+            sync_execute(
+                "SELECT count() FROM events WHERE team_id = %(team_id)s",
+                {"team_id": self.team.pk},
+            )[0][0]
+            == event_count
+        )
+        assert (
+            sync_execute(
+                "SELECT count() FROM person WHERE team_id = %(team_id)s",
+                {"team_id": self.team.pk},
+            )[0][0]
+            == sink.rows_written["person"]
+        )
+        assert (
+            sync_execute(
+                "SELECT count() FROM groups WHERE team_id = %(team_id)s",
+                {"team_id": self.team.pk},
+            )[0][0]
+            == sink.rows_written["groups"]
+        )
+        assert self.team.name == DummyMatrix.PRODUCT_NAME
+
+    def test_save_clickhouse_data_to_parquet(self):
+        import pyarrow.parquet as pq
+
+        with tempfile.TemporaryDirectory() as directory:
+            sink = ParquetSimDataSink(directory, batch_size=2)
+            manager = MatrixManager(self.matrix, sink=sink)
+
+            manager.save_clickhouse_data(self.team.pk)
+
+            events = pq.read_table(
+                [os.path.join(directory, name) for name in sorted(os.listdir(directory)) if name.startswith("events-")]
+            )
+            assert events.num_rows == sum(len(person.past_events) for person in self.matrix.people)
+            assert set(events.column("team_id").to_pylist()) == {self.team.pk}
+            assert "$pageview" in events.column("event").to_pylist()
+
+    def test_load_dataset(self):
+        with tempfile.TemporaryDirectory() as directory:
+            manifest = generate_dataset(
+                lambda seed: DummyMatrix(seed, n_clusters=3, now=self.matrix.now, days_future=0),
+                directory,
+                seed="test-seed",
+                events=1,
+                team_id=0,
+            )
+
+            rows_loaded = load_dataset(directory, team_id=self.team.pk)
+
+        assert rows_loaded == manifest["rows"]
+        assert (
+            sync_execute(
+                "SELECT count() FROM events WHERE team_id = %(team_id)s",
+                {"team_id": self.team.pk},
+            )[0][0]
+            == manifest["rows"]["events"]
+        )
+        assert sync_execute("SELECT count() FROM events WHERE team_id = 0")[0][0] == 0
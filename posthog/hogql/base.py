@@ -1,7 +1,7 @@
 import re
 from dataclasses import dataclass, field
 
-from typing import TYPE_CHECKING, Literal, Optional
+from typing import TYPE_CHECKING, ClassVar, Literal, Optional
 
 from posthog.hogql.constants import ConstantDataType
 from posthog.hogql.errors import NotImplementedError
@@ -13,29 +13,52 @@ if TYPE_CHECKING:
 camel_case_pattern = re.compile(r"(?<!^)(?<![A-Z])(?=[A-Z])")
 
 
-@dataclass(kw_only=True)
+def visit_method_name(class_name: str) -> str:
+    name = camel_case_pattern.sub("_", class_name).lower()
+
+    # NOTE: Sync with ./test/test_visitor.py#test_hogql_visitor_naming_exceptions
+    replacements = {"hog_qlxtag": "hogqlx_tag", "hog_qlxattribute": "hogqlx_attribute", "uuidtype": "uuid_type"}
+    for old, new in replacements.items():
+        name = name.replace(old, new)
+    return f"visit_{name}"
+
+
+@dataclass(kw_only=True, slots=True)
 class AST:
     start: Optional[int] = field(default=None)
     end: Optional[int] = field(default=None)
 
+    # Computed once per node class, instead of on every visit
+    _visit_method_name: ClassVar[str] = "visit_ast"
+
+    def __init_subclass__(cls, **kwargs):
+        # :TRICKY: slotted dataclasses are recreated by the decorator, so zero-argument super() doesn't work here
+        super(AST, cls).__init_subclass__(**kwargs)  # noqa: UP008 - the class in __class__ is the replaced one
+        cls._visit_method_name = visit_method_name(cls.__name__)
+
     # This is part of the visitor pattern from visitor.py.
     def accept(self, visitor):
-        name = camel_case_pattern.sub("_", self.__class__.__name__).lower()
-
-        # NOTE: Sync with ./test/test_visitor.py#test_hogql_visitor_naming_exceptions
-        replacements = {"hog_qlxtag": "hogqlx_tag", "hog_qlxattribute": "hogqlx_attribute", "uuidtype": "uuid_type"}
-        for old, new in replacements.items():
-            name = name.replace(old, new)
-        method_name = f"visit_{name}"
-        if hasattr(visitor, method_name):
-            visit = getattr(visitor, method_name)
-            return visit(self)
-        if hasattr(visitor, "visit_unknown"):
-            return visitor.visit_unknown(self)
-        raise NotImplementedError(f"{visitor.__class__.__name__} has no method {method_name}")
-
-
-@dataclass(kw_only=True)
+        # Each visitor class keeps a table of which of its methods handles which node class
+        visitor_class = visitor.__class__
+        methods: Optional[dict[type, str]] = visitor_class.__dict__.get("_hogql_visit_methods")
+        if methods is None:
+            methods = {}
+            visitor_class._hogql_visit_methods = methods
+
+        node_class = self.__class__
+        method_name = methods.get(node_class)
+        if method_name is None:
+            method_name = self._visit_method_name
+            if not hasattr(visitor, method_name):
+                if not hasattr(visitor, "visit_unknown"):
+                    raise NotImplementedError(f"{visitor_class.__name__} has no method {method_name}")
+                method_name = "visit_unknown"
+            methods[node_class] = method_name
+
+        return getattr(visitor, method_name)(self)
+
+
+@dataclass(kw_only=True, slots=True)
 class Type(AST):
     def get_child(self, name: str, context: "HogQLContext") -> "Type":
         raise NotImplementedError("Type.get_child not overridden")
@@ -50,12 +73,12 @@ class Type(AST):
         raise NotImplementedError(f"{self.__class__.__name__}.resolve_column_constant_type not overridden")
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class Expr(AST):
     type: Optional[Type] = field(default=None)
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class CTE(Expr):
     """A common table expression."""
 
@@ -65,7 +88,7 @@ class CTE(Expr):
     cte_type: Literal["column", "subquery"]
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class ConstantType(Type):
     data_type: ConstantDataType
     nullable: bool = field(default=True)
@@ -77,7 +100,7 @@ class ConstantType(Type):
         raise NotImplementedError("ConstantType.print_type not implemented")
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class UnknownType(ConstantType):
     data_type: ConstantDataType = field(default="unknown", init=False)
 
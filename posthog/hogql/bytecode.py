@@ -7,6 +7,7 @@ from hogvm.python.execute import execute_bytecode, BytecodeResult
 from hogvm.python.stl import STL
 from posthog.hogql import ast
 from posthog.hogql.base import AST
+from posthog.hogql.bytecode_optimizer import optimize_ast, repeated_global_chains
 from posthog.hogql.errors import QueryError
 from posthog.hogql.parser import parse_program
 from posthog.hogql.visitor import Visitor
@@ -48,21 +49,34 @@ ARITHMETIC_OPERATIONS = {
 }
 
 
-def to_bytecode(expr: str) -> list[Any]:
+def to_bytecode(expr: str, optimize: bool = False) -> list[Any]:
     from posthog.hogql.parser import parse_expr
 
-    return create_bytecode(parse_expr(expr))
+    return create_bytecode(parse_expr(expr), optimize=optimize)
 
 
 def create_bytecode(
     expr: ast.Expr | ast.Statement | ast.Program,
     supported_functions: Optional[set[str]] = None,
     args: Optional[list[str]] = None,
+    optimize: bool = False,
 ) -> list[Any]:
+    """
+    Compiles an expression or a program to Hog bytecode.
+
+    With `optimize`, constant expressions are folded, dead code is removed, `and`/`or` short-circuit from left to
+    right, and globals read more than once in a top level expression are fetched once into locals.
+    """
     bytecode: list[Any] = []
     if args is None:
         bytecode.append(HOGQL_BYTECODE_IDENTIFIER)
-    bytecode.extend(BytecodeBuilder(supported_functions, args).visit(expr))
+    if optimize:
+        expr = optimize_ast(expr)
+    builder = BytecodeBuilder(supported_functions, args, optimize)
+    if optimize and args is None and isinstance(expr, ast.Expr):
+        bytecode.extend(builder.visit_with_cached_globals(expr))
+    else:
+        bytecode.extend(builder.visit(expr))
     return bytecode
 
 
@@ -80,13 +94,21 @@ class HogFunction:
 
 
 class BytecodeBuilder(Visitor):
-    def __init__(self, supported_functions: Optional[set[str]] = None, args: Optional[list[str]] = None):
+    def __init__(
+        self,
+        supported_functions: Optional[set[str]] = None,
+        args: Optional[list[str]] = None,
+        optimize: bool = False,
+    ):
         super().__init__()
         self.supported_functions = supported_functions or set()
         self.locals: list[Local] = []
         self.functions: dict[str, HogFunction] = {}
         self.scope_depth = 0
         self.args = args
+        self.optimize = optimize
+        # stack positions of globals fetched once at the start of an expression, see `visit_with_cached_globals`
+        self.cached_globals: dict[tuple[str | int, ...], int] = {}
         # we're in a function definition
         if args is not None:
             for arg in reversed(args):
@@ -114,7 +136,24 @@ class BytecodeBuilder(Visitor):
 
         self.locals.append(Local(name, self.scope_depth))
 
+    def visit_with_cached_globals(self, expr: ast.Expr) -> list[Any]:
+        """
+        Fetches every global that's read more than once in the expression into a local, and returns the result
+        explicitly, as the locals are left on the stack underneath it.
+        """
+        response: list[Any] = []
+        for chain in repeated_global_chains(expr):
+            response.extend(self.visit_field(ast.Field(chain=list(chain))))
+            self.cached_globals[chain] = len(self.cached_globals)
+        if not self.cached_globals:
+            return self.visit(expr)
+        response.extend(self.visit(expr))
+        response.append(Operation.RETURN)
+        return response
+
     def visit_and(self, node: ast.And):
+        if self.optimize:
+            return self._short_circuit(node.exprs, is_and=True)
         response = []
         for expr in reversed(node.exprs):
             response.extend(self.visit(expr))
@@ -123,6 +162,8 @@ class BytecodeBuilder(Visitor):
         return response
 
     def visit_or(self, node: ast.Or):
+        if self.optimize:
+            return self._short_circuit(node.exprs, is_and=False)
         response = []
         for expr in reversed(node.exprs):
             response.extend(self.visit(expr))
@@ -130,6 +171,21 @@ class BytecodeBuilder(Visitor):
         response.append(len(node.exprs))
         return response
 
+    def _short_circuit(self, exprs: list[ast.Expr], is_and: bool) -> list[Any]:
+        """
+        Evaluates the operands from left to right, jumping to the result as soon as one decides it.
+        Only uses JUMP_IF_FALSE, so the bytecode runs on every VM that supports `if` statements.
+        """
+        # for `or`, each operand is negated so that a truthy value jumps to the result
+        decided, undecided = (Operation.FALSE, Operation.TRUE) if is_and else (Operation.TRUE, Operation.FALSE)
+        response: list[Any] = [undecided, Operation.JUMP, 1, decided]
+        distance = 3  # from after an operand's jump to the `decided` constant
+        for expr in reversed(exprs):
+            check = [*self.visit(expr), *([] if is_and else [Operation.NOT]), Operation.JUMP_IF_FALSE, distance]
+            response = check + response
+            distance += len(check)
+        return response
+
     def visit_not(self, node: ast.Not):
         return [*self.visit(node.expr), Operation.NOT]
 
@@ -159,6 +215,8 @@ class BytecodeBuilder(Visitor):
                         else:
                             ops.extend([Operation.STRING, str(element), Operation.GET_PROPERTY])
                     return ops
+        if self.cached_globals and tuple(node.chain) in self.cached_globals:
+            return [Operation.GET_LOCAL, self.cached_globals[tuple(node.chain)]]
         chain = []
         for element in reversed(node.chain):
             chain.extend([Operation.STRING, element])
@@ -190,11 +248,15 @@ class BytecodeBuilder(Visitor):
         if node.name == "not" and len(node.args) == 1:
             return [*self.visit(node.args[0]), Operation.NOT]
         if node.name == "and" and len(node.args) > 1:
+            if self.optimize:
+                return self._short_circuit(node.args, is_and=True)
             args = []
             for arg in reversed(node.args):
                 args.extend(self.visit(arg))
             return [*args, Operation.AND, len(node.args)]
         if node.name == "or" and len(node.args) > 1:
+            if self.optimize:
+                return self._short_circuit(node.args, is_and=False)
             args = []
             for arg in reversed(node.args):
                 args.extend(self.visit(arg))
@@ -354,7 +416,7 @@ class BytecodeBuilder(Visitor):
         elif not isinstance(node.body, ast.ReturnStatement):
             body = ast.Block(declarations=[node.body, ast.ReturnStatement(expr=None)])
 
-        bytecode = create_bytecode(body, all_known_functions, node.params)
+        bytecode = create_bytecode(body, all_known_functions, node.params, self.optimize)
         self.functions[node.name] = HogFunction(node.name, node.params, bytecode)
         return [Operation.DECLARE_FN, node.name, len(node.params), len(bytecode), *bytecode]
 
@@ -390,6 +452,7 @@ def execute_hog(
     globals: Optional[dict[str, Any]] = None,
     functions: Optional[dict[str, Callable[..., Any]]] = None,
     timeout=timedelta(seconds=10),
+    optimize: bool = False,
 ) -> BytecodeResult:
     source_code = source_code.strip()
     if source_code.count("\n") == 0:
@@ -398,5 +461,5 @@ def execute_hog(
         if not source_code.endswith(";"):
             source_code = f"{source_code};"
     program = parse_program(source_code)
-    bytecode = create_bytecode(program)
+    bytecode = create_bytecode(program, optimize=optimize)
     return execute_bytecode(bytecode, globals=globals, functions=functions, timeout=timeout, team=team)
@@ -0,0 +1,193 @@
+from collections import Counter
+from typing import Any, Optional
+
+from posthog.hogql import ast
+from posthog.hogql.visitor import CloningVisitor, TraversingVisitor
+
+# Integers outside this range lose precision in the TypeScript VM, so we leave them to be computed at runtime
+MAX_SAFE_INTEGER = 2**53
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def _is_safe_number(value: Any) -> bool:
+    return _is_number(value) and -MAX_SAFE_INTEGER <= value <= MAX_SAFE_INTEGER
+
+
+def _fold_arithmetic(op: ast.ArithmeticOperationOp, left: Any, right: Any) -> Optional[ast.Constant]:
+    if not _is_safe_number(left) or not _is_safe_number(right):
+        return None
+    if op == ast.ArithmeticOperationOp.Add:
+        value = left + right
+    elif op == ast.ArithmeticOperationOp.Sub:
+        value = left - right
+    elif op == ast.ArithmeticOperationOp.Mult:
+        value = left * right
+    elif op == ast.ArithmeticOperationOp.Div and right != 0:
+        value = left / right
+    elif (
+        # Python and JavaScript disagree on the sign of the remainder for negative operands
+        op == ast.ArithmeticOperationOp.Mod
+        and isinstance(left, int)
+        and isinstance(right, int)
+        and left >= 0
+        and right > 0
+    ):
+        value = left % right
+    else:
+        return None
+    if not _is_safe_number(value):
+        return None
+    return ast.Constant(value=value)
+
+
+def _fold_comparison(op: ast.CompareOperationOp, left: Any, right: Any) -> Optional[ast.Constant]:
+    if op in (ast.CompareOperationOp.Eq, ast.CompareOperationOp.NotEq):
+        # Only fold values that compare the same way in Python and with JavaScript's `===`
+        if not (
+            (_is_number(left) and _is_number(right))
+            or (isinstance(left, str) and isinstance(right, str))
+            or (isinstance(left, bool) and isinstance(right, bool))
+        ):
+            return None
+        equal = left == right
+        return ast.Constant(value=equal if op == ast.CompareOperationOp.Eq else not equal)
+
+    if not _is_number(left) or not _is_number(right):
+        return None
+    if op == ast.CompareOperationOp.Gt:
+        return ast.Constant(value=left > right)
+    if op == ast.CompareOperationOp.GtEq:
+        return ast.Constant(value=left >= right)
+    if op == ast.CompareOperationOp.Lt:
+        return ast.Constant(value=left < right)
+    if op == ast.CompareOperationOp.LtEq:
+        return ast.Constant(value=left <= right)
+    return None
+
+
+class BytecodeOptimizer(CloningVisitor):
+    """
+    Folds constant expressions and removes dead code before a program or expression is compiled to bytecode.
+
+    Only folds operations whose results are identical in the Python and the TypeScript VMs. `and` and `or` are
+    assumed to short-circuit from left to right, as the optimizing `BytecodeBuilder` compiles them.
+    """
+
+    def __init__(self):
+        super().__init__(clear_types=False, clear_locations=False)
+
+    def visit_arithmetic_operation(self, node: ast.ArithmeticOperation):
+        node = super().visit_arithmetic_operation(node)
+        if isinstance(node.left, ast.Constant) and isinstance(node.right, ast.Constant):
+            return _fold_arithmetic(node.op, node.left.value, node.right.value) or node
+        return node
+
+    def visit_compare_operation(self, node: ast.CompareOperation):
+        node = super().visit_compare_operation(node)
+        if isinstance(node.left, ast.Constant) and isinstance(node.right, ast.Constant):
+            return _fold_comparison(node.op, node.left.value, node.right.value) or node
+        return node
+
+    def visit_not(self, node: ast.Not):
+        node = super().visit_not(node)
+        if isinstance(node.expr, ast.Constant):
+            return ast.Constant(value=not node.expr.value)
+        return node
+
+    def visit_and(self, node: ast.And):
+        return self._fold_and_or(node.exprs, ast.And, absorbing=False)
+
+    def visit_or(self, node: ast.Or):
+        return self._fold_and_or(node.exprs, ast.Or, absorbing=True)
+
+    def visit_call(self, node: ast.Call):
+        # the bytecode builder treats these calls as the equivalent operators
+        if node.name == "not" and len(node.args) == 1:
+            return self.visit_not(ast.Not(expr=node.args[0], start=node.start, end=node.end))
+        if node.name == "and" and len(node.args) > 1:
+            return self._fold_and_or(node.args, ast.And, absorbing=False)
+        if node.name == "or" and len(node.args) > 1:
+            return self._fold_and_or(node.args, ast.Or, absorbing=True)
+        return super().visit_call(node)
+
+    def _fold_and_or(self, exprs: list[ast.Expr], cls: type[ast.And] | type[ast.Or], absorbing: bool) -> ast.Expr:
+        """
+        Drops operands that can't change the result, and everything after an operand that decides it.
+        `absorbing` is the constant truthiness that decides the result: false for `and`, true for `or`.
+        """
+        folded: list[ast.Expr] = []
+        for expr in exprs:
+            expr = self.visit(expr)
+            if isinstance(expr, ast.Constant):
+                if bool(expr.value) != absorbing:
+                    continue
+                folded.append(expr)
+                break
+            folded.append(expr)
+
+        if len(folded) == 0:
+            return ast.Constant(value=not absorbing)
+        if len(folded) == 1 and isinstance(folded[0], ast.Constant):
+            return ast.Constant(value=absorbing)
+        return cls(exprs=folded)
+
+    def visit_block(self, node: ast.Block):
+        return ast.Block(start=node.start, end=node.end, declarations=self._visit_declarations(node.declarations))
+
+    def visit_program(self, node: ast.Program):
+        return ast.Program(start=node.start, end=node.end, declarations=self._visit_declarations(node.declarations))
+
+    def _visit_declarations(self, declarations: list[ast.Declaration]) -> list[ast.Declaration]:
+        response: list[ast.Declaration] = []
+        for declaration in declarations:
+            response.append(self.visit(declaration))
+            # nothing after a return statement in the same block is ever executed
+            if isinstance(declaration, ast.ReturnStatement):
+                break
+        return response
+
+    def visit_if_statement(self, node: ast.IfStatement):
+        expr = self.visit(node.expr)
+        if isinstance(expr, ast.Constant):
+            if expr.value:
+                return self.visit(node.then)
+            if node.else_:
+                return self.visit(node.else_)
+            return ast.ExprStatement(expr=None)
+        return ast.IfStatement(
+            start=node.start,
+            end=node.end,
+            expr=expr,
+            then=self.visit(node.then),
+            else_=self.visit(node.else_) if node.else_ else None,
+        )
+
+    def visit_while_statement(self, node: ast.WhileStatement):
+        expr = self.visit(node.expr)
+        if isinstance(expr, ast.Constant) and not expr.value:
+            return ast.ExprStatement(expr=None)
+        return ast.WhileStatement(start=node.start, end=node.end, expr=expr, body=self.visit(node.body))
+
+
+class GlobalChainCounter(TraversingVisitor):
+    """Counts how many times each global field chain is read in an expression."""
+
+    def __init__(self):
+        super().__init__()
+        self.counts: Counter[tuple[str | int, ...]] = Counter()
+
+    def visit_field(self, node: ast.Field):
+        self.counts[tuple(node.chain)] += 1
+
+
+def optimize_ast(node: ast.Expr | ast.Statement | ast.Program) -> Any:
+    return BytecodeOptimizer().visit(node)
+
+
+def repeated_global_chains(expr: ast.Expr) -> list[tuple[str | int, ...]]:
+    counter = GlobalChainCounter()
+    counter.visit(expr)
+    return [chain for chain, count in counter.counts.items() if count > 1]
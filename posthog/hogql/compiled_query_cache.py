@@ -0,0 +1,96 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Optional, Union
+
+from django.conf import settings
+from prometheus_client import Counter
+
+from posthog.hogql import ast
+from posthog.hogql.constants import HogQLGlobalSettings
+from posthog.hogql.context import HogQLContext
+from posthog.hogql.visitor import clone_expr
+from posthog.models.hogql_schema_version import get_hogql_schema_version
+from posthog.schema import HogQLQueryModifiers
+
+COMPILED_QUERY_CACHE_COUNTER = Counter(
+    "hogql_compiled_query_cache",
+    "Lookups of compiled HogQL queries in the in-memory cache, by result.",
+    labelnames=["result"],
+)
+
+
+@dataclass(frozen=True)
+class CompiledQuery:
+    """Everything execute_hogql_query needs from the compilation step to run a query and build its response."""
+
+    hogql: Optional[str]  # None if the HogQL dialect query wasn't printed
+    columns: list[str]
+    clickhouse_sql: str
+    values: dict[str, Any]
+
+
+_cache: OrderedDict[str, tuple[float, CompiledQuery]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def compiled_query_cache_key(
+    select_query: Union[ast.SelectQuery, ast.SelectUnionQuery],
+    team_id: int,
+    context: HogQLContext,
+    modifiers: HogQLQueryModifiers,
+    settings: HogQLGlobalSettings,
+    pretty: bool,
+) -> Optional[str]:
+    """
+    Returns the key under which the compiled query is cached, or None if it can't be cached.
+
+    Placeholders and filters are already part of the query by now. The team's schema version covers everything the
+    query is resolved against, so that changes to e.g. warehouse tables or property definitions invalidate the key.
+    """
+    if context.database is not None or context.values:
+        # Queries compiled against a custom database or with existing values depend on more than the key captures
+        return None
+
+    normalized_query = clone_expr(select_query, clear_types=True, clear_locations=True)
+    key_parts = (
+        repr(normalized_query),
+        team_id,
+        get_hogql_schema_version(team_id),
+        modifiers.model_dump_json(),
+        settings.model_dump_json(),
+        context.within_non_hogql_query,
+        context.limit_top_select,
+        context.max_view_depth,
+        pretty,
+    )
+    return hashlib.sha256(repr(key_parts).encode()).hexdigest()
+
+
+def get_compiled_query(key: str) -> Optional[CompiledQuery]:
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and monotonic() - entry[0] > settings.HOGQL_COMPILED_QUERY_CACHE_TTL:
+            del _cache[key]
+            entry = None
+        if entry is None:
+            COMPILED_QUERY_CACHE_COUNTER.labels(result="miss").inc()
+            return None
+        _cache.move_to_end(key)
+    COMPILED_QUERY_CACHE_COUNTER.labels(result="hit").inc()
+    return entry[1]
+
+
+def set_compiled_query(key: str, compiled_query: CompiledQuery) -> None:
+    with _lock:
+        _cache[key] = (monotonic(), compiled_query)
+        _cache.move_to_end(key)
+        while len(_cache) > settings.HOGQL_COMPILED_QUERY_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def clear_compiled_query_cache() -> None:
+    with _lock:
+        _cache.clear()
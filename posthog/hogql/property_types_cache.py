@@ -0,0 +1,80 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from time import monotonic
+
+from django.conf import settings
+from prometheus_client import Counter
+
+PROPERTY_TYPES_CACHE_COUNTER = Counter(
+    "hogql_property_types_cache",
+    "Lookups of a team's property types in the in-memory cache, by result.",
+    labelnames=["result"],
+)
+
+
+@dataclass
+class TeamPropertyTypes:
+    """The types of all typed property definitions of a team, as used by resolve_property_types."""
+
+    event_properties: dict[str, str] = field(default_factory=dict)
+    person_properties: dict[str, str] = field(default_factory=dict)
+    # Keyed by "{group_type_index}_{name}"
+    group_properties: dict[str, str] = field(default_factory=dict)
+
+
+_cache: OrderedDict[int, tuple[float, int, TeamPropertyTypes]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_team_property_types(team_id: int) -> TeamPropertyTypes:
+    """
+    Returns the property types of the team, loading all of them at once if they aren't cached yet.
+
+    Entries are shared by all queries in the worker, and are reloaded when the team's HogQL schema version changes
+    (i.e. a property definition was saved or deleted), or when they are older than HOGQL_PROPERTY_TYPES_CACHE_TTL.
+    """
+    from posthog.models.hogql_schema_version import get_hogql_schema_version
+
+    version = get_hogql_schema_version(team_id)
+    with _lock:
+        entry = _cache.get(team_id)
+        if entry is not None:
+            loaded_at, loaded_version, property_types = entry
+            if loaded_version == version and monotonic() - loaded_at <= settings.HOGQL_PROPERTY_TYPES_CACHE_TTL:
+                _cache.move_to_end(team_id)
+                PROPERTY_TYPES_CACHE_COUNTER.labels(result="hit").inc()
+                return property_types
+
+    PROPERTY_TYPES_CACHE_COUNTER.labels(result="miss").inc()
+    property_types = _load_team_property_types(team_id)
+    with _lock:
+        _cache[team_id] = (monotonic(), version, property_types)
+        _cache.move_to_end(team_id)
+        while len(_cache) > settings.HOGQL_PROPERTY_TYPES_CACHE_TEAMS:
+            _cache.popitem(last=False)
+    return property_types
+
+
+def clear_property_types_cache() -> None:
+    with _lock:
+        _cache.clear()
+
+
+def _load_team_property_types(team_id: int) -> TeamPropertyTypes:
+    from posthog.models import PropertyDefinition
+
+    property_types = TeamPropertyTypes()
+    property_definitions = PropertyDefinition.objects.filter(team_id=team_id, property_type__isnull=False).values_list(
+        "name", "property_type", "type", "group_type_index"
+    )
+    for name, property_type, type, group_type_index in property_definitions.iterator(chunk_size=10000):
+        if not property_type:
+            continue
+        if type is None or type == PropertyDefinition.Type.EVENT:
+            property_types.event_properties[name] = property_type
+        elif type == PropertyDefinition.Type.PERSON:
+            property_types.person_properties[name] = property_type
+        elif type == PropertyDefinition.Type.GROUP and group_type_index is not None:
+            property_types.group_properties[f"{group_type_index}_{name}"] = property_type
+    return property_types
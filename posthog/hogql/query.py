@@ -1,9 +1,17 @@
 import dataclasses
 from typing import Optional, Union, cast
 
+from django.conf import settings as django_settings
+
 from posthog.clickhouse.client.connection import Workload
 from posthog.errors import ExposedCHQueryError
 from posthog.hogql import ast
+from posthog.hogql.compiled_query_cache import (
+    CompiledQuery,
+    compiled_query_cache_key,
+    get_compiled_query,
+    set_compiled_query,
+)
 from posthog.hogql.constants import HogQLGlobalSettings, LimitContext, get_default_limit_for_context
 from posthog.hogql.errors import ExposedHogQLError
 from posthog.hogql.hogql import HogQLContext
@@ -39,6 +47,7 @@ def execute_hogql_query(
     timings: Optional[HogQLTimings] = None,
     pretty: Optional[bool] = True,
     context: Optional[HogQLContext] = None,
+    include_hogql: bool = True,
 ) -> HogQLQueryResponse:
     if timings is None:
         timings = HogQLTimings()
@@ -88,81 +97,93 @@ def execute_hogql_query(
             if one_query.limit is None:
                 one_query.limit = ast.Constant(value=get_default_limit_for_context(limit_context))
 
-    # Get printed HogQL query, and returned columns. Using a cloned query.
-    with timings.measure("hogql"):
-        with timings.measure("prepare_ast"):
-            hogql_query_context = dataclasses.replace(
-                context,
-                # set the team.pk here so someone can't pass a context for a different team 🤷‍️
-                team_id=team.pk,
-                team=team,
-                enable_select_queries=True,
-                timings=timings,
-                modifiers=query_modifiers,
-            )
-
-            with timings.measure("clone"):
-                cloned_query = clone_expr(select_query, True)
-            select_query_hogql = cast(
-                ast.SelectQuery,
-                prepare_ast_for_printing(node=cloned_query, context=hogql_query_context, dialect="hogql"),
-            )
-
-        with timings.measure("print_ast"):
-            hogql = print_prepared_ast(
-                select_query_hogql, hogql_query_context, "hogql", pretty=pretty if pretty is not None else True
-            )
-            print_columns = []
-            columns_query = (
-                select_query_hogql.select_queries[0]
-                if isinstance(select_query_hogql, ast.SelectUnionQuery)
-                else select_query_hogql
-            )
-            for node in columns_query.select:
-                if isinstance(node, ast.Alias):
-                    print_columns.append(node.alias)
-                else:
-                    print_columns.append(
-                        print_prepared_ast(
-                            node=node,
-                            context=hogql_query_context,
-                            dialect="hogql",
-                            stack=[select_query_hogql],
-                        )
-                    )
-
     settings = settings or HogQLGlobalSettings()
     if limit_context in (LimitContext.EXPORT, LimitContext.COHORT_CALCULATION, LimitContext.QUERY_ASYNC):
         settings.max_execution_time = HOGQL_INCREASED_MAX_EXECUTION_TIME
 
-    # Print the ClickHouse SQL query
-    with timings.measure("print_ast"):
-        try:
-            clickhouse_context = dataclasses.replace(
-                context,
-                # set the team.pk here so someone can't pass a context for a different team 🤷‍️
+    clickhouse_context = dataclasses.replace(
+        context,
+        # set the team.pk here so someone can't pass a context for a different team 🤷‍️
+        team_id=team.pk,
+        team=team,
+        enable_select_queries=True,
+        timings=timings,
+        modifiers=query_modifiers,
+    )
+
+    hogql_query_context = dataclasses.replace(
+        context,
+        # set the team.pk here so someone can't pass a context for a different team 🤷‍️
+        team_id=team.pk,
+        team=team,
+        enable_select_queries=True,
+        timings=timings,
+        modifiers=query_modifiers,
+    )
+    # The HogQL dialect query is a second full resolution of the query, so only print it when it's asked for
+    needs_hogql = include_hogql or debug
+    hogql: Optional[str] = None
+    print_columns: Optional[list[str]] = None
+
+    compiled_query: Optional[CompiledQuery] = None
+    cache_key: Optional[str] = None
+    if django_settings.HOGQL_COMPILED_QUERY_CACHE_SIZE > 0:
+        with timings.measure("compiled_query_cache"):
+            cache_key = compiled_query_cache_key(
+                select_query,
                 team_id=team.pk,
-                team=team,
-                enable_select_queries=True,
-                timings=timings,
+                context=context,
                 modifiers=query_modifiers,
-            )
-            clickhouse_sql = print_ast(
-                select_query,
-                context=clickhouse_context,
-                dialect="clickhouse",
                 settings=settings,
                 pretty=pretty if pretty is not None else True,
             )
-        except Exception as e:
-            if debug:
-                clickhouse_sql = None
-                if isinstance(e, ExposedCHQueryError | ExposedHogQLError):
-                    error = str(e)
+            compiled_query = get_compiled_query(cache_key) if cache_key else None
+
+    if compiled_query is not None:
+        hogql = compiled_query.hogql
+        print_columns = list(compiled_query.columns)
+        clickhouse_sql = compiled_query.clickhouse_sql
+        clickhouse_context.values.update(compiled_query.values)
+        if needs_hogql and hogql is None:
+            with timings.measure("hogql"):
+                hogql, _ = _print_hogql_query(select_query, hogql_query_context, pretty)
+    else:
+        print_columns = _get_aliased_column_names(select_query)
+        if needs_hogql or print_columns is None:
+            # Get printed HogQL query, and returned columns. Using a cloned query.
+            with timings.measure("hogql"):
+                hogql, print_columns = _print_hogql_query(select_query, hogql_query_context, pretty)
+
+        # Print the ClickHouse SQL query
+        with timings.measure("print_ast"):
+            try:
+                clickhouse_sql = print_ast(
+                    select_query,
+                    context=clickhouse_context,
+                    dialect="clickhouse",
+                    settings=settings,
+                    pretty=pretty if pretty is not None else True,
+                )
+            except Exception as e:
+                if debug:
+                    clickhouse_sql = None
+                    if isinstance(e, ExposedCHQueryError | ExposedHogQLError):
+                        error = str(e)
+                    else:
+                        error = "Unknown error"
                 else:
-                    error = "Unknown error"
-            else:
-                raise e
+                    raise e
+
+        if cache_key is not None and clickhouse_sql is not None:
+            set_compiled_query(
+                cache_key,
+                CompiledQuery(
+                    hogql=hogql,
+                    columns=list(print_columns),
+                    clickhouse_sql=clickhouse_sql,
+                    values=dict(clickhouse_context.values),
+                ),
+            )
 
     if clickhouse_sql is not None:
         timings_dict = timings.to_dict()
@@ -184,6 +205,7 @@ def execute_hogql_query(
                     workload=workload,
                     team_id=team.pk,
                     readonly=True,
+                    comment_free=True,
                 )
             except Exception as e:
                 if debug:
@@ -204,12 +226,13 @@ def execute_hogql_query(
                     workload=workload,
                     team_id=team.pk,
                     readonly=True,
+                    comment_free=True,
                 )
                 explain = [str(r[0]) for r in explain_results[0]]
             with timings.measure("metadata"):
                 from posthog.hogql.metadata import get_hogql_metadata
 
-                metadata = get_hogql_metadata(HogQLMetadata(select=hogql, debug=True), team)
+                metadata = get_hogql_metadata(HogQLMetadata(select=cast(str, hogql), debug=True), team)
 
     return HogQLQueryResponse(
         query=query,
@@ -224,3 +247,48 @@ def execute_hogql_query(
         explain=explain,
         metadata=metadata,
     )
+
+
+def _get_aliased_column_names(select_query: Union[ast.SelectQuery, ast.SelectUnionQuery]) -> Optional[list[str]]:
+    """Returns the names of the returned columns if they are all aliased, as then they don't need to be printed."""
+    columns_query = select_query
+    while isinstance(columns_query, ast.SelectUnionQuery):
+        columns_query = columns_query.select_queries[0]
+    if all(isinstance(node, ast.Alias) for node in columns_query.select):
+        return [cast(ast.Alias, node).alias for node in columns_query.select]
+    return None
+
+
+def _print_hogql_query(
+    select_query: Union[ast.SelectQuery, ast.SelectUnionQuery], context: HogQLContext, pretty: Optional[bool]
+) -> tuple[str, list[str]]:
+    """Prints a clone of the query in the HogQL dialect, and returns it together with the names of its columns."""
+    with context.timings.measure("prepare_ast"):
+        with context.timings.measure("clone"):
+            cloned_query = clone_expr(select_query, True)
+        select_query_hogql = cast(
+            ast.SelectQuery,
+            prepare_ast_for_printing(node=cloned_query, context=context, dialect="hogql"),
+        )
+
+    with context.timings.measure("print_ast"):
+        hogql = print_prepared_ast(select_query_hogql, context, "hogql", pretty=pretty if pretty is not None else True)
+        print_columns = []
+        columns_query = (
+            select_query_hogql.select_queries[0]
+            if isinstance(select_query_hogql, ast.SelectUnionQuery)
+            else select_query_hogql
+        )
+        for node in columns_query.select:
+            if isinstance(node, ast.Alias):
+                print_columns.append(node.alias)
+            else:
+                print_columns.append(
+                    print_prepared_ast(
+                        node=node,
+                        context=context,
+                        dialect="hogql",
+                        stack=[select_query_hogql],
+                    )
+                )
+    return hogql, print_columns
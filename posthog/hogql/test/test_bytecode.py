@@ -1,6 +1,7 @@
 import pytest
 
 from posthog.hogql.bytecode import to_bytecode, execute_hog
+from hogvm.python.execute import execute_bytecode
 from hogvm.python.operation import Operation as op, HOGQL_BYTECODE_IDENTIFIER as _H
 from posthog.hogql.errors import NotImplementedError, QueryError
 from posthog.test.base import BaseTest
@@ -217,3 +218,78 @@ class TestBytecode(BaseTest):
             ).result,
             8,
         )
+
+    def test_bytecode_create_optimized(self):
+        self.assertEqual(to_bytecode("1 + 2 * 3", optimize=True), [_H, op.INTEGER, 7])
+        self.assertEqual(to_bytecode("1 / 0", optimize=True), to_bytecode("1 / 0"))
+        self.assertEqual(to_bytecode("'a' = 1", optimize=True), to_bytecode("'a' = 1"))
+        self.assertEqual(to_bytecode("true or event", optimize=True), [_H, op.TRUE])
+        self.assertEqual(to_bytecode("event and false", optimize=True)[-1], op.FALSE)
+        self.assertEqual(
+            to_bytecode("event and 1", optimize=True),
+            [_H, op.STRING, "event", op.GET_GLOBAL, 1, op.JUMP_IF_FALSE, 3, op.TRUE, op.JUMP, 1, op.FALSE],
+        )
+        self.assertEqual(
+            to_bytecode("event = 'a' or event = 'b'", optimize=True),
+            [
+                _H,
+                op.STRING,
+                "event",
+                op.GET_GLOBAL,
+                1,
+                op.STRING,
+                "a",
+                op.GET_LOCAL,
+                0,
+                op.EQ,
+                op.NOT,
+                op.JUMP_IF_FALSE,
+                11,
+                op.STRING,
+                "b",
+                op.GET_LOCAL,
+                0,
+                op.EQ,
+                op.NOT,
+                op.JUMP_IF_FALSE,
+                3,
+                op.FALSE,
+                op.JUMP,
+                1,
+                op.TRUE,
+                op.RETURN,
+            ],
+        )
+
+    def test_bytecode_execute_optimized(self):
+        globals = {"event": "$pageview", "properties": {"a": 1, "b": "x", "empty": ""}, "person": {"properties": {}}}
+        expressions = [
+            "event = '$pageview' and properties.a = 1",
+            "event = '$pageview' and properties.a = 2",
+            "event = 'x' or properties.a = 1 or properties.b = 'x'",
+            "(event = 'x' or properties.b = 'x') and not (properties.a > 1 or properties.empty)",
+            "and(event, properties.missing, properties.a)",
+            "or(properties.missing, properties.empty, 0)",
+            "not(properties.a = 1) or 1 + 2 = 3",
+            "properties.a + 2 * 3 - 10 / 4 > 2 and 7 % 3 = 1",
+            "person.properties.email = 'a' or person.properties.email = 'b' or event = event",
+            "false and event = event",
+            "concat(event, properties.b, properties.b)",
+        ]
+        for expr in expressions:
+            self.assertEqual(
+                execute_bytecode(to_bytecode(expr), globals).result,
+                execute_bytecode(to_bytecode(expr, optimize=True), globals).result,
+                expr,
+            )
+
+        program = """
+            let a := 1 + 2;
+            if (a > 2 and true) {
+                return a * 10;
+            } else {
+                return 0;
+            }
+            return 1;
+        """
+        self.assertEqual(execute_hog(program, team=self.team, optimize=True).result, 30)
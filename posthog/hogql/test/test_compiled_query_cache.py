@@ -0,0 +1,102 @@
+from unittest.mock import patch
+
+from django.test import override_settings
+
+from posthog.hogql import printer
+from posthog.hogql.compiled_query_cache import clear_compiled_query_cache
+from posthog.hogql.query import execute_hogql_query
+from posthog.models import Cohort, PropertyDefinition
+from posthog.test.base import (
+    APIBaseTest,
+    ClickhouseTestMixin,
+    _create_event,
+    _create_person,
+    flush_persons_and_events,
+)
+
+
+@override_settings(HOGQL_COMPILED_QUERY_CACHE_SIZE=10)
+class TestCompiledQueryCache(ClickhouseTestMixin, APIBaseTest):
+    def setUp(self):
+        super().setUp()
+        clear_compiled_query_cache()
+        _create_event(distinct_id="bla", event="random event", team=self.team, properties={"index": 1})
+        flush_persons_and_events()
+
+    def _execute(self, query: str):
+        with patch("posthog.hogql.query.print_ast", wraps=printer.print_ast) as print_ast:
+            response = execute_hogql_query(query, team=self.team)
+        return response, print_ast.call_count
+
+    def test_repeated_query_is_compiled_once(self):
+        query = "select event, properties.index from events where event = 'random event'"
+        first, first_compilations = self._execute(query)
+        second, second_compilations = self._execute(query)
+
+        assert first_compilations == 1
+        assert second_compilations == 0
+        assert second.clickhouse == first.clickhouse
+        assert second.hogql == first.hogql
+        assert second.columns == first.columns
+        assert second.results == first.results == [("random event", "1")]
+
+    def test_query_is_normalized_before_caching(self):
+        _, first_compilations = self._execute("select event from events where event = 'random event'")
+        _, second_compilations = self._execute("select   event\nfrom events where event='random event'")
+
+        assert first_compilations == 1
+        assert second_compilations == 0
+
+    def test_different_values_are_compiled_separately(self):
+        first, _ = self._execute("select event from events where event = 'random event'")
+        second, compilations = self._execute("select event from events where event = 'other event'")
+
+        assert compilations == 1
+        assert first.results == [("random event",)]
+        assert second.results == []
+
+    def test_schema_changes_invalidate_the_cache(self):
+        query = "select properties.index from events"
+        first, _ = self._execute(query)
+
+        PropertyDefinition.objects.create(
+            team=self.team, name="index", property_type="Numeric", type=PropertyDefinition.Type.EVENT
+        )
+        second, compilations = self._execute(query)
+
+        assert compilations == 1
+        assert first.results == [("1",)]
+        assert second.results == [(1,)]
+
+    def test_cohort_recalculation_invalidates_the_cache(self):
+        _create_person(distinct_ids=["bla"], team=self.team, properties={"name": "test"})
+        flush_persons_and_events()
+        cohort = Cohort.objects.create(
+            team=self.team, groups=[{"properties": [{"key": "name", "value": "test", "type": "person"}]}]
+        )
+        cohort.calculate_people_ch(pending_version=0)
+        query = f"select count() from events where person_id in cohort {cohort.pk}"
+        self._execute(query)
+
+        original_save = Cohort.save
+
+        def save_and_execute(cohort: Cohort, *args, **kwargs):
+            original_save(cohort, *args, **kwargs)
+            # Compiled after the recalculation is saved, but before the cohort is moved to its new version
+            if not cohort.is_calculating:
+                self._execute(query)
+
+        with patch.object(Cohort, "save", autospec=True, side_effect=save_and_execute):
+            cohort.calculate_people_ch(pending_version=1)
+        response, compilations = self._execute(query)
+
+        assert compilations == 1
+        assert response.results == [(1,)]
+
+    @override_settings(HOGQL_COMPILED_QUERY_CACHE_SIZE=0)
+    def test_cache_disabled(self):
+        query = "select event from events"
+        _, first_compilations = self._execute(query)
+        _, second_compilations = self._execute(query)
+
+        assert first_compilations == second_compilations == 1
@@ -1382,6 +1382,30 @@ class TestQuery(ClickhouseTestMixin, APIBaseTest):
         )
         self.assertEqual(response.hogql, "SELECT event FROM events WHERE true LIMIT 100")
 
+    def test_hogql_query_without_hogql(self):
+        with freeze_time("2020-01-10"):
+            self._create_random_events()
+            response = execute_hogql_query(
+                "SELECT event AS e, count() AS c FROM events GROUP BY e",
+                team=self.team,
+                include_hogql=False,
+            )
+            self.assertEqual(response.hogql, None)
+            self.assertEqual(response.columns, ["e", "c"])
+            self.assertEqual(response.results, [("random event", 2)])
+            assert response.timings is not None
+            self.assertNotIn("./hogql", [timing.k for timing in response.timings])
+
+            # Columns that aren't aliased are still named like in the HogQL query
+            response = execute_hogql_query("SELECT event, count() FROM events GROUP BY event", team=self.team)
+            unaliased_response = execute_hogql_query(
+                "SELECT event, count() FROM events GROUP BY event",
+                team=self.team,
+                include_hogql=False,
+            )
+            self.assertEqual(unaliased_response.columns, response.columns)
+            self.assertEqual(unaliased_response.columns, ["event", "count()"])
+
     def test_hogql_query_filters_double_error(self):
         query = "SELECT event from events where {filters}"
         with self.assertRaises(ValueError) as e:
@@ -154,3 +154,26 @@ class TestVisitor(BaseTest):
         assert NamingCheck().visit(UUIDType()) == "visit_uuid_type"
         assert NamingCheck().visit(HogQLXAttribute(name="a", value="a")) == "visit_hogqlx_attribute"
         assert NamingCheck().visit(HogQLXTag(kind="", attributes=[])) == "visit_hogqlx_tag"
+
+    def test_visitor_dispatch_is_cached_per_visitor_class(self):
+        class ParentVisitor(Visitor):
+            def visit_constant(self, node: ast.Constant):
+                return "parent"
+
+            def visit_unknown(self, node: ast.AST):
+                return "unknown"
+
+        class ChildVisitor(ParentVisitor):
+            def visit_field(self, node: ast.Field):
+                return "child"
+
+        # The parent's dispatch table must not leak into the child's, or vice versa
+        assert ParentVisitor().visit(ast.Field(chain=["a"])) == "unknown"
+        assert ChildVisitor().visit(ast.Field(chain=["a"])) == "child"
+        assert ChildVisitor().visit(ast.Constant(value=1)) == "parent"
+        assert ParentVisitor().visit(ast.Field(chain=["a"])) == "unknown"
+
+    def test_ast_nodes_are_slotted(self):
+        node = ast.Constant(value=1)
+        with self.assertRaises(AttributeError):
+            node.some_attribute = 1  # type: ignore
@@ -7,6 +7,7 @@ from posthog.hogql.database.models import (
     BooleanDatabaseField,
 )
 from posthog.hogql.escape_sql import escape_hogql_identifier
+from posthog.hogql.property_types_cache import TeamPropertyTypes, get_team_property_types
 from posthog.hogql.visitor import CloningVisitor, TraversingVisitor
 from posthog.models.property import PropertyName, TableColumn
 from posthog.schema import PersonsOnEventsMode
@@ -14,8 +15,6 @@ from posthog.hogql.database.s3_table import S3Table
 
 
 def resolve_property_types(node: ast.Expr, context: HogQLContext) -> ast.Expr:
-    from posthog.models import PropertyDefinition
-
     if not context or not context.team_id:
         return node
 
@@ -23,49 +22,22 @@ def resolve_property_types(node: ast.Expr, context: HogQLContext) -> ast.Expr:
     property_finder = PropertyFinder(context)
     property_finder.visit(node)
 
-    # fetch them
-    event_property_values = (
-        PropertyDefinition.objects.filter(
-            name__in=property_finder.event_properties,
-            team_id=context.team_id,
-            type__in=[None, PropertyDefinition.Type.EVENT],
-        ).values_list("name", "property_type")
-        if property_finder.event_properties
-        else []
-    )
-    event_properties = {name: property_type for name, property_type in event_property_values if property_type}
-
-    person_property_values = (
-        PropertyDefinition.objects.filter(
-            name__in=property_finder.person_properties,
-            team_id=context.team_id,
-            type=PropertyDefinition.Type.PERSON,
-        ).values_list("name", "property_type")
-        if property_finder.person_properties
-        else []
-    )
-    person_properties = {name: property_type for name, property_type in person_property_values if property_type}
-
-    group_properties = {}
-    for group_id, properties in property_finder.group_properties.items():
-        if not properties:
-            continue
-        group_property_values = PropertyDefinition.objects.filter(
-            name__in=properties,
-            team_id=context.team_id,
-            type=PropertyDefinition.Type.GROUP,
-            group_type_index=group_id,
-        ).values_list("name", "property_type")
-        group_properties.update(
-            {f"{group_id}_{name}": property_type for name, property_type in group_property_values if property_type}
-        )
+    # fetch their types, unless there are none to look up
+    if (
+        property_finder.event_properties
+        or property_finder.person_properties
+        or any(property_finder.group_properties.values())
+    ):
+        property_types = get_team_property_types(context.team_id)
+    else:
+        property_types = TeamPropertyTypes()
 
     timezone = context.database.get_timezone() if context and context.database else "UTC"
     property_swapper = PropertySwapper(
         timezone=timezone,
-        event_properties=event_properties,
-        person_properties=person_properties,
-        group_properties=group_properties,
+        event_properties=property_types.event_properties,
+        person_properties=property_types.person_properties,
+        group_properties=property_types.group_properties,
         context=context,
     )
     return property_swapper.visit(node)
@@ -235,21 +207,23 @@ class PropertySwapper(CloningVisitor):
         field_type: str,
     ):
         property_name = str(node.chain[-1])
-        if property_type == "person":
-            if self.context.modifiers.personsOnEventsMode != PersonsOnEventsMode.DISABLED:
-                materialized_column = self._get_materialized_column("events", property_name, "person_properties")
-            else:
-                materialized_column = self._get_materialized_column("person", property_name, "properties")
-        elif property_type == "group":
+        if property_type == "group":
             name_parts = property_name.split("_")
             name_parts.pop(0)
             property_name = "_".join(name_parts)
-            materialized_column = self._get_materialized_column("groups", property_name, "properties")
-        else:
-            materialized_column = self._get_materialized_column("events", property_name, "properties")
 
         message = f"{property_type.capitalize()} property '{property_name}' is of type '{field_type}'."
         if self.context.debug:
+            if property_type == "person":
+                if self.context.modifiers.personsOnEventsMode != PersonsOnEventsMode.DISABLED:
+                    materialized_column = self._get_materialized_column("events", property_name, "person_properties")
+                else:
+                    materialized_column = self._get_materialized_column("person", property_name, "properties")
+            elif property_type == "group":
+                materialized_column = self._get_materialized_column("groups", property_name, "properties")
+            else:
+                materialized_column = self._get_materialized_column("events", property_name, "properties")
+
             if materialized_column:
                 message += " This property is materialized ⚡️."
             else:
@@ -1,10 +1,13 @@
 import pytest
 from typing import Any
+from unittest.mock import patch
 
 from django.test import override_settings
 
+from ee.models.property_definition import EnterprisePropertyDefinition
 from posthog.hogql.context import HogQLContext
 from posthog.hogql.parser import parse_select
+from posthog.hogql import property_types_cache
 from posthog.hogql.printer import print_ast
 from posthog.hogql.test.utils import pretty_print_in_tests
 from posthog.models import PropertyDefinition, GroupTypeMapping
@@ -148,6 +151,50 @@ class TestPropertyTypes(BaseTest):
 
         assert printed == self.snapshot
 
+    def test_property_types_are_loaded_once(self):
+        with patch.object(
+            property_types_cache,
+            "_load_team_property_types",
+            wraps=property_types_cache._load_team_property_types,
+        ) as load_team_property_types:
+            self._print_select("select event from events")
+            assert load_team_property_types.call_count == 0
+
+            first = self._print_select("select properties.$screen_width, person.properties.tickets from events")
+            second = self._print_select("select properties.$screen_width, person.properties.tickets from events")
+            assert load_team_property_types.call_count == 1
+            assert first == second
+
+    def test_property_types_are_reloaded_when_definitions_change(self):
+        printed = self._print_select("select properties.$screen_width, properties.new_prop from events")
+        assert printed.count("toFloat") == 1
+
+        PropertyDefinition.objects.create(
+            team=self.team,
+            type=PropertyDefinition.Type.EVENT,
+            name="new_prop",
+            property_type="Numeric",
+        )
+
+        printed = self._print_select("select properties.$screen_width, properties.new_prop from events")
+        assert printed.count("toFloat") == 2
+
+    def test_property_types_are_reloaded_when_enterprise_definitions_change(self):
+        # The EE API saves property definitions as their EnterprisePropertyDefinition subclass
+        property_definition = EnterprisePropertyDefinition.objects.create(
+            team=self.team,
+            type=PropertyDefinition.Type.EVENT,
+            name="new_prop",
+        )
+        printed = self._print_select("select properties.$screen_width, properties.new_prop from events")
+        assert printed.count("toFloat") == 1
+
+        property_definition.property_type = "Numeric"
+        property_definition.save()
+
+        printed = self._print_select("select properties.$screen_width, properties.new_prop from events")
+        assert printed.count("toFloat") == 2
+
     def _print_select(self, select: str):
         expr = parse_select(select)
         query = print_ast(
@@ -1,6 +1,9 @@
 import itertools
 from typing import Optional
 from collections.abc import Sequence, Iterator
+
+from rest_framework.exceptions import ValidationError
+
 from posthog.hogql import ast
 from posthog.hogql.parser import parse_expr, parse_order_expr
 from posthog.hogql.property import has_aggregation
@@ -8,6 +11,7 @@ from posthog.hogql_queries.actor_strategies import ActorStrategy, PersonStrategy
 from posthog.hogql_queries.insights.insight_actors_query_runner import InsightActorsQueryRunner
 from posthog.hogql_queries.insights.paginators import HogQLHasMorePaginator
 from posthog.hogql_queries.query_runner import QueryRunner, get_query_runner
+from posthog.queries.person_query import decode_person_cursor, encode_person_cursor
 from posthog.schema import ActorsQuery, ActorsQueryResponse, CachedActorsQueryResponse, DashboardFilter
 
 
@@ -19,7 +23,10 @@ class ActorsQueryRunner(QueryRunner):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.paginator = HogQLHasMorePaginator.from_limit_context(
-            limit_context=self.limit_context, limit=self.query.limit, offset=self.query.offset
+            limit_context=self.limit_context,
+            limit=self.query.limit,
+            # With a cursor, the actors to skip are excluded by the cursor condition instead
+            offset=self.query.offset if self.query.cursor is None else None,
         )
         self.source_query_runner: Optional[QueryRunner] = None
 
@@ -115,9 +122,45 @@ class ActorsQueryRunner(QueryRunner):
             hogql=response.hogql,
             modifiers=self.modifiers,
             missing_actors_count=missing_actors_count,
+            nextCursor=self._next_cursor(input_columns),
             **self.paginator.response_params(),
         )
 
+    def _next_cursor(self, input_columns: list[str]) -> Optional[str]:
+        if self.query.cursor is None or not self.paginator.has_more():
+            return None
+        last_row = self.paginator.results[-1]
+        id_column = "id" if "id" in input_columns else "person"
+        return encode_person_cursor(
+            last_row[input_columns.index("created_at")], str(last_row[input_columns.index(id_column)])
+        )
+
+    def _cursor_conditions(self, aggregations: list[ast.Expr]) -> list[ast.Expr]:
+        if self.query.cursor is None:
+            return []
+        input_columns = self.input_columns()
+        # Keyset pagination needs a unique sort key that's in the results: persons listed by creation date have one
+        if (
+            not isinstance(self.strategy, PersonStrategy)
+            or self.query.source is not None
+            or self.query.orderBy not in (None, ["created_at DESC"])
+            or len(aggregations) > 0
+            or "created_at" not in input_columns
+            or ("id" not in input_columns and "person" not in input_columns)
+        ):
+            raise ValidationError("Cursor pagination is only supported when listing persons by creation date.")
+
+        cursor = decode_person_cursor(self.query.cursor)
+        if cursor is None:
+            return []
+        created_at, person_id = cursor
+        return [
+            parse_expr(
+                "created_at < {created_at} or (created_at = {created_at} and id < {id})",
+                {"created_at": ast.Constant(value=created_at), "id": ast.Constant(value=person_id)},
+            )
+        ]
+
     def input_columns(self) -> list[str]:
         if self.query.select:
             return self.query.select
@@ -193,7 +236,7 @@ class ActorsQueryRunner(QueryRunner):
             has_any_aggregation = len(aggregations) > 0
 
         with self.timings.measure("filters"):
-            filter_conditions = self.strategy.filter_conditions()
+            filter_conditions = [*self.strategy.filter_conditions(), *self._cursor_conditions(aggregations)]
             where_list = [expr for expr in filter_conditions if not has_aggregation(expr)]
             if len(where_list) == 0:
                 where = None
@@ -228,6 +271,9 @@ class ActorsQueryRunner(QueryRunner):
                 order_by = [ast.OrderExpr(expr=self._remove_aliases(columns[0]), order="ASC")]
             else:
                 order_by = []
+            if self.query.cursor is not None:
+                # Persons created at the same time are ordered by id, so that the cursor can continue between them
+                order_by = [*order_by, ast.OrderExpr(expr=ast.Field(chain=["id"]), order="DESC")]
 
         with self.timings.measure("select"):
             if self.query.source:
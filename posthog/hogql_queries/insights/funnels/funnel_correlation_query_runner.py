@@ -1,5 +1,4 @@
-import dataclasses
-from typing import Literal, Optional, Any, TypedDict, cast
+from typing import Optional, Any, cast
 
 from posthog.constants import AUTOCAPTURE_EVENT
 from posthog.hogql.parser import parse_select
@@ -23,6 +22,7 @@ from posthog.hogql_queries.insights.funnels.utils import funnel_window_interval_
 from posthog.hogql_queries.query_runner import QueryRunner
 from posthog.models import Team
 from posthog.models.property.util import get_property_string_expr
+from posthog.queries.funnels.correlation import EventOddsRatio, get_top_odds_ratios
 from posthog.queries.util import correct_result_for_sampling
 from posthog.schema import (
     ActionsNode,
@@ -43,38 +43,6 @@ from posthog.schema import (
 )
 
 
-class EventOddsRatio(TypedDict):
-    event: str
-
-    success_count: int
-    failure_count: int
-
-    odds_ratio: float
-    correlation_type: Literal["success", "failure"]
-
-
-@dataclasses.dataclass
-class EventStats:
-    success_count: int
-    failure_count: int
-
-
-@dataclasses.dataclass
-class EventContingencyTable:
-    """
-    Represents a contingency table for a single event. Note that this isn't a
-    complete contingency table, but rather only includes totals for
-    failure/success as opposed to including the number of successes for cases
-    that a persons _doesn't_ visit an event.
-    """
-
-    event: str
-    visited: EventStats
-
-    success_total: int
-    failure_total: int
-
-
 PRIOR_COUNT = 1
 
 
@@ -84,6 +52,8 @@ class FunnelCorrelationQueryRunner(QueryRunner):
     AUTOCAPTURE_EVENT_TYPE = "$event_type"
     MIN_PERSON_COUNT = 25
     MIN_PERSON_PERCENTAGE = 0.02
+    # When set, only events whose correlation is significant at this false discovery rate are returned
+    MAX_FALSE_DISCOVERY_RATE: Optional[float] = None
 
     query: FunnelCorrelationQuery
     response: FunnelCorrelationResponse
@@ -236,29 +206,18 @@ class FunnelCorrelationQueryRunner(QueryRunner):
             timings=self.timings,
             modifiers=self.modifiers,
             limit_context=self.limit_context,
+            include_hogql=False,
         )
         assert response.results
 
         # Get the total success/failure counts from the results
         results = [result for result in response.results if result[0] != self.TOTAL_IDENTIFIER]
-        _, success_total, failure_total = next(
+        _, queried_success_total, queried_failure_total = next(
             result for result in response.results if result[0] == self.TOTAL_IDENTIFIER
         )
 
-        # Add a little structure, and keep it close to the query definition so it's
-        # obvious what's going on with result indices.
-        event_contingency_tables = [
-            EventContingencyTable(
-                event=result[0],
-                visited=EventStats(success_count=result[1], failure_count=result[2]),
-                success_total=success_total,
-                failure_total=failure_total,
-            )
-            for result in results
-        ]
-
-        success_total = int(correct_result_for_sampling(success_total, self.funnels_query.samplingFactor))
-        failure_total = int(correct_result_for_sampling(failure_total, self.funnels_query.samplingFactor))
+        success_total = int(correct_result_for_sampling(queried_success_total, self.funnels_query.samplingFactor))
+        failure_total = int(correct_result_for_sampling(queried_failure_total, self.funnels_query.samplingFactor))
 
         if not success_total or not failure_total:
             return [], True, hogql, response
@@ -270,26 +229,21 @@ class FunnelCorrelationQueryRunner(QueryRunner):
         if success_total / failure_total > 10 or failure_total / success_total > 10:
             skewed_totals = True
 
-        odds_ratios = [
-            get_entity_odds_ratio(event_stats, PRIOR_COUNT)
-            for event_stats in event_contingency_tables
-            if not self.are_results_insignificant(event_stats)
-        ]
-
-        positively_correlated_events = sorted(
-            [odds_ratio for odds_ratio in odds_ratios if odds_ratio["correlation_type"] == "success"],
-            key=lambda x: x["odds_ratio"],
-            reverse=True,
-        )
-
-        negatively_correlated_events = sorted(
-            [odds_ratio for odds_ratio in odds_ratios if odds_ratio["correlation_type"] == "failure"],
-            key=lambda x: x["odds_ratio"],
-            reverse=False,
-        )
+        # Each result is a partial contingency table of an event: how many successful and failed people visited it
+        event_names, success_counts, failure_counts = zip(*results) if results else ((), (), ())
 
         # Return the top ten positively correlated events, and top then negatively correlated events
-        events = positively_correlated_events[:10] + negatively_correlated_events[:10]
+        events = get_top_odds_ratios(
+            event_names,
+            success_counts,
+            failure_counts,
+            queried_success_total,
+            queried_failure_total,
+            prior_count=PRIOR_COUNT,
+            min_person_count=self.MIN_PERSON_COUNT,
+            min_person_percentage=self.MIN_PERSON_PERCENTAGE,
+            max_false_discovery_rate=self.MAX_FALSE_DISCOVERY_RATE,
+        )
         return events, skewed_totals, hogql, response
 
     def serialize_event_odds_ratio(self, odds_ratio: EventOddsRatio) -> EventOddsRatioSerialized:
@@ -860,39 +814,3 @@ class FunnelCorrelationQueryRunner(QueryRunner):
         ):
             return True
         return False
-
-    @staticmethod
-    def are_results_insignificant(event_contingency_table: EventContingencyTable) -> bool:
-        """
-        Check if the results are insignificant, i.e. if the success/failure counts are
-        significantly different from the total counts
-        """
-
-        total_count = event_contingency_table.success_total + event_contingency_table.failure_total
-
-        if event_contingency_table.visited.success_count + event_contingency_table.visited.failure_count < min(
-            FunnelCorrelationQueryRunner.MIN_PERSON_COUNT,
-            FunnelCorrelationQueryRunner.MIN_PERSON_PERCENTAGE * total_count,
-        ):
-            return True
-
-        return False
-
-
-def get_entity_odds_ratio(event_contingency_table: EventContingencyTable, prior_counts: int) -> EventOddsRatio:
-    # Add 1 to all values to prevent divide by zero errors, and introduce a [prior](https://en.wikipedia.org/wiki/Prior_probability)
-    odds_ratio = (
-        (event_contingency_table.visited.success_count + prior_counts)
-        * (event_contingency_table.failure_total - event_contingency_table.visited.failure_count + prior_counts)
-    ) / (
-        (event_contingency_table.success_total - event_contingency_table.visited.success_count + prior_counts)
-        * (event_contingency_table.visited.failure_count + prior_counts)
-    )
-
-    return EventOddsRatio(
-        event=event_contingency_table.event,
-        success_count=event_contingency_table.visited.success_count,
-        failure_count=event_contingency_table.visited.failure_count,
-        odds_ratio=odds_ratio,
-        correlation_type="success" if odds_ratio > 1 else "failure",
-    )
@@ -96,6 +96,7 @@ class FunnelsQueryRunner(QueryRunner):
             timings=self.timings,
             modifiers=self.modifiers,
             limit_context=self.limit_context,
+            include_hogql=False,
             settings=HogQLGlobalSettings(
                 max_bytes_before_external_group_by=MAX_BYTES_BEFORE_EXTERNAL_GROUP_BY
             ),  # Make sure funnel queries never OOM
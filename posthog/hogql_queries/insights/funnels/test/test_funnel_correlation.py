@@ -1,13 +1,10 @@
 from typing import Any, cast
-import unittest
 
 from freezegun import freeze_time
 from rest_framework.exceptions import ValidationError
 
 from posthog.constants import INSIGHT_FUNNELS
 from posthog.hogql_queries.insights.funnels.funnel_correlation_query_runner import (
-    EventContingencyTable,
-    EventStats,
     FunnelCorrelationQueryRunner,
 )
 from posthog.hogql_queries.insights.funnels.test.test_funnel_correlations_persons import get_actors
@@ -2075,94 +2072,3 @@ class TestClickhouseFunnelCorrelation(ClickhouseTestMixin, APIBaseTest):
         #     ),
         #     6,
         # )
-
-
-class TestCorrelationFunctions(unittest.TestCase):
-    def test_are_results_insignificant(self):
-        # Same setup as above test: test_discarding_insignificant_events
-        contingency_tables = [
-            EventContingencyTable(
-                event="negatively_related",
-                visited=EventStats(success_count=0, failure_count=5),
-                success_total=10,
-                failure_total=10,
-            ),
-            EventContingencyTable(
-                event="positively_related",
-                visited=EventStats(success_count=5, failure_count=0),
-                success_total=10,
-                failure_total=10,
-            ),
-            EventContingencyTable(
-                event="low_sig_negatively_related",
-                visited=EventStats(success_count=0, failure_count=2),
-                success_total=10,
-                failure_total=10,
-            ),
-            EventContingencyTable(
-                event="low_sig_positively_related",
-                visited=EventStats(success_count=1, failure_count=0),
-                success_total=10,
-                failure_total=10,
-            ),
-        ]
-
-        # Discard both low_sig due to %
-        FunnelCorrelationQueryRunner.MIN_PERSON_PERCENTAGE = 0.11
-        FunnelCorrelationQueryRunner.MIN_PERSON_COUNT = 25
-        result = [
-            1
-            for contingency_table in contingency_tables
-            if not FunnelCorrelationQueryRunner.are_results_insignificant(contingency_table)
-        ]
-        self.assertEqual(len(result), 2)
-
-        # Discard one low_sig due to %
-        FunnelCorrelationQueryRunner.MIN_PERSON_PERCENTAGE = 0.051
-        FunnelCorrelationQueryRunner.MIN_PERSON_COUNT = 25
-        result = [
-            1
-            for contingency_table in contingency_tables
-            if not FunnelCorrelationQueryRunner.are_results_insignificant(contingency_table)
-        ]
-        self.assertEqual(len(result), 3)
-
-        # Discard both due to count
-        FunnelCorrelationQueryRunner.MIN_PERSON_PERCENTAGE = 0.5
-        FunnelCorrelationQueryRunner.MIN_PERSON_COUNT = 3
-        result = [
-            1
-            for contingency_table in contingency_tables
-            if not FunnelCorrelationQueryRunner.are_results_insignificant(contingency_table)
-        ]
-        self.assertEqual(len(result), 2)
-
-        # Discard one due to count
-        FunnelCorrelationQueryRunner.MIN_PERSON_PERCENTAGE = 0.5
-        FunnelCorrelationQueryRunner.MIN_PERSON_COUNT = 2
-        result = [
-            1
-            for contingency_table in contingency_tables
-            if not FunnelCorrelationQueryRunner.are_results_insignificant(contingency_table)
-        ]
-        self.assertEqual(len(result), 3)
-
-        # Discard everything due to %
-        FunnelCorrelationQueryRunner.MIN_PERSON_PERCENTAGE = 0.5
-        FunnelCorrelationQueryRunner.MIN_PERSON_COUNT = 100
-        result = [
-            1
-            for contingency_table in contingency_tables
-            if not FunnelCorrelationQueryRunner.are_results_insignificant(contingency_table)
-        ]
-        self.assertEqual(len(result), 0)
-
-        # Discard everything due to count
-        FunnelCorrelationQueryRunner.MIN_PERSON_PERCENTAGE = 0.5
-        FunnelCorrelationQueryRunner.MIN_PERSON_COUNT = 6
-        result = [
-            1
-            for contingency_table in contingency_tables
-            if not FunnelCorrelationQueryRunner.are_results_insignificant(contingency_table)
-        ]
-        self.assertEqual(len(result), 0)
@@ -160,6 +160,7 @@ class LifecycleQueryRunner(QueryRunner):
             timings=self.timings,
             modifiers=self.modifiers,
             limit_context=self.limit_context,
+            include_hogql=False,
         )
 
         # TODO: can we move the data conversion part into the query as well? It would make it easier to swap
@@ -216,6 +216,7 @@ class StickinessQueryRunner(QueryRunner):
                 timings=self.timings,
                 modifiers=self.modifiers,
                 limit_context=self.limit_context,
+                include_hogql=False,
             )
 
             if response.timings is not None:
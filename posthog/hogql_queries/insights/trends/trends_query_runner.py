@@ -250,6 +250,7 @@ class TrendsQueryRunner(QueryRunner):
                     query_type="TrendsActorsQueryOptions",
                     query=query,
                     team=self.team,
+                    include_hogql=False,
                     # timings=timings,
                     # modifiers=modifiers,
                 )
@@ -320,6 +321,7 @@ class TrendsQueryRunner(QueryRunner):
                     timings=self.timings,
                     modifiers=self.modifiers,
                     limit_context=self.limit_context,
+                    include_hogql=False,
                 )
 
                 timings_matrix[index] = response.timings
@@ -25,6 +25,7 @@ from posthog.test.base import (
     _create_event,
 )
 from freezegun import freeze_time
+from rest_framework.exceptions import ValidationError
 from django.test import override_settings
 
 
@@ -185,6 +186,31 @@ class TestActorsQueryRunner(ClickhouseTestMixin, APIBaseTest):
         self.assertEqual(response.results, [[f"jacob7@{self.random_uuid}.posthog.com"]])
         self.assertEqual(response.hasMore, True)
 
+    def test_persons_query_cursor(self):
+        # Persons created at the same time are still paginated through in a stable order
+        with freeze_time("2024-05-01T12:00:00Z"):
+            self.random_uuid = self._create_random_persons()
+        with freeze_time("2024-05-02T12:00:00Z"):
+            _create_person(team=self.team, distinct_ids=["newest"], properties={"random_uuid": self.random_uuid})
+            flush_persons_and_events()
+        properties = [PersonPropertyFilter(key="random_uuid", value=self.random_uuid, operator=PropertyOperator.EXACT)]
+        all_ids = [row[1] for row in self._create_runner(ActorsQuery(properties=properties)).calculate().results]
+
+        pages = []
+        cursor: str | None = ""
+        while cursor is not None:
+            response = self._create_runner(ActorsQuery(properties=properties, limit=3, cursor=cursor)).calculate()
+            pages.append([row[1] for row in response.results])
+            cursor = response.nextCursor
+            self.assertEqual(cursor is not None, response.hasMore)
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 3, 2])
+        self.assertEqual(pages[0][0], all_ids[0])
+        self.assertCountEqual([person_id for page in pages for person_id in page], all_ids)
+
+        with self.assertRaises(ValidationError):
+            self._create_runner(ActorsQuery(select=["properties.email"], cursor="")).calculate()
+
     @override_settings(PERSON_ON_EVENTS_OVERRIDE=True, PERSON_ON_EVENTS_V2_OVERRIDE=True)
     def test_source_hogql_query_poe_on(self):
         self.random_uuid = self._create_random_persons()
@@ -131,6 +131,7 @@ FROM (
             timings=self.timings,
             modifiers=self.modifiers,
             limit_context=self.limit_context,
+            include_hogql=False,
         )
         assert response.results
 
@@ -0,0 +1,85 @@
+import datetime as dt
+import logging
+from functools import partial
+from time import monotonic
+
+from django.core.management.base import BaseCommand
+
+from posthog.demo.matrix.dataset import generate_dataset
+from posthog.demo.products.hedgebox import HedgeboxMatrix
+
+logging.getLogger("kafka").setLevel(logging.ERROR)  # Hide kafka-python's logspam
+
+# The date ranges queried by ee/benchmarks end before this
+DEFAULT_NOW = dt.datetime(2021, 11, 23, tzinfo=dt.timezone.utc)
+
+
+class Command(BaseCommand):
+    help = "Generate a reproducible dataset of simulated analytics data in Parquet files, for benchmarking locally"
+
+    def add_arguments(self, parser):
+        parser.add_argument("directory", type=str, help="Directory to write the dataset to")
+        parser.add_argument(
+            "--events",
+            type=int,
+            default=1_000_000,
+            help="Minimum number of events in the dataset, e.g. 1000000, 10000000, or 100000000 (default: 1000000)",
+        )
+        parser.add_argument(
+            "--seed", type=str, default="benchmark", help="Simulation seed for the dataset (default: benchmark)"
+        )
+        parser.add_argument(
+            "--now",
+            type=dt.datetime.fromisoformat,
+            default=DEFAULT_NOW,
+            help=f"Simulation 'now' datetime in ISO format (default: {DEFAULT_NOW.isoformat()})",
+        )
+        parser.add_argument(
+            "--days-past",
+            type=int,
+            default=365,
+            help="At how many days before 'now' should the simulation start (default: 365)",
+        )
+        parser.add_argument(
+            "--clusters-per-shard",
+            type=int,
+            default=250,
+            help="Number of clusters simulated at once, which bounds memory use (default: 250)",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Number of processes to simulate clusters in, the result is the same for any number (default: 1)",
+        )
+        parser.add_argument(
+            "--team-id",
+            type=int,
+            default=2,
+            help="ID of the team the data belongs to, which can be overridden when loading (default: 2, as used by "
+            "ee/benchmarks)",
+        )
+
+    def handle(self, *args, **options):
+        timer = monotonic()
+        matrix_factory = partial(
+            HedgeboxMatrix,
+            now=options["now"],
+            days_past=options["days_past"],
+            days_future=0,
+            n_clusters=options["clusters_per_shard"],
+        )
+        manifest = generate_dataset(
+            matrix_factory,
+            options["directory"],
+            seed=options["seed"],
+            events=options["events"],
+            team_id=options["team_id"],
+            processes=options["processes"],
+            print_steps=True,
+        )
+        print(
+            f"Dataset written to {options['directory']} in {monotonic() - timer:.1f} s: "
+            + ", ".join(f"{rows} {table} rows" for table, rows in manifest["rows"].items())
+            + f". Load it with `./manage.py load_benchmark_dataset {options['directory']}`."
+        )
@@ -7,6 +7,7 @@ from django.core import exceptions
 from django.core.management.base import BaseCommand
 
 from posthog.demo.matrix import Matrix, MatrixManager
+from posthog.demo.matrix.sinks import ClickHouseSimDataSink, KafkaSimDataSink, ParquetSimDataSink, SimDataSink
 from posthog.demo.products.hedgebox import HedgeboxMatrix
 from posthog.models.group_type_mapping import GroupTypeMapping
 from posthog.models.team.team import Team
@@ -42,7 +43,26 @@ class Command(BaseCommand):
             default=500,
             help="Number of clusters (default: 500)",
         )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Number of processes to simulate clusters in, the result is the same for any number (default: 1)",
+        )
         parser.add_argument("--dry-run", action="store_true", help="Don't save simulation results")
+        parser.add_argument(
+            "--sink",
+            choices=["kafka", "clickhouse"],
+            default="kafka",
+            help="Whether to save analytics data via Kafka like regular ingestion, or by inserting it into ClickHouse "
+            "in bulk, which is much faster for large simulations (default: kafka)",
+        )
+        parser.add_argument(
+            "--export-parquet",
+            type=str,
+            default=None,
+            help="If specified, analytics data is only written to Parquet files in this directory, per ClickHouse table",
+        )
         parser.add_argument(
             "--team-id",
             type=int,
@@ -86,17 +106,23 @@ class Command(BaseCommand):
             else 0,
         )
         print("Running simulation...")
-        matrix.simulate()
+        matrix.simulate(processes=options["processes"])
         self.print_results(
             matrix,
             seed=seed,
             duration=monotonic() - timer,
             verbosity=options["verbosity"],
         )
-        if not options["dry_run"]:
+        if options["export_parquet"]:
+            print(f"Exporting analytics data to {options['export_parquet']}...")
+            MatrixManager(matrix, sink=ParquetSimDataSink(options["export_parquet"])).save_clickhouse_data(
+                existing_team_id or 0
+            )
+        elif not options["dry_run"]:
             email = options["email"]
             password = options["password"]
-            matrix_manager = MatrixManager(matrix, print_steps=True)
+            sink: SimDataSink = ClickHouseSimDataSink() if options["sink"] == "clickhouse" else KafkaSimDataSink()
+            matrix_manager = MatrixManager(matrix, print_steps=True, sink=sink)
             try:
                 if existing_team_id is not None:
                     if existing_team_id == 0:
@@ -0,0 +1,26 @@
+from time import monotonic
+
+from django.core.management.base import BaseCommand
+
+from posthog.demo.matrix.dataset import load_dataset
+
+
+class Command(BaseCommand):
+    help = "Load a dataset written by generate_benchmark_dataset into ClickHouse"
+
+    def add_arguments(self, parser):
+        parser.add_argument("directory", type=str, help="Directory the dataset was written to")
+        parser.add_argument(
+            "--team-id",
+            type=int,
+            default=None,
+            help="ID of the team to load the data for (default: the team the dataset was generated for)",
+        )
+
+    def handle(self, *args, **options):
+        timer = monotonic()
+        rows_loaded = load_dataset(options["directory"], team_id=options["team_id"], print_steps=True)
+        print(
+            f"Dataset loaded in {monotonic() - timer:.1f} s: "
+            + ", ".join(f"{rows} {table} rows" for table, rows in rows_loaded.items())
+        )
@@ -34,7 +34,7 @@ from posthog.cloud_utils import is_cloud
 from posthog.exceptions import generate_exception_response
 from posthog.metrics import LABEL_TEAM_ID
 from posthog.models import Action, Cohort, Dashboard, FeatureFlag, Insight, Notebook, User, Team
-from posthog.rate_limit import DecideRateThrottle
+from posthog.rate_limit import DecideRateThrottle, RedisPreallocatingStorage
 from posthog.settings import SITE_URL, DEBUG, PROJECT_SWITCHING_TOKEN_ALLOWLIST
 from posthog.user_permissions import UserPermissions
 from .auth import PersonalAPIKeyAuthentication
@@ -383,6 +383,11 @@ class ShortCircuitMiddleware:
         self.decide_throttler = DecideRateThrottle(
             replenish_rate=settings.DECIDE_BUCKET_REPLENISH_RATE,
             bucket_capacity=settings.DECIDE_BUCKET_CAPACITY,
+            storage=(
+                RedisPreallocatingStorage(allocation_size=settings.DECIDE_BUCKET_LOCAL_ALLOCATION)
+                if settings.DECIDE_BUCKET_SHARED
+                else None
+            ),
         )
 
     def __call__(self, request: HttpRequest):
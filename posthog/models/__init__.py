@@ -41,6 +41,7 @@ from .filters import Filter, RetentionFilter
 from .group import Group
 from .group_type_mapping import GroupTypeMapping
 from .hog_functions import HogFunction
+from . import hogql_schema_version  # noqa: F401 - registers the signals that invalidate compiled queries
 from .insight import Insight, InsightViewed
 from .insight_caching_state import InsightCachingState
 from .instance_setting import InstanceSetting
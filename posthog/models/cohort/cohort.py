@@ -196,6 +196,7 @@ class Cohort(models.Model):
 
     def calculate_people_ch(self, pending_version: int, *, initiating_user_id: Optional[int] = None):
         from posthog.models.cohort.util import recalculate_cohortpeople
+        from posthog.models.hogql_schema_version import bump_hogql_schema_version
         from posthog.tasks.calculate_cohort import clear_stale_cohort
 
         logger.warn(
@@ -230,6 +231,8 @@ class Cohort(models.Model):
         Cohort.objects.filter(pk=self.pk).filter(Q(version__lt=pending_version) | Q(version__isnull=True)).update(
             version=pending_version, count=count
         )
+        # Queries compiled since the save above still select the previous version's people, which are cleared below
+        bump_hogql_schema_version(self.team_id)
         self.refresh_from_db()
 
         logger.warn(
@@ -1,6 +1,6 @@
 import secrets
 from datetime import timedelta
-from typing import Optional
+from typing import IO, Optional
 
 import structlog
 from django.conf import settings
@@ -177,7 +177,28 @@ def save_content_to_exported_asset(exported_asset: ExportedAsset, content: bytes
     exported_asset.save(update_fields=["content"])
 
 
-def save_content_to_object_storage(exported_asset: ExportedAsset, content: bytes) -> None:
+def save_content_from_file(exported_asset: ExportedAsset, content: IO[bytes]) -> None:
+    """
+    Like `save_content`, but streams a (possibly disk backed) file to object storage instead of holding it in memory.
+    """
+    try:
+        if settings.OBJECT_STORAGE_ENABLED:
+            save_file_to_object_storage(exported_asset, content)
+        else:
+            save_content_to_exported_asset(exported_asset, content.read())
+    except ObjectStorageError as ose:
+        capture_exception(ose)
+        logger.error(
+            "exported_asset.object-storage-error",
+            exported_asset_id=exported_asset.id,
+            exception=ose,
+            exc_info=True,
+        )
+        content.seek(0)
+        save_content_to_exported_asset(exported_asset, content.read())
+
+
+def _object_storage_path(exported_asset: ExportedAsset) -> str:
     path_parts: list[str] = [
         settings.OBJECT_STORAGE_EXPORTS_FOLDER,
         exported_asset.export_format.split("/")[1],
@@ -185,7 +206,18 @@ def save_content_to_object_storage(exported_asset: ExportedAsset, content: bytes
         f"task-{exported_asset.id}",
         str(UUIDT()),
     ]
-    object_path = "/".join(path_parts)
+    return "/".join(path_parts)
+
+
+def save_content_to_object_storage(exported_asset: ExportedAsset, content: bytes) -> None:
+    object_path = _object_storage_path(exported_asset)
     object_storage.write(object_path, content)
     exported_asset.content_location = object_path
     exported_asset.save(update_fields=["content_location"])
+
+
+def save_file_to_object_storage(exported_asset: ExportedAsset, content: IO[bytes]) -> None:
+    object_path = _object_storage_path(exported_asset)
+    object_storage.write_stream(object_path, content)
+    exported_asset.content_location = object_path
+    exported_asset.save(update_fields=["content_location"])
@@ -4,6 +4,7 @@ from .mixins.common import (
     BreakdownValueMixin,
     ClientQueryIdMixin,
     CompareMixin,
+    CursorMixin,
     DateMixin,
     DisplayDerivedMixin,
     DistinctIdMixin,
@@ -86,6 +87,7 @@ class Filter(
     DistinctIdMixin,
     EmailMixin,
     UpdatedAfterMixin,
+    CursorMixin,
     ClientQueryIdMixin,
     SampleMixin,
     BaseFilter,
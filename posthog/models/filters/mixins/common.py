@@ -629,6 +629,17 @@ class UpdatedAfterMixin(BaseParamMixin):
         return updated_after
 
 
+class CursorMixin(BaseParamMixin):
+    """
+    Cursor to continue paginating from, as returned in the next page's URL. Only used for person endpoint
+    """
+
+    @cached_property
+    def cursor(self) -> Optional[str]:
+        cursor = self._data.get("cursor", None)
+        return cursor
+
+
 class SampleMixin(BaseParamMixin):
     """
     Sample factor for a query.
@@ -0,0 +1,47 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+from posthog.models.action.action import Action
+from posthog.models.cohort.cohort import Cohort
+from posthog.models.event_definition import EventDefinition
+from posthog.models.group_type_mapping import GroupTypeMapping
+from posthog.models.property_definition import PropertyDefinition
+from posthog.models.signals import mutable_receiver
+from posthog.models.team.team import Team
+from posthog.warehouse.models import DataWarehouseJoin, DataWarehouseSavedQuery, DataWarehouseTable
+
+# A per team counter that changes whenever something that HogQL queries are compiled against changes: the tables,
+# views and joins of the database, property and event definitions, group types, actions or cohorts. Caches of
+# compiled queries include it in their keys, so that they never serve SQL that was compiled against an older schema.
+HOGQL_SCHEMA_VERSION_CACHE_KEY = "@posthog/hogql/schema_version/{team_id}"
+
+
+def get_hogql_schema_version(team_id: int) -> int:
+    return cache.get(HOGQL_SCHEMA_VERSION_CACHE_KEY.format(team_id=team_id), 0)
+
+
+def bump_hogql_schema_version(team_id: int) -> None:
+    key = HOGQL_SCHEMA_VERSION_CACHE_KEY.format(team_id=team_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The key doesn't exist yet (or was evicted), any value other than the previous one will do
+        cache.set(key, 1, timeout=None)
+
+
+@mutable_receiver([post_save, post_delete], sender=Team)
+def team_schema_changed(sender, instance: Team, **kwargs):
+    bump_hogql_schema_version(instance.pk)
+
+
+@mutable_receiver([post_save, post_delete], sender=Action)
+@mutable_receiver([post_save, post_delete], sender=Cohort)
+@mutable_receiver([post_save, post_delete], sender=GroupTypeMapping)
+@mutable_receiver([post_save, post_delete], sender=DataWarehouseTable)
+@mutable_receiver([post_save, post_delete], sender=DataWarehouseSavedQuery)
+@mutable_receiver([post_save, post_delete], sender=DataWarehouseJoin)
+@mutable_receiver([post_save, post_delete], sender=PropertyDefinition)
+@mutable_receiver([post_save, post_delete], sender=EventDefinition)
+def team_model_schema_changed(sender, instance, **kwargs):
+    # Subclasses are sent as their own class, so the EE definition models connect their own receivers
+    bump_hogql_schema_version(instance.team_id)
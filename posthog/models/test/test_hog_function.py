@@ -1,7 +1,10 @@
 import json
+from unittest.mock import patch
+
 from django.test import TestCase
 from inline_snapshot import snapshot
 
+from posthog.hogql.bytecode import create_bytecode
 from posthog.models.action.action import Action
 from posthog.models.hog_functions.hog_function import HogFunction
 from posthog.models.user import User
@@ -281,3 +284,47 @@ class TestHogFunctionsBackgroundReloading(TestCase, QueryMatchingTest):
             '["_h", 32, "$pageview", 32, "event", 1, 1, 11, 30, 32, "test", 32, "$pageview", 32, "properties", 1, 2, 2, "toString", 1, 2, "match", 2, 2, "ifNull", 2, 30, 32, "^(localhost|127\\\\.0\\\\.0\\\\.1)($|:)", 32, "$host", 32, "properties", 1, 2, 2, "toString", 1, 2, "match", 2, 2, "ifNull", 2, 3, 3, 4, 1]'
         )
         assert json.dumps(hog_function_3.filters["bytecode"]) == snapshot('["_h", 29]')
+
+    def test_hog_functions_not_reloaded_when_team_save_does_not_change_bytecode(self):
+        self.team.test_account_filters = [
+            {"key": "$host", "operator": "regex", "value": "^(localhost|127\\.0\\.0\\.1)($|:)"},
+        ]
+        self.team.save()
+        hog_function = HogFunction.objects.create(
+            name="func 1",
+            team=self.team,
+            filters={"filter_test_accounts": True},
+        )
+        bytecode = json.dumps(hog_function.filters["bytecode"])
+
+        self.team.name = "New name"
+        # 1 update team, 1 load hog functions
+        with (
+            self.assertNumQueries(2),
+            patch("posthog.tasks.hog_functions.reload_hog_functions_on_workers") as mock_reload,
+        ):
+            self.team.save()
+
+        mock_reload.assert_not_called()
+        hog_function.refresh_from_db()
+        assert json.dumps(hog_function.filters["bytecode"]) == bytecode
+
+    def test_hog_functions_with_identical_filters_compiled_once(self):
+        filters = {
+            "filter_test_accounts": True,
+            "actions": [{"id": str(self.action.id), "name": "Test Action", "type": "actions", "order": 1}],
+        }
+        hog_functions = [
+            HogFunction.objects.create(name=f"func {i}", team=self.team, filters=dict(filters)) for i in range(3)
+        ]
+        expected_bytecode = json.dumps(hog_functions[0].filters["bytecode"])
+
+        self.team.test_account_filters = [{"key": "$host", "operator": "exact", "value": "localhost"}]
+        with patch("posthog.cdp.filters.create_bytecode", wraps=create_bytecode) as mock_create_bytecode:
+            self.team.save()
+
+        assert mock_create_bytecode.call_count == 1
+        for hog_function in hog_functions:
+            hog_function.refresh_from_db()
+            assert json.dumps(hog_function.filters["bytecode"]) != expected_bytecode
+            assert hog_function.filters["bytecode"] == hog_functions[0].filters["bytecode"]
@@ -0,0 +1,106 @@
+import math
+from collections.abc import Sequence
+from typing import Literal, Optional, TypedDict
+
+import numpy as np
+
+# numpy has no erfc, and scipy isn't one of our dependencies
+_erfc = np.vectorize(math.erfc, otypes=[float])
+
+
+class EventOddsRatio(TypedDict):
+    event: str
+
+    success_count: int
+    failure_count: int
+
+    odds_ratio: float
+    correlation_type: Literal["success", "failure"]
+
+
+def get_top_odds_ratios(
+    events: Sequence[str],
+    success_counts: Sequence[int],
+    failure_counts: Sequence[int],
+    success_total: int,
+    failure_total: int,
+    *,
+    prior_count: int,
+    min_person_count: int,
+    min_person_percentage: float,
+    limit: int = 10,
+    max_false_discovery_rate: Optional[float] = None,
+) -> list[EventOddsRatio]:
+    """
+    Returns the `limit` events most positively correlated with success, most first, followed by the `limit` most
+    negatively correlated, most first, out of the events visited by enough people.
+
+    `success_counts` and `failure_counts` are how many successful and failed people visited each of `events`, and
+    the odds ratios of all events are computed at once, so that correlating properties with tens of thousands of
+    values doesn't take a Python loop per value.
+
+    With `max_false_discovery_rate`, events are also dropped unless their odds ratio is significantly different
+    from 1, correcting for testing many events at once with the Benjamini-Hochberg procedure.
+    """
+    visited_success = np.asarray(success_counts, dtype=np.int64)
+    visited_failure = np.asarray(failure_counts, dtype=np.int64)
+
+    visited = visited_success + visited_failure
+    included = visited >= min(min_person_count, min_person_percentage * (success_total + failure_total))
+
+    # Add the prior to all values to prevent divide by zero errors, and introduce a [prior](https://en.wikipedia.org/wiki/Prior_probability)
+    success_visited = visited_success + prior_count
+    success_not_visited = success_total - visited_success + prior_count
+    failure_visited = visited_failure + prior_count
+    failure_not_visited = failure_total - visited_failure + prior_count
+    odds_ratios = (success_visited * failure_not_visited) / (success_not_visited * failure_visited)
+
+    if max_false_discovery_rate is not None:
+        included &= _are_odds_ratios_significant(
+            odds_ratios,
+            (success_visited, success_not_visited, failure_visited, failure_not_visited),
+            included,
+            max_false_discovery_rate,
+        )
+
+    # Stable sorts, so that events with the same odds ratio keep the order they were queried in
+    (positive,) = np.nonzero(included & (odds_ratios > 1))
+    positive = positive[np.argsort(-odds_ratios[positive], kind="stable")[:limit]]
+    (negative,) = np.nonzero(included & (odds_ratios <= 1))
+    negative = negative[np.argsort(odds_ratios[negative], kind="stable")[:limit]]
+
+    return [
+        EventOddsRatio(
+            event=events[index],
+            success_count=int(visited_success[index]),
+            failure_count=int(visited_failure[index]),
+            odds_ratio=float(odds_ratios[index]),
+            correlation_type="success" if correlation_type_is_success else "failure",
+        )
+        for indexes, correlation_type_is_success in ((positive, True), (negative, False))
+        for index in indexes.tolist()
+    ]
+
+
+def _are_odds_ratios_significant(
+    odds_ratios: np.ndarray,
+    cells: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    tested: np.ndarray,
+    max_false_discovery_rate: float,
+) -> np.ndarray:
+    # Two-sided p-values of the log odds ratios, which are about normally distributed with this standard error
+    standard_errors = np.sqrt(sum(1 / cell for cell in cells))
+    p_values = _erfc(np.abs(np.log(odds_ratios)) / standard_errors / np.sqrt(2))
+
+    # Benjamini-Hochberg: of the m tested events, the k with the smallest p-values are discoveries, where k is the
+    # largest rank with p-value <= k / m * max_false_discovery_rate
+    significant = np.zeros(len(odds_ratios), dtype=bool)
+    (tested_indexes,) = np.nonzero(tested)
+    if not len(tested_indexes):
+        return significant
+    ranked = tested_indexes[np.argsort(p_values[tested_indexes], kind="stable")]
+    thresholds = np.arange(1, len(ranked) + 1) / len(ranked) * max_false_discovery_rate
+    (below_threshold,) = np.nonzero(p_values[ranked] <= thresholds)
+    if len(below_threshold):
+        significant[ranked[: below_threshold[-1] + 1]] = True
+    return significant
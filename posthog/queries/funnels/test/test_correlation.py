@@ -0,0 +1,119 @@
+import random
+import unittest
+
+from posthog.hogql_queries.insights.funnels.funnel_correlation_query_runner import FunnelCorrelationQueryRunner
+from posthog.queries.funnels.correlation import EventOddsRatio, get_top_odds_ratios
+
+
+def get_event_odds_ratio(
+    event: str, success_count: int, failure_count: int, success_total: int, failure_total: int
+) -> EventOddsRatio:
+    """The odds ratio of a single event with a prior count of 1, as correlations were computed event by event."""
+    odds_ratio = ((success_count + 1) * (failure_total - failure_count + 1)) / (
+        (success_total - success_count + 1) * (failure_count + 1)
+    )
+    return EventOddsRatio(
+        event=event,
+        success_count=success_count,
+        failure_count=failure_count,
+        odds_ratio=odds_ratio,
+        correlation_type="success" if odds_ratio > 1 else "failure",
+    )
+
+
+class TestGetTopOddsRatios(unittest.TestCase):
+    def test_matches_odds_ratios_of_each_event(self):
+        rng = random.Random(0)
+        success_total, failure_total = 5_000, 20_000
+        # Few distinct counts, so that many events have the same odds ratio and ties have to be kept in order
+        events = [(f"event_{index}", rng.randint(0, 50) * 10, rng.randint(0, 50) * 10) for index in range(10_000)]
+
+        odds_ratios = [
+            get_event_odds_ratio(event, success_count, failure_count, success_total, failure_total)
+            for event, success_count, failure_count in events
+            if success_count + failure_count >= 25
+        ]
+        positive = sorted(
+            [odds_ratio for odds_ratio in odds_ratios if odds_ratio["correlation_type"] == "success"],
+            key=lambda x: x["odds_ratio"],
+            reverse=True,
+        )
+        negative = sorted(
+            [odds_ratio for odds_ratio in odds_ratios if odds_ratio["correlation_type"] == "failure"],
+            key=lambda x: x["odds_ratio"],
+        )
+
+        self.assertEqual(
+            get_top_odds_ratios(
+                [event for event, _, _ in events],
+                [success_count for _, success_count, _ in events],
+                [failure_count for _, _, failure_count in events],
+                success_total,
+                failure_total,
+                prior_count=1,
+                min_person_count=FunnelCorrelationQueryRunner.MIN_PERSON_COUNT,
+                min_person_percentage=FunnelCorrelationQueryRunner.MIN_PERSON_PERCENTAGE,
+            ),
+            positive[:10] + negative[:10],
+        )
+
+    def test_no_events(self):
+        self.assertEqual(
+            get_top_odds_ratios([], [], [], 10, 10, prior_count=1, min_person_count=25, min_person_percentage=0.02),
+            [],
+        )
+
+    def test_max_false_discovery_rate(self):
+        kwargs = {"prior_count": 1, "min_person_count": 1, "min_person_percentage": 0}
+        events = ["signed up", "watched video", "opened settings"]
+        # Visited by 900 vs 100, 65 vs 35 and 51 vs 49 of 1000 successful and 1000 failed people
+        success_counts, failure_counts = [900, 65, 51], [100, 35, 49]
+
+        all_events = get_top_odds_ratios(events, success_counts, failure_counts, 1000, 1000, **kwargs)
+        self.assertEqual([odds_ratio["event"] for odds_ratio in all_events], events)
+
+        significant_events = get_top_odds_ratios(
+            events, success_counts, failure_counts, 1000, 1000, max_false_discovery_rate=0.05, **kwargs
+        )
+        self.assertEqual([odds_ratio["event"] for odds_ratio in significant_events], ["signed up", "watched video"])
+
+        strictly_significant_events = get_top_odds_ratios(
+            events, success_counts, failure_counts, 1000, 1000, max_false_discovery_rate=0.001, **kwargs
+        )
+        self.assertEqual([odds_ratio["event"] for odds_ratio in strictly_significant_events], ["signed up"])
+
+    def test_min_person_count_and_percentage(self):
+        events = [
+            "negatively_related",
+            "positively_related",
+            "low_sig_negatively_related",
+            "low_sig_positively_related",
+        ]
+        success_counts, failure_counts = [0, 5, 0, 1], [5, 0, 2, 0]
+
+        def count_included(min_person_percentage: float, min_person_count: int) -> int:
+            return len(
+                get_top_odds_ratios(
+                    events,
+                    success_counts,
+                    failure_counts,
+                    10,
+                    10,
+                    prior_count=1,
+                    min_person_count=min_person_count,
+                    min_person_percentage=min_person_percentage,
+                )
+            )
+
+        # Discard both low_sig due to %
+        self.assertEqual(count_included(0.11, 25), 2)
+        # Discard one low_sig due to %
+        self.assertEqual(count_included(0.051, 25), 3)
+        # Discard both due to count
+        self.assertEqual(count_included(0.5, 3), 2)
+        # Discard one due to count
+        self.assertEqual(count_included(0.5, 2), 3)
+        # Discard everything due to %
+        self.assertEqual(count_included(0.5, 100), 0)
+        # Discard everything due to count
+        self.assertEqual(count_included(0.5, 6), 0)
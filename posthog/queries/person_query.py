@@ -1,6 +1,11 @@
+import base64
+import json
+from datetime import datetime, timezone
 from typing import Any, Optional, Union
 from uuid import UUID
 
+from rest_framework.exceptions import ValidationError
+
 from posthog.clickhouse.materialized_columns import ColumnName
 from posthog.constants import PropertyOperatorType
 from posthog.models import Filter
@@ -29,6 +34,25 @@ from posthog.queries.trends.util import COUNT_PER_ACTOR_MATH_FUNCTIONS
 from posthog.queries.util import PersonPropertiesMode
 
 
+def encode_person_cursor(created_at: datetime, person_id: Union[str, UUID]) -> str:
+    """Returns an opaque cursor for the persons after the given one, in the order persons are paginated in."""
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    payload = json.dumps([created_at.astimezone(timezone.utc).isoformat(), str(person_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_person_cursor(cursor: str) -> Optional[tuple[datetime, UUID]]:
+    """Returns the sort key a cursor continues after, or None for an empty cursor, which starts from the first page."""
+    if not cursor:
+        return None
+    try:
+        created_at, person_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(created_at).astimezone(timezone.utc), UUID(person_id)
+    except (ValueError, TypeError):
+        raise ValidationError("Invalid cursor.")
+
+
 class PersonQuery:
     """
     Query class responsible for joining with `person` clickhouse table
@@ -110,9 +134,11 @@ class PersonQuery:
         if paginate:
             order = "ORDER BY argMax(person.created_at, version) DESC, id DESC" if paginate else ""
             limit_offset, limit_params = self._get_limit_offset_clause()
+            cursor_prefiltering_condition, cursor_finalization_condition, cursor_params = self._get_cursor_clauses()
         else:
             order = ""
             limit_offset, limit_params = "", {}
+            cursor_prefiltering_condition, cursor_finalization_condition, cursor_params = "", "", {}
         (
             search_prefiltering_condition,
             search_finalization_condition,
@@ -152,11 +178,13 @@ class PersonQuery:
             WHERE team_id = %(team_id)s
             {prefiltering_lookup}
             {multiple_cohorts_condition}
+            {cursor_prefiltering_condition}
             GROUP BY id
             HAVING max(is_deleted) = 0
             {filter_future_persons_condition} {updated_after_condition}
             {person_filters_finalization_condition} {search_finalization_condition}
             {distinct_id_condition} {email_condition}
+            {cursor_finalization_condition}
             {order}
             {limit_offset}
             SETTINGS optimize_aggregation_in_order = 1
@@ -166,6 +194,7 @@ class PersonQuery:
                 **person_filters_params,
                 **single_cohort_params,
                 **limit_params,
+                **cursor_params,
                 **search_params,
                 **distinct_id_params,
                 **email_params,
@@ -289,12 +318,33 @@ class PersonQuery:
             clause += " LIMIT %(limit)s"
             params.update({"limit": self._filter.limit})
 
-        if self._filter.offset:
+        # With a cursor, the persons to skip are excluded by the cursor clause instead
+        if self._filter.offset and self._filter.cursor is None:
             clause += " OFFSET %(offset)s"
             params.update({"offset": self._filter.offset})
 
         return clause, params
 
+    def _get_cursor_clauses(self) -> tuple[str, str, dict]:
+        """
+        Return - respectively - the prefiltering cursor clause, which skips the rows of persons created after the
+        cursor before they are aggregated, the exact final cursor clause, and new params.
+        """
+        if not isinstance(self._filter, Filter) or not self._filter.cursor:
+            return "", "", {}
+
+        cursor = decode_person_cursor(self._filter.cursor)
+        if cursor is None:
+            return "", "", {}
+        created_at, person_id = cursor
+        # Keyset pagination: every page only needs to sort the persons after the previous page, however deep it is.
+        # Every version of a person has the same created_at, so prefiltering on it doesn't change any aggregate.
+        return (
+            "AND person.created_at <= toDateTime64(%(cursor_created_at)s, 6, 'UTC')",
+            "AND (argMax(person.created_at, version), id) < (toDateTime64(%(cursor_created_at)s, 6, 'UTC'), toUUID(%(cursor_person_id)s))",
+            {"cursor_created_at": created_at.strftime("%Y-%m-%d %H:%M:%S.%f"), "cursor_person_id": str(person_id)},
+        )
+
     def _get_search_clauses(self, prepend: str = "") -> tuple[str, str, dict]:
         """
         Return - respectively - the prefiltering search clause (not aggregated by is_deleted or version, which is great
@@ -13,7 +13,7 @@ from posthog.auth import PersonalAPIKeyAuthentication
 from posthog.metrics import LABEL_PATH, LABEL_TEAM_ID
 from posthog.models.instance_setting import get_instance_setting
 from posthog.settings.utils import get_list
-from token_bucket import Limiter, MemoryStorage
+from token_bucket import Limiter, MemoryStorage, StorageBase
 
 
 RATE_LIMIT_EXCEEDED_COUNTER = Counter(
@@ -154,6 +154,76 @@ class TeamRateThrottle(SimpleRateThrottle):
         return team_id is not None and str(team_id) in allow_list
 
 
+# Takes up to ARGV[3] tokens from the bucket at KEYS[1], replenishing it first based on the Redis clock.
+# Returns the number of tokens granted.
+ALLOCATE_TOKENS_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'timestamp')
+local tokens = tonumber(bucket[1]) or capacity
+local timestamp = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - timestamp) * rate)
+local granted = math.min(requested, math.floor(tokens))
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - granted), 'timestamp', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return granted
+"""
+
+
+class RedisPreallocatingStorage(StorageBase):
+    """
+    Token bucket storage shared across processes through Redis.
+
+    To keep Redis off the hot path, each process takes tokens from the shared bucket `allocation_size` at a time and
+    hands them out locally until they run out. A process can therefore hold on to at most `allocation_size - 1`
+    tokens that other processes can't use.
+    """
+
+    def __init__(self, allocation_size: int = 10, key_prefix: str = "@posthog/decide-rate-limit/") -> None:
+        self.allocation_size = allocation_size
+        self.key_prefix = key_prefix
+        self._local_tokens: dict[str, int] = {}
+        self._rate: float = 0
+        self._capacity: int = 0
+        self._allocate_tokens = None
+
+    def get_token_count(self, key) -> int:
+        return self._local_tokens.get(key, 0)
+
+    def replenish(self, key, rate, capacity) -> None:
+        # The shared bucket is replenished whenever tokens are allocated from it
+        self._rate = rate
+        self._capacity = capacity
+
+    def consume(self, key, num_tokens) -> bool:
+        tokens = self._local_tokens.get(key, 0)
+        if tokens < num_tokens:
+            tokens += self._allocate(key, max(num_tokens - tokens, self.allocation_size))
+
+        if tokens < num_tokens:
+            self._local_tokens[key] = tokens
+            return False
+
+        self._local_tokens[key] = tokens - num_tokens
+        return True
+
+    def _allocate(self, key: str, requested: int) -> int:
+        if self._allocate_tokens is None:
+            from posthog.redis import get_client
+
+            self._allocate_tokens = get_client().register_script(ALLOCATE_TOKENS_SCRIPT)
+
+        return int(
+            self._allocate_tokens(
+                keys=[f"{self.key_prefix}{key}"],
+                args=[self._rate, self._capacity, min(requested, self._capacity)],
+            )
+        )
+
+
 class DecideRateThrottle(BaseThrottle):
     """
     This is a custom throttle that is used to limit the number of requests to the /decide endpoint.
@@ -162,14 +232,15 @@ class DecideRateThrottle(BaseThrottle):
     This uses the token bucket algorithm to limit the number of requests to the endpoint. It's a lot
     more performant than DRF's SimpleRateThrottle, which inefficiently uses the Django cache.
 
-    However, note that this throttle is per process, and not global.
+    However, note that this throttle is per process, and not global, unless it's given a shared storage
+    like `RedisPreallocatingStorage`.
     """
 
-    def __init__(self, replenish_rate: float = 5, bucket_capacity=100) -> None:
+    def __init__(self, replenish_rate: float = 5, bucket_capacity=100, storage: Optional[StorageBase] = None) -> None:
         self.limiter = Limiter(
             rate=replenish_rate,
             capacity=bucket_capacity,
-            storage=MemoryStorage(),
+            storage=storage or MemoryStorage(),
         )
 
     @staticmethod
@@ -179,6 +250,9 @@ class DecideRateThrottle(BaseThrottle):
 
         Not all requests are valid, and might not have a token.
         Accessing it when it does not exist throws a KeyError. Hence, this method.
+
+        The decoded payload is memoized on the request by `load_data_from_request`, so the view handling the
+        request doesn't have to parse it again.
         """
         try:
             from posthog.api.utils import get_token
@@ -1302,6 +1302,9 @@ class ActorsQueryResponse(BaseModel):
     modifiers: Optional[HogQLQueryModifiers] = Field(
         default=None, description="Modifiers used when performing the query"
     )
+    nextCursor: Optional[str] = Field(
+        default=None, description="Cursor to pass in the next query to get the next page, when paginating by cursor"
+    )
     offset: int
     results: list[list]
     timings: Optional[list[QueryTiming]] = Field(
@@ -1360,6 +1363,9 @@ class CachedActorsQueryResponse(BaseModel):
     modifiers: Optional[HogQLQueryModifiers] = Field(
         default=None, description="Modifiers used when performing the query"
     )
+    nextCursor: Optional[str] = Field(
+        default=None, description="Cursor to pass in the next query to get the next page, when paginating by cursor"
+    )
     next_allowed_client_refresh: AwareDatetime
     offset: int
     query_status: Optional[QueryStatus] = Field(
@@ -1741,6 +1747,9 @@ class Response1(BaseModel):
     modifiers: Optional[HogQLQueryModifiers] = Field(
         default=None, description="Modifiers used when performing the query"
     )
+    nextCursor: Optional[str] = Field(
+        default=None, description="Cursor to pass in the next query to get the next page, when paginating by cursor"
+    )
     offset: int
     results: list[list]
     timings: Optional[list[QueryTiming]] = Field(
@@ -2209,6 +2218,9 @@ class QueryResponseAlternative3(BaseModel):
     modifiers: Optional[HogQLQueryModifiers] = Field(
         default=None, description="Modifiers used when performing the query"
     )
+    nextCursor: Optional[str] = Field(
+        default=None, description="Cursor to pass in the next query to get the next page, when paginating by cursor"
+    )
     offset: int
     results: list[list]
     timings: Optional[list[QueryTiming]] = Field(
@@ -2379,6 +2391,9 @@ class QueryResponseAlternative14(BaseModel):
     modifiers: Optional[HogQLQueryModifiers] = Field(
         default=None, description="Modifiers used when performing the query"
     )
+    nextCursor: Optional[str] = Field(
+        default=None, description="Cursor to pass in the next query to get the next page, when paginating by cursor"
+    )
     offset: int
     results: list[list]
     timings: Optional[list[QueryTiming]] = Field(
@@ -4348,6 +4363,13 @@ class ActorsQuery(BaseModel):
     model_config = ConfigDict(
         extra="forbid",
     )
+    cursor: Optional[str] = Field(
+        default=None,
+        description=(
+            "Continue from the `nextCursor` of the previous page, instead of paginating by offset. Only supported when"
+            " listing persons by creation date."
+        ),
+    )
     fixedProperties: Optional[
         list[Union[PersonPropertyFilter, CohortPropertyFilter, HogQLPropertyFilter, EmptyPropertyFilter]]
     ] = Field(
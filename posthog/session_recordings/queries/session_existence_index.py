@@ -0,0 +1,198 @@
+import hashlib
+import math
+import struct
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from time import monotonic
+from typing import Optional
+
+import pytz
+from django.conf import settings
+from django.core.cache import cache
+from prometheus_client import Counter
+
+from posthog.clickhouse.client import sync_execute
+
+SESSION_EXISTENCE_INDEX_COUNTER = Counter(
+    "session_existence_index_lookups",
+    "Lookups of sessions in the session existence index, by result.",
+    labelnames=["result"],
+)
+
+# Sessions end after 24 hours at the latest, so their events are within a day of the start encoded in their id.
+# Allow for a little clock drift before the start too.
+SESSION_MAX_DURATION = timedelta(hours=24)
+SESSION_START_TOLERANCE = timedelta(hours=1)
+# Replay events are kept for at most this long, so older days are never indexed
+MAX_RETENTION_DAYS = 370
+
+
+class SessionIdBloomFilter:
+    """
+    A Bloom filter of session ids: it may wrongly say a session id was added, at a rate of about
+    false_positive_rate, but never wrongly says it wasn't.
+    """
+
+    _header = struct.Struct(">QB")
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: Optional[bytearray] = None) -> None:
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float) -> "SessionIdBloomFilter":
+        capacity = max(capacity, 1)
+        num_bits = max(8, math.ceil(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2)))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SessionIdBloomFilter":
+        num_bits, num_hashes = cls._header.unpack_from(data)
+        return cls(num_bits, num_hashes, bytearray(data[cls._header.size :]))
+
+    def to_bytes(self) -> bytes:
+        return self._header.pack(self.num_bits, self.num_hashes) + bytes(self.bits)
+
+    def _positions(self, session_id: str) -> list[int]:
+        # Double hashing: every position is derived from the two halves of a single digest
+        first, second = struct.unpack(">QQ", hashlib.blake2b(session_id.encode(), digest_size=16).digest())
+        return [(first + i * second) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, session_id: str) -> None:
+        for position in self._positions(session_id):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, session_id: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(session_id))
+
+
+def session_start_from_id(session_id: str) -> Optional[datetime]:
+    """Returns when a session started, if its id is a UUIDv7, as generated by our SDKs."""
+    try:
+        parsed = uuid.UUID(session_id)
+    except ValueError:
+        return None
+    if parsed.version != 7:
+        return None
+    return datetime.fromtimestamp((parsed.int >> 80) / 1000, tz=pytz.UTC)
+
+
+def get_session_days(session_id: str) -> Optional[tuple[date, date]]:
+    """Returns the first and last days a session could have replay events on, if its id encodes its start time."""
+    session_start = session_start_from_id(session_id)
+    if session_start is None:
+        return None
+    return (session_start - SESSION_START_TOLERANCE).date(), (session_start + SESSION_MAX_DURATION).date()
+
+
+# Partitions are shared by all requests of the worker, and expire with the cache entries they were loaded from
+_partitions: OrderedDict[tuple[int, date], tuple[float, Optional[SessionIdBloomFilter]]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_candidate_days(team_id: int, session_id: str) -> Optional[list[date]]:
+    """
+    Returns the days on which the session could have replay events, using an index of the sessions of each team and
+    day, without querying ClickHouse once the index is built.
+
+    Returns an empty list if the session definitely has no replay events, and None if the index can't tell, e.g.
+    because the session is so recent that its days may still be ingesting, or the id doesn't encode a start time.
+    Days are only indexed once REPLAY_SESSION_EXISTENCE_INDEX_DELAY_HOURS have passed since they ended, which covers
+    the ingestion window with a margin, so that no session is ingested into a day after it's indexed.
+    """
+    if not settings.REPLAY_SESSION_EXISTENCE_INDEX_ENABLED:
+        return None
+
+    session_days = get_session_days(session_id)
+    if session_days is None:
+        SESSION_EXISTENCE_INDEX_COUNTER.labels(result="unknown").inc()
+        return None
+
+    now = datetime.now(tz=pytz.UTC)
+    first_day, last_day = session_days
+    indexed_until = (now - timedelta(hours=settings.REPLAY_SESSION_EXISTENCE_INDEX_DELAY_HOURS)).date()
+    if last_day >= indexed_until or first_day < (now - timedelta(days=MAX_RETENTION_DAYS)).date():
+        SESSION_EXISTENCE_INDEX_COUNTER.labels(result="unknown").inc()
+        return None
+
+    candidate_days = []
+    day = first_day
+    while day <= last_day:
+        partition = _get_partition(team_id, day)
+        if partition is None:
+            SESSION_EXISTENCE_INDEX_COUNTER.labels(result="unknown").inc()
+            return None
+        if session_id in partition:
+            candidate_days.append(day)
+        day += timedelta(days=1)
+
+    SESSION_EXISTENCE_INDEX_COUNTER.labels(result="maybe" if candidate_days else "absent").inc()
+    return candidate_days
+
+
+def clear_session_existence_index() -> None:
+    with _lock:
+        _partitions.clear()
+
+
+def _get_partition(team_id: int, day: date) -> Optional[SessionIdBloomFilter]:
+    """Returns the filter of the sessions of the team on the day, or None if the day has too many to index."""
+    with _lock:
+        entry = _partitions.get((team_id, day))
+        if entry is not None and monotonic() < entry[0]:
+            _partitions.move_to_end((team_id, day))
+            return entry[1]
+
+    cache_key = f"session_existence_index_team_{team_id}_day_{day.isoformat()}"
+    cached = cache.get(cache_key)
+    if isinstance(cached, bytes):
+        partition = SessionIdBloomFilter.from_bytes(cached) if cached else None
+    else:
+        partition = _build_partition(team_id, day)
+        # An empty value records that the day has too many sessions to be indexed
+        cache.set(
+            cache_key,
+            partition.to_bytes() if partition is not None else b"",
+            timeout=settings.REPLAY_SESSION_EXISTENCE_INDEX_TTL_SECONDS,
+        )
+
+    with _lock:
+        _partitions[(team_id, day)] = (monotonic() + settings.REPLAY_SESSION_EXISTENCE_INDEX_TTL_SECONDS, partition)
+        _partitions.move_to_end((team_id, day))
+        while len(_partitions) > settings.REPLAY_SESSION_EXISTENCE_INDEX_PARTITIONS:
+            _partitions.popitem(last=False)
+    return partition
+
+
+def _build_partition(team_id: int, day: date) -> Optional[SessionIdBloomFilter]:
+    max_sessions = settings.REPLAY_SESSION_EXISTENCE_INDEX_MAX_SESSIONS_PER_DAY
+    start = datetime.combine(day, datetime.min.time(), tzinfo=pytz.UTC)
+    rows = sync_execute(
+        """
+        SELECT DISTINCT session_id
+        FROM session_replay_events
+        PREWHERE team_id = %(team_id)s
+        AND min_first_timestamp >= %(start)s
+        AND min_first_timestamp < %(end)s
+        LIMIT %(limit)s
+        """,
+        {
+            "team_id": team_id,
+            "start": start,
+            "end": start + timedelta(days=1),
+            "limit": max_sessions + 1,
+        },
+    )
+    if len(rows) > max_sessions:
+        return None
+
+    partition = SessionIdBloomFilter.for_capacity(
+        len(rows), settings.REPLAY_SESSION_EXISTENCE_INDEX_FALSE_POSITIVE_RATE
+    )
+    for (session_id,) in rows:
+        partition.add(session_id)
+    return partition
@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Optional
 
 import pytz
@@ -15,6 +15,7 @@ from posthog.models.team import Team
 from posthog.session_recordings.models.metadata import (
     RecordingMetadata,
 )
+from posthog.session_recordings.queries.session_existence_index import get_candidate_days
 
 
 def seconds_until_midnight():
@@ -31,10 +32,17 @@ class SessionReplayEvents:
         if isinstance(cached_response, bool):
             return cached_response
 
-        # Once we know that session exists we don't need to check again (until the end of the day since TTL might apply)
-        existence = self._check_exists_within_days(ttl_days(team), session_id, team) or self._check_exists_within_days(
-            370, session_id, team
-        )
+        candidate_days = get_candidate_days(team.pk, session_id)
+        if candidate_days is None:
+            # Once we know that session exists we don't need to check again (until the end of the day since TTL might apply)
+            existence = self._check_exists_within_days(ttl_days(team), session_id, team)
+            existence = existence or self._check_exists_within_days(370, session_id, team)
+        elif not candidate_days:
+            # Days are only indexed once they're past the ingestion window, so the index has all of their sessions
+            return False
+        else:
+            # The filters can have false positives, so ClickHouse only confirms the session on the days they match
+            existence = self._check_exists_on_days(min(candidate_days), max(candidate_days), session_id, team)
 
         if existence:
             # let's be cautious and not cache non-existence
@@ -62,6 +70,26 @@ class SessionReplayEvents:
         )
         return result[0][0] > 0
 
+    @staticmethod
+    def _check_exists_on_days(first_day: date, last_day: date, session_id: str, team: Team) -> bool:
+        result = sync_execute(
+            """
+            SELECT count()
+            FROM session_replay_events
+            PREWHERE team_id = %(team_id)s
+            AND session_id = %(session_id)s
+            AND min_first_timestamp >= %(start)s
+            AND min_first_timestamp < %(end)s
+            """,
+            {
+                "team_id": team.pk,
+                "session_id": session_id,
+                "start": datetime.combine(first_day, datetime.min.time(), tzinfo=pytz.UTC),
+                "end": datetime.combine(last_day + timedelta(days=1), datetime.min.time(), tzinfo=pytz.UTC),
+            },
+        )
+        return result[0][0] > 0
+
     def get_metadata(
         self,
         session_id: str,
@@ -1,4 +1,10 @@
+import uuid
+from datetime import datetime
+
+from django.test import override_settings
+
 from posthog.models import Team
+from posthog.session_recordings.queries.session_existence_index import SessionIdBloomFilter
 from posthog.session_recordings.queries.session_replay_events import SessionReplayEvents
 from posthog.session_recordings.queries.test.session_replay_sql import (
     produce_replay_summary,
@@ -71,3 +77,98 @@ class SessionReplayEventsQueries(ClickhouseTestMixin, APIBaseTest):
             recording_start_time=self.base_time + relativedelta(days=2),
         )
         assert metadata is None
+
+
+def uuid7_at(timestamp: datetime) -> str:
+    # The first 48 bits are the milliseconds since the epoch, then the version and random bits
+    random_bits = uuid.uuid4().int & ((1 << 80) - 1)
+    value = (int(timestamp.timestamp() * 1000) << 80) | random_bits
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+    return str(uuid.UUID(int=value))
+
+
+@override_settings(REPLAY_SESSION_EXISTENCE_INDEX_ENABLED=True)
+class SessionReplayEventsExistenceIndex(ClickhouseTestMixin, APIBaseTest):
+    def setUp(self):
+        super().setUp()
+        self.base_time = (now() - relativedelta(days=5)).replace(microsecond=0)
+        self.session_id = uuid7_at(self.base_time)
+        produce_replay_summary(
+            session_id=self.session_id,
+            team_id=self.team.pk,
+            first_timestamp=self.base_time.isoformat(),
+            last_timestamp=(self.base_time + relativedelta(minutes=5)).isoformat(),
+            distinct_id="u1",
+        )
+
+    def test_exists(self) -> None:
+        assert SessionReplayEvents().exists(session_id=self.session_id, team=self.team)
+
+    def test_does_not_exist_without_querying_the_session(self) -> None:
+        # Builds the index of the days the session could be on
+        assert not SessionReplayEvents().exists(session_id=uuid7_at(self.base_time), team=self.team)
+
+        with self.capture_select_queries() as queries:
+            assert not SessionReplayEvents().exists(
+                session_id=uuid7_at(self.base_time + relativedelta(minutes=10)), team=self.team
+            )
+        assert queries == []
+
+    @override_settings(REPLAY_SESSION_EXISTENCE_INDEX_DELAY_HOURS=24 * 5)
+    def test_days_within_the_ingestion_window_are_not_indexed(self) -> None:
+        session_id = uuid7_at(self.base_time + relativedelta(minutes=10))
+        assert not SessionReplayEvents().exists(session_id=session_id, team=self.team)
+
+        # Ingested late, but still within the window
+        produce_replay_summary(
+            session_id=session_id,
+            team_id=self.team.pk,
+            first_timestamp=(self.base_time + relativedelta(minutes=10)).isoformat(),
+            last_timestamp=(self.base_time + relativedelta(minutes=15)).isoformat(),
+            distinct_id="u1",
+        )
+        assert SessionReplayEvents().exists(session_id=session_id, team=self.team)
+
+    def test_does_not_leak_between_teams(self) -> None:
+        another_team = Team.objects.create(organization=self.organization, name="Another Team")
+        assert not SessionReplayEvents().exists(session_id=self.session_id, team=another_team)
+
+    def test_recent_sessions_are_not_indexed(self) -> None:
+        recent_time = now().replace(microsecond=0)
+        session_id = uuid7_at(recent_time)
+        produce_replay_summary(
+            session_id=session_id,
+            team_id=self.team.pk,
+            first_timestamp=recent_time.isoformat(),
+            last_timestamp=recent_time.isoformat(),
+            distinct_id="u1",
+        )
+        assert SessionReplayEvents().exists(session_id=session_id, team=self.team)
+
+    def test_falls_back_for_session_ids_without_a_start_time(self) -> None:
+        produce_replay_summary(
+            session_id="not a uuid",
+            team_id=self.team.pk,
+            first_timestamp=self.base_time.isoformat(),
+            last_timestamp=self.base_time.isoformat(),
+            distinct_id="u1",
+        )
+        assert SessionReplayEvents().exists(session_id="not a uuid", team=self.team)
+
+    @override_settings(REPLAY_SESSION_EXISTENCE_INDEX_MAX_SESSIONS_PER_DAY=0)
+    def test_falls_back_when_days_have_too_many_sessions(self) -> None:
+        assert SessionReplayEvents().exists(session_id=self.session_id, team=self.team)
+        assert not SessionReplayEvents().exists(session_id=uuid7_at(self.base_time), team=self.team)
+
+
+def test_session_id_bloom_filter() -> None:
+    session_ids = [str(uuid.uuid4()) for _ in range(1000)]
+    bloom_filter = SessionIdBloomFilter.for_capacity(len(session_ids), 0.01)
+    for session_id in session_ids:
+        bloom_filter.add(session_id)
+
+    restored = SessionIdBloomFilter.from_bytes(bloom_filter.to_bytes())
+    assert all(session_id in restored for session_id in session_ids)
+    false_positives = sum(str(uuid.uuid4()) in restored for _ in range(10000))
+    assert false_positives < 300
@@ -13,7 +13,7 @@ import posthoganalytics
 import requests
 from django.contrib.auth.models import AnonymousUser
 from django.core.cache import cache
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from drf_spectacular.utils import extend_schema
 from loginas.utils import is_impersonated_session
 from rest_framework import exceptions, request, serializers, viewsets
@@ -56,6 +56,7 @@ from posthog.session_recordings.realtime_snapshots import get_realtime_snapshots
 from ee.session_recordings.session_summary.summarize_session import summarize_recording
 from ee.session_recordings.ai.similar_recordings import similar_recordings
 from ee.session_recordings.ai.error_clustering import error_clustering
+from posthog.session_recordings.snapshots.blobs import blob_key_time_range, list_blob_keys, stream_blobs
 from posthog.session_recordings.snapshots.convert_legacy_snapshots import convert_original_version_lts_recording
 from posthog.storage import object_storage
 from prometheus_client import Counter
@@ -408,7 +409,8 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet):
         if recording.object_storage_path:
             if recording.storage_version == "2023-08-01":
                 blob_prefix = recording.object_storage_path
-                blob_keys = object_storage.list_objects(cast(str, blob_prefix))
+                # LTS recordings are copied once the recording is complete, so their blobs never change
+                blob_keys = list_blob_keys(cast(str, blob_prefix), immutable=True)
             else:
                 # originally LTS files were in a single file
                 # TODO this branch can be deleted after 01-08-2024
@@ -423,14 +425,13 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet):
                 might_have_realtime = False
         else:
             blob_prefix = recording.build_blob_ingestion_storage_path()
-            blob_keys = object_storage.list_objects(blob_prefix)
+            blob_keys = list_blob_keys(blob_prefix)
 
         if blob_keys:
             for full_key in blob_keys:
                 # Keys are like 1619712000-1619712060
                 blob_key = full_key.replace(blob_prefix.rstrip("/") + "/", "")
-                blob_key_base = blob_key.split(".")[0]  # Remove the extension if it exists
-                time_range = [datetime.fromtimestamp(int(x) / 1000, tz=timezone.utc) for x in blob_key_base.split("-")]
+                time_range = blob_key_time_range(blob_key)
 
                 sources.append(
                     {
@@ -609,7 +610,10 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet):
 
     def _stream_blob_to_client(
         self, recording: SessionRecording, request: request.Request, event_properties: dict
-    ) -> HttpResponse:
+    ) -> HttpResponse | StreamingHttpResponse:
+        if request.GET.get("blob_keys"):
+            return self._stream_blobs_to_client(recording, request, event_properties)
+
         blob_key = request.GET.get("blob_key", "")
         self._validate_blob_key(blob_key)
 
@@ -674,6 +678,50 @@ class SessionRecordingViewSet(TeamAndOrgViewSetMixin, viewsets.GenericViewSet):
 
                 return response
 
+    def _stream_blobs_to_client(
+        self, recording: SessionRecording, request: request.Request, event_properties: dict
+    ) -> StreamingHttpResponse:
+        """
+        Streams several consecutive blobs back as a single JSONL response, reading them from object storage
+        concurrently, so that clients loading a long recording don't wait on one blob request after another.
+        """
+        blob_keys = request.GET["blob_keys"].split(",")
+        if len(blob_keys) > settings.REPLAY_SNAPSHOT_MAX_BLOB_KEYS:
+            raise exceptions.ValidationError(
+                f"Can load at most {settings.REPLAY_SNAPSHOT_MAX_BLOB_KEYS} blob keys at once"
+            )
+        for blob_key in blob_keys:
+            self._validate_blob_key(blob_key)
+
+        if recording.object_storage_path:
+            if recording.storage_version != "2023-08-01":
+                raise exceptions.ValidationError("Legacy recordings must be loaded one blob_key at a time")
+            blob_prefix = recording.object_storage_path
+        else:
+            blob_prefix = recording.build_blob_ingestion_storage_path()
+
+        try:
+            content = stream_blobs(
+                [f"{blob_prefix}/{blob_key}" for blob_key in blob_keys],
+                max_concurrency=settings.REPLAY_SNAPSHOT_BLOB_FETCH_CONCURRENCY,
+            )
+        except object_storage.ObjectStorageError:
+            raise exceptions.NotFound("Snapshot file not found")
+
+        event_properties["source"] = "blob"
+        event_properties["blob_keys"] = blob_keys
+        posthoganalytics.capture(
+            self._distinct_id_from_request(request),
+            "session recording snapshots v2 loaded",
+            event_properties,
+        )
+
+        response = StreamingHttpResponse(streaming_content=content, content_type="application/json")
+        # blobs are immutable, see _stream_blob_to_client
+        response["Cache-Control"] = "max-age=3600"
+        response["Content-Disposition"] = "inline"
+        return response
+
     def _send_realtime_snapshots_to_client(
         self, recording: SessionRecording, request: request.Request, event_properties: dict
     ) -> HttpResponse | Response:
@@ -93,6 +93,19 @@ EVENT_SUMMARY_DATA_INCLUSIONS = [
 Event = dict[str, Any]
 
 
+class SerializedSnapshotItems(list):
+    """
+    Snapshot items along with their JSON, which is measured to split events by size anyway, so that
+    `event_to_json` can reuse it rather than serializing the items a second time on their way to Kafka.
+    """
+
+    json: str
+
+    def __init__(self, items: list[dict], serialized_items: list[str]) -> None:
+        super().__init__(items)
+        self.json = f"[{', '.join(serialized_items)}]"
+
+
 def split_replay_events(events: list[Event]) -> tuple[list[Event], list[Event]]:
     replay, other = [], []
 
@@ -117,7 +130,8 @@ def preprocess_replay_events(
        If one message has this property, they all do (thanks to batching).
     2. If this property isn't set, we estimate the size (json.dumps) and if it is small enough - merge it all together in one event
     3. If not, we split out the "full snapshots" from the rest (they are typically bigger) and send them individually,
-            trying one more time to group the rest, otherwise sending them individually
+            grouping the rest into as few events as fit
+    Items are serialized once to measure them, and `event_to_json` reuses that to send the events in 2. and 3.
     """
 
     if isinstance(_events, Generator):
@@ -176,36 +190,75 @@ def preprocess_replay_events(
         EVENTS_RECEIVED_WITHOUT_BYTES_COUNTER.labels(resource_type="recordings").inc()
 
         snapshot_data_list = list(flatten([event["properties"]["$snapshot_data"] for event in events], max_depth=1))
+        # Each item is serialized once, both to measure it and to send it
+        serialized_data_list = [json.dumps(snapshot_data) for snapshot_data in snapshot_data_list]
 
         # 2. Otherwise, try and group all the events if they are small enough
-        if byte_size_dict(snapshot_data_list) < size_with_headroom:
-            event = new_event(snapshot_data_list)
-            yield event
+        if _serialized_list_size(serialized_data_list) < size_with_headroom:
+            yield new_event(SerializedSnapshotItems(snapshot_data_list, serialized_data_list))
         else:
             # 3. If not, split out the full snapshots from the rest
-            full_snapshots = []
             other_snapshots = []
+            other_serialized_snapshots = []
 
-            for snapshot_data in snapshot_data_list:
+            for snapshot_data, serialized_data in zip(snapshot_data_list, serialized_data_list):
                 if snapshot_data["type"] == RRWEB_MAP_EVENT_TYPE.FullSnapshot:
-                    full_snapshots.append(snapshot_data)
+                    # Send the full snapshots individually
+                    yield new_event(SerializedSnapshotItems([snapshot_data], [serialized_data]))
                 else:
                     other_snapshots.append(snapshot_data)
+                    other_serialized_snapshots.append(serialized_data)
+
+            # Group the rest into as few events as fit
+            for items, serialized_items in _chunk_serialized_items(
+                other_snapshots, other_serialized_snapshots, size_with_headroom
+            ):
+                yield new_event(SerializedSnapshotItems(items, serialized_items))
+
+
+def _serialized_list_size(serialized_items: list[str]) -> int:
+    # The size of the JSON of a list of the items: brackets, and a comma and a space between items
+    return sum(len(serialized_item) for serialized_item in serialized_items) + 2 * max(len(serialized_items), 1)
+
+
+def _chunk_serialized_items(
+    items: list[dict], serialized_items: list[str], max_size: float
+) -> Generator[tuple[list[dict], list[str]], None, None]:
+    """Splits items into consecutive chunks whose JSON is smaller than max_size, or of one item if that's too big."""
+    chunk: list[dict] = []
+    serialized_chunk: list[str] = []
+    chunk_size = 2
+    for item, serialized_item in zip(items, serialized_items):
+        additional_size = len(serialized_item) + (2 if chunk else 0)
+        if chunk and chunk_size + additional_size >= max_size:
+            yield chunk, serialized_chunk
+            chunk, serialized_chunk, chunk_size = [], [], 2
+            additional_size = len(serialized_item)
+        chunk.append(item)
+        serialized_chunk.append(serialized_item)
+        chunk_size += additional_size
+    if chunk:
+        yield chunk, serialized_chunk
+
+
+def event_to_json(event: Event) -> str:
+    """
+    Serializes an event like `json.dumps`, but reusing the JSON of its snapshot items if it was already serialized
+    while splitting them by size. Keys may be in a different order.
+    """
+    properties = event.get("properties")
+    snapshot_items = properties.get("$snapshot_items") if isinstance(properties, dict) else None
+    if not isinstance(snapshot_items, SerializedSnapshotItems):
+        return json.dumps(event)
+
+    return _dumps_with_last_value(
+        event, "properties", _dumps_with_last_value(properties, "$snapshot_items", snapshot_items.json)
+    )
 
-            # Send the full snapshots individually
-            for snapshot_data in full_snapshots:
-                event = new_event([snapshot_data])
-                yield event
 
-            # Try and group the rest
-            if byte_size_dict(other_snapshots) < size_with_headroom:
-                event = new_event(other_snapshots)
-                yield event
-            else:
-                # If not, send them individually
-                for snapshot_data in other_snapshots:
-                    event = new_event([snapshot_data])
-                    yield event
+def _dumps_with_last_value(obj: dict, key: str, serialized_value: str) -> str:
+    rest = json.dumps({k: v for k, v in obj.items() if k != key})
+    return f"{rest[:-1]}{', ' if len(rest) > 2 else ''}{json.dumps(key)}: {serialized_value}}}"
 
 
 def _process_windowed_events(
@@ -273,7 +326,3 @@ def parse_snapshot_timestamp(timestamp: int):
 
 def convert_to_timestamp(source: str) -> int:
     return int(parse(source).timestamp() * 1000)
-
-
-def byte_size_dict(x: dict | list) -> int:
-    return len(json.dumps(x))
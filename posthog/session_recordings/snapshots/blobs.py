@@ -0,0 +1,103 @@
+import gzip
+import hashlib
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from prometheus_client import Counter
+
+from posthog.storage import object_storage
+
+BLOB_KEYS_CACHE_COUNTER = Counter(
+    "session_snapshots_blob_keys_cache",
+    "Lookups of the blob keys of a recording in the cache, by result.",
+    labelnames=["result"],
+)
+
+# Sessions last at most 24 hours, and the blob ingester flushes what it has buffered within the hour after,
+# so no more blobs are written for a session that started before then
+BLOB_INGESTION_WINDOW = timedelta(hours=25)
+
+
+def blob_key_time_range(blob_key: str) -> list[datetime]:
+    # Keys are like 1619712000-1619712060, possibly with an extension
+    blob_key_base = blob_key.split(".")[0]
+    return [datetime.fromtimestamp(int(x) / 1000, tz=timezone.utc) for x in blob_key_base.split("-")]
+
+
+def list_blob_keys(blob_prefix: str, immutable: bool = False) -> Optional[list[str]]:
+    """
+    Lists the blobs of a recording, caching the listing once no more blobs can be written under the prefix: when the
+    caller knows it is immutable (e.g. LTS storage) or when the recording started before the ingestion window.
+    """
+    cache_key = f"session_recording_blob_keys_{hashlib.sha256(blob_prefix.encode()).hexdigest()}"
+    cached = cache.get(cache_key)
+    if cached is not None:
+        BLOB_KEYS_CACHE_COUNTER.labels(result="hit").inc()
+        return cached
+
+    BLOB_KEYS_CACHE_COUNTER.labels(result="miss").inc()
+    blob_keys = object_storage.list_objects(blob_prefix)
+    # Listing failures and recordings without blobs yet return None, neither of which is worth caching
+    if not blob_keys:
+        return blob_keys
+
+    if not immutable:
+        oldest_start = min(
+            blob_key_time_range(full_key.replace(blob_prefix.rstrip("/") + "/", ""))[0] for full_key in blob_keys
+        )
+        immutable = oldest_start + BLOB_INGESTION_WINDOW < datetime.now(timezone.utc)
+
+    if immutable:
+        cache.set(cache_key, blob_keys, timeout=settings.REPLAY_SNAPSHOT_BLOB_KEYS_CACHE_TTL_SECONDS)
+    return blob_keys
+
+
+def _read_blob(file_key: str) -> bytes:
+    content = object_storage.read_bytes(file_key) or b""
+    # The blob ingester writes gzipped JSONL, which we unzip so that the parts can be concatenated
+    if content[:2] == b"\x1f\x8b":
+        content = gzip.decompress(content)
+    if content and not content.endswith(b"\n"):
+        content += b"\n"
+    return content
+
+
+def stream_blobs(file_keys: list[str], max_concurrency: int) -> Iterator[bytes]:
+    """
+    Yields the contents of the blobs in order, while reading up to max_concurrency of the following ones
+    from object storage, so that the parts of long recordings are fetched in parallel but not all held in memory.
+
+    The first blob is read before returning, so that a missing recording raises rather than ending the stream early.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="session-snapshots-blobs")
+    pending_keys = deque(file_keys)
+    in_flight: deque[Future[bytes]] = deque()
+
+    def fill() -> None:
+        while pending_keys and len(in_flight) < max_concurrency:
+            in_flight.append(executor.submit(_read_blob, pending_keys.popleft()))
+
+    try:
+        fill()
+        first = in_flight.popleft().result() if in_flight else b""
+    except Exception:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+
+    def generate() -> Iterator[bytes]:
+        try:
+            yield first
+            fill()
+            while in_flight:
+                content = in_flight.popleft().result()
+                fill()
+                yield content
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    return generate()
@@ -11,6 +11,7 @@ from pytest_mock import MockerFixture
 from posthog.session_recordings.session_recording_helpers import (
     RRWEB_MAP_EVENT_TYPE,
     SessionRecordingEventSummary,
+    event_to_json,
     is_active_event,
     preprocess_replay_events_for_blob_ingestion,
     split_replay_events,
@@ -488,3 +489,41 @@ def test_new_ingestion_groups_using_snapshot_bytes_if_possible(raw_snapshot_even
             },
         },
     ]
+
+
+def test_new_ingestion_groups_large_non_full_snapshots_into_as_few_events_as_fit(mocker: MockerFixture):
+    mocker.patch("time.time", return_value=0)
+
+    snapshots = [{"type": 3, "timestamp": index, "something": "x" * 100} for index in range(50)]
+    events = [
+        {
+            "event": "$snapshot",
+            "properties": {
+                "$session_id": "1234",
+                "$window_id": "1",
+                "$snapshot_data": snapshot,
+                "distinct_id": "abc123",
+            },
+        }
+        for snapshot in snapshots
+    ]
+
+    new_replay_events = mock_capture_flow(events, max_size_bytes=2000)[1]
+
+    assert [len(event["properties"]["$snapshot_items"]) for event in new_replay_events] == [12, 12, 12, 12, 2]
+    assert [item for event in new_replay_events for item in event["properties"]["$snapshot_items"]] == snapshots
+    for event in new_replay_events:
+        assert len(json.dumps(event["properties"]["$snapshot_items"])) < 2000 * 0.95
+
+
+def test_event_to_json_reuses_serialized_snapshot_items(raw_snapshot_events, mocker: MockerFixture):
+    mocker.patch("time.time", return_value=0)
+
+    new_replay_events = mock_capture_flow(raw_snapshot_events)[1]
+    serialized_event = event_to_json(new_replay_events[0])
+
+    assert json.loads(serialized_event) == new_replay_events[0]
+    assert json.dumps(new_replay_events[0]["properties"]["$snapshot_items"]) in serialized_event
+    assert event_to_json({"event": "$pageview", "properties": {}}) == json.dumps(
+        {"event": "$pageview", "properties": {}}
+    )
@@ -1,3 +1,4 @@
+import gzip
 import json
 import time
 import uuid
@@ -911,6 +912,104 @@ class TestSessionRecordings(APIBaseTest, ClickhouseTestMixin, QueryMatchingTest)
         response = self.client.get(url)
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    @freeze_time("2023-01-01T00:00:00Z")
+    @patch(
+        "posthog.session_recordings.queries.session_replay_events.SessionReplayEvents.exists",
+        return_value=True,
+    )
+    @patch("posthog.session_recordings.session_recording_api.object_storage.list_objects")
+    def test_get_snapshots_v2_caches_blob_keys_of_old_recordings(self, mock_list_objects, _mock_exists) -> None:
+        session_id = str(uuid.uuid4())
+        old_timestamp = round((now() - timedelta(hours=26)).timestamp() * 1000)
+        mock_list_objects.return_value = [
+            f"session_recordings/team_id/{self.team.pk}/session_id/{session_id}/data/{old_timestamp - 10000}-{old_timestamp}",
+        ]
+
+        url = f"/api/projects/{self.team.id}/session_recordings/{session_id}/snapshots"
+        first_response = self.client.get(url)
+        second_response = self.client.get(url)
+
+        assert first_response.json() == second_response.json()
+        assert [source["blob_key"] for source in second_response.json()["sources"]] == [
+            f"{old_timestamp - 10000}-{old_timestamp}"
+        ]
+        assert mock_list_objects.call_count == 1
+
+    @freeze_time("2023-01-01T00:00:00Z")
+    @patch(
+        "posthog.session_recordings.queries.session_replay_events.SessionReplayEvents.exists",
+        return_value=True,
+    )
+    @patch("posthog.session_recordings.session_recording_api.object_storage.list_objects")
+    def test_get_snapshots_v2_does_not_cache_blob_keys_of_recent_recordings(
+        self, mock_list_objects, _mock_exists
+    ) -> None:
+        session_id = str(uuid.uuid4())
+        timestamp = round(now().timestamp() * 1000)
+        mock_list_objects.return_value = [
+            f"session_recordings/team_id/{self.team.pk}/session_id/{session_id}/data/{timestamp - 10000}-{timestamp}",
+        ]
+
+        url = f"/api/projects/{self.team.id}/session_recordings/{session_id}/snapshots"
+        self.client.get(url)
+        self.client.get(url)
+
+        assert mock_list_objects.call_count == 2
+
+    @patch(
+        "posthog.session_recordings.queries.session_replay_events.SessionReplayEvents.exists",
+        return_value=True,
+    )
+    @patch("posthog.session_recordings.session_recording_api.SessionRecording.get_or_build")
+    @patch("posthog.session_recordings.session_recording_api.object_storage.read_bytes")
+    def test_can_get_several_session_recording_blobs_at_once(
+        self, mock_read_bytes, mock_get_session_recording, _mock_exists
+    ) -> None:
+        session_id = str(uuid.uuid4())
+        blob_keys = ["1682608337071-1682608338071", "1682608338071-1682608339071", "1682608339071-1682608340071"]
+        url = f"/api/projects/{self.team.pk}/session_recordings/{session_id}/snapshots/?source=blob&blob_keys={','.join(blob_keys)}"
+
+        mock_get_session_recording.return_value = SessionRecording(session_id=session_id, team=self.team, deleted=False)
+
+        def read_bytes_sideeffect(key: str) -> bytes:
+            prefix = f"session_recordings/team_id/{self.team.pk}/session_id/{session_id}/data/"
+            assert key.startswith(prefix)
+            blob_key = key[len(prefix) :]
+            # blobs are gzipped by the blob ingester, but we also support plain ones
+            if blob_key == blob_keys[1]:
+                return f'{{"blob_key": "{blob_key}"}}'.encode()
+            return gzip.compress(f'{{"blob_key": "{blob_key}"}}\n'.encode())
+
+        mock_read_bytes.side_effect = read_bytes_sideeffect
+
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers.get("content-type") == "application/json"
+        assert b"".join(response.streaming_content).decode().splitlines() == [  # type: ignore[arg-type]
+            f'{{"blob_key": "{blob_key}"}}' for blob_key in blob_keys
+        ]
+
+    @patch(
+        "posthog.session_recordings.queries.session_replay_events.SessionReplayEvents.exists",
+        return_value=True,
+    )
+    @patch("posthog.session_recordings.session_recording_api.SessionRecording.get_or_build")
+    @patch("posthog.session_recordings.session_recording_api.object_storage.read_bytes")
+    def test_validates_several_blob_keys(self, mock_read_bytes, mock_get_session_recording, _mock_exists) -> None:
+        session_id = str(uuid.uuid4())
+        mock_get_session_recording.return_value = SessionRecording(session_id=session_id, team=self.team, deleted=False)
+
+        url = f"/api/projects/{self.team.pk}/session_recordings/{session_id}/snapshots/?source=blob&blob_keys=1682608337071,../escape"
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        too_many_blob_keys = ",".join(str(1682608337071 + i) for i in range(21))
+        url = f"/api/projects/{self.team.pk}/session_recordings/{session_id}/snapshots/?source=blob&blob_keys={too_many_blob_keys}"
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        assert mock_read_bytes.call_count == 0
+
     @patch("ee.session_recordings.session_recording_extensions.object_storage.copy_objects")
     def test_get_via_sharing_token(self, mock_copy_objects: MagicMock) -> None:
         mock_copy_objects.return_value = 2
@@ -111,6 +111,16 @@ IN_UNIT_TESTING: bool = get_from_env("IN_UNIT_TESTING", False, type_cast=str_to_
 
 HOGQL_INCREASED_MAX_EXECUTION_TIME: int = get_from_env("HOGQL_INCREASED_MAX_EXECUTION_TIME", 600, type_cast=int)
 
+# How many compiled HogQL queries each worker keeps in memory, 0 disables the cache
+HOGQL_COMPILED_QUERY_CACHE_SIZE: int = get_from_env("HOGQL_COMPILED_QUERY_CACHE_SIZE", 0, type_cast=int)
+# Bounds how stale compiled queries can get, e.g. when property types or materialized columns change outside Django
+HOGQL_COMPILED_QUERY_CACHE_TTL: int = get_from_env("HOGQL_COMPILED_QUERY_CACHE_TTL", 300, type_cast=int)
+
+# How many teams' property types each worker keeps in memory for HogQL, and for how long at most. Types set by
+# ingestion don't invalidate the cache, so the TTL bounds how long a new property can be typed as a string.
+HOGQL_PROPERTY_TYPES_CACHE_TEAMS: int = get_from_env("HOGQL_PROPERTY_TYPES_CACHE_TEAMS", 100, type_cast=int)
+HOGQL_PROPERTY_TYPES_CACHE_TTL: int = get_from_env("HOGQL_PROPERTY_TYPES_CACHE_TTL", 60, type_cast=int)
+
 # Extend and override these settings with EE's ones
 if "ee.apps.EnterpriseConfig" in INSTALLED_APPS:
     from ee.settings import *  # noqa: F401, F403
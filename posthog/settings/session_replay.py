@@ -16,6 +16,39 @@ REALTIME_SNAPSHOTS_FROM_REDIS_ATTEMPT_TIMEOUT_SECONDS = get_from_env(
     "REALTIME_SNAPSHOTS_FROM_REDIS_ATTEMPT_TIMEOUT_SECONDS", 0.2, type_cast=float
 )
 
+# How long the blob keys of a recording are cached, once no more blobs can be added to it
+REPLAY_SNAPSHOT_BLOB_KEYS_CACHE_TTL_SECONDS = get_from_env(
+    "REPLAY_SNAPSHOT_BLOB_KEYS_CACHE_TTL_SECONDS", 60 * 60, type_cast=int
+)
+# Snapshots can be loaded for up to REPLAY_SNAPSHOT_MAX_BLOB_KEYS blobs at once,
+# of which REPLAY_SNAPSHOT_BLOB_FETCH_CONCURRENCY are read from object storage at the same time
+REPLAY_SNAPSHOT_MAX_BLOB_KEYS = get_from_env("REPLAY_SNAPSHOT_MAX_BLOB_KEYS", 20, type_cast=int)
+REPLAY_SNAPSHOT_BLOB_FETCH_CONCURRENCY = get_from_env("REPLAY_SNAPSHOT_BLOB_FETCH_CONCURRENCY", 4, type_cast=int)
+
+# An index of the sessions of each team and day answers whether a session exists without querying ClickHouse,
+# for sessions older than REPLAY_SESSION_EXISTENCE_INDEX_DELAY_HOURS plus a day. The delay must cover how late replay
+# events can still be ingested, as a day's index isn't updated once it's built. Days with more sessions than REPLAY_SESSION_EXISTENCE_INDEX_MAX_SESSIONS_PER_DAY aren't indexed.
+REPLAY_SESSION_EXISTENCE_INDEX_ENABLED = get_from_env(
+    "REPLAY_SESSION_EXISTENCE_INDEX_ENABLED", False, type_cast=str_to_bool
+)
+REPLAY_SESSION_EXISTENCE_INDEX_DELAY_HOURS = get_from_env(
+    "REPLAY_SESSION_EXISTENCE_INDEX_DELAY_HOURS", 24, type_cast=int
+)
+REPLAY_SESSION_EXISTENCE_INDEX_MAX_SESSIONS_PER_DAY = get_from_env(
+    "REPLAY_SESSION_EXISTENCE_INDEX_MAX_SESSIONS_PER_DAY", 200_000, type_cast=int
+)
+REPLAY_SESSION_EXISTENCE_INDEX_FALSE_POSITIVE_RATE = get_from_env(
+    "REPLAY_SESSION_EXISTENCE_INDEX_FALSE_POSITIVE_RATE", 0.01, type_cast=float
+)
+# How long each day of the index is kept, in the cache and in the memory of each worker
+REPLAY_SESSION_EXISTENCE_INDEX_TTL_SECONDS = get_from_env(
+    "REPLAY_SESSION_EXISTENCE_INDEX_TTL_SECONDS", 60 * 60 * 24, type_cast=int
+)
+# How many days of any team each worker keeps in memory
+REPLAY_SESSION_EXISTENCE_INDEX_PARTITIONS = get_from_env(
+    "REPLAY_SESSION_EXISTENCE_INDEX_PARTITIONS", 128, type_cast=int
+)
+
 REPLAY_EMBEDDINGS_ALLOWED_TEAMS: list[str] = get_list(get_from_env("REPLAY_EMBEDDINGS_ALLOWED_TEAM", "", type_cast=str))
 REPLAY_EMBEDDINGS_BATCH_SIZE = get_from_env("REPLAY_EMBEDDINGS_BATCH_SIZE", 10, type_cast=int)
 REPLAY_EMBEDDINGS_MIN_DURATION_SECONDS = get_from_env("REPLAY_EMBEDDINGS_MIN_DURATION_SECONDS", 30, type_cast=int)
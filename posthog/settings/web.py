@@ -23,6 +23,9 @@ AXES_META_PRECEDENCE_ORDER = ["HTTP_X_FORWARDED_FOR", "REMOTE_ADDR"]
 DECIDE_RATE_LIMIT_ENABLED = get_from_env("DECIDE_RATE_LIMIT_ENABLED", False, type_cast=str_to_bool)
 DECIDE_BUCKET_CAPACITY = get_from_env("DECIDE_BUCKET_CAPACITY", type_cast=int, default=500)
 DECIDE_BUCKET_REPLENISH_RATE = get_from_env("DECIDE_BUCKET_REPLENISH_RATE", type_cast=float, default=10.0)
+# Share rate limit buckets across processes through Redis, handing out tokens locally in batches of this size
+DECIDE_BUCKET_SHARED = get_from_env("DECIDE_BUCKET_SHARED", False, type_cast=str_to_bool)
+DECIDE_BUCKET_LOCAL_ALLOCATION = get_from_env("DECIDE_BUCKET_LOCAL_ALLOCATION", type_cast=int, default=10)
 
 # Decide db settings
 
@@ -132,6 +135,8 @@ else:
 
 # Max size of a POST body (for event ingestion)
 DATA_UPLOAD_MAX_MEMORY_SIZE = 20971520  # 20 MB
+# Max size of a POST body once decompressed, guards against decompression bombs
+MAX_DECOMPRESSED_REQUEST_SIZE = get_from_env("MAX_DECOMPRESSED_REQUEST_SIZE", 268435456, type_cast=int)  # 256 MB
 
 ROOT_URLCONF = "posthog.urls"
 
@@ -380,3 +385,6 @@ PROXY_TARGET_CNAME = get_from_env("PROXY_TARGET_CNAME", "")
 PROXY_BASE_CNAME = get_from_env("PROXY_BASE_CNAME", "")
 
 LOGO_DEV_TOKEN = get_from_env("LOGO_DEV_TOKEN", "")
+
+# Compile hog function filters with constant folding, short-circuiting and cached globals
+HOG_BYTECODE_OPTIMIZATION_ENABLED = get_from_env("HOG_BYTECODE_OPTIMIZATION_ENABLED", False, type_cast=str_to_bool)
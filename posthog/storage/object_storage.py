@@ -1,5 +1,5 @@
 import abc
-from typing import Optional, Union
+from typing import IO, Optional, Union
 
 import structlog
 from boto3 import client
@@ -45,6 +45,13 @@ class ObjectStorageClient(metaclass=abc.ABCMeta):
     def write(self, bucket: str, key: str, content: Union[str, bytes], extras: dict | None) -> None:
         pass
 
+    @abc.abstractmethod
+    def write_stream(self, bucket: str, key: str, content: IO[bytes], extras: dict | None) -> None:
+        """
+        Upload a file-like object, as a multipart upload if it is large enough, without reading it into memory.
+        """
+        pass
+
     @abc.abstractmethod
     def copy_objects(self, bucket: str, source_prefix: str, target_prefix: str) -> int | None:
         """
@@ -75,6 +82,9 @@ class UnavailableStorage(ObjectStorageClient):
     def write(self, bucket: str, key: str, content: Union[str, bytes], extras: dict | None) -> None:
         pass
 
+    def write_stream(self, bucket: str, key: str, content: IO[bytes], extras: dict | None) -> None:
+        pass
+
     def copy_objects(self, bucket: str, source_prefix: str, target_prefix: str) -> int | None:
         pass
 
@@ -170,6 +180,19 @@ class ObjectStorage(ObjectStorageClient):
             capture_exception(e)
             raise ObjectStorageError("write failed") from e
 
+    def write_stream(self, bucket: str, key: str, content: IO[bytes], extras: dict | None) -> None:
+        try:
+            self.aws_client.upload_fileobj(Fileobj=content, Bucket=bucket, Key=key, ExtraArgs=extras or None)
+        except Exception as e:
+            logger.error(
+                "object_storage.write_stream_failed",
+                bucket=bucket,
+                file_name=key,
+                error=e,
+            )
+            capture_exception(e)
+            raise ObjectStorageError("write failed") from e
+
     def copy_objects(self, bucket: str, source_prefix: str, target_prefix: str) -> int | None:
         try:
             source_objects = self.list_objects(bucket, source_prefix) or []
@@ -227,6 +250,15 @@ def write(file_name: str, content: Union[str, bytes], extras: dict | None = None
     )
 
 
+def write_stream(file_name: str, content: IO[bytes], extras: dict | None = None) -> None:
+    return object_storage_client().write_stream(
+        bucket=settings.OBJECT_STORAGE_BUCKET,
+        key=file_name,
+        content=content,
+        extras=extras,
+    )
+
+
 def tag(file_name: str, tags: dict[str, str]) -> None:
     return object_storage_client().tag(bucket=settings.OBJECT_STORAGE_BUCKET, key=file_name, tags=tags)
 
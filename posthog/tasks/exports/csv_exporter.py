@@ -1,7 +1,11 @@
+import csv
 import datetime
 import io
-from typing import Any, Optional
-from collections.abc import Generator
+import pickle
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Any, Optional
+from collections.abc import Generator, Iterator
 from urllib.parse import parse_qsl, quote, urlencode, urlparse, urlunparse
 
 from pydantic import BaseModel
@@ -15,7 +19,7 @@ from requests.exceptions import HTTPError
 from posthog.api.services.query import process_query_dict
 from posthog.hogql_queries.query_runner import ExecutionMode
 from posthog.jwt import PosthogJwtAudience, encode_jwt
-from posthog.models.exported_asset import ExportedAsset, save_content
+from posthog.models.exported_asset import ExportedAsset, save_content_from_file
 from posthog.utils import absolute_uri
 from .ordered_csv_renderer import OrderedCsvRenderer
 from ..exporter import (
@@ -25,11 +29,22 @@ from ..exporter import (
     EXPORT_TIMER,
 )
 from ...exceptions import QuerySizeExceeded
-from ...hogql.constants import CSV_EXPORT_LIMIT, CSV_EXPORT_BREAKDOWN_LIMIT_INITIAL, CSV_EXPORT_BREAKDOWN_LIMIT_LOW
+from ...hogql.constants import (
+    CSV_EXPORT_LIMIT,
+    CSV_EXPORT_BREAKDOWN_LIMIT_INITIAL,
+    CSV_EXPORT_BREAKDOWN_LIMIT_LOW,
+    get_max_limit_for_context,
+)
 from ...hogql.query import LimitContext
 
 logger = structlog.get_logger(__name__)
 
+# Exports larger than this are spooled to disk rather than kept in memory
+EXPORT_SPOOL_MAX_MEMORY_SIZE = 16 * 1024 * 1024
+# Queries with limit/offset pagination are run a page of this many rows at a time
+EXPORT_QUERY_PAGE_SIZE = 5000
+PAGINATED_QUERY_KINDS = ("EventsQuery", "ActorsQuery")
+
 
 # SUPPORTED CSV TYPES
 
@@ -51,9 +66,9 @@ logger = structlog.get_logger(__name__)
 # HOW DOES THIS WORK
 # 1. We receive an export task with a given resource uri (identical to the API)
 # 2. We call the actual API to load the data with the given params so that we receive a paginateable response
-# 3. We save the response to a chunk in object storage and then load the `next` page of results
+# 3. We flatten each row and spool it to a temporary file, then load the `next` page of results
 # 4. Repeat until exhausted or limit reached
-# 5. We save the final blob output and update the ExportedAsset
+# 5. We write the table (CSV or write-only XLSX) to another spooled file, stream it to object storage and update the ExportedAsset
 
 
 def add_query_params(url: str, params: dict[str, str]) -> str:
@@ -248,6 +263,10 @@ def get_from_hogql_query(exported_asset: ExportedAsset, limit: int, resource: di
     query = resource.get("source")
     assert query is not None
 
+    if query.get("kind") in PAGINATED_QUERY_KINDS:
+        yield from _get_pages_from_hogql_query(exported_asset, query)
+        return
+
     while True:
         try:
             query_response = process_query_dict(
@@ -271,7 +290,54 @@ def get_from_hogql_query(exported_asset: ExportedAsset, limit: int, resource: di
         return
 
 
-def _export_to_dict(exported_asset: ExportedAsset, limit: int) -> Any:
+def _get_pages_from_hogql_query(exported_asset: ExportedAsset, query: dict) -> Generator[Any, None, None]:
+    """
+    Runs the query one page at a time, up to the query's own limit, so that only a page of the response is held in
+    memory at once.
+    """
+    max_limit = get_max_limit_for_context(LimitContext.EXPORT)
+    export_limit = min(query.get("limit") or max_limit, max_limit)
+    offset = query.get("offset") or 0
+    total = 0
+    while total < export_limit:
+        page_query = {**query, "limit": min(EXPORT_QUERY_PAGE_SIZE, export_limit - total), "offset": offset + total}
+        query_response = process_query_dict(
+            team=exported_asset.team,
+            query_json=page_query,
+            limit_context=LimitContext.EXPORT,
+            execution_mode=ExecutionMode.CALCULATE_BLOCKING_ALWAYS,
+        )
+        if isinstance(query_response, BaseModel):
+            query_response = query_response.model_dump(by_alias=True)
+
+        csv_rows = list(_convert_response_to_csv_data(query_response))
+        total += len(csv_rows)
+        yield from csv_rows
+
+        if not query_response.get("hasMore") or not csv_rows:
+            break
+
+
+def _iter_spooled_rows(spool: IO[bytes]) -> Iterator[dict[str, Any]]:
+    spool.seek(0)
+    while True:
+        try:
+            yield pickle.load(spool)
+        except EOFError:
+            return
+
+
+@contextmanager
+def _export_to_table(
+    exported_asset: ExportedAsset, limit: int, header_from_first_row: bool
+) -> Iterator[Iterator[list]]:
+    """
+    Yields the export as table rows, header first.
+
+    The column set is the union of all flattened rows, so it is only known once every row has been fetched. Rows are
+    flattened and pickled into a spooled temporary file as they arrive, and read back when writing the table, so the
+    export is never held in memory as a whole.
+    """
     resource = exported_asset.export_context
 
     columns: list[str] = resource.get("columns", [])
@@ -282,50 +348,76 @@ def _export_to_dict(exported_asset: ExportedAsset, limit: int) -> Any:
     else:
         returned_rows = get_from_insights_api(exported_asset, limit, resource)
 
-    all_csv_rows = list(returned_rows)
     renderer = OrderedCsvRenderer()
-    render_context = {}
-    if columns:
-        render_context["header"] = columns
-
-    if len(all_csv_rows):
-        # NOTE: This is not ideal as some rows _could_ have different keys
-        # Ideally we would extend the csvrenderer to supported keeping the order in place
-        is_any_col_list_or_dict = [x for x in all_csv_rows[0].values() if isinstance(x, dict) or isinstance(x, list)]
-        if not is_any_col_list_or_dict:
-            # If values are serialised then keep the order of the keys, else allow it to be unordered
-            renderer.header = all_csv_rows[0].keys()
-    else:
-        # If we have no rows, that means we couldn't convert anything, so put something to avoid confusion
-        all_csv_rows = [{"error": "No data available or unable to format for export."}]
+    header: Any = columns or None
 
-    return renderer, all_csv_rows, render_context
+    with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_MEMORY_SIZE) as spool:
+        unique_fields: dict[str, None] = {}
+        is_first_row = True
+        for row in returned_rows:
+            if is_first_row:
+                is_first_row = False
+                # NOTE: This is not ideal as some rows _could_ have different keys
+                # Ideally we would extend the csvrenderer to supported keeping the order in place
+                is_any_col_list_or_dict = [x for x in row.values() if isinstance(x, dict) or isinstance(x, list)]
+                if header_from_first_row and not header and not is_any_col_list_or_dict:
+                    # If values are serialised then keep the order of the keys, else allow it to be unordered
+                    header = row.keys()
 
+            flat_row = renderer.flatten_item(row)
+            unique_fields.update(dict.fromkeys(flat_row.keys()))
+            pickle.dump(flat_row, spool, protocol=pickle.HIGHEST_PROTOCOL)
 
-def _export_to_csv(exported_asset: ExportedAsset, limit: int) -> None:
-    renderer, all_csv_rows, render_context = _export_to_dict(exported_asset, limit)
+        if is_first_row:
+            # If we have no rows, that means we couldn't convert anything, so put something to avoid confusion
+            flat_row = renderer.flatten_item({"error": "No data available or unable to format for export."})
+            unique_fields.update(dict.fromkeys(flat_row.keys()))
+            pickle.dump(flat_row, spool, protocol=pickle.HIGHEST_PROTOCOL)
 
-    rendered_csv_content = renderer.render(all_csv_rows, renderer_context=render_context)
-    save_content(exported_asset, rendered_csv_content)
+        field_headers = renderer.ordered_field_headers(list(unique_fields), header)
 
+        def table() -> Iterator[list]:
+            yield list(field_headers)
+            for item in _iter_spooled_rows(spool):
+                yield [item.get(key, None) for key in field_headers]
+
+        yield table()
 
-def _export_to_excel(exported_asset: ExportedAsset, limit: int) -> None:
-    output = io.BytesIO()
 
-    workbook = Workbook()
-    worksheet = workbook.active
+def _export_to_csv(exported_asset: ExportedAsset, limit: int) -> None:
+    with (
+        _export_to_table(exported_asset, limit, header_from_first_row=True) as table,
+        tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_MEMORY_SIZE) as output,
+    ):
+        text_output = io.TextIOWrapper(output, encoding="utf-8", newline="")
+        csv.writer(text_output).writerows(table)
+        text_output.flush()
+        text_output.detach()
+
+        output.seek(0)
+        save_content_from_file(exported_asset, output)
 
-    renderer, all_csv_rows, render_context = _export_to_dict(exported_asset, limit)
 
-    for row_num, row_data in enumerate(renderer.tablize(all_csv_rows, header=render_context.get("header"))):
-        for col_num, value in enumerate(row_data):
-            if value is not None and not isinstance(value, str | int | float | bool):
-                value = str(value)
-            worksheet.cell(row=row_num + 1, column=col_num + 1, value=value)
+def _export_to_excel(exported_asset: ExportedAsset, limit: int) -> None:
+    with (
+        _export_to_table(exported_asset, limit, header_from_first_row=False) as table,
+        tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_MEMORY_SIZE) as output,
+    ):
+        # Write-only workbooks stream rows to the zip file instead of keeping every cell in memory
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet()
+
+        for row_data in table:
+            worksheet.append(
+                [
+                    str(value) if value is not None and not isinstance(value, str | int | float | bool) else value
+                    for value in row_data
+                ]
+            )
 
-    workbook.save(output)
-    output.seek(0)
-    save_content(exported_asset, output.getvalue())
+        workbook.save(output)
+        output.seek(0)
+        save_content_from_file(exported_asset, output)
 
 
 def get_limit_param_key(path: str) -> str:
@@ -28,7 +28,23 @@ class OrderedCsvRenderer(
 
         # Get the set of all unique headers, and sort them.
         unique_fields = list(unique_everseen(itertools.chain(*(item.keys() for item in data))))
+        field_headers = self.ordered_field_headers(unique_fields, header)
 
+        # Return your "table", with the headers as the first row.
+        if labels:
+            yield [labels.get(x, x) for x in field_headers]
+        else:
+            yield field_headers
+
+        # Create a row for each dictionary, filling in columns for which the
+        # item has no data with None values.
+        for item in data:
+            yield [item.get(key, None) for key in field_headers]
+
+    def ordered_field_headers(self, unique_fields: list[str], header: Any = None) -> Any:
+        """
+        Group flattened fields by their top level key, expanding any nested key named in `header` into its fields.
+        """
         ordered_fields: dict[str, Any] = OrderedDict()
         for item in unique_fields:
             field = item.split(".")
@@ -40,24 +56,15 @@ class OrderedCsvRenderer(
 
         flat_ordered_fields = list(itertools.chain(*ordered_fields.values()))
         if not header:
-            field_headers = flat_ordered_fields
-        else:
-            field_headers = header
-            for single_header in field_headers:
-                if single_header in flat_ordered_fields or single_header not in ordered_fields:
-                    continue
+            return flat_ordered_fields
 
-                pos_single_header = field_headers.index(single_header)
-                field_headers.remove(single_header)
-                field_headers[pos_single_header:pos_single_header] = ordered_fields[single_header]
+        field_headers = header
+        for single_header in field_headers:
+            if single_header in flat_ordered_fields or single_header not in ordered_fields:
+                continue
 
-        # Return your "table", with the headers as the first row.
-        if labels:
-            yield [labels.get(x, x) for x in field_headers]
-        else:
-            yield field_headers
+            pos_single_header = field_headers.index(single_header)
+            field_headers.remove(single_header)
+            field_headers[pos_single_header:pos_single_header] = ordered_fields[single_header]
 
-        # Create a row for each dictionary, filling in columns for which the
-        # item has no data with None values.
-        for item in data:
-            yield [item.get(key, None) for key in field_headers]
+        return field_headers
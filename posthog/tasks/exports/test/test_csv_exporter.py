@@ -154,7 +154,7 @@ class TestCSVExporter(APIBaseTest):
             assert exported_asset.content is None
 
     @patch("posthog.models.exported_asset.UUIDT")
-    @patch("posthog.models.exported_asset.object_storage.write")
+    @patch("posthog.models.exported_asset.object_storage.write_stream")
     def test_csv_exporter_writes_to_asset_when_object_storage_write_fails(
         self, mocked_object_storage_write, mocked_uuidt
     ) -> None:
@@ -173,7 +173,7 @@ class TestCSVExporter(APIBaseTest):
             )
 
     @patch("posthog.models.exported_asset.UUIDT")
-    @patch("posthog.models.exported_asset.object_storage.write")
+    @patch("posthog.models.exported_asset.object_storage.write_stream")
     def test_csv_exporter_does_not_filter_columns_on_empty_param(
         self, mocked_object_storage_write, mocked_uuidt
     ) -> None:
@@ -192,7 +192,7 @@ class TestCSVExporter(APIBaseTest):
             )
 
     @patch("posthog.models.exported_asset.UUIDT")
-    @patch("posthog.models.exported_asset.object_storage.write")
+    @patch("posthog.models.exported_asset.object_storage.write_stream")
     def test_csv_exporter_does_filter_columns(self, mocked_object_storage_write, mocked_uuidt) -> None:
         # NB these columns are not in the "natural" order
         exported_asset = self._create_asset({"columns": ["distinct_id", "properties.$browser", "event"]})
@@ -210,7 +210,7 @@ class TestCSVExporter(APIBaseTest):
             )
 
     @patch("posthog.models.exported_asset.UUIDT")
-    @patch("posthog.models.exported_asset.object_storage.write")
+    @patch("posthog.models.exported_asset.object_storage.write_stream")
     def test_csv_exporter_includes_whole_dict(self, mocked_object_storage_write, mocked_uuidt) -> None:
         exported_asset = self._create_asset({"columns": ["distinct_id", "properties"]})
         mocked_uuidt.return_value = "a-guid"
@@ -224,7 +224,7 @@ class TestCSVExporter(APIBaseTest):
             assert exported_asset.content == b"distinct_id,properties.$browser\r\n2,Safari\r\n2,Safari\r\n2,Safari\r\n"
 
     @patch("posthog.models.exported_asset.UUIDT")
-    @patch("posthog.models.exported_asset.object_storage.write")
+    @patch("posthog.models.exported_asset.object_storage.write_stream")
     def test_csv_exporter_includes_whole_dict_alternative_order(
         self, mocked_object_storage_write, mocked_uuidt
     ) -> None:
@@ -240,7 +240,7 @@ class TestCSVExporter(APIBaseTest):
             assert exported_asset.content == b"properties.$browser,distinct_id\r\nSafari,2\r\nSafari,2\r\nSafari,2\r\n"
 
     @patch("posthog.models.exported_asset.UUIDT")
-    @patch("posthog.models.exported_asset.object_storage.write")
+    @patch("posthog.models.exported_asset.object_storage.write_stream")
     def test_csv_exporter_does_filter_columns_and_can_handle_unexpected_columns(
         self, mocked_object_storage_write, mocked_uuidt
     ) -> None:
@@ -260,7 +260,7 @@ class TestCSVExporter(APIBaseTest):
             )
 
     @patch("posthog.models.exported_asset.UUIDT")
-    @patch("posthog.models.exported_asset.object_storage.write")
+    @patch("posthog.models.exported_asset.object_storage.write_stream")
     def test_csv_exporter_excel(self, mocked_object_storage_write: Any, mocked_uuidt: Any) -> None:
         exported_asset = self._create_asset({"columns": ["distinct_id", "properties.$browser", "event", "tomato"]})
         exported_asset.export_format = ExportedAsset.ExportFormat.XLSX
@@ -284,7 +284,7 @@ class TestCSVExporter(APIBaseTest):
             ]
 
     @patch("posthog.models.exported_asset.UUIDT")
-    @patch("posthog.models.exported_asset.object_storage.write")
+    @patch("posthog.models.exported_asset.object_storage.write_stream")
     @patch("requests.request")
     def test_csv_exporter_limits_breakdown_insights_correctly(
         self, mocked_request, mocked_object_storage_write, mocked_uuidt
@@ -557,6 +557,35 @@ class TestCSVExporter(APIBaseTest):
                 ],
             )
 
+    @patch("posthog.hogql.constants.MAX_SELECT_RETURNED_ROWS", 5)
+    @patch("posthog.tasks.exports.csv_exporter.EXPORT_QUERY_PAGE_SIZE", 2)
+    @patch("posthog.tasks.exports.csv_exporter.process_query_dict")
+    def test_csv_exporter_events_query_is_fetched_in_pages(self, mocked_process_query_dict: Any) -> None:
+        def events_page(team: Any, query_json: dict, **kwargs: Any) -> dict:
+            rows = [[f"event_{i}"] for i in range(query_json["offset"], 7)]
+            return {
+                "columns": ["event"],
+                "types": ["String"],
+                "results": rows[: query_json["limit"]],
+                "hasMore": len(rows) > query_json["limit"],
+            }
+
+        mocked_process_query_dict.side_effect = events_page
+        exported_asset = ExportedAsset(
+            team=self.team,
+            export_format=ExportedAsset.ExportFormat.CSV,
+            export_context={"source": {"kind": "EventsQuery", "select": ["event"]}},
+        )
+
+        rows = list(csv_exporter.get_from_hogql_query(exported_asset, 0, exported_asset.export_context))
+
+        # Pages are fetched until the export limit, the last one only as large as needed
+        assert rows == [{"event": f"event_{i}"} for i in range(5)]
+        assert [
+            (call.kwargs["query_json"]["limit"], call.kwargs["query_json"]["offset"])
+            for call in mocked_process_query_dict.call_args_list
+        ] == [(2, 0), (2, 2), (1, 4)]
+
     @patch("posthog.models.exported_asset.UUIDT")
     def test_csv_exporter_empty_result(self, mocked_uuidt: Any) -> None:
         exported_asset = ExportedAsset(
@@ -589,6 +618,34 @@ class TestCSVExporter(APIBaseTest):
                 self.assertEqual(lines[0], "error")
                 self.assertEqual(lines[1], "No data available or unable to format for export.")
 
+    @patch("posthog.tasks.exports.csv_exporter.EXPORT_SPOOL_MAX_MEMORY_SIZE", 1024)
+    @patch("posthog.models.exported_asset.UUIDT")
+    def test_csv_exporter_spools_large_exports_to_disk(self, mocked_uuidt: Any) -> None:
+        exported_asset = ExportedAsset(
+            team=self.team,
+            export_format=ExportedAsset.ExportFormat.CSV,
+            export_context={"source": {"kind": "HogQLQuery", "query": "select 1"}},
+        )
+        exported_asset.save()
+        mocked_uuidt.return_value = "a-guid"
+
+        rows: list[dict[str, Any]] = [{"event": "$pageview", "properties": {"index": i}} for i in range(5000)]
+        # A key only present on the last row must still end up in the header
+        rows.append({"event": "$pageleave", "properties": {"index": 5000, "late": True}})
+
+        with patch("posthog.tasks.exports.csv_exporter.get_from_hogql_query") as mocked_get_from_hogql_query:
+            mocked_get_from_hogql_query.return_value = iter(rows)
+
+            with self.settings(OBJECT_STORAGE_ENABLED=True, OBJECT_STORAGE_EXPORTS_FOLDER="Test-Exports"):
+                csv_exporter.export_tabular(exported_asset)
+                content = object_storage.read(exported_asset.content_location)
+                lines = (content or "").split("\r\n")
+
+        assert lines[0] == "event,properties.index,properties.late"
+        assert lines[1] == "$pageview,0,"
+        assert lines[5001] == "$pageleave,5000,True"
+        assert len(lines) == 5003
+
     def _split_to_dict(self, url: str) -> dict[str, Any]:
         first_split_parts = url.split("?")
         assert len(first_split_parts) == 2
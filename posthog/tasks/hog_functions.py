@@ -2,7 +2,7 @@ from typing import Optional
 
 from celery import shared_task
 
-from posthog.cdp.filters import compile_filters_bytecode
+from posthog.cdp.filters import FiltersCompilationContext, compile_filters_bytecode
 from posthog.models.action.action import Action
 from posthog.plugins.plugin_server_api import reload_hog_functions_on_workers
 from posthog.tasks.utils import CeleryQueue
@@ -47,13 +47,26 @@ def refresh_affected_hog_functions(team_id: Optional[int] = None, action_id: Opt
 
     actions_by_id = {action.id: action for action in all_related_actions}
 
+    # All functions belong to the same team, so they can share the compiled actions and test account filters
+    context = FiltersCompilationContext(affected_hog_functions[0].team, actions_by_id)
+    changed_hog_functions: list[HogFunction] = []
+
     for hog_function in affected_hog_functions:
-        hog_function.filters = compile_filters_bytecode(hog_function.filters, hog_function.team, actions_by_id)
+        previous_bytecode = (hog_function.filters or {}).get("bytecode")
+        hog_function.filters = compile_filters_bytecode(
+            hog_function.filters, hog_function.team, actions_by_id, context=context
+        )
+        # Most team saves don't touch the test account filters, so there's nothing to write or reload
+        if hog_function.filters["bytecode"] != previous_bytecode:
+            changed_hog_functions.append(hog_function)
+
+    if not changed_hog_functions:
+        return 0
 
-    updates = HogFunction.objects.bulk_update(affected_hog_functions, ["filters"])
+    updates = HogFunction.objects.bulk_update(changed_hog_functions, ["filters"])
 
     reload_hog_functions_on_workers(
-        team_id=team_id, hog_function_ids=[str(hog_function.id) for hog_function in affected_hog_functions]
+        team_id=team_id, hog_function_ids=[str(hog_function.id) for hog_function in changed_hog_functions]
     )
 
     return updates
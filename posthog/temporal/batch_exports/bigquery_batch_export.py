@@ -1,8 +1,13 @@
 import asyncio
+import collections
+import collections.abc
 import contextlib
 import dataclasses
 import datetime as dt
 import json
+import shutil
+import tempfile
+import typing
 
 import pyarrow as pa
 from django.conf import settings
@@ -34,6 +39,10 @@ from posthog.temporal.batch_exports.metrics import (
 )
 from posthog.temporal.batch_exports.temporary_file import (
     BatchExportTemporaryFile,
+    BatchExportWriter,
+    FlushCallable,
+    JSONLBatchExportWriter,
+    ParquetBatchExportWriter,
 )
 from posthog.temporal.batch_exports.utils import apeek_first_and_rewind, try_set_batch_export_run_to_running
 from posthog.temporal.common.clickhouse import get_client
@@ -45,15 +54,38 @@ from posthog.temporal.common.utils import (
 )
 
 
-async def load_jsonl_file_to_bigquery_table(jsonl_file, table, table_schema, bigquery_client):
-    """Execute a COPY FROM query with given connection to copy contents of jsonl_file."""
+async def load_file_to_bigquery_table(
+    file: typing.IO[bytes],
+    table: bigquery.Table,
+    table_schema: list[bigquery.SchemaField],
+    bigquery_client: bigquery.Client,
+    source_format: str = "NEWLINE_DELIMITED_JSON",
+) -> None:
+    """Execute a load job to load the contents of file into table, waiting for it to finish.
+
+    Both the upload of the file and the load job run in a thread, so that multiple loads can run concurrently.
+    Parquet files describe their own schema, so table_schema is only passed along for JSONL files.
+    """
     job_config = bigquery.LoadJobConfig(
-        source_format="NEWLINE_DELIMITED_JSON",
-        schema=table_schema,
+        source_format=source_format,
+        schema=table_schema if source_format == "NEWLINE_DELIMITED_JSON" else None,
     )
 
-    load_job = bigquery_client.load_table_from_file(jsonl_file, table, job_config=job_config, rewind=True)
-    await asyncio.to_thread(load_job.result)
+    def load() -> None:
+        load_job = bigquery_client.load_table_from_file(file, table, job_config=job_config, rewind=True)
+        load_job.result()
+
+    await asyncio.to_thread(load)
+
+
+async def load_jsonl_file_to_bigquery_table(jsonl_file, table, table_schema, bigquery_client):
+    """Execute a load job with given client to load contents of jsonl_file."""
+    await load_file_to_bigquery_table(jsonl_file, table, table_schema, bigquery_client)
+
+
+async def load_parquet_file_to_bigquery_table(parquet_file, table, table_schema, bigquery_client):
+    """Execute a load job with given client to load contents of parquet_file."""
+    await load_file_to_bigquery_table(parquet_file, table, table_schema, bigquery_client, source_format="PARQUET")
 
 
 async def create_table_in_bigquery(
@@ -126,6 +158,247 @@ def get_bigquery_fields_from_record_schema(
     return bq_schema
 
 
+def can_load_as_parquet(table_schema: list[bigquery.SchemaField]) -> bool:
+    """Whether all fields of table_schema can be loaded from Parquet files.
+
+    BigQuery only loads JSON columns from Parquet strings annotated with the JSON logical type, which pyarrow
+    can't write. Tables with JSON columns have to be loaded from JSONL files instead.
+    """
+    return all(field.field_type != "JSON" for field in table_schema)
+
+
+def get_parquet_schema_for_bigquery(record_schema: pa.Schema, table_schema: list[bigquery.SchemaField]) -> pa.Schema:
+    """Generate the schema of Parquet files loaded into a BigQuery table from the schema of the records.
+
+    Columns are sorted according to the BigQuery schema. Timestamps are written in UTC and with microsecond
+    precision, as timestamps without a timezone would be loaded as DATETIME, and BigQuery doesn't support
+    nanoseconds.
+    """
+    fields = []
+    for table_field in table_schema:
+        pa_field = record_schema.field(table_field.name)
+
+        if pa.types.is_timestamp(pa_field.type):
+            pa_field = pa_field.with_type(pa.timestamp("us", tz="UTC"))
+
+        fields.append(pa_field.with_nullable(True))
+
+    return pa.schema(fields)
+
+
+def cast_record_batch(record_batch: pa.RecordBatch, schema: pa.Schema) -> pa.RecordBatch:
+    """Cast the columns of record_batch that are in schema to their type in schema, keeping any other columns."""
+    columns = []
+    fields = []
+
+    for pa_field, column in zip(record_batch.schema, record_batch.columns):
+        if pa_field.name in schema.names:
+            target_field = schema.field(pa_field.name)
+            if not column.type.equals(target_field.type):
+                column = column.cast(target_field.type, safe=False)
+            pa_field = target_field
+
+        columns.append(column)
+        fields.append(pa_field)
+
+    return pa.RecordBatch.from_arrays(columns, schema=pa.schema(fields))
+
+
+class BigQueryJSONLBatchExportWriter(JSONLBatchExportWriter):
+    """A `JSONLBatchExportWriter` that writes JSON columns as JSON values instead of JSON strings.
+
+    Attributes:
+        json_columns: Columns of JSON strings that are loaded into JSON columns.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        flush_callable: FlushCallable,
+        json_columns: collections.abc.Sequence[str],
+    ):
+        super().__init__(max_bytes=max_bytes, flush_callable=flush_callable)
+        self.json_columns = json_columns
+
+    def _write_record_batch(self, record_batch: pa.RecordBatch) -> None:
+        """Write records to a temporary file as JSONL, parsing JSON columns."""
+        for record in record_batch.to_pylist():
+            for json_column in self.json_columns:
+                if (json_str := record.get(json_column, None)) is not None:
+                    record[json_column] = json.loads(json_str)
+
+            self.write(record)
+
+
+OnLoadedCallable = collections.abc.Callable[[int, int, dt.datetime], None]
+
+
+class BigQueryLoadJobs:
+    """Run up to `max_concurrent_loads` BigQuery load jobs at a time.
+
+    Load jobs can finish in any order, but `on_loaded` is only called for a load once all the loads submitted
+    before it have finished too, so that it can be used to track progress, e.g. in heartbeats. It's called
+    with the number of records and bytes loaded, and the latest `_inserted_at` loaded.
+
+    Exiting the context manager waits for all loads to finish, and cancels them if an exception was raised.
+    """
+
+    def __init__(self, max_concurrent_loads: int, on_loaded: OnLoadedCallable | None = None):
+        self.max_concurrent_loads = max_concurrent_loads
+        self.on_loaded = on_loaded
+
+        self._semaphore = asyncio.Semaphore(max_concurrent_loads)
+        self._pending: collections.deque[tuple[asyncio.Task[None], int, int, dt.datetime]] = collections.deque()
+
+    async def __aenter__(self) -> "BigQueryLoadJobs":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_value is not None:
+            await self.cancel()
+        else:
+            await self.wait()
+
+    async def submit(
+        self,
+        load: collections.abc.Callable[[], collections.abc.Coroutine[typing.Any, typing.Any, None]],
+        records_loaded: int,
+        bytes_loaded: int,
+        last_inserted_at: dt.datetime,
+    ) -> None:
+        """Start a load once less than `max_concurrent_loads` loads are running."""
+        self._report_loaded()
+        await self._semaphore.acquire()
+
+        task = asyncio.create_task(load())
+        task.add_done_callback(lambda _: self._semaphore.release())
+        self._pending.append((task, records_loaded, bytes_loaded, last_inserted_at))
+
+        self._report_loaded()
+
+    async def wait(self) -> None:
+        """Wait for all submitted loads to finish, raising the first error of any of them."""
+        try:
+            while self._pending:
+                await asyncio.wait([self._pending[0][0]])
+                self._report_loaded()
+        except BaseException:
+            await self.cancel()
+            raise
+
+    async def cancel(self) -> None:
+        """Cancel all loads that are still running."""
+        tasks = [task for task, *_ in self._pending]
+        self._pending.clear()
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _report_loaded(self) -> None:
+        """Report loads that finished in submission order, raising the error of the first failed load.
+
+        A failed load stays pending, so that no load submitted after it is ever reported.
+        """
+        while self._pending and self._pending[0][0].done():
+            self._pending[0][0].result()
+
+            _, records_loaded, bytes_loaded, last_inserted_at = self._pending.popleft()
+
+            if self.on_loaded is not None:
+                self.on_loaded(records_loaded, bytes_loaded, last_inserted_at)
+
+
+async def load_records_to_bigquery_table(
+    record_batches: collections.abc.AsyncGenerator[pa.RecordBatch, None],
+    table: bigquery.Table,
+    table_schema: list[bigquery.SchemaField],
+    bigquery_client: bigquery.Client,
+    json_columns: collections.abc.Sequence[str] = (),
+    max_bytes: int | None = None,
+    max_concurrent_loads: int | None = None,
+    on_loaded: OnLoadedCallable | None = None,
+) -> int:
+    """Load records into a BigQuery table with a load job every `max_bytes`, returning the number of records loaded.
+
+    Records are written as Parquet files, unless the table has JSON columns, in which case they are written as
+    JSONL files (see `can_load_as_parquet`). Each file is copied out of the writer's temporary file so that
+    writing the next one doesn't have to wait for it to be loaded.
+
+    Arguments:
+        record_batches: Record batches with the columns of table_schema, and an `_inserted_at` column.
+        table: The BigQuery table to load records into.
+        table_schema: The schema of the BigQuery table.
+        bigquery_client: The client used to run load jobs.
+        json_columns: Columns of JSON strings that are loaded into JSON columns.
+        max_bytes: The size of each loaded file, defaults to BATCH_EXPORT_BIGQUERY_UPLOAD_CHUNK_SIZE_BYTES.
+        max_concurrent_loads: How many load jobs to run at a time, defaults to
+            BATCH_EXPORT_BIGQUERY_MAX_CONCURRENT_LOADS.
+        on_loaded: Called as loads finish, see `BigQueryLoadJobs`.
+    """
+    max_bytes = max_bytes or settings.BATCH_EXPORT_BIGQUERY_UPLOAD_CHUNK_SIZE_BYTES
+    max_concurrent_loads = max_concurrent_loads or settings.BATCH_EXPORT_BIGQUERY_MAX_CONCURRENT_LOADS
+
+    first_record_batch, record_batches = await apeek_first_and_rewind(record_batches)
+    if first_record_batch is None:
+        return 0
+
+    # Columns need to be sorted according to BigQuery schema.
+    record_columns = [field.name for field in table_schema] + ["_inserted_at"]
+
+    if can_load_as_parquet(table_schema):
+        source_format = "PARQUET"
+        parquet_schema: pa.Schema | None = get_parquet_schema_for_bigquery(first_record_batch.schema, table_schema)
+    else:
+        source_format = "NEWLINE_DELIMITED_JSON"
+        parquet_schema = None
+
+    async with BigQueryLoadJobs(max_concurrent_loads, on_loaded=on_loaded) as load_jobs:
+
+        async def flush_to_bigquery(
+            batch_export_file: BatchExportTemporaryFile,
+            records_since_last_flush: int,
+            bytes_since_last_flush: int,
+            last_inserted_at: dt.datetime,
+            is_last: bool,
+        ) -> None:
+            load_file = tempfile.TemporaryFile()
+            await asyncio.to_thread(shutil.copyfileobj, batch_export_file, load_file)
+
+            async def load() -> None:
+                with load_file:
+                    await load_file_to_bigquery_table(
+                        load_file, table, table_schema, bigquery_client, source_format=source_format
+                    )
+
+            await load_jobs.submit(load, records_since_last_flush, bytes_since_last_flush, last_inserted_at)
+
+        writer: BatchExportWriter
+        if parquet_schema is not None:
+            writer = ParquetBatchExportWriter(
+                max_bytes=max_bytes,
+                flush_callable=flush_to_bigquery,
+                schema=parquet_schema,
+                complete_file_on_flush=True,
+            )
+        else:
+            writer = BigQueryJSONLBatchExportWriter(
+                max_bytes=max_bytes,
+                flush_callable=flush_to_bigquery,
+                json_columns=json_columns,
+            )
+
+        async with writer.open_temporary_file():
+            async for record_batch in record_batches:
+                record_batch = record_batch.select(record_columns)
+                if parquet_schema is not None:
+                    record_batch = cast_record_batch(record_batch, parquet_schema)
+
+                await writer.write_record_batch(record_batch)
+
+    return writer.records_total
+
+
 @dataclasses.dataclass
 class BigQueryHeartbeatDetails(BatchExportHeartbeatDetails):
     """The BigQuery batch export details included in every heartbeat."""
@@ -221,10 +494,8 @@ async def insert_into_bigquery_activity(inputs: BigQueryInsertInputs) -> Records
 
         if should_resume is True and details is not None:
             data_interval_start = details.last_inserted_at.isoformat()
-            last_inserted_at = details.last_inserted_at
         else:
             data_interval_start = inputs.data_interval_start
-            last_inserted_at = None
 
         async with get_client(team_id=inputs.team_id) as client:
             if not await client.is_alive():
@@ -255,94 +526,64 @@ async def insert_into_bigquery_activity(inputs: BigQueryInsertInputs) -> Records
             if first_record_batch is None:
                 return 0
 
-            bigquery_table = None
-            inserted_at = None
-
             with bigquery_client(inputs) as bq_client:
-                with BatchExportTemporaryFile() as jsonl_file:
-                    rows_exported = get_rows_exported_metric()
-                    bytes_exported = get_bytes_exported_metric()
-
-                    async def flush_to_bigquery(bigquery_table, table_schema):
-                        logger.debug(
-                            "Loading %s records of size %s bytes",
-                            jsonl_file.records_since_last_reset,
-                            jsonl_file.bytes_since_last_reset,
-                        )
-                        await load_jsonl_file_to_bigquery_table(jsonl_file, bigquery_table, table_schema, bq_client)
-
-                        rows_exported.add(jsonl_file.records_since_last_reset)
-                        bytes_exported.add(jsonl_file.bytes_since_last_reset)
-
-                    if inputs.use_json_type is True:
-                        json_type = "JSON"
-                        json_columns = ["properties", "set", "set_once", "person_properties"]
-                    else:
-                        json_type = "STRING"
-                        json_columns = []
-
-                    if inputs.batch_export_schema is None:
-                        schema = [
-                            bigquery.SchemaField("uuid", "STRING"),
-                            bigquery.SchemaField("event", "STRING"),
-                            bigquery.SchemaField("properties", json_type),
-                            bigquery.SchemaField("elements", "STRING"),
-                            bigquery.SchemaField("set", json_type),
-                            bigquery.SchemaField("set_once", json_type),
-                            bigquery.SchemaField("distinct_id", "STRING"),
-                            bigquery.SchemaField("team_id", "INT64"),
-                            bigquery.SchemaField("ip", "STRING"),
-                            bigquery.SchemaField("site_url", "STRING"),
-                            bigquery.SchemaField("timestamp", "TIMESTAMP"),
-                            bigquery.SchemaField("bq_ingested_timestamp", "TIMESTAMP"),
-                        ]
-
-                    else:
-                        column_names = [
-                            column for column in first_record_batch.schema.names if column != "_inserted_at"
-                        ]
-                        record_schema = first_record_batch.select(column_names).schema
-                        schema = get_bigquery_fields_from_record_schema(record_schema, known_json_columns=json_columns)
-
-                    bigquery_table = await create_table_in_bigquery(
-                        inputs.project_id,
-                        inputs.dataset_id,
-                        inputs.table_id,
-                        schema,
-                        bq_client,
-                    )
-
-                    # Columns need to be sorted according to BigQuery schema.
-                    record_columns = [field.name for field in schema] + ["_inserted_at"]
-
-                    async for record_batch in records_iterator:
-                        for record in record_batch.select(record_columns).to_pylist():
-                            inserted_at = record.pop("_inserted_at")
-
-                            for json_column in json_columns:
-                                if json_column in record and (json_str := record.get(json_column, None)) is not None:
-                                    record[json_column] = json.loads(json_str)
-
-                            # TODO: Parquet is a much more efficient format to send data to BigQuery.
-                            jsonl_file.write_records_to_jsonl([record])
-
-                            if jsonl_file.tell() > settings.BATCH_EXPORT_BIGQUERY_UPLOAD_CHUNK_SIZE_BYTES:
-                                await flush_to_bigquery(bigquery_table, schema)
-
-                                last_inserted_at = inserted_at.isoformat()
-                                heartbeater.details = (str(last_inserted_at),)
-
-                                jsonl_file.reset()
-
-                    if jsonl_file.tell() > 0 and inserted_at is not None:
-                        await flush_to_bigquery(bigquery_table, schema)
-
-                        last_inserted_at = inserted_at.isoformat()
-                        heartbeater.details = (str(last_inserted_at),)
-
-                        jsonl_file.reset()
-
-                    return jsonl_file.records_total
+                rows_exported = get_rows_exported_metric()
+                bytes_exported = get_bytes_exported_metric()
+
+                def on_loaded(records_loaded: int, bytes_loaded: int, last_inserted_at: dt.datetime) -> None:
+                    logger.debug("Loaded %s records of size %s bytes", records_loaded, bytes_loaded)
+
+                    rows_exported.add(records_loaded)
+                    bytes_exported.add(bytes_loaded)
+
+                    heartbeater.details = (last_inserted_at.isoformat(),)
+
+                if inputs.use_json_type is True:
+                    json_type = "JSON"
+                    json_columns = ["properties", "set", "set_once", "person_properties"]
+                else:
+                    json_type = "STRING"
+                    json_columns = []
+
+                if inputs.batch_export_schema is None:
+                    schema = [
+                        bigquery.SchemaField("uuid", "STRING"),
+                        bigquery.SchemaField("event", "STRING"),
+                        bigquery.SchemaField("properties", json_type),
+                        bigquery.SchemaField("elements", "STRING"),
+                        bigquery.SchemaField("set", json_type),
+                        bigquery.SchemaField("set_once", json_type),
+                        bigquery.SchemaField("distinct_id", "STRING"),
+                        bigquery.SchemaField("team_id", "INT64"),
+                        bigquery.SchemaField("ip", "STRING"),
+                        bigquery.SchemaField("site_url", "STRING"),
+                        bigquery.SchemaField("timestamp", "TIMESTAMP"),
+                        bigquery.SchemaField("bq_ingested_timestamp", "TIMESTAMP"),
+                    ]
+
+                else:
+                    column_names = [column for column in first_record_batch.schema.names if column != "_inserted_at"]
+                    record_schema = first_record_batch.select(column_names).schema
+                    schema = get_bigquery_fields_from_record_schema(record_schema, known_json_columns=json_columns)
+
+                bigquery_table = await create_table_in_bigquery(
+                    inputs.project_id,
+                    inputs.dataset_id,
+                    inputs.table_id,
+                    schema,
+                    bq_client,
+                )
+
+                return await load_records_to_bigquery_table(
+                    records_iterator,
+                    bigquery_table,
+                    schema,
+                    bq_client,
+                    json_columns=json_columns,
+                    max_bytes=settings.BATCH_EXPORT_BIGQUERY_UPLOAD_CHUNK_SIZE_BYTES,
+                    max_concurrent_loads=settings.BATCH_EXPORT_BIGQUERY_MAX_CONCURRENT_LOADS,
+                    on_loaded=on_loaded,
+                )
 
 
 @workflow.defn(name="bigquery-export")
@@ -3,11 +3,14 @@ import contextlib
 import csv
 import datetime as dt
 import json
+import struct
 import typing
 from dataclasses import dataclass
 
+import numpy as np
 import psycopg
 import pyarrow as pa
+import pyarrow.compute as pc
 from django.conf import settings
 from psycopg import sql
 from temporalio import activity, workflow
@@ -105,6 +108,278 @@ async def copy_tsv_to_postgres(
                 await copy.write(data)
 
 
+PGCOPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+# The signature is followed by 32-bit flags and the length of the header extension area, both zero.
+PGCOPY_HEADER = PGCOPY_SIGNATURE + struct.pack(">ii", 0, 0)
+PGCOPY_TRAILER = struct.pack(">h", -1)
+# Postgres timestamps are microseconds since 2000-01-01, instead of since the Unix epoch.
+POSTGRES_EPOCH_MICROSECONDS = 946_684_800_000_000
+# Binary COPY encodes record batches in slices of about this many bytes, to bound the size of intermediate arrays.
+PGCOPY_ENCODING_CHUNK_SIZE_BYTES = 1024 * 1024
+
+# Postgres types, as returned by information_schema.columns.data_type, mapped to the format of their binary
+# representation: Fixed width values as a numpy dtype, and variable width values as any bytes they start with.
+PGCOPY_BINARY_FORMATS: dict[str, str | bytes] = {
+    "smallint": ">i2",
+    "integer": ">i4",
+    "bigint": ">i8",
+    "real": ">f4",
+    "double precision": ">f8",
+    "boolean": "u1",
+    "timestamp with time zone": ">i8",
+    "timestamp without time zone": ">i8",
+    "text": b"",
+    "character varying": b"",
+    "character": b"",
+    "json": b"",
+    # JSONB starts with its version number, 1, followed by the JSON text.
+    "jsonb": b"\x01",
+    "bytea": b"",
+}
+
+
+PGCOPY_ARROW_TYPES: dict[str, pa.DataType] = {
+    "smallint": pa.int16(),
+    "integer": pa.int32(),
+    "bigint": pa.int64(),
+    "real": pa.float32(),
+    "double precision": pa.float64(),
+}
+
+
+def is_pgcopy_binary_compatible(pa_type: pa.DataType, pg_type: str) -> bool:
+    """Whether Arrow arrays of pa_type can be encoded in the binary format of Postgres columns of pg_type."""
+    binary_format = PGCOPY_BINARY_FORMATS.get(pg_type, None)
+
+    if binary_format is None:
+        return False
+    elif pg_type.startswith("timestamp"):
+        return pa.types.is_timestamp(pa_type)
+    elif pg_type == "bytea":
+        return pa.types.is_binary(pa_type) or pa.types.is_large_binary(pa_type)
+    elif isinstance(binary_format, bytes):
+        return pa.types.is_string(pa_type) or pa.types.is_large_string(pa_type)
+    elif pg_type == "boolean":
+        return pa.types.is_boolean(pa_type)
+    elif pg_type in ("real", "double precision"):
+        return pa.types.is_floating(pa_type) or pa.types.is_integer(pa_type)
+    else:
+        return pa.types.is_integer(pa_type)
+
+
+def _scatter_fixed_width(out: np.ndarray, starts: np.ndarray, values: np.ndarray) -> None:
+    """Write each row of the 2D uint8 array values into out, starting at the corresponding position of starts."""
+    out[starts[:, np.newaxis] + np.arange(values.shape[1])] = values
+
+
+def _scatter_variable_width(
+    out: np.ndarray, starts: np.ndarray, data: np.ndarray, data_starts: np.ndarray, lengths: np.ndarray
+) -> None:
+    """Write each data[data_starts[i]:data_starts[i] + lengths[i]] into out, starting at starts[i]."""
+    total_length = int(lengths.sum())
+    if total_length == 0:
+        return
+
+    position_in_value = np.arange(total_length) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    out[np.repeat(starts, lengths) + position_in_value] = data[np.repeat(data_starts, lengths) + position_in_value]
+
+
+def encode_record_batch_as_pgcopy(record_batch: pa.RecordBatch, pg_types: collections.abc.Sequence[str]) -> bytes:
+    """Encode the rows of a record batch as tuples of the Postgres binary COPY format.
+
+    The format is row oriented: Each tuple is a 16-bit field count followed by each field as its 32-bit length
+    (-1 for NULL) and its value. We encode each column at once, writing its fields into their position in the
+    output with numpy, so that no Python objects are created per value. The header and trailer of the format
+    are not included.
+
+    Arguments:
+        record_batch: A record batch with a column for each type in pg_types, see `is_pgcopy_binary_compatible`.
+        pg_types: The Postgres type of each column, as returned by information_schema.columns.data_type.
+    """
+    num_rows = record_batch.num_rows
+    if num_rows == 0:
+        return b""
+
+    # Every tuple starts with the field count, and every field with its length.
+    row_lengths = np.full(num_rows, 2 + 4 * record_batch.num_columns, dtype=np.int64)
+    value_lengths = []
+
+    for column, pg_type in zip(record_batch.columns, pg_types):
+        binary_format = PGCOPY_BINARY_FORMATS[pg_type]
+        is_valid = column.is_valid().to_numpy(zero_copy_only=False)
+
+        if isinstance(binary_format, str):
+            lengths = np.where(is_valid, np.dtype(binary_format).itemsize, -1)
+        else:
+            offsets = _get_value_offsets(column)
+            lengths = np.where(is_valid, np.diff(offsets) + len(binary_format), -1)
+
+        value_lengths.append(lengths)
+        row_lengths += np.maximum(lengths, 0)
+
+    row_starts = np.cumsum(row_lengths) - row_lengths
+    out = np.empty(int(row_lengths.sum()), dtype=np.uint8)
+
+    field_count = np.array([record_batch.num_columns], dtype=">i2").view(np.uint8)
+    _scatter_fixed_width(out, row_starts, np.broadcast_to(field_count, (num_rows, 2)))
+
+    field_starts = row_starts + 2
+    for column, pg_type, lengths in zip(record_batch.columns, pg_types, value_lengths):
+        _scatter_fixed_width(out, field_starts, lengths.astype(">i4").view(np.uint8).reshape(num_rows, 4))
+
+        is_valid = lengths >= 0
+        value_starts = field_starts[is_valid] + 4
+        binary_format = PGCOPY_BINARY_FORMATS[pg_type]
+
+        if isinstance(binary_format, str):
+            values = _get_fixed_width_values(column, pg_type)
+            itemsize = values.dtype.itemsize
+            _scatter_fixed_width(
+                out, value_starts, values[is_valid].astype(binary_format).view(np.uint8).reshape(-1, itemsize)
+            )
+
+        else:
+            if binary_format:
+                prefix = np.frombuffer(binary_format, dtype=np.uint8)
+                _scatter_fixed_width(out, value_starts, np.broadcast_to(prefix, (len(value_starts), len(prefix))))
+                value_starts = value_starts + len(prefix)
+
+            offsets = _get_value_offsets(column)
+            buffer = column.buffers()[2]
+            data = np.frombuffer(buffer, dtype=np.uint8) if buffer is not None else np.empty(0, dtype=np.uint8)
+            _scatter_variable_width(
+                out, value_starts, data, offsets[:-1][is_valid], lengths[is_valid] - len(binary_format)
+            )
+
+        field_starts += 4 + np.maximum(lengths, 0)
+
+    return out.tobytes()
+
+
+def _get_value_offsets(column: pa.Array) -> np.ndarray:
+    """Return the offsets of the values of a variable width column in its data buffer."""
+    if pa.types.is_large_string(column.type) or pa.types.is_large_binary(column.type):
+        offset_dtype: type[np.signedinteger] = np.int64
+    else:
+        offset_dtype = np.int32
+
+    offsets = np.frombuffer(column.buffers()[1], dtype=offset_dtype)
+    return offsets[column.offset : column.offset + len(column) + 1].astype(np.int64)
+
+
+def _get_fixed_width_values(column: pa.Array, pg_type: str) -> np.ndarray:
+    """Return the values of a fixed width column as a numpy array, with NULLs replaced by zeros."""
+    if pg_type.startswith("timestamp"):
+        if column.type.unit == "ns":
+            # Postgres only keeps microseconds, and a safe cast would raise on any nanoseconds left
+            column = pc.floor_temporal(column, unit="microsecond")
+        microseconds = column.cast(pa.timestamp("us", tz=column.type.tz)).view(pa.int64())
+        return microseconds.fill_null(0).to_numpy() - POSTGRES_EPOCH_MICROSECONDS
+
+    elif pg_type == "boolean":
+        return column.fill_null(False).to_numpy(zero_copy_only=False).astype(np.uint8)
+
+    # Cast with Arrow, as numpy would silently overflow values that don't fit in the column.
+    return column.cast(PGCOPY_ARROW_TYPES[pg_type]).fill_null(0).to_numpy()
+
+
+def iter_pgcopy_chunks(
+    record_batch: pa.RecordBatch, pg_types: collections.abc.Sequence[str]
+) -> collections.abc.Iterator[bytes]:
+    """Encode a record batch with `encode_record_batch_as_pgcopy` in slices of PGCOPY_ENCODING_CHUNK_SIZE_BYTES."""
+    if record_batch.num_rows == 0:
+        return
+
+    rows_per_chunk = max(1, record_batch.num_rows * PGCOPY_ENCODING_CHUNK_SIZE_BYTES // max(record_batch.nbytes, 1))
+
+    for offset in range(0, record_batch.num_rows, rows_per_chunk):
+        yield encode_record_batch_as_pgcopy(record_batch.slice(offset, rows_per_chunk), pg_types)
+
+
+async def get_postgres_column_types(
+    postgres_connection: psycopg.AsyncConnection, schema: str | None, table_name: str
+) -> dict[str, str]:
+    """Return the type of each column of an existing table, as in information_schema.columns.data_type."""
+    async with postgres_connection.cursor() as cursor:
+        await cursor.execute(
+            """
+            SELECT column_name, data_type
+            FROM information_schema.columns
+            WHERE table_schema = coalesce(%(schema)s, current_schema()) AND table_name = %(table_name)s
+            """,
+            {"schema": schema or None, "table_name": table_name},
+        )
+        return dict(await cursor.fetchall())
+
+
+async def copy_record_batches_to_postgres(
+    record_batches: collections.abc.AsyncIterator[pa.RecordBatch],
+    postgres_connection: psycopg.AsyncConnection,
+    schema: str | None,
+    table_name: str,
+    schema_columns: list[str],
+    pg_types: list[str],
+    max_bytes: int,
+    on_copied: collections.abc.Callable[[int, int], None] | None = None,
+) -> int:
+    """Execute COPY FROM queries in binary format, streaming record batches to the connection as they are encoded.
+
+    A COPY is finished and a new one started every max_bytes, like files are flushed in other batch exports.
+
+    Arguments:
+        record_batches: Record batches with at least the columns in schema_columns.
+        postgres_connection: A connection to Postgres as setup by psycopg.
+        schema: An existing schema where the table is.
+        table_name: The name of the table to copy into.
+        schema_columns: A list of column names.
+        pg_types: The Postgres type of each column in schema_columns, see `is_pgcopy_binary_compatible`.
+        max_bytes: Bytes to copy before finishing a COPY.
+        on_copied: Called with the number of records and bytes copied after each COPY.
+
+    Returns:
+        The number of records copied.
+    """
+    records_total = 0
+    record_batches_iterator = aiter(record_batches)
+    exhausted = False
+
+    async with postgres_connection.cursor() as cursor:
+        if schema:
+            await cursor.execute(sql.SQL("SET search_path TO {schema}").format(schema=sql.Identifier(schema)))
+
+        while not exhausted:
+            records_copied = 0
+            bytes_copied = 0
+
+            async with cursor.copy(
+                sql.SQL("COPY {table_name} ({fields}) FROM STDIN WITH (FORMAT BINARY)").format(
+                    table_name=sql.Identifier(table_name),
+                    fields=sql.SQL(",").join(sql.Identifier(column) for column in schema_columns),
+                )
+            ) as copy:
+                await copy.write(PGCOPY_HEADER)
+
+                while bytes_copied < max_bytes:
+                    try:
+                        record_batch = await anext(record_batches_iterator)
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+
+                    for chunk in iter_pgcopy_chunks(record_batch.select(schema_columns), pg_types):
+                        await copy.write(chunk)
+                        bytes_copied += len(chunk)
+                    records_copied += record_batch.num_rows
+
+                await copy.write(PGCOPY_TRAILER)
+
+            records_total += records_copied
+            if on_copied is not None and records_copied > 0:
+                on_copied(records_copied, bytes_copied)
+
+    return records_total
+
+
 PostgreSQLField = tuple[str, str]
 Fields = collections.abc.Iterable[PostgreSQLField]
 
@@ -321,6 +596,47 @@ async def insert_into_postgres_activity(inputs: PostgresInsertInputs) -> Records
             rows_exported = get_rows_exported_metric()
             bytes_exported = get_bytes_exported_metric()
 
+            async with postgres_connection(inputs) as connection:
+                column_types = await get_postgres_column_types(connection, inputs.schema, inputs.table_name)
+                pg_types = [column_types.get(column, "") for column in schema_columns]
+
+                if all(
+                    is_pgcopy_binary_compatible(first_record_batch.schema.field(column).type, pg_type)
+                    for column, pg_type in zip(schema_columns, pg_types)
+                ):
+
+                    def on_copied(records_copied: int, bytes_copied: int) -> None:
+                        logger.debug("Copied %s records of size %s bytes", records_copied, bytes_copied)
+                        rows_exported.add(records_copied)
+                        # The size of the binary COPY data, which isn't comparable to the TSV size counted below
+                        bytes_exported.add(bytes_copied)
+
+                    async def prepare_record_batches():
+                        async for record_batch in record_iterator:
+                            if "elements" in record_batch.schema.names and inputs.batch_export_schema is None:
+                                elements_index = record_batch.schema.get_field_index("elements")
+                                elements = pa.array(
+                                    [json.dumps(value) for value in record_batch.column(elements_index).to_pylist()],
+                                    type=pa.string(),
+                                )
+                                columns = record_batch.columns
+                                columns[elements_index] = elements
+                                record_batch = pa.RecordBatch.from_arrays(columns, names=record_batch.schema.names)
+
+                            yield record_batch
+
+                    return await copy_record_batches_to_postgres(
+                        prepare_record_batches(),
+                        connection,
+                        inputs.schema,
+                        inputs.table_name,
+                        schema_columns,
+                        pg_types,
+                        max_bytes=settings.BATCH_EXPORT_POSTGRES_UPLOAD_CHUNK_SIZE_BYTES,
+                        on_copied=on_copied,
+                    )
+
+            # The table has columns that we can't encode in binary format, so we fall back to a TSV COPY.
             with BatchExportTemporaryFile() as pg_file:
                 async with postgres_connection(inputs) as connection:
 
@@ -2,11 +2,15 @@ import collections.abc
 import contextlib
 import datetime as dt
 import json
+import posixpath
 import typing
+import uuid
 from dataclasses import dataclass
 
+import aioboto3
 import psycopg
 import pyarrow as pa
+from django.conf import settings
 from psycopg import sql
 from temporalio import activity, workflow
 from temporalio.common import RetryPolicy
@@ -30,6 +34,7 @@ from posthog.temporal.batch_exports.postgres_batch_export import (
     create_table_in_postgres,
     postgres_connection,
 )
+from posthog.temporal.batch_exports.temporary_file import BatchExportTemporaryFile, ParquetBatchExportWriter
 from posthog.temporal.batch_exports.utils import apeek_first_and_rewind, try_set_batch_export_run_to_running
 from posthog.temporal.common.clickhouse import get_client
 from posthog.temporal.common.heartbeat import Heartbeater
@@ -262,15 +267,238 @@ async def async_client_cursor_from_connection(
         psycopg_connection.cursor_factory = current_factory
 
 
+def get_redshift_stage_fields(parquet_schema: pa.Schema) -> list[RedshiftField]:
+    """Generate the fields of a stage table that Redshift can COPY Parquet files with `parquet_schema` into.
+
+    Redshift doesn't convert types when copying Parquet files, so the columns of the stage table have the types
+    of the Parquet columns (e.g. BIGINT for an int64 `team_id`) rather than those of the destination table.
+    Strings are staged as the largest VARCHAR, as TEXT is only 256 bytes in Redshift.
+    """
+    return [
+        (name, "VARCHAR(65535)" if field_type == "TEXT" else field_type)
+        for name, field_type in get_redshift_fields_from_record_schema(parquet_schema, known_super_columns=[])
+    ]
+
+
+class StagingObjectStore(typing.Protocol):
+    """An object store where files are staged for Redshift to COPY them from."""
+
+    def url(self, key: str) -> str:
+        """Return the URL Redshift can COPY the object(s) under `key` from."""
+        ...
+
+    async def upload_file(self, file: BatchExportTemporaryFile | typing.IO[bytes], key: str) -> None: ...
+
+    async def delete_files(self, keys: collections.abc.Sequence[str]) -> None: ...
+
+
+class S3StagingObjectStore:
+    """Stage files in an S3 bucket, or in any S3 compatible store (like MinIO) by setting `endpoint_url`."""
+
+    def __init__(
+        self,
+        bucket_name: str,
+        region_name: str | None = None,
+        aws_access_key_id: str | None = None,
+        aws_secret_access_key: str | None = None,
+        endpoint_url: str | None = None,
+    ):
+        self._session = aioboto3.Session()
+        self.bucket_name = bucket_name
+        self.region_name = region_name
+        self.aws_access_key_id = aws_access_key_id
+        self.aws_secret_access_key = aws_secret_access_key
+        self.endpoint_url = endpoint_url
+
+    @contextlib.asynccontextmanager
+    async def s3_client(self):
+        """Asynchronously yield an S3 client."""
+        async with self._session.client(
+            "s3",
+            region_name=self.region_name,
+            aws_access_key_id=self.aws_access_key_id,
+            aws_secret_access_key=self.aws_secret_access_key,
+            endpoint_url=self.endpoint_url,
+        ) as client:
+            yield client
+
+    def url(self, key: str) -> str:
+        return f"s3://{self.bucket_name}/{key}"
+
+    async def upload_file(self, file: BatchExportTemporaryFile | typing.IO[bytes], key: str) -> None:
+        async with self.s3_client() as s3_client:
+            await s3_client.upload_fileobj(file, self.bucket_name, key)
+
+    async def delete_files(self, keys: collections.abc.Sequence[str]) -> None:
+        async with self.s3_client() as s3_client:
+            # DeleteObjects accepts up to 1000 keys per request.
+            for index in range(0, len(keys), 1000):
+                await s3_client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in keys[index : index + 1000]]},
+                )
+
+
+async def copy_records_to_redshift(
+    record_batches: collections.abc.AsyncGenerator[pa.RecordBatch, None],
+    redshift_connection: psycopg.AsyncConnection,
+    schema: str | None,
+    table: str,
+    table_fields: list[RedshiftField],
+    object_store: StagingObjectStore,
+    key_prefix: str,
+    authorization: sql.Composable,
+    region: str | None = None,
+    max_bytes: int | None = None,
+) -> int:
+    """Stage record batches as Parquet files in an object store and load them into Redshift with a COPY.
+
+    The files are loaded into a temporary table that matches the Parquet files, as Redshift maps columns of
+    columnar formats by position and requires their types to match, and then inserted into the destination table
+    from there, casting each column to its type. This also lets us parse SUPER columns with JSON_PARSE, as a COPY
+    of a Parquet string into a SUPER column only loads a string. For the same reason, SUPER values are limited to
+    the maximum size of a VARCHAR: 65535 bytes.
+
+    Staged files are deleted once the COPY is done, whether it succeeded or not.
+
+    Arguments:
+        record_batches: The record batches to export. Must include an `_inserted_at` column and all of
+            the columns in `table_fields`.
+        redshift_connection: A connection to Redshift setup by psycopg.
+        schema: The schema that contains the table where to insert the records.
+        table: The name of the table where to insert the records.
+        table_fields: The (name, type) tuples of the columns to insert to.
+        object_store: Where to stage the Parquet files. Redshift must be able to read from it.
+        key_prefix: A prefix for the keys of staged files. Every call stages its files under a new
+            unique prefix within it, so that a COPY never loads files from a different call.
+        authorization: The authorization parameters of the COPY, like an IAM_ROLE or access keys.
+        region: The region of the object store, if different from the region of the Redshift cluster.
+        max_bytes: The maximum size of each staged file, defaults to BATCH_EXPORT_REDSHIFT_UPLOAD_CHUNK_SIZE_BYTES.
+            Multiple files can be loaded in parallel by the slices of the cluster.
+    """
+    first_record_batch, record_batches = await apeek_first_and_rewind(record_batches)
+    if first_record_batch is None:
+        return 0
+
+    column_names = [name for name, _ in table_fields]
+    parquet_schema = pa.schema(
+        [first_record_batch.schema.field(name).with_nullable(True) for name in column_names],
+    )
+    stage_prefix = posixpath.join(key_prefix, str(uuid.uuid4()), "")
+    staged_keys: list[str] = []
+    rows_exported = get_rows_exported_metric()
+
+    async def flush_to_object_store(
+        batch_export_file: BatchExportTemporaryFile,
+        records_since_last_flush: int,
+        bytes_since_last_flush: int,
+        last_inserted_at: dt.datetime,
+        last: bool,
+    ):
+        key = f"{stage_prefix}{len(staged_keys):06}.parquet"
+        await object_store.upload_file(batch_export_file, key)
+        staged_keys.append(key)
+
+    writer = ParquetBatchExportWriter(
+        max_bytes=max_bytes or settings.BATCH_EXPORT_REDSHIFT_UPLOAD_CHUNK_SIZE_BYTES,
+        flush_callable=flush_to_object_store,
+        schema=parquet_schema,
+        complete_file_on_flush=True,
+    )
+
+    try:
+        async with writer.open_temporary_file():
+            async for record_batch in record_batches:
+                await writer.write_record_batch(record_batch)
+
+        if schema:
+            table_identifier = sql.Identifier(schema, table)
+        else:
+            table_identifier = sql.Identifier(table)
+        stage_table_identifier = sql.Identifier(f"stage_{table}_{uuid.uuid4().hex[:8]}")
+
+        async with redshift_connection.cursor() as cursor:
+            await cursor.execute(
+                sql.SQL("CREATE TEMPORARY TABLE {table} ({fields})").format(
+                    table=stage_table_identifier,
+                    fields=sql.SQL(",").join(
+                        sql.SQL("{field} {type}").format(field=sql.Identifier(field), type=sql.SQL(field_type))
+                        for field, field_type in get_redshift_stage_fields(parquet_schema)
+                    ),
+                )
+            )
+            await cursor.execute(
+                sql.SQL("COPY {table} FROM {url} {authorization} {region} FORMAT AS PARQUET").format(
+                    table=stage_table_identifier,
+                    url=sql.Literal(object_store.url(stage_prefix)),
+                    authorization=authorization,
+                    region=sql.SQL("REGION {}").format(sql.Literal(region)) if region else sql.SQL(""),
+                )
+            )
+            await cursor.execute(
+                sql.SQL("INSERT INTO {table} ({fields}) SELECT {values} FROM {stage_table}").format(
+                    table=table_identifier,
+                    fields=sql.SQL(", ").join(map(sql.Identifier, column_names)),
+                    values=sql.SQL(", ").join(
+                        sql.SQL("JSON_PARSE({})").format(sql.Identifier(field))
+                        if field_type == "SUPER"
+                        else sql.SQL("CAST({field} AS {type})").format(
+                            field=sql.Identifier(field), type=sql.SQL(field_type)
+                        )
+                        for field, field_type in table_fields
+                    ),
+                    stage_table=stage_table_identifier,
+                )
+            )
+            await cursor.execute(sql.SQL("DROP TABLE {table}").format(table=stage_table_identifier))
+
+    finally:
+        if staged_keys:
+            await object_store.delete_files(staged_keys)
+
+    rows_exported.add(writer.records_total)
+    return writer.records_total
+
+
+class MissingS3StagingCredentialsError(Exception):
+    """Raised when an S3 staging bucket is configured without an IAM role or access keys for Redshift to read it."""
+
+    def __init__(self, bucket_name: str | None):
+        super().__init__(
+            f"Redshift needs an IAM role or an access key ID and secret access key to COPY from S3 staging bucket "
+            f"'{bucket_name}', but none are configured"
+        )
+
+
 @dataclass
 class RedshiftInsertInputs(PostgresInsertInputs):
     """Inputs for Redshift insert activity.
 
     Inherit from PostgresInsertInputs as they are the same, but allow
-    for setting property_data_type which is unique to Redshift.
+    for setting property_data_type and an S3 staging bucket, which are unique to Redshift.
     """
 
     properties_data_type: str = "varchar"
+    s3_staging_bucket_name: str | None = None
+    s3_staging_region: str | None = None
+    s3_staging_key_prefix: str = ""
+    s3_staging_aws_access_key_id: str | None = None
+    s3_staging_aws_secret_access_key: str | None = None
+    s3_staging_iam_role: str | None = None
+    s3_staging_endpoint_url: str | None = None
+
+
+def get_copy_authorization(inputs: RedshiftInsertInputs) -> sql.Composable:
+    """Return the parameters of a COPY for Redshift to authorize with when reading the S3 staging bucket."""
+    if inputs.s3_staging_iam_role:
+        return sql.SQL("IAM_ROLE {}").format(sql.Literal(inputs.s3_staging_iam_role))
+
+    if not inputs.s3_staging_aws_access_key_id or not inputs.s3_staging_aws_secret_access_key:
+        raise MissingS3StagingCredentialsError(inputs.s3_staging_bucket_name)
+
+    return sql.SQL("ACCESS_KEY_ID {} SECRET_ACCESS_KEY {}").format(
+        sql.Literal(inputs.s3_staging_aws_access_key_id), sql.Literal(inputs.s3_staging_aws_secret_access_key)
+    )
 
 
 @activity.defn
@@ -281,7 +509,7 @@ async def insert_into_redshift_activity(inputs: RedshiftInsertInputs) -> Records
     1. Check if anything is to be exported.
     2. Create destination table if not present.
     3. Query rows to export.
-    4. Insert rows into Redshift.
+    4. Insert rows into Redshift, or stage them in S3 and COPY them if a staging bucket is configured.
 
     Args:
         inputs: The dataclass holding inputs for this activity. The inputs
@@ -367,6 +595,32 @@ async def insert_into_redshift_activity(inputs: RedshiftInsertInputs) -> Records
                     fields=table_fields,
                 )
 
+            if inputs.s3_staging_bucket_name is not None:
+                # Fail before exporting anything if Redshift won't be able to read what we stage
+                authorization = get_copy_authorization(inputs)
+                object_store = S3StagingObjectStore(
+                    bucket_name=inputs.s3_staging_bucket_name,
+                    region_name=inputs.s3_staging_region,
+                    aws_access_key_id=inputs.s3_staging_aws_access_key_id,
+                    aws_secret_access_key=inputs.s3_staging_aws_secret_access_key,
+                    endpoint_url=inputs.s3_staging_endpoint_url,
+                )
+
+                async with redshift_connection(inputs) as connection:
+                    records_completed = await copy_records_to_redshift(
+                        record_iterator,
+                        connection,
+                        inputs.schema,
+                        inputs.table_name,
+                        table_fields=table_fields,
+                        object_store=object_store,
+                        key_prefix=posixpath.join(inputs.s3_staging_key_prefix, str(inputs.team_id)),
+                        authorization=authorization,
+                        region=inputs.s3_staging_region,
+                    )
+
+                return records_completed
+
             schema_columns = {field[0] for field in table_fields}
 
             def map_to_record(row: dict) -> dict:
@@ -462,6 +716,13 @@ class RedshiftBatchExportWorkflow(PostHogWorkflow):
             exclude_events=inputs.exclude_events,
             include_events=inputs.include_events,
             properties_data_type=inputs.properties_data_type,
+            s3_staging_bucket_name=inputs.s3_staging_bucket_name,
+            s3_staging_region=inputs.s3_staging_region,
+            s3_staging_key_prefix=inputs.s3_staging_key_prefix,
+            s3_staging_aws_access_key_id=inputs.s3_staging_aws_access_key_id,
+            s3_staging_aws_secret_access_key=inputs.s3_staging_aws_secret_access_key,
+            s3_staging_iam_role=inputs.s3_staging_iam_role,
+            s3_staging_endpoint_url=inputs.s3_staging_endpoint_url,
             batch_export_schema=inputs.batch_export_schema,
             run_id=run_id,
             is_backfill=inputs.is_backfill,
@@ -479,6 +740,8 @@ class RedshiftBatchExportWorkflow(PostHogWorkflow):
                 "InvalidSchemaName",
                 # Missing permissions to, e.g., insert into table.
                 "InsufficientPrivilege",
+                # An S3 staging bucket is configured without credentials for Redshift to read it.
+                "MissingS3StagingCredentialsError",
             ],
             finish_inputs=finish_inputs,
         )
@@ -512,6 +512,9 @@ class ParquetBatchExportWriter(BatchExportWriter):
     Attributes:
         schema: The schema used by the Parquet file. Should match the schema of written RecordBatches.
         compression: Compression codec passed to underlying `pyarrow.parquet.ParquetWriter`.
+        complete_file_on_flush: Write the Parquet footer before every flush, so that each flushed file is
+            a complete Parquet file on its own, instead of a part of a single file. Required by destinations
+            that load files individually, like a COPY from S3.
     """
 
     def __init__(
@@ -520,6 +523,7 @@ class ParquetBatchExportWriter(BatchExportWriter):
         flush_callable: FlushCallable,
         schema: pa.Schema,
         compression: str | None = "snappy",
+        complete_file_on_flush: bool = False,
     ):
         super().__init__(
             max_bytes=max_bytes,
@@ -528,6 +532,7 @@ class ParquetBatchExportWriter(BatchExportWriter):
         )
         self.schema = schema
         self.compression = compression
+        self.complete_file_on_flush = complete_file_on_flush
 
         self._parquet_writer: pq.ParquetWriter | None = None
 
@@ -552,6 +557,18 @@ class ParquetBatchExportWriter(BatchExportWriter):
                     self._parquet_writer.writer.close()
                     self._parquet_writer = None
 
+    async def flush(self, last_inserted_at: dt.datetime, is_last: bool = False) -> None:
+        """Close the current Parquet file before flushing it if each flush should be a complete file.
+
+        A new Parquet writer, and with it a new file, will be started on the next write.
+        """
+        if self.complete_file_on_flush is True and self._parquet_writer is not None:
+            self._parquet_writer.writer.close()
+            self._parquet_writer = None
+            self.track_bytes_written(self.batch_export_file)
+
+        await super().flush(last_inserted_at, is_last)
+
     def _write_record_batch(self, record_batch: pa.RecordBatch) -> None:
         """Write records to a temporary file as Parquet."""
 
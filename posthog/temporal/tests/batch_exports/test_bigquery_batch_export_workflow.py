@@ -1,5 +1,6 @@
 import asyncio
 import datetime as dt
+import io
 import json
 import operator
 import os
@@ -8,6 +9,7 @@ from random import randint
 from uuid import uuid4
 
 import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 import pytest_asyncio
 from django.conf import settings
@@ -31,6 +33,7 @@ from posthog.temporal.batch_exports.bigquery_batch_export import (
     bigquery_default_fields,
     get_bigquery_fields_from_record_schema,
     insert_into_bigquery_activity,
+    load_records_to_bigquery_table,
 )
 from posthog.temporal.common.clickhouse import ClickHouseClient
 from posthog.temporal.tests.batch_exports.utils import mocked_start_batch_export_run
@@ -722,3 +725,129 @@ def test_get_bigquery_fields_from_record_schema(pyrecords, expected_schema):
     schema = get_bigquery_fields_from_record_schema(record_batch.schema, known_json_columns=[])
 
     assert schema == expected_schema
+
+
+class FakeLoadJob:
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+
+    def result(self):
+        if self.error is not None:
+            raise self.error
+
+
+class FakeBigQueryClient:
+    """A fake `bigquery.Client` that keeps the contents of every loaded file."""
+
+    def __init__(self, fail_on_load: int | None = None):
+        self.loaded_files: list[tuple[str, bytes]] = []
+        self.fail_on_load = fail_on_load
+
+    def load_table_from_file(self, file, table, job_config, rewind=False):
+        if rewind:
+            file.seek(0)
+        self.loaded_files.append((job_config.source_format, file.read()))
+
+        if len(self.loaded_files) == self.fail_on_load:
+            return FakeLoadJob(error=ValueError("Load failed"))
+        return FakeLoadJob()
+
+
+def make_record_batches(batches: int, records_per_batch: int) -> list[pa.RecordBatch]:
+    inserted_at = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+    record_batches = []
+
+    for batch in range(batches):
+        indexes = range(batch * records_per_batch, (batch + 1) * records_per_batch)
+        record_batches.append(
+            pa.RecordBatch.from_pydict(
+                {
+                    "event": [f"event-{index}" for index in indexes],
+                    "properties": [json.dumps({"index": index}) for index in indexes],
+                    "timestamp": pa.array(
+                        [inserted_at + dt.timedelta(seconds=index) for index in indexes], type=pa.timestamp("ns")
+                    ),
+                    "_inserted_at": [inserted_at + dt.timedelta(seconds=index) for index in indexes],
+                }
+            )
+        )
+
+    return record_batches
+
+
+async def aiter_record_batches(record_batches: list[pa.RecordBatch]):
+    for record_batch in record_batches:
+        yield record_batch
+
+
+@pytest.mark.parametrize("max_concurrent_loads", [1, 3])
+@pytest.mark.parametrize("use_json_type", [False, True], indirect=True)
+async def test_load_records_to_bigquery_table_with_fake_client(use_json_type, max_concurrent_loads):
+    """Test records are loaded as Parquet, or as JSONL into JSON columns, and progress is reported in order."""
+    table_schema = [
+        bigquery.SchemaField("event", "STRING"),
+        bigquery.SchemaField("properties", "JSON" if use_json_type else "STRING"),
+        bigquery.SchemaField("timestamp", "TIMESTAMP"),
+    ]
+    record_batches = make_record_batches(batches=10, records_per_batch=100)
+    client = FakeBigQueryClient()
+    loaded = []
+
+    records_total = await load_records_to_bigquery_table(
+        aiter_record_batches(record_batches),
+        bigquery.Table("project.dataset.table"),
+        table_schema,
+        client,  # type: ignore[arg-type]
+        json_columns=["properties"],
+        max_bytes=1,
+        max_concurrent_loads=max_concurrent_loads,
+        on_loaded=lambda records, _, last_inserted_at: loaded.append((records, last_inserted_at)),
+    )
+
+    assert records_total == 1000
+    assert len(client.loaded_files) == len(loaded) == 10
+    assert [last_inserted_at for _, last_inserted_at in loaded] == [
+        record_batch.column("_inserted_at")[-1].as_py() for record_batch in record_batches
+    ]
+
+    if use_json_type is True:
+        assert all(source_format == "NEWLINE_DELIMITED_JSON" for source_format, _ in client.loaded_files)
+        first_record = json.loads(client.loaded_files[0][1].splitlines()[0])
+        assert list(first_record.keys()) == ["event", "properties", "timestamp"]
+        assert first_record["properties"] == {"index": 0}
+
+    else:
+        assert all(source_format == "PARQUET" for source_format, _ in client.loaded_files)
+        tables = [pq.read_table(io.BytesIO(contents)) for _, contents in client.loaded_files]
+        assert sum(table.num_rows for table in tables) == 1000
+        assert tables[0].schema.names == ["event", "properties", "timestamp"]
+        assert tables[0].schema.field("timestamp").type == pa.timestamp("us", tz="UTC")
+        assert tables[0].column("properties")[0].as_py() == json.dumps({"index": 0})
+
+
+async def test_load_records_to_bigquery_table_raises_load_errors():
+    """Test a failed load job fails the whole load, and no progress is reported past it."""
+    table_schema = [
+        bigquery.SchemaField("event", "STRING"),
+        bigquery.SchemaField("properties", "STRING"),
+        bigquery.SchemaField("timestamp", "TIMESTAMP"),
+    ]
+    record_batches = make_record_batches(batches=10, records_per_batch=100)
+    client = FakeBigQueryClient(fail_on_load=2)
+    loaded = []
+
+    with pytest.raises(ValueError):
+        await load_records_to_bigquery_table(
+            aiter_record_batches(record_batches),
+            bigquery.Table("project.dataset.table"),
+            table_schema,
+            client,  # type: ignore[arg-type]
+            max_bytes=1,
+            max_concurrent_loads=3,
+            on_loaded=lambda records, _, last_inserted_at: loaded.append(last_inserted_at),
+        )
+
+    # Loads run concurrently, so any of the first loads could be the one that failed.
+    expected_loaded = [record_batch.column("_inserted_at")[-1].as_py() for record_batch in record_batches]
+    assert len(loaded) < len(expected_loaded)
+    assert loaded == expected_loaded[: len(loaded)]
@@ -5,11 +5,14 @@ import uuid
 from random import randint
 
 import psycopg
+import pyarrow as pa
 import pytest
 import pytest_asyncio
 from django.conf import settings
 from django.test import override_settings
-from psycopg import sql
+from psycopg import adapt, postgres, pq, sql
+from psycopg.copy import format_row_binary
+from psycopg.types.json import Jsonb
 from temporalio import activity
 from temporalio.client import WorkflowFailureError
 from temporalio.common import RetryPolicy
@@ -26,7 +29,12 @@ from posthog.temporal.batch_exports.postgres_batch_export import (
     PostgresBatchExportInputs,
     PostgresBatchExportWorkflow,
     PostgresInsertInputs,
+    copy_record_batches_to_postgres,
+    create_table_in_postgres,
+    encode_record_batch_as_pgcopy,
+    get_postgres_column_types,
     insert_into_postgres_activity,
+    is_pgcopy_binary_compatible,
     postgres_default_fields,
 )
 from posthog.temporal.common.clickhouse import ClickHouseClient
@@ -612,3 +620,132 @@ async def test_postgres_export_workflow_handles_cancellation(ateam, postgres_bat
     assert run.status == "Cancelled"
     assert run.latest_error == "Cancelled"
     assert run.records_completed is None
+
+
+PGCOPY_TEST_TIMESTAMP = dt.datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=dt.timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "array,pg_type,psycopg_type",
+    [
+        (pa.array(["a", "", None, "héllo"]), "text", "text"),
+        (pa.array(["a", None], type=pa.large_string()), "character varying", "varchar"),
+        (pa.array(['{"a": 1}', None, "[]", '"x"']), "jsonb", "jsonb"),
+        (pa.array([1, None, -3, 2**31 - 1], type=pa.int64()), "integer", "int4"),
+        (pa.array([10, None, -30, 2**40], type=pa.int64()), "bigint", "int8"),
+        (pa.array([1, 2, None, -4], type=pa.int8()), "smallint", "int2"),
+        (pa.array([1.5, None, -2.25, 0.0]), "double precision", "float8"),
+        (pa.array([1.5, None, -2.25, 0.0]), "real", "float4"),
+        (pa.array([True, False, None, True]), "boolean", "bool"),
+        (
+            pa.array([PGCOPY_TEST_TIMESTAMP, None], type=pa.timestamp("ns", tz="UTC")),
+            "timestamp with time zone",
+            "timestamptz",
+        ),
+        (
+            pa.array([PGCOPY_TEST_TIMESTAMP.replace(tzinfo=None), dt.datetime(1990, 1, 1)], type=pa.timestamp("us")),
+            "timestamp without time zone",
+            "timestamp",
+        ),
+        (pa.array([b"\x00\x01", None, b""], type=pa.binary()), "bytea", "bytea"),
+    ],
+)
+def test_encode_record_batch_as_pgcopy_matches_psycopg(array, pg_type, psycopg_type):
+    """Test our column-wise binary encoding matches the row by row encoding of psycopg, also for slices."""
+    record_batch = pa.RecordBatch.from_arrays([array, pa.array(range(len(array)), type=pa.int64())], ["value", "id"])
+    transformer = adapt.Transformer()
+    transformer.set_dumper_types([postgres.types[psycopg_type].oid, postgres.types["int8"].oid], pq.Format.BINARY)
+
+    expected = bytearray()
+    for row in record_batch.to_pylist():
+        value = row["value"]
+        if pg_type == "jsonb" and value is not None:
+            value = Jsonb(value, dumps=lambda obj: obj)
+        format_row_binary([value, row["id"]], transformer, expected)
+
+    assert is_pgcopy_binary_compatible(array.type, pg_type)
+    assert encode_record_batch_as_pgcopy(record_batch, [pg_type, "bigint"]) == expected
+    assert (
+        encode_record_batch_as_pgcopy(record_batch.slice(1), [pg_type, "bigint"])
+        == expected[len(encode_record_batch_as_pgcopy(record_batch.slice(0, 1), [pg_type, "bigint"])) :]
+    )
+
+
+def test_encode_record_batch_as_pgcopy_truncates_nanoseconds():
+    """Test timestamps with nanoseconds are truncated to the microseconds Postgres keeps, also before 1970."""
+    nanoseconds = pa.array([1_704_164_645_678_901_234, -1_500, None], type=pa.int64())
+    microseconds = pa.array([1_704_164_645_678_901, -2, None], type=pa.int64())
+    record_batch = pa.RecordBatch.from_arrays([nanoseconds.cast(pa.timestamp("ns", tz="UTC"))], ["value"])
+    expected = pa.RecordBatch.from_arrays([microseconds.cast(pa.timestamp("us", tz="UTC"))], ["value"])
+
+    assert encode_record_batch_as_pgcopy(record_batch, ["timestamp with time zone"]) == encode_record_batch_as_pgcopy(
+        expected, ["timestamp with time zone"]
+    )
+
+
+async def test_copy_record_batches_to_postgres(postgres_connection, postgres_config):
+    """Test records copied in binary format over multiple COPY queries are read back as they were written."""
+    table_name = f"test_binary_copy_{uuid.uuid4().hex}"
+    fields = [
+        ("event", "VARCHAR(200)"),
+        ("properties", "JSONB"),
+        ("team_id", "INTEGER"),
+        ("timestamp", "TIMESTAMP WITH TIME ZONE"),
+    ]
+    await create_table_in_postgres(postgres_connection, postgres_config["schema"], table_name, fields)
+
+    record_batches = [
+        pa.RecordBatch.from_pydict(
+            {
+                "event": [f"event-{batch}-{index}" for index in range(100)],
+                "properties": [json.dumps({"index": index}) if index % 7 else None for index in range(100)],
+                "team_id": pa.array([batch] * 100, type=pa.int32()),
+                "timestamp": [PGCOPY_TEST_TIMESTAMP + dt.timedelta(seconds=index) for index in range(100)],
+                "_inserted_at": [PGCOPY_TEST_TIMESTAMP] * 100,
+            }
+        )
+        for batch in range(5)
+    ]
+
+    async def aiter_record_batches():
+        for record_batch in record_batches:
+            yield record_batch
+
+    column_types = await get_postgres_column_types(postgres_connection, postgres_config["schema"], table_name)
+    schema_columns = [field[0] for field in fields]
+    copied = []
+
+    records_total = await copy_record_batches_to_postgres(
+        aiter_record_batches(),
+        postgres_connection,
+        postgres_config["schema"],
+        table_name,
+        schema_columns,
+        [column_types[column] for column in schema_columns],
+        max_bytes=1,
+        on_copied=lambda records, _: copied.append(records),
+    )
+    await postgres_connection.commit()
+
+    assert records_total == 500
+    assert copied == [100] * 5
+
+    async with postgres_connection.cursor() as cursor:
+        await cursor.execute(
+            sql.SQL("SELECT event, properties, team_id, timestamp FROM {} ORDER BY team_id, timestamp").format(
+                sql.Identifier(postgres_config["schema"], table_name)
+            )
+        )
+        inserted = await cursor.fetchall()
+
+    expected = [
+        (
+            record["event"],
+            json.loads(record["properties"]) if record["properties"] is not None else None,
+            record["team_id"],
+            record["timestamp"],
+        )
+        for record_batch in record_batches
+        for record in record_batch.to_pylist()
+    ]
+    assert inserted == expected
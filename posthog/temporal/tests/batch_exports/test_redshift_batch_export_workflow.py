@@ -1,4 +1,6 @@
+import contextlib
 import datetime as dt
+import io
 import json
 import operator
 import os
@@ -6,7 +8,10 @@ import warnings
 from random import randint
 from uuid import uuid4
 
+import aioboto3
 import psycopg
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 import pytest_asyncio
 from django.conf import settings
@@ -27,7 +32,11 @@ from posthog.temporal.batch_exports.batch_exports import (
 from posthog.temporal.batch_exports.redshift_batch_export import (
     RedshiftBatchExportInputs,
     RedshiftBatchExportWorkflow,
+    MissingS3StagingCredentialsError,
     RedshiftInsertInputs,
+    S3StagingObjectStore,
+    copy_records_to_redshift,
+    get_copy_authorization,
     insert_into_redshift_activity,
     redshift_default_fields,
     remove_escaped_whitespace_recursive,
@@ -49,6 +58,16 @@ REQUIRED_ENV_VARS = (
 
 MISSING_REQUIRED_ENV_VARS = any(env_var not in os.environ for env_var in REQUIRED_ENV_VARS)
 
+# A COPY needs an actual Redshift cluster, and a bucket it can read from.
+REQUIRED_S3_STAGING_ENV_VARS = (
+    "REDSHIFT_S3_STAGING_BUCKET_NAME",
+    "REDSHIFT_S3_STAGING_IAM_ROLE",
+)
+
+MISSING_REQUIRED_S3_STAGING_ENV_VARS = MISSING_REQUIRED_ENV_VARS or any(
+    env_var not in os.environ for env_var in REQUIRED_S3_STAGING_ENV_VARS
+)
+
 
 pytestmark = [pytest.mark.django_db, pytest.mark.asyncio]
 
@@ -65,6 +84,7 @@ async def assert_clickhouse_records_in_redshfit(
     exclude_events: list[str] | None = None,
     include_events: list[str] | None = None,
     use_super_type: bool = False,
+    copied_from_s3: bool = False,
 ):
     """Assert expected records are written to a given Redshift table.
 
@@ -88,6 +108,8 @@ async def assert_clickhouse_records_in_redshfit(
         table_name: Redshift table name.
         team_id: The ID of the team that we are testing events for.
         batch_export_schema: Custom schema used in the batch export.
+        copied_from_s3: Whether records were loaded with a COPY, which keeps JSON values as they are
+            instead of removing escaped whitespace from them.
     """
     inserted_records = []
 
@@ -125,7 +147,7 @@ async def assert_clickhouse_records_in_redshfit(
                     # _inserted_at is not exported, only used for tracking progress.
                     continue
 
-                if k in super_columns and v is not None:
+                if k in super_columns and v is not None and not copied_from_s3:
                     expected_record[k] = json.dumps(
                         remove_escaped_whitespace_recursive(json.loads(v)), ensure_ascii=False
                     )
@@ -320,6 +342,246 @@ async def test_insert_into_redshift_activity_inserts_data_into_redshift_table(
     )
 
 
+@pytest.mark.skipif(
+    MISSING_REQUIRED_S3_STAGING_ENV_VARS,
+    reason="Redshift and an S3 staging bucket required to test COPY",
+)
+@pytest.mark.parametrize("exclude_events", [None], indirect=True)
+@pytest.mark.parametrize("batch_export_schema", TEST_SCHEMAS)
+async def test_insert_into_redshift_activity_copies_data_from_s3_staging_bucket(
+    clickhouse_client, activity_environment, psycopg_connection, redshift_config, exclude_events, batch_export_schema
+):
+    """Test that the insert_into_redshift_activity function stages data in S3 and copies it into Redshift."""
+    data_interval_start = dt.datetime(2023, 4, 20, 14, 0, 0, tzinfo=dt.timezone.utc)
+    data_interval_end = dt.datetime(2023, 4, 25, 15, 0, 0, tzinfo=dt.timezone.utc)
+    team_id = randint(1, 1000000)
+
+    await generate_test_events_in_clickhouse(
+        client=clickhouse_client,
+        team_id=team_id,
+        start_time=data_interval_start,
+        end_time=data_interval_end,
+        count=1000,
+        count_outside_range=10,
+        count_other_team=10,
+        duplicate=True,
+        properties={"$browser": "Chrome", "$os": "Mac OS X", "multi-byte": "é"},
+        person_properties={"utm_medium": "referral", "$initial_os": "Linux"},
+    )
+
+    insert_inputs = RedshiftInsertInputs(
+        team_id=team_id,
+        table_name="test_copy_table",
+        data_interval_start=data_interval_start.isoformat(),
+        data_interval_end=data_interval_end.isoformat(),
+        exclude_events=exclude_events,
+        batch_export_schema=batch_export_schema,
+        s3_staging_bucket_name=os.environ["REDSHIFT_S3_STAGING_BUCKET_NAME"],
+        s3_staging_region=os.environ.get("REDSHIFT_S3_STAGING_REGION", None),
+        s3_staging_key_prefix=f"test-copy-{uuid4()}",
+        s3_staging_iam_role=os.environ["REDSHIFT_S3_STAGING_IAM_ROLE"],
+        **redshift_config,
+    )
+
+    with override_settings(BATCH_EXPORT_REDSHIFT_UPLOAD_CHUNK_SIZE_BYTES=1024**2):
+        await activity_environment.run(insert_into_redshift_activity, insert_inputs)
+
+    await assert_clickhouse_records_in_redshfit(
+        redshift_connection=psycopg_connection,
+        clickhouse_client=clickhouse_client,
+        schema_name=redshift_config["schema"],
+        table_name="test_copy_table",
+        team_id=team_id,
+        data_interval_start=data_interval_start,
+        data_interval_end=data_interval_end,
+        batch_export_schema=batch_export_schema,
+        exclude_events=exclude_events,
+        copied_from_s3=True,
+    )
+
+
+@pytest_asyncio.fixture
+async def minio_bucket_name():
+    """Create a MinIO bucket to stand in for the S3 staging bucket, and delete it afterwards."""
+    bucket_name = f"test-redshift-staging-{uuid4()}"
+
+    async with aioboto3.Session().client(
+        "s3",
+        endpoint_url=settings.OBJECT_STORAGE_ENDPOINT,
+        aws_access_key_id="object_storage_root_user",
+        aws_secret_access_key="object_storage_root_password",
+    ) as minio_client:
+        await minio_client.create_bucket(Bucket=bucket_name)
+
+        yield bucket_name
+
+        response = await minio_client.list_objects_v2(Bucket=bucket_name)
+        for obj in response.get("Contents", []):
+            await minio_client.delete_object(Bucket=bucket_name, Key=obj["Key"])
+        await minio_client.delete_bucket(Bucket=bucket_name)
+
+
+async def test_s3_staging_object_store_uploads_and_deletes_files(minio_bucket_name):
+    """Test staged files can be read back as Parquet, and that they are all deleted afterwards."""
+    object_store = S3StagingObjectStore(
+        bucket_name=minio_bucket_name,
+        endpoint_url=settings.OBJECT_STORAGE_ENDPOINT,
+        aws_access_key_id="object_storage_root_user",
+        aws_secret_access_key="object_storage_root_password",
+    )
+    table = pa.table({"event": ["test-event-0", "test-event-1"], "team_id": pa.array([1, 2], type=pa.int32())})
+    keys = [f"staging/{index}.parquet" for index in range(2)]
+
+    for key in keys:
+        parquet_file = io.BytesIO()
+        pq.write_table(table, parquet_file)
+        parquet_file.seek(0)
+        await object_store.upload_file(parquet_file, key)
+
+    assert object_store.url("staging/") == f"s3://{minio_bucket_name}/staging/"
+
+    async with object_store.s3_client() as s3_client:
+        for key in keys:
+            response = await s3_client.get_object(Bucket=minio_bucket_name, Key=key)
+            assert pq.read_table(io.BytesIO(await response["Body"].read())) == table
+
+        await object_store.delete_files(keys)
+
+        response = await s3_client.list_objects_v2(Bucket=minio_bucket_name)
+        assert "Contents" not in response
+
+
+class RecordingObjectStore:
+    """A staging object store that reads back staged Parquet files instead of uploading them."""
+
+    def __init__(self):
+        self.tables: dict[str, pa.Table] = {}
+        self.deleted_keys: list[str] = []
+
+    def url(self, key: str) -> str:
+        return f"s3://staging-bucket/{key}"
+
+    async def upload_file(self, file, key: str) -> None:
+        file.seek(0)
+        self.tables[key] = pq.read_table(io.BytesIO(file.read()))
+
+    async def delete_files(self, keys) -> None:
+        self.deleted_keys.extend(keys)
+
+
+class RecordingRedshiftConnection:
+    """A Redshift connection that only records the queries executed on it."""
+
+    def __init__(self):
+        self.queries: list[str] = []
+
+    @contextlib.asynccontextmanager
+    async def cursor(self):
+        yield self
+
+    async def execute(self, query: sql.Composable) -> None:
+        self.queries.append(render_query(query))
+
+
+def render_query(query: sql.Composable) -> str:
+    """Render a query as psycopg would, without the connection that it needs to quote identifiers."""
+    if isinstance(query, sql.Composed):
+        return "".join(render_query(part) for part in query)
+    if isinstance(query, sql.Identifier):
+        return ".".join('"{}"'.format(part.replace('"', '""')) for part in query._obj)
+    return query.as_string(None)
+
+
+async def test_copy_records_to_redshift_stages_parquet_types_and_casts_them(activity_environment):
+    """Test the stage table has the types of the Parquet files, which are cast when inserting into the table."""
+    record_batch = pa.RecordBatch.from_pydict(
+        {
+            "event": ["test-event"],
+            "properties": ['{"$browser": "Chrome"}'],
+            "team_id": pa.array([1], type=pa.int64()),
+            "timestamp": pa.array(
+                [dt.datetime(2023, 4, 20, 14, tzinfo=dt.timezone.utc)], type=pa.timestamp("us", tz="UTC")
+            ),
+            "_inserted_at": pa.array(
+                [dt.datetime(2023, 4, 20, 14, tzinfo=dt.timezone.utc)], type=pa.timestamp("us", tz="UTC")
+            ),
+        }
+    )
+
+    async def record_batches():
+        yield record_batch
+
+    object_store = RecordingObjectStore()
+    connection = RecordingRedshiftConnection()
+
+    records_completed = await activity_environment.run(
+        copy_records_to_redshift,
+        record_batches(),
+        connection,  # type: ignore
+        "exports",
+        "events",
+        table_fields=[
+            ("event", "VARCHAR(200)"),
+            ("properties", "SUPER"),
+            ("team_id", "INTEGER"),
+            ("timestamp", "TIMESTAMP WITH TIME ZONE"),
+        ],
+        object_store=object_store,
+        key_prefix="prefix",
+        authorization=sql.SQL("IAM_ROLE {}").format(sql.Literal("arn:aws:iam::123:role/redshift")),
+        region="us-east-2",
+    )
+
+    assert records_completed == 1
+    (key,) = object_store.tables
+    assert object_store.tables[key].schema.types == [pa.string(), pa.string(), pa.int64(), pa.timestamp("us", tz="UTC")]
+    assert object_store.deleted_keys == [key]
+
+    create_stage_table, copy, insert, drop_stage_table = connection.queries
+    stage_table = create_stage_table.split()[3]
+    stage_prefix = key.rsplit("/", 1)[0] + "/"
+    assert create_stage_table == (
+        f"CREATE TEMPORARY TABLE {stage_table} "
+        '("event" VARCHAR(65535),"properties" VARCHAR(65535),"team_id" BIGINT,"timestamp" TIMESTAMPTZ)'
+    )
+    assert copy == (
+        f"COPY {stage_table} FROM 's3://staging-bucket/{stage_prefix}' "
+        "IAM_ROLE 'arn:aws:iam::123:role/redshift' REGION 'us-east-2' FORMAT AS PARQUET"
+    )
+    assert insert == (
+        'INSERT INTO "exports"."events" ("event", "properties", "team_id", "timestamp") '
+        'SELECT CAST("event" AS VARCHAR(200)), JSON_PARSE("properties"), CAST("team_id" AS INTEGER), '
+        f'CAST("timestamp" AS TIMESTAMP WITH TIME ZONE) FROM {stage_table}'
+    )
+    assert drop_stage_table == f"DROP TABLE {stage_table}"
+
+
+def test_get_copy_authorization_requires_credentials():
+    """Test a COPY can't be attempted without an IAM role or access keys for Redshift to read the staging bucket."""
+    inputs = RedshiftInsertInputs(
+        team_id=1,
+        user="user",
+        password="password",
+        host="host",
+        database="dev",
+        schema="exports",
+        table_name="events",
+        data_interval_start="2023-04-20T14:00:00+00:00",
+        data_interval_end="2023-04-20T15:00:00+00:00",
+        s3_staging_bucket_name="staging-bucket",
+    )
+
+    with pytest.raises(MissingS3StagingCredentialsError):
+        get_copy_authorization(inputs)
+
+    inputs.s3_staging_aws_access_key_id = "key-id"
+    inputs.s3_staging_aws_secret_access_key = "secret"
+    assert render_query(get_copy_authorization(inputs)) == "ACCESS_KEY_ID 'key-id' SECRET_ACCESS_KEY 'secret'"
+
+    inputs.s3_staging_iam_role = "arn:aws:iam::123:role/redshift"
+    assert render_query(get_copy_authorization(inputs)) == "IAM_ROLE 'arn:aws:iam::123:role/redshift'"
+
+
 @pytest.fixture
 def table_name(ateam, interval):
     return f"test_workflow_table_{ateam.pk}_{interval}"
@@ -334,6 +334,43 @@ async def test_parquet_writer_writes_record_batches(record_batch):
     ]
 
 
+@pytest.mark.asyncio
+async def test_parquet_writer_completes_file_on_flush():
+    """Test every flush is a complete Parquet file when `complete_file_on_flush` is set."""
+    flushed_files = []
+
+    async def store_in_memory_on_flush(
+        batch_export_file, records_since_last_flush, bytes_since_last_flush, last_inserted_at, is_last
+    ):
+        flushed_files.append((batch_export_file.read(), records_since_last_flush))
+
+    record_batch = TEST_RECORD_BATCHES[0]
+    schema_columns = [column_name for column_name in record_batch.column_names if column_name != "_inserted_at"]
+
+    writer = ParquetBatchExportWriter(
+        max_bytes=1,
+        flush_callable=store_in_memory_on_flush,
+        schema=record_batch.select(schema_columns).schema,
+        complete_file_on_flush=True,
+    )
+
+    async with writer.open_temporary_file():
+        for index in range(record_batch.num_rows):
+            await writer.write_record_batch(record_batch.slice(offset=index, length=1))
+
+    # No extra flush for footer bytes, as the footer is written before each flush.
+    assert len(flushed_files) == record_batch.num_rows
+    assert writer.records_total == record_batch.num_rows
+
+    for index, (flushed_file, records_since_last_flush) in enumerate(flushed_files):
+        written_parquet = pq.read_table(io.BytesIO(flushed_file))
+
+        assert records_since_last_flush == 1
+        assert (
+            written_parquet.to_pylist() == record_batch.slice(offset=index, length=1).select(schema_columns).to_pylist()
+        )
+
+
 @pytest.mark.parametrize(
     "record_batch",
     TEST_RECORD_BATCHES,
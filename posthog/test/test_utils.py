@@ -1,3 +1,6 @@
+import base64
+import gzip
+import json
 from datetime import datetime
 from unittest.mock import call, patch
 from zoneinfo import ZoneInfo
@@ -8,6 +11,7 @@ from django.http import HttpRequest
 from django.test import TestCase
 from django.test.client import RequestFactory
 from freezegun import freeze_time
+from prometheus_client import REGISTRY
 from rest_framework.request import Request
 
 from posthog.api.test.mock_sentry import mock_sentry_context_for_tagging
@@ -18,6 +22,7 @@ from posthog.test.base import BaseTest
 from posthog.utils import (
     PotentialSecurityProblemException,
     absolute_uri,
+    decompress,
     flatten,
     format_query_params_absolute_url,
     get_available_timezones_with_offsets,
@@ -393,14 +398,14 @@ class TestLoadDataFromRequest(TestCase):
             str(ctx.exception),
         )
 
-    @patch("posthog.utils.gzip")
-    def test_can_decompress_gzipped_body_received_with_no_compression_flag(self, patched_gzip):
+    @patch("posthog.utils._gunzip")
+    def test_can_decompress_gzipped_body_received_with_no_compression_flag(self, patched_gunzip):
         # see https://sentry.io/organizations/posthog2/issues/3136510367
         # one organization is causing a request parsing error by sending an encoded body
         # but the empty string for the compression value
         # this accounts for a large majority of our Sentry errors
 
-        patched_gzip.decompress.return_value = '{"what is it": "the decompressed value"}'
+        patched_gunzip.return_value = b'{"what is it": "the decompressed value"}'
 
         rf = RequestFactory()
         # a request with no compression set
@@ -410,6 +415,74 @@ class TestLoadDataFromRequest(TestCase):
         self.assertEqual({"what is it": "the decompressed value"}, data)
 
 
+class TestDecompress(TestCase):
+    payload = {"event": "$pageview", "properties": {"distinct_id": "eeeeeeegϥeeeee", "$time": 1.5}}
+
+    def test_decodes_plain_json(self):
+        body = b" \n" + json.dumps(self.payload).encode()
+
+        self.assertEqual(self.payload, decompress(body, ""))
+        self.assertEqual(self.payload, decompress(body.decode(), ""))
+
+    def test_decodes_gzip_with_and_without_compression_flag(self):
+        body = gzip.compress(json.dumps(self.payload).encode())
+
+        self.assertEqual(self.payload, decompress(body, "gzip-js"))
+        self.assertEqual(self.payload, decompress(body, ""))
+
+    def test_decodes_multi_member_gzip(self):
+        body = json.dumps(self.payload).encode()
+
+        self.assertEqual(self.payload, decompress(gzip.compress(body[:10]) + gzip.compress(body[10:]), "gzip"))
+
+    def test_rejects_trailing_bytes_after_gzip(self):
+        body = gzip.compress(json.dumps(self.payload).encode())
+
+        # Null padding is allowed after the last member, as it is by gzip.decompress
+        self.assertEqual(self.payload, decompress(body + b"\x00\x00", "gzip"))
+        with self.assertRaises(RequestParsingError) as ctx:
+            decompress(body + b"garbage", "gzip")
+
+        self.assertEqual("Failed to decompress data. Not a gzipped file (b'ga')", str(ctx.exception))
+
+    @patch("posthog.utils._gunzip")
+    def test_unspecified_gzip_retry_is_counted_once(self, patched_gunzip):
+        patched_gunzip.return_value = json.dumps(self.payload).encode()
+
+        def samples() -> list:
+            return [
+                REGISTRY.get_sample_value("posthog_kludges_total", {"kludge": "unspecified_gzip_fallback"}) or 0,
+                *(
+                    REGISTRY.get_sample_value(
+                        "posthog_request_payload_decode_seconds_count", {"compression": compression, "parser": parser}
+                    )
+                    or 0
+                    for compression in ("none", "gzip")
+                    for parser in ("fast", "fallback")
+                ),
+            ]
+
+        before = samples()
+        self.assertEqual(self.payload, decompress(b"the gzip compressed string", ""))
+
+        # The retry is timed as part of the fallback of the original payload, not as a gzip payload of its own
+        self.assertEqual([after - value for after, value in zip(samples(), before)], [1, 0, 1, 0, 0])
+
+    def test_decodes_base64(self):
+        self.assertEqual(self.payload, decompress(base64.b64encode(json.dumps(self.payload).encode()), ""))
+
+    def test_replaces_non_finite_constants_with_none(self):
+        self.assertEqual({"value": None}, decompress(b'{"value": NaN}', ""))
+
+    def test_refuses_to_decompress_past_the_size_limit(self):
+        body = gzip.compress(json.dumps({"padding": "a" * 2000}).encode())
+
+        with self.settings(MAX_DECOMPRESSED_REQUEST_SIZE=1000), self.assertRaises(RequestParsingError) as ctx:
+            decompress(body, "gzip")
+
+        self.assertEqual("Decompressed data is larger than 1000 bytes", str(ctx.exception))
+
+
 class TestShouldRefresh(TestCase):
     def test_refresh_requested_by_client_with_refresh_true(self):
         request = HttpRequest()
@@ -28,6 +28,7 @@ from urllib.parse import urljoin, urlparse
 from zoneinfo import ZoneInfo
 
 import lzstring
+import orjson
 import posthoganalytics
 import pytz
 import structlog
@@ -43,6 +44,7 @@ from django.http import HttpRequest, HttpResponse
 from django.template.loader import get_template
 from django.utils import timezone
 from django.utils.cache import patch_cache_control
+from prometheus_client import Histogram
 from rest_framework.request import Request
 from sentry_sdk import configure_scope
 from sentry_sdk.api import capture_exception
@@ -609,10 +611,72 @@ def base64_decode(data):
     return data.decode("utf8", "surrogatepass").encode("utf-16", "surrogatepass")
 
 
+GZIP_MAGIC_BYTES = b"\x1f\x8b"
+
+# Matches payloads that can only be plain JSON (base64 and lz64 never start with "{" or "[")
+_JSON_PAYLOAD_START_BYTES = re.compile(rb"[ \t\n\r]*[\[{]")
+_JSON_PAYLOAD_START_STR = re.compile(r"[ \t\n\r]*[\[{]")
+
+REQUEST_PAYLOAD_DECODE_HISTOGRAM = Histogram(
+    "posthog_request_payload_decode_seconds",
+    "Time taken to decompress and parse capture and decide request payloads",
+    labelnames=["compression", "parser"],
+)
+
+
+def _gunzip(data: bytes) -> bytes:
+    """
+    Decompresses (possibly multi-member) gzip data in one pass, refusing to inflate it past
+    `settings.MAX_DECOMPRESSED_REQUEST_SIZE` bytes. Like `gzip.decompress`, only null padding may follow the last
+    member.
+    """
+    max_size = settings.MAX_DECOMPRESSED_REQUEST_SIZE
+    members: list[bytes] = []
+    size = 0
+    while True:
+        decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        member = decompressor.decompress(data, max_size - size + 1)
+        size += len(member)
+        if size > max_size:
+            raise RequestParsingError(f"Decompressed data is larger than {max_size} bytes")
+        if not decompressor.eof:
+            raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+        members.append(member)
+
+        data = decompressor.unused_data.lstrip(b"\x00")
+        if not data:
+            return b"".join(members)
+        if not data.startswith(GZIP_MAGIC_BYTES):
+            raise gzip.BadGzipFile(f"Not a gzipped file ({data[:2]!r})")
+
+
+def _fast_json_loads(data: Any) -> Any:
+    """
+    Parses payloads that are obviously JSON with orjson. Returns `None` when the payload needs the slower path
+    (base64 encoded, NaN/Infinity constants, lone surrogates, integers wider than 64 bits, invalid JSON...).
+    """
+    if isinstance(data, bytes):
+        if not _JSON_PAYLOAD_START_BYTES.match(data):
+            return None
+    elif not isinstance(data, str) or not _JSON_PAYLOAD_START_STR.match(data):
+        return None
+
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return None
+
+
 def decompress(data: Any, compression: str):
     if not data:
         return None
 
+    start_time = time.perf_counter()
+    if compression == "" and isinstance(data, bytes) and data.startswith(GZIP_MAGIC_BYTES):
+        # Some clients send gzipped bodies without saying so, sniff them instead of failing to parse them first
+        KLUDGES_COUNTER.labels(kludge="unspecified_gzip_fallback").inc()
+        compression = "gzip"
+
     if compression == "gzip" or compression == "gzip-js":
         if data == b"undefined":
             raise RequestParsingError(
@@ -620,7 +684,7 @@ def decompress(data: Any, compression: str):
             )
 
         try:
-            data = gzip.decompress(data)
+            data = _gunzip(data)
         except (EOFError, OSError, zlib.error) as error:
             raise RequestParsingError("Failed to decompress data. {}".format(str(error)))
 
@@ -637,6 +701,21 @@ def decompress(data: Any, compression: str):
 
         data = data.encode("utf-16", "surrogatepass").decode("utf-16")
 
+    parsed = _fast_json_loads(data)
+    if parsed is not None:
+        REQUEST_PAYLOAD_DECODE_HISTOGRAM.labels(compression=compression or "none", parser="fast").observe(
+            time.perf_counter() - start_time
+        )
+        return parsed
+
+    parsed = _decode_payload_fallback(data, compression)
+    REQUEST_PAYLOAD_DECODE_HISTOGRAM.labels(compression=compression or "none", parser="fallback").observe(
+        time.perf_counter() - start_time
+    )
+    return parsed
+
+
+def _decode_payload_fallback(data: Any, compression: str):
     base64_decoded = None
     try:
         base64_decoded = base64_decode(data)
@@ -655,7 +734,11 @@ def decompress(data: Any, compression: str):
     except (json.JSONDecodeError, UnicodeDecodeError) as error_main:
         if compression == "":
             try:
-                fallback = decompress(data, "gzip")
+                # Not through `decompress`, which would count and time this payload a second time
+                decompressed = _gunzip(data)
+                fallback = _fast_json_loads(decompressed)
+                if fallback is None:
+                    fallback = _decode_payload_fallback(decompressed, "gzip")
                 KLUDGES_COUNTER.labels(kludge="unspecified_gzip_fallback").inc()
                 return fallback
             except Exception as inner:
@@ -670,6 +753,25 @@ def decompress(data: Any, compression: str):
 
 # Used by non-DRF endpoints from capture.py and decide.py (/decide, /batch, /capture, etc)
 def load_data_from_request(request):
+    """
+    Decodes the request payload. The result, or the parsing error, is memoized on the request so that throttles
+    and views handling the same request only decompress and parse the body once.
+    """
+    decoded = getattr(request, "_decoded_payload", None)
+    if decoded is None:
+        try:
+            decoded = (_load_data_from_request(request), None)
+        except RequestParsingError as error:
+            decoded = (None, error)
+        request._decoded_payload = decoded
+
+    data, error = decoded
+    if error is not None:
+        raise error
+    return data
+
+
+def _load_data_from_request(request):
     if request.method == "POST":
         if request.content_type in ["", "text/plain", "application/json"]:
             data = request.body